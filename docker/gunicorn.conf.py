@@ -0,0 +1,25 @@
+"""Gunicorn configuration for DiveOps production workers."""
+
+bind = "0.0.0.0:8000"
+workers = 4
+threads = 2
+accesslog = "-"
+errorlog = "-"
+
+# No post_fork hook: rust_client drops inherited HTTP pools itself via
+# os.register_at_fork, and importing it here would load Django models
+# before the WSGI app has called django.setup().
+
+
+def worker_exit(server, worker):
+    """Close pooled keep-alive connections."""
+    from django.apps import apps
+
+    if not apps.ready:
+        return  # The worker exited before the app was loaded
+
+    from diveops.operations.planning import deco_runner
+    from diveops.operations.pricing import rust_client
+
+    rust_client.close_clients()
+    deco_runner.close_client()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark location batch ingestion.
+
+Compares writing a batch of GPS fixes one INSERT at a time (the previous
+LocationBatchUpdateView behaviour) with LocationIngestService.ingest_batch
+(validation, one dedupe query, bulk_create).
+
+Writes go to the configured database inside a transaction that is rolled
+back, so nothing is kept.
+
+Usage:
+    # 10k-point batches, 3 runs each
+    python scripts/benchmark_location_ingest.py --points 10000 --runs 3
+
+    # Only the bulk path
+    python scripts/benchmark_location_ingest.py --bulk-only
+
+Requirements:
+    - Database from DJANGO_SETTINGS_MODULE (default: diveops.settings.dev) migrated
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from statistics import mean
+
+# Add src to path for Django imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "diveops.settings.dev")
+
+import django
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from django_parties.models import Person
+
+from diveops.operations.models import LocationUpdate
+from diveops.operations.services.locations import LocationIngestService, parse_location
+
+
+class Rollback(Exception):
+    pass
+
+
+def make_updates(count: int) -> list[dict]:
+    """Synthetic fixes one second apart around Cozumel."""
+    start = timezone.now() - timedelta(seconds=count)
+    return [
+        {
+            "latitude": f"{20.5 + (i % 1000) * 0.0001:.6f}",
+            "longitude": f"{-87.3 - (i % 1000) * 0.0001:.6f}",
+            "accuracy_meters": 8.5,
+            "source": "gps",
+            "recorded_at": (start + timedelta(seconds=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def ingest_per_row(person, updates):
+    """Previous behaviour: validate and INSERT each fix separately."""
+    for update in updates:
+        LocationUpdate.objects.create(person=person, **parse_location(update))
+    return len(updates)
+
+
+def ingest_bulk(person, updates):
+    return LocationIngestService.ingest_batch(person, updates).accepted
+
+
+def run(label, fn, updates, runs):
+    times = []
+    queries = 0
+    for _ in range(runs):
+        try:
+            with transaction.atomic():
+                person = Person.objects.create(first_name="Benchmark", last_name="Diver")
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    written = fn(person, updates)
+                    times.append(time.perf_counter() - start)
+                queries = len(ctx.captured_queries)
+                raise Rollback
+        except Rollback:
+            pass
+
+    rate = len(updates) / mean(times)
+    print(f"{label:<10} {mean(times) * 1000:>10.1f} ms  {min(times) * 1000:>10.1f} ms  "
+          f"{rate:>10.0f}/s  {queries:>8}  ({written} written)")
+    return mean(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10000, help="Fixes per batch")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per strategy")
+    parser.add_argument("--bulk-only", action="store_true", help="Skip the per-row baseline")
+    args = parser.parse_args()
+
+    updates = make_updates(args.points)
+    print(f"{args.points} points, {args.runs} runs, database: {connection.vendor}\n")
+    print(f"{'strategy':<10} {'mean':>13}  {'best':>13}  {'rate':>12}  {'queries':>8}")
+
+    bulk = run("bulk", ingest_bulk, updates, args.runs)
+    if not args.bulk_only:
+        per_row = run("per-row", ingest_per_row, updates, args.runs)
+        print(f"\nbulk is {per_row / bulk:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark scalar vs vectorized Bühlmann tissue loading.
+
+Usage:
+    # Default: 20, 200 and 2000-step route profiles
+    python scripts/benchmark_tissue.py --iterations 200
+
+    # Custom profile lengths
+    python scripts/benchmark_tissue.py --segments 50 500 5000
+
+Requirements:
+    - Django settings configured
+    - numpy installed
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from statistics import mean
+
+# Add src to path for Django imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "diveops.settings.dev")
+
+import django
+django.setup()
+
+from diveops.operations import _services as scalar
+from diveops.operations.planning import tissue_engine as engine
+
+
+def build_profile(segment_count: int) -> list[dict]:
+    """Build a segmented multilevel route profile."""
+    rng = random.Random(segment_count)
+    return [
+        {"depth_m": round(rng.uniform(3.0, 40.0), 1), "duration_min": round(rng.uniform(0.1, 2.0), 2)}
+        for _ in range(segment_count)
+    ]
+
+
+def time_calls(fn, iterations: int) -> list[float]:
+    """Time fn() over iterations, returning milliseconds per call."""
+    # Warm up
+    for _ in range(5):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def benchmark_profile(segment_count: int, iterations: int):
+    """Compare dive loading + NDL for one profile length."""
+    steps = build_profile(segment_count)
+
+    def run_scalar():
+        state, _ = scalar.calculate_dive_tissue_loading(route_segments=steps, gas_o2_fraction=0.32)
+        scalar.calculate_ndl(state, 18.0, gf_high=85)
+
+    def run_vectorized():
+        state, _ = engine.calculate_dive_tissue_loading(route_segments=steps, gas_o2_fraction=0.32)
+        engine.calculate_ndl(state, 18.0, gf_high=85)
+
+    # Sanity check before timing
+    expected, _ = scalar.calculate_dive_tissue_loading(route_segments=steps, gas_o2_fraction=0.32)
+    actual, _ = engine.calculate_dive_tissue_loading(route_segments=steps, gas_o2_fraction=0.32)
+    max_error = max(abs(a - b) for a, b in zip(expected.n2_pressures, actual.n2_pressures, strict=True))
+
+    scalar_avg = mean(time_calls(run_scalar, iterations))
+    vector_avg = mean(time_calls(run_vectorized, iterations))
+    speedup = scalar_avg / vector_avg if vector_avg > 0 else 0
+
+    print(f"\n{segment_count} segments:")
+    print(f"  Scalar:     {scalar_avg:.3f} ms")
+    print(f"  Vectorized: {vector_avg:.3f} ms")
+    print(f"  Speedup:    {speedup:.1f}x")
+    print(f"  Max error:  {max_error:.2e} bar")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tissue loading implementations")
+    parser.add_argument("--iterations", type=int, default=200, help="Number of iterations (default: 200)")
+    parser.add_argument(
+        "--segments",
+        type=int,
+        nargs="+",
+        default=[20, 200, 2000],
+        help="Route profile lengths to benchmark (default: 20 200 2000)",
+    )
+    args = parser.parse_args()
+
+    print("Benchmark Configuration:")
+    print(f"  Iterations: {args.iterations}")
+    print(f"  Segments:   {args.segments}")
+
+    print("\n" + "=" * 60)
+    print("BENCHMARK RESULTS")
+    print("=" * 60)
+
+    for segment_count in args.segments:
+        benchmark_profile(segment_count, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
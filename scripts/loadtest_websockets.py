@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Load test for the chat WebSocket consumer.
+
+Opens many concurrent sockets against ChatConsumer in-process (in-memory
+channel layer, no server or Redis needed), spread over conversation rooms
+with one staff socket each, then measures how long connecting takes and
+how long a staff message takes to reach every visitor in its room.
+
+Each channel layer call is delayed by --layer-latency-ms to stand in for
+the Redis round trip; that is where sync consumers block their thread.
+
+Usage:
+    # Current consumer
+    python scripts/loadtest_websockets.py --sockets 2000 --rooms 200
+
+    # Compare with another implementation (e.g. a copy of the old sync
+    # consumer saved as scripts/old_consumers.py)
+    python scripts/loadtest_websockets.py --consumer old_consumers.ChatConsumer
+
+    # Without simulated Redis latency
+    python scripts/loadtest_websockets.py --layer-latency-ms 0
+
+Reports sockets connected, connect time, fan-out latency and the peak
+number of threads the process used.
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+import uuid
+from statistics import mean, median
+
+# Add src to path for Django imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Setup Django (in-memory channel layer)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "diveops.settings.test")
+
+import django
+django.setup()
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+
+
+class StaffUser:
+    pk = 1
+    is_authenticated = True
+    is_staff = True
+
+
+def load_consumer(path):
+    module_name, _, class_name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def add_layer_latency(latency_ms):
+    """Delay group operations on the channel layer like a Redis round trip."""
+    layer = get_channel_layer()
+    for name in ("group_add", "group_discard", "group_send"):
+        original = getattr(layer, name)
+
+        async def delayed(*args, _original=original, **kwargs):
+            await asyncio.sleep(latency_ms / 1000)
+            return await _original(*args, **kwargs)
+
+        setattr(layer, name, delayed)
+
+
+class ThreadSampler:
+    """Record the peak thread count while the test runs."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def open_socket(consumer, conversation_id, user=None):
+    communicator = WebsocketCommunicator(consumer.as_asgi(), f"/ws/chat/conversation/{conversation_id}/")
+    communicator.scope["url_route"] = {"kwargs": {"conversation_id": conversation_id}}
+    communicator.scope["user"] = user
+    connected, _ = await communicator.connect(timeout=30)
+    if not connected:
+        return None
+    await communicator.receive_json_from(timeout=30)
+    return communicator
+
+
+async def run(consumer, sockets, rooms, timeout):
+    room_ids = [str(uuid.uuid4()) for _ in range(rooms)]
+    visitors_per_room = max(1, sockets // rooms - 1)
+
+    start = time.perf_counter()
+    staff = await asyncio.gather(*(open_socket(consumer, room, StaffUser()) for room in room_ids))
+    visitors = await asyncio.gather(
+        *(open_socket(consumer, room) for room in room_ids for _ in range(visitors_per_room))
+    )
+    connect_seconds = time.perf_counter() - start
+
+    opened = [c for c in [*staff, *visitors] if c is not None]
+    print(f"Connected: {len(opened)}/{len(staff) + len(visitors)} sockets in {connect_seconds:.2f}s")
+
+    latencies = []
+
+    async def fan_out(index, room_staff):
+        room_visitors = visitors[index * visitors_per_room:(index + 1) * visitors_per_room]
+        sent = time.perf_counter()
+        await room_staff.send_json_to({"type": "message", "message": "ping"})
+        await asyncio.gather(*(v.receive_json_from(timeout=timeout) for v in room_visitors if v))
+        latencies.append((time.perf_counter() - sent) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fan_out(i, s) for i, s in enumerate(staff) if s))
+    fan_out_seconds = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Fan-out: {len(latencies)} rooms in {fan_out_seconds:.2f}s")
+    print(f"  Mean:   {mean(latencies):.2f}ms")
+    print(f"  Median: {median(latencies):.2f}ms")
+    print(f"  P99:    {latencies[int(len(latencies) * 0.99) - 1]:.2f}ms")
+
+    await asyncio.gather(*(c.disconnect() for c in opened))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the chat WebSocket consumer")
+    parser.add_argument("--consumer", default="diveops.operations.consumers.ChatConsumer", help="Consumer class path")
+    parser.add_argument("--sockets", type=int, default=1000, help="Total sockets to open")
+    parser.add_argument("--rooms", type=int, default=100, help="Conversation rooms")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for each message")
+    parser.add_argument("--layer-latency-ms", type=float, default=1.0, help="Simulated channel layer round trip")
+    args = parser.parse_args()
+
+    consumer = load_consumer(args.consumer)
+    if args.layer_latency_ms:
+        add_layer_latency(args.layer_latency_ms)
+    print(f"Consumer: {args.consumer} ({args.sockets} sockets, {args.rooms} rooms)")
+    with ThreadSampler() as sampler:
+        asyncio.run(run(consumer, args.sockets, args.rooms, args.timeout))
+    print(f"Peak threads: {sampler.peak}")
+
+
+if __name__ == "__main__":
+    main()
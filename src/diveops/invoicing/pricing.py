@@ -14,7 +14,7 @@ from django_agreements.models import Agreement
 
 from diveops.pricing.exceptions import NoPriceFoundError
 from diveops.pricing.models import PricedBasketItem
-from diveops.pricing.selectors import resolve_price
+from diveops.pricing.selectors import resolve_prices
 
 from .exceptions import MixedCurrencyError, PricingError
 
@@ -90,14 +90,26 @@ def price_basket(
     failed_items: List[BasketItem] = []
     currency: Optional[str] = None
 
-    for basket_item in basket.items.select_related("catalog_item"):
+    basket_items = list(basket.items.select_related("catalog_item"))
+    resolved_prices = resolve_prices(
+        [basket_item.catalog_item for basket_item in basket_items],
+        organization=organization,
+        party=party,
+        agreement=agreement,
+    )
+
+    for basket_item in basket_items:
         try:
-            resolved = resolve_price(
-                basket_item.catalog_item,
-                organization=organization,
-                party=party,
-                agreement=agreement,
-            )
+            resolved = resolved_prices.get(basket_item.catalog_item_id)
+            if resolved is None:
+                raise NoPriceFoundError(
+                    basket_item.catalog_item,
+                    context={
+                        "organization": organization,
+                        "party": party,
+                        "agreement": agreement,
+                    },
+                )
 
             # Create or update PricedBasketItem
             priced_item, _ = PricedBasketItem.objects.update_or_create(
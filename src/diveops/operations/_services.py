@@ -3436,7 +3436,9 @@ def lock_dive_plan(
         )
 
     # Build and save snapshot
-    dive.plan_snapshot = build_plan_snapshot(template=template, dive=dive)
+    new_snapshot = build_plan_snapshot(template=template, dive=dive)
+    _carry_over_validation(dive.plan_snapshot, new_snapshot)
+    dive.plan_snapshot = new_snapshot
     dive.plan_locked_at = timezone.now()
     dive.plan_locked_by = actor
     dive.plan_template_id = template.id
@@ -3504,7 +3506,9 @@ def resnapshot_dive_plan(
     old_snapshot = dive.plan_snapshot
 
     # Build and save new snapshot
-    dive.plan_snapshot = build_plan_snapshot(template=template, dive=dive)
+    new_snapshot = build_plan_snapshot(template=template, dive=dive)
+    _carry_over_validation(old_snapshot, new_snapshot)
+    dive.plan_snapshot = new_snapshot
     dive.plan_locked_at = timezone.now()
     dive.plan_locked_by = actor
     dive.plan_template_id = template.id
@@ -3539,7 +3543,9 @@ def lock_excursion_plans(
     """Lock plans for all dives in an excursion.
 
     Typically called when sending briefing to customers. Only locks
-    dives that are not already locked.
+    dives that are not already locked. With DECO_VALIDATE_ON_LOCK (and
+    ENABLE_DECO_VALIDATION) set, the locked plans are validated in one
+    batch after the transaction commits.
 
     Args:
         actor: Staff user locking plans
@@ -3548,6 +3554,8 @@ def lock_excursion_plans(
     Returns:
         List of locked Dive instances
     """
+    from django.conf import settings
+
     from .models import Dive
 
     # Get all unlocked dives in this excursion
@@ -3562,6 +3570,15 @@ def lock_excursion_plans(
             # Skip dives without templates or other issues
             pass
 
+    # Validator calls (HTTP or subprocess) must not run while this
+    # transaction holds the dives' row locks
+    if locked_dives and getattr(settings, "DECO_VALIDATE_ON_LOCK", False):
+        dive_ids = [d.pk for d in locked_dives]
+        transaction.on_commit(
+            lambda: _validate_locked_plans(actor=actor, dive_ids=dive_ids),
+            robust=True,
+        )
+
     if locked_dives:
         log_excursion_event(
             action=Actions.EXCURSION_PLANS_LOCKED,
@@ -3581,6 +3598,52 @@ def lock_excursion_plans(
 # =============================================================================
 
 
+def _plan_validator_input(plan_snapshot: dict) -> dict | None:
+    """Build deco validator input from a plan snapshot's briefing.
+
+    Returns None if the snapshot has no route segments.
+    """
+    from django.conf import settings
+
+    from .planning import build_validator_input
+
+    briefing = plan_snapshot.get("briefing", {})
+    route_segments = briefing.get("route_segments", [])
+    if not route_segments:
+        return None
+
+    # Use stored gas values (floats), not label lookup; configured GF values
+    return build_validator_input(
+        route_segments=route_segments,
+        gas_o2=briefing.get("gas_o2", 0.21),
+        gas_he=briefing.get("gas_he", 0.0),
+        gf_low=getattr(settings, "DECO_GF_LOW", 0.40),
+        gf_high=getattr(settings, "DECO_GF_HIGH", 0.85),
+    )
+
+
+def _carry_over_validation(old_snapshot: dict | None, new_snapshot: dict) -> None:
+    """Keep a previous validation if the validator input is unchanged.
+
+    Re-locking or re-snapshotting a plan whose route, gas and GF settings
+    are identical would otherwise drop the validation and force a new
+    sidecar call. Validations made under an older DECO_RESULT_CACHE_VERSION
+    are dropped, like cached results.
+    """
+    from .planning.deco_runner import result_cache_version
+    from .planning.segment_converter import content_hash
+
+    validation = (old_snapshot or {}).get("validation")
+    if not validation or "error" in validation or not validation.get("input_key"):
+        return
+    if validation.get("cache_version") != result_cache_version():
+        return
+
+    input_data = _plan_validator_input(new_snapshot)
+    if input_data is not None and content_hash(input_data) == validation["input_key"]:
+        new_snapshot["validation"] = validation
+
+
 @transaction.atomic
 def validate_dive_plan(
     *,
@@ -3607,8 +3670,6 @@ def validate_dive_plan(
     """
     from django.conf import settings
 
-    from .audit import Actions, log_dive_event
-
     if not dive.plan_snapshot:
         raise ValueError("Dive plan must be locked before validation")
 
@@ -3624,12 +3685,11 @@ def validate_dive_plan(
         logger.info(f"Deco validation disabled, skipping dive {dive.id}")
         return dive
 
-    from .planning import build_validator_input, run_deco_validator
+    from .planning import run_deco_validator
 
-    briefing = dive.plan_snapshot.get("briefing", {})
-    route_segments = briefing.get("route_segments", [])
+    input_data = _plan_validator_input(dive.plan_snapshot)
 
-    if not route_segments:
+    if input_data is None:
         dive.plan_snapshot["validation"] = {
             "error": "no_route_segments",
             "validated_at": timezone.now().isoformat(),
@@ -3637,23 +3697,77 @@ def validate_dive_plan(
         dive.save(update_fields=["plan_snapshot"])
         return dive
 
-    # Use stored gas values (floats), not label lookup
-    gas_o2 = briefing.get("gas_o2", 0.21)
-    gas_he = briefing.get("gas_he", 0.0)
+    # Unchanged input is answered from the deco result cache (no sidecar call)
+    result = run_deco_validator(input_data)
+    _store_validation(actor=actor, dive=dive, result=result)
+
+    return dive
 
-    # Build validator input using configured GF values
-    gf_low = getattr(settings, "DECO_GF_LOW", 0.40)
-    gf_high = getattr(settings, "DECO_GF_HIGH", 0.85)
 
-    input_data = build_validator_input(
-        route_segments=route_segments,
-        gas_o2=gas_o2,
-        gas_he=gas_he,
-        gf_low=gf_low,
-        gf_high=gf_high,
-    )
+@transaction.atomic
+def validate_excursion_plans(
+    *,
+    actor,
+    dives: list["Dive"],
+    force: bool = False,
+) -> list["Dive"]:
+    """Validate the locked plans of several dives in one batch.
+
+    Same as validate_dive_plan per dive, but all inputs go through one
+    run_deco_validators call: cached results are reused, and once the HTTP
+    endpoint is found down the remaining dives skip it.
+
+    Args:
+        actor: User performing validation
+        dives: Dives with locked plan_snapshots (unlocked dives are skipped)
+        force: If True, re-validate dives that already have a validation
+
+    Returns:
+        Dives whose validation was updated
+    """
+    from django.conf import settings
+
+    if not getattr(settings, "ENABLE_DECO_VALIDATION", False):
+        logger.info("Deco validation disabled, skipping excursion dives")
+        return []
+
+    from .planning import run_deco_validators
+
+    pending = []
+    for dive in dives:
+        if not dive.plan_snapshot:
+            continue
+        if dive.plan_snapshot.get("validation") and not force:
+            continue
+        pending.append((dive, _plan_validator_input(dive.plan_snapshot)))
+
+    batch = [(dive, input_data) for dive, input_data in pending if input_data is not None]
+    results = run_deco_validators([input_data for _, input_data in batch])
+
+    for dive, input_data in pending:
+        if input_data is None:
+            dive.plan_snapshot["validation"] = {
+                "error": "no_route_segments",
+                "validated_at": timezone.now().isoformat(),
+            }
+            dive.save(update_fields=["plan_snapshot"])
+    for (dive, _), result in zip(batch, results, strict=True):
+        _store_validation(actor=actor, dive=dive, result=result)
+
+    return [dive for dive, _ in pending]
+
+
+def _validate_locked_plans(*, actor, dive_ids: list) -> None:
+    """Validate freshly locked plans after the lock transaction commits."""
+    from .models import Dive
+
+    validate_excursion_plans(actor=actor, dives=list(Dive.objects.filter(pk__in=dive_ids)))
+
+
+def _store_validation(*, actor, dive: "Dive", result: dict) -> None:
+    """Save a validator result on the dive's plan_snapshot and audit it."""
+    from .audit import Actions, log_dive_event
 
-    result = run_deco_validator(input_data)
     result["validated_at"] = timezone.now().isoformat()
 
     dive.plan_snapshot["validation"] = result
@@ -3680,8 +3794,6 @@ def validate_dive_plan(
             data={"error": result.get("error")},
         )
 
-    return dive
-
 
 # =============================================================================
 # Catalog Item Services
@@ -4857,6 +4969,46 @@ class ExcursionTissueProfile:
     gf_high: int  # Gradient factor high used for calculations
 
 
+def _tissue_functions():
+    """Return (dive_loading, offgassing, ndl) functions.
+
+    Uses the vectorized NumPy engine when available, otherwise the scalar
+    functions above.
+    """
+    try:
+        from .planning import tissue_engine as engine
+    except ImportError:
+        return calculate_dive_tissue_loading, calculate_surface_interval_offgassing, calculate_ndl
+    return engine.calculate_dive_tissue_loading, engine.calculate_surface_interval_offgassing, engine.calculate_ndl
+
+
+def _dive_template_profile(dive) -> tuple[list[dict], float]:
+    """Return (flat steps, gas O2 fraction) for an excursion type dive."""
+    from .planning.segment_converter import segments_to_steps
+
+    # Get dive segments from route_segments or use simple depth profile
+    if hasattr(dive, "route_segments") and dive.route_segments:
+        # Convert route_segments to flat steps for calculation
+        steps = segments_to_steps(dive.route_segments)
+    else:
+        # Simple rectangular profile based on planned depth and duration
+        # ExcursionTypeDive uses planned_depth_meters and planned_duration_minutes
+        max_depth = getattr(dive, "planned_depth_meters", None)
+        if max_depth is None:
+            max_depth = getattr(dive, "max_depth_m", 18.0)
+        bottom_time = getattr(dive, "planned_duration_minutes", None)
+        if bottom_time is None:
+            bottom_time = getattr(dive, "bottom_time_min", 30.0)
+        steps = [{"depth_m": float(max_depth), "duration_min": float(bottom_time)}]
+
+    # Get gas mix (default to air)
+    gas_o2 = 0.21
+    if hasattr(dive, "gas_o2_fraction") and dive.gas_o2_fraction:
+        gas_o2 = float(dive.gas_o2_fraction)
+
+    return steps, gas_o2
+
+
 def calculate_excursion_tissue_loading(
     excursion_type,
     gf_low: int = DEFAULT_GF_LOW,
@@ -4875,7 +5027,7 @@ def calculate_excursion_tissue_loading(
     Returns:
         ExcursionTissueProfile with dive results and surface intervals
     """
-    from .planning.segment_converter import segments_to_steps
+    dive_loading, offgassing, ndl = _tissue_functions()
 
     dives = excursion_type.dive_templates.order_by("sequence")
     dive_results = []
@@ -4891,7 +5043,7 @@ def calculate_excursion_tissue_loading(
             si_loading_before = current_tissue_state.max_loading_percent()
             si_pg_before = loading_to_pressure_group(si_loading_before)
 
-            current_tissue_state = calculate_surface_interval_offgassing(
+            current_tissue_state = offgassing(
                 tissue_state=current_tissue_state,
                 duration_min=float(dive.surface_interval_minutes),
             )
@@ -4913,31 +5065,13 @@ def calculate_excursion_tissue_loading(
             # Update loading_before to reflect post-SI state
             loading_before = current_tissue_state.max_loading_percent()
 
-        # Get dive segments from route_segments or use simple depth profile
-        if hasattr(dive, "route_segments") and dive.route_segments:
-            # Convert route_segments to flat steps for calculation
-            steps = segments_to_steps(dive.route_segments)
-        else:
-            # Simple rectangular profile based on planned depth and duration
-            # ExcursionTypeDive uses planned_depth_meters and planned_duration_minutes
-            max_depth = getattr(dive, "planned_depth_meters", None)
-            if max_depth is None:
-                max_depth = getattr(dive, "max_depth_m", 18.0)
-            bottom_time = getattr(dive, "planned_duration_minutes", None)
-            if bottom_time is None:
-                bottom_time = getattr(dive, "bottom_time_min", 30.0)
-            steps = [{"depth_m": float(max_depth), "duration_min": float(bottom_time)}]
-
-        # Extract max depth from steps (works for both branches)
-        dive_max_depth = max((s.get("depth_m", 0) for s in steps), default=18.0)
+        steps, gas_o2 = _dive_template_profile(dive)
 
-        # Get gas mix (default to air)
-        gas_o2 = 0.21
-        if hasattr(dive, "gas_o2_fraction") and dive.gas_o2_fraction:
-            gas_o2 = float(dive.gas_o2_fraction)
+        # Extract max depth from steps (works for both profile sources)
+        dive_max_depth = max((s.get("depth_m", 0) for s in steps), default=18.0)
 
         # Calculate NDL at start of this dive (with gradient factors)
-        ndl_at_start = calculate_ndl(
+        ndl_at_start = ndl(
             tissue_state=current_tissue_state,
             depth_m=float(dive_max_depth),
             gas_o2_fraction=gas_o2,
@@ -4949,7 +5083,7 @@ def calculate_excursion_tissue_loading(
         pg_before_dive = loading_to_pressure_group(loading_before)
 
         # Calculate dive tissue loading
-        current_tissue_state, metrics = calculate_dive_tissue_loading(
+        current_tissue_state, metrics = dive_loading(
             route_segments=steps,
             gas_o2_fraction=gas_o2,
             initial_tissue_state=current_tissue_state,
@@ -4987,6 +5121,126 @@ def calculate_excursion_tissue_loading(
     )
 
 
+@dataclass
+class TissueGridPoint:
+    """Result for one (gf_low, gf_high, gas, depth offset) combination.
+
+    WARNING: This is EPHEMERAL planning data. Do NOT persist.
+    """
+
+    gf_low: int
+    gf_high: int
+    gas_o2_fraction: float | None  # None = each dive's own gas
+    depth_offset_m: float
+    dive_ndls: list[int | None]  # NDL at start of each dive, in sequence order
+    dive_loading_after: list[float]  # Max loading after each dive
+    min_ndl: int | None
+    max_loading_percent: float
+    final_loading_percent: float
+
+
+def build_tissue_grid(
+    gf_lows: list[int],
+    gf_highs: list[int],
+    gas_o2_fractions: list[float | None] | None = None,
+    depth_offsets_m: list[float] | None = None,
+) -> list[tuple[int, int, float | None, float]]:
+    """Build the cartesian grid for calculate_excursion_tissue_grid.
+
+    Combinations with gf_low > gf_high are skipped.
+    """
+    return [
+        (gf_low, gf_high, gas, offset)
+        for gas in (gas_o2_fractions or [None])
+        for offset in (depth_offsets_m or [0.0])
+        for gf_high in gf_highs
+        for gf_low in gf_lows
+        if gf_low <= gf_high
+    ]
+
+
+def calculate_excursion_tissue_grid(
+    excursion_type,
+    grid: list[tuple[int, int, float | None, float]],
+) -> list[TissueGridPoint]:
+    """Calculate NDL and loading for a whole what-if grid in one call.
+
+    Dive templates are loaded and their segments converted once. Tissue
+    loading does not depend on gradient factors, so the dive sequence is
+    simulated once per distinct (gas, depth offset) pair. Each grid point
+    then only solves NDL against the cached pre-dive tissue states.
+
+    WARNING: Returns EPHEMERAL data for planning/visualization only.
+    Do NOT store these results. Recalculate fresh each time.
+
+    Args:
+        excursion_type: ExcursionType instance with related dives
+        grid: (gf_low, gf_high, gas_o2_fraction, depth_offset_m) tuples.
+            gas_o2_fraction None uses each dive's own gas. depth_offset_m
+            is added to every step depth (clamped at the surface).
+
+    Returns:
+        TissueGridPoint per grid entry, in grid order
+    """
+    dive_loading, offgassing, ndl = _tissue_functions()
+
+    dives = [
+        (_dive_template_profile(dive), float(dive.surface_interval_minutes or 0), dive.sequence)
+        for dive in excursion_type.dive_templates.order_by("sequence")
+    ]
+
+    # (gas, offset) -> ([(state_before, max_depth, gas_o2)], [loading_after], final_loading)
+    trajectories = {}
+
+    def simulate(gas_override, offset):
+        tissue_state = TissueState()
+        before = []
+        loading_after = []
+        for (steps, dive_gas), si_minutes, sequence in dives:
+            if si_minutes and sequence > 1:
+                tissue_state = offgassing(tissue_state=tissue_state, duration_min=si_minutes)
+            if offset:
+                steps = [{**step, "depth_m": max(0.0, float(step.get("depth_m", 0)) + offset)} for step in steps]
+            gas_o2 = dive_gas if gas_override is None else gas_override
+            max_depth = max((s.get("depth_m", 0) for s in steps), default=18.0)
+            before.append((tissue_state, float(max_depth), gas_o2))
+            tissue_state, _ = dive_loading(
+                route_segments=steps,
+                gas_o2_fraction=gas_o2,
+                initial_tissue_state=tissue_state,
+            )
+            loading_after.append(tissue_state.max_loading_percent())
+        return before, loading_after, tissue_state.max_loading_percent()
+
+    results = []
+    for gf_low, gf_high, gas_o2_fraction, depth_offset_m in grid:
+        key = (gas_o2_fraction, float(depth_offset_m))
+        if key not in trajectories:
+            trajectories[key] = simulate(*key)
+        before, loading_after, final_loading = trajectories[key]
+
+        dive_ndls = [
+            ndl(tissue_state=state, depth_m=depth, gas_o2_fraction=gas_o2, gf_low=gf_low, gf_high=gf_high)
+            for state, depth, gas_o2 in before
+        ]
+        known_ndls = [n for n in dive_ndls if n is not None]
+        results.append(
+            TissueGridPoint(
+                gf_low=gf_low,
+                gf_high=gf_high,
+                gas_o2_fraction=gas_o2_fraction,
+                depth_offset_m=float(depth_offset_m),
+                dive_ndls=dive_ndls,
+                dive_loading_after=loading_after,
+                min_ndl=min(known_ndls) if known_ndls else None,
+                max_loading_percent=max(loading_after, default=TissueState().max_loading_percent()),
+                final_loading_percent=final_loading,
+            )
+        )
+
+    return results
+
+
 # =============================================================================
 # Protected Area Inheritance-Aware Services
 # =============================================================================
@@ -10,3 +10,6 @@ class OperationsConfig(AppConfig):
     label = "diveops"
     verbose_name = "Dive Operations"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from . import signals  # noqa: F401
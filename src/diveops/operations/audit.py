@@ -41,6 +41,7 @@ Usage:
     )
 """
 
+from django.db import transaction
 from django_audit_log import log as audit_log
 
 
@@ -548,6 +549,43 @@ def log_excursion_event(
     )
 
 
+def log_excursion_events(
+    action: str,
+    entries: list[tuple],
+    actor=None,
+    request=None,
+) -> list:
+    """Log the same audit action for many excursions in one transaction.
+
+    Used by bulk services (e.g. quote_excursions) so a batch of events is
+    committed together instead of one commit per event.
+
+    Args:
+        action: One of Actions.EXCURSION_* constants
+        entries: List of (excursion, data) tuples
+        actor: Django User who performed the action
+        request: Optional HTTP request
+
+    Returns:
+        List of AuditLog instances
+    """
+    if not entries:
+        return []
+
+    with transaction.atomic():
+        return [
+            audit_log(
+                action=action,
+                obj=excursion,
+                actor=actor,
+                changes={},
+                metadata=_build_excursion_metadata(excursion, data),
+                request=request,
+            )
+            for excursion, data in entries
+        ]
+
+
 def log_booking_event(
     action: str,
     booking,
@@ -16,6 +16,7 @@ from django_parties.models import Person
 from django_communication.models import MessageDirection, MessageStatus
 
 from .services.chat_queries import ConversationQueryService, MessageQueryService
+from .services.presence import PresenceService, RoomPresence
 
 
 class ChatInboxView(StaffPortalMixin, TemplateView):
@@ -40,6 +41,8 @@ class StaffChatConversationsAPIView(StaffPortalMixin, View):
 
     Uses ConversationQueryService to avoid N+1 queries - all conversation
     data including last message is fetched in a single optimized query.
+    Who is viewing each conversation comes from PresenceService (one cache
+    round trip, no database query).
     """
 
     def get(self, request):
@@ -70,6 +73,13 @@ class StaffChatConversationsAPIView(StaffPortalMixin, View):
             ).select_related("diver_profile")
         }
 
+        # Presence for the conversation, lead and visitor rooms of every row at once
+        presence = PresenceService.get_rooms(
+            [f"chat_conversation_{conv.pk}" for conv in conversations]
+            + [f"chat_lead_{conv.related_object_id}" for conv in conversations]
+            + [f"chat_visitor_{p.visitor_id}" for p in persons_by_id.values() if p.visitor_id]
+        )
+
         result = []
         now = timezone.now()
 
@@ -122,11 +132,26 @@ class StaffChatConversationsAPIView(StaffPortalMixin, View):
                 "lead_status": person.lead_status,
                 "conversation_status": conv.status,
                 "is_diver": is_diver,
+                "presence": _merge_presence(
+                    presence[f"chat_conversation_{conv.pk}"],
+                    presence[f"chat_lead_{conv.related_object_id}"],
+                    presence.get(f"chat_visitor_{person.visitor_id}", RoomPresence()),
+                ),
             })
 
         return JsonResponse({"conversations": result})
 
 
+def _merge_presence(*rooms) -> dict:
+    """Combine presence of the rooms that show the same conversation."""
+    merged = RoomPresence()
+    for room in rooms:
+        merged.staff_ids |= room.staff_ids
+        merged.user_ids |= room.user_ids
+        merged.visitors += room.visitors
+    return merged.to_dict()
+
+
 class StaffChatMessagesAPIView(StaffPortalMixin, View):
     """Get messages for a specific lead conversation.
 
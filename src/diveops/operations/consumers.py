@@ -1,11 +1,18 @@
-"""WebSocket consumers for real-time chat and WebRTC signaling."""
+"""WebSocket consumers for real-time chat and WebRTC signaling.
 
+Both consumers are async so an open socket costs a coroutine, not a thread
+from the server's sync pool. Any database access must go through
+channels.db.database_sync_to_async.
+"""
+
+import asyncio
 import json
 import logging
 
-from asgiref.sync import async_to_sync
-from channels.generic.websocket import WebsocketConsumer
-from django.contrib.contenttypes.models import ContentType
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .services.presence import PresenceService, TypingCoalescer, member_id, presence_ttl
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +22,7 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
-class WebRTCConsumer(WebsocketConsumer):
+class WebRTCConsumer(AsyncWebsocketConsumer):
     """WebSocket consumer for WebRTC signaling.
 
     Handles peer-to-peer video/audio call signaling:
@@ -29,21 +36,21 @@ class WebRTCConsumer(WebsocketConsumer):
     # Track connected users for call routing
     connected_users = {}
 
-    def connect(self):
+    async def connect(self):
         """Handle WebSocket connection."""
         route_kwargs = self.scope.get("url_route", {}).get("kwargs", {})
         user = self.scope.get("user")
 
         if not user or not user.is_authenticated:
             logger.warning("Unauthenticated WebRTC connection attempt")
-            self.close()
+            await self.close()
             return
 
         self.user_id = str(user.pk)
         self.room_group_name = f"webrtc_user_{self.user_id}"
 
         # Join personal room for receiving calls
-        async_to_sync(self.channel_layer.group_add)(
+        await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
@@ -51,18 +58,18 @@ class WebRTCConsumer(WebsocketConsumer):
         # Track this connection
         WebRTCConsumer.connected_users[self.user_id] = self.channel_name
 
-        self.accept()
+        await self.accept()
         logger.info(f"WebRTC connected: user {self.user_id}")
 
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "connected",
             "user_id": self.user_id,
         }))
 
-    def disconnect(self, close_code):
+    async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
         if hasattr(self, "room_group_name"):
-            async_to_sync(self.channel_layer.group_discard)(
+            await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name
             )
@@ -72,24 +79,24 @@ class WebRTCConsumer(WebsocketConsumer):
 
         logger.info(f"WebRTC disconnected: user {getattr(self, 'user_id', 'unknown')}")
 
-    def receive(self, text_data):
+    async def receive(self, text_data):
         """Handle incoming signaling message."""
         try:
             data = json.loads(text_data)
             msg_type = data.get("type")
 
             if msg_type == "call":
-                self.handle_call(data)
+                await self.handle_call(data)
             elif msg_type == "offer":
-                self.handle_offer(data)
+                await self.handle_offer(data)
             elif msg_type == "answer":
-                self.handle_answer(data)
+                await self.handle_answer(data)
             elif msg_type == "ice_candidate":
-                self.handle_ice_candidate(data)
+                await self.handle_ice_candidate(data)
             elif msg_type == "hangup":
-                self.handle_hangup(data)
+                await self.handle_hangup(data)
             elif msg_type == "reject":
-                self.handle_reject(data)
+                await self.handle_reject(data)
             else:
                 logger.warning(f"Unknown WebRTC message type: {msg_type}")
 
@@ -98,13 +105,13 @@ class WebRTCConsumer(WebsocketConsumer):
         except Exception as e:
             logger.exception(f"Error handling WebRTC message: {e}")
 
-    def handle_call(self, data):
+    async def handle_call(self, data):
         """Initiate a call to another user."""
         target_user_id = data.get("target_user_id")
         call_type = data.get("call_type", "video")  # video or audio
 
         if not target_user_id:
-            self.send(text_data=json.dumps({
+            await self.send(text_data=json.dumps({
                 "type": "error",
                 "message": "target_user_id required",
             }))
@@ -112,7 +119,7 @@ class WebRTCConsumer(WebsocketConsumer):
 
         # Check if target is online
         if target_user_id not in WebRTCConsumer.connected_users:
-            self.send(text_data=json.dumps({
+            await self.send(text_data=json.dumps({
                 "type": "user_offline",
                 "target_user_id": target_user_id,
             }))
@@ -120,7 +127,7 @@ class WebRTCConsumer(WebsocketConsumer):
 
         # Notify target user of incoming call
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "incoming_call",
@@ -131,7 +138,7 @@ class WebRTCConsumer(WebsocketConsumer):
 
         logger.info(f"Call initiated: {self.user_id} -> {target_user_id}")
 
-    def handle_offer(self, data):
+    async def handle_offer(self, data):
         """Forward SDP offer to target user."""
         target_user_id = data.get("target_user_id")
         sdp = data.get("sdp")
@@ -140,7 +147,7 @@ class WebRTCConsumer(WebsocketConsumer):
             return
 
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "webrtc_offer",
@@ -149,7 +156,7 @@ class WebRTCConsumer(WebsocketConsumer):
             }
         )
 
-    def handle_answer(self, data):
+    async def handle_answer(self, data):
         """Forward SDP answer to caller."""
         target_user_id = data.get("target_user_id")
         sdp = data.get("sdp")
@@ -158,7 +165,7 @@ class WebRTCConsumer(WebsocketConsumer):
             return
 
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "webrtc_answer",
@@ -167,7 +174,7 @@ class WebRTCConsumer(WebsocketConsumer):
             }
         )
 
-    def handle_ice_candidate(self, data):
+    async def handle_ice_candidate(self, data):
         """Forward ICE candidate to peer."""
         target_user_id = data.get("target_user_id")
         candidate = data.get("candidate")
@@ -176,7 +183,7 @@ class WebRTCConsumer(WebsocketConsumer):
             return
 
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "ice_candidate",
@@ -185,7 +192,7 @@ class WebRTCConsumer(WebsocketConsumer):
             }
         )
 
-    def handle_hangup(self, data):
+    async def handle_hangup(self, data):
         """End the call."""
         target_user_id = data.get("target_user_id")
 
@@ -193,7 +200,7 @@ class WebRTCConsumer(WebsocketConsumer):
             return
 
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "call_ended",
@@ -201,7 +208,7 @@ class WebRTCConsumer(WebsocketConsumer):
             }
         )
 
-    def handle_reject(self, data):
+    async def handle_reject(self, data):
         """Reject incoming call."""
         target_user_id = data.get("target_user_id")
 
@@ -209,7 +216,7 @@ class WebRTCConsumer(WebsocketConsumer):
             return
 
         target_room = f"webrtc_user_{target_user_id}"
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             target_room,
             {
                 "type": "call_rejected",
@@ -219,54 +226,54 @@ class WebRTCConsumer(WebsocketConsumer):
 
     # Channel layer message handlers
 
-    def incoming_call(self, event):
+    async def incoming_call(self, event):
         """Notify user of incoming call."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "incoming_call",
             "caller_id": event["caller_id"],
             "call_type": event["call_type"],
         }))
 
-    def webrtc_offer(self, event):
+    async def webrtc_offer(self, event):
         """Forward offer to user."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "offer",
             "caller_id": event["caller_id"],
             "sdp": event["sdp"],
         }))
 
-    def webrtc_answer(self, event):
+    async def webrtc_answer(self, event):
         """Forward answer to user."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "answer",
             "answerer_id": event["answerer_id"],
             "sdp": event["sdp"],
         }))
 
-    def ice_candidate(self, event):
+    async def ice_candidate(self, event):
         """Forward ICE candidate to user."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "ice_candidate",
             "sender_id": event["sender_id"],
             "candidate": event["candidate"],
         }))
 
-    def call_ended(self, event):
+    async def call_ended(self, event):
         """Notify user call ended."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "hangup",
             "ended_by": event["ended_by"],
         }))
 
-    def call_rejected(self, event):
+    async def call_rejected(self, event):
         """Notify user call was rejected."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "rejected",
             "rejected_by": event["rejected_by"],
         }))
 
 
-class ChatConsumer(WebsocketConsumer):
+class ChatConsumer(AsyncWebsocketConsumer):
     """WebSocket consumer for lead chat conversations.
 
     Supports two connection types:
@@ -274,12 +281,17 @@ class ChatConsumer(WebsocketConsumer):
     2. Staff (authenticated): /ws/chat/lead/<lead_id>/
 
     Messages are broadcast to all participants in the conversation.
+    Typing events are coalesced per socket (see TypingCoalescer) and each
+    socket is tracked in room presence while connected.
     """
 
-    def connect(self):
+    async def connect(self):
         """Handle WebSocket connection."""
         self.conversation_id = None
         self.room_group_name = None
+        self.presence_member = None
+        self.heartbeat_task = None
+        self.typing = TypingCoalescer(self.send_typing)
 
         # Determine connection type from URL route
         route_name = self.scope.get("url_route", {}).get("kwargs", {})
@@ -294,7 +306,7 @@ class ChatConsumer(WebsocketConsumer):
             user = self.scope.get("user")
             if not user or not user.is_authenticated or not user.is_staff:
                 logger.warning("Unauthorized WebSocket connection attempt")
-                self.close()
+                await self.close()
                 return
             self.lead_id = route_name["lead_id"]
             self.is_staff = True
@@ -315,54 +327,81 @@ class ChatConsumer(WebsocketConsumer):
             self.room_group_name = f"chat_conversation_{self.conversation_id}"
         else:
             logger.warning("Invalid WebSocket route")
-            self.close()
+            await self.close()
             return
 
         # Join room group
         try:
-            async_to_sync(self.channel_layer.group_add)(
+            await self.channel_layer.group_add(
                 self.room_group_name,
                 self.channel_name
             )
         except Exception as e:
             logger.exception(f"Failed to join channel group: {e}")
-            self.close()
+            await self.close()
             return
 
-        self.accept()
+        await self.accept()
         logger.info(f"WebSocket connected: {self.room_group_name}")
 
+        # Track presence, refreshed well inside its TTL while the socket is open
+        user = self.scope.get("user")
+        if self.is_staff:
+            self.presence_member = member_id("staff", str(user.pk), self.channel_name)
+        elif user and user.is_authenticated:
+            self.presence_member = member_id("user", str(user.pk), self.channel_name)
+        else:
+            visitor_id = getattr(self, "visitor_id", "anonymous")
+            self.presence_member = member_id("visitor", visitor_id, self.channel_name)
+        self.heartbeat_task = asyncio.ensure_future(self.presence_heartbeat())
+
         # Send connection confirmation to client
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "connection_established",
             "room": self.room_group_name,
         }))
 
-    def disconnect(self, close_code):
+    async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
+        if getattr(self, "typing", None):
+            self.typing.cancel()
+        if getattr(self, "heartbeat_task", None):
+            self.heartbeat_task.cancel()
+        if getattr(self, "presence_member", None):
+            await sync_to_async(PresenceService.leave, thread_sensitive=False)(
+                self.room_group_name, self.presence_member
+            )
+
         if self.room_group_name:
-            async_to_sync(self.channel_layer.group_discard)(
+            await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name
             )
             logger.info(f"WebSocket disconnected: {self.room_group_name}")
 
-    def receive(self, text_data):
+    async def presence_heartbeat(self):
+        """Keep this socket's presence entry alive."""
+        join = sync_to_async(PresenceService.join, thread_sensitive=False)
+        while True:
+            await join(self.room_group_name, self.presence_member)
+            await asyncio.sleep(presence_ttl() / 3)
+
+    async def receive(self, text_data):
         """Handle incoming WebSocket message."""
         try:
             data = json.loads(text_data)
             message_type = data.get("type", "message")
 
             if message_type == "message":
-                self.handle_message(data)
+                await self.handle_message(data)
             elif message_type == "typing":
-                self.handle_typing(data)
+                await self.handle_typing(data)
         except json.JSONDecodeError:
             logger.warning("Invalid JSON in WebSocket message")
         except Exception as e:
             logger.exception(f"Error handling WebSocket message: {e}")
 
-    def handle_message(self, data):
+    async def handle_message(self, data):
         """Handle a chat message."""
         message_text = data.get("message", "").strip()
         if not message_text:
@@ -370,7 +409,7 @@ class ChatConsumer(WebsocketConsumer):
 
         # The actual message saving is done via the HTTP API
         # This just broadcasts to the room that a new message exists
-        async_to_sync(self.channel_layer.group_send)(
+        await self.channel_layer.group_send(
             self.room_group_name,
             {
                 "type": "chat_message",
@@ -380,37 +419,41 @@ class ChatConsumer(WebsocketConsumer):
             }
         )
 
-    def handle_typing(self, data):
-        """Handle typing indicator."""
-        async_to_sync(self.channel_layer.group_send)(
+    async def handle_typing(self, data):
+        """Handle typing indicator (coalesced, see TypingCoalescer)."""
+        await self.typing.update(bool(data.get("is_typing", False)))
+
+    async def send_typing(self, is_typing):
+        """Fan out a coalesced typing state to the room."""
+        await self.channel_layer.group_send(
             self.room_group_name,
             {
                 "type": "typing_indicator",
-                "is_typing": data.get("is_typing", False),
+                "is_typing": is_typing,
                 "sender": "staff" if self.is_staff else "visitor",
             }
         )
 
-    def chat_message(self, event):
+    async def chat_message(self, event):
         """Send chat message to WebSocket."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "message",
             "message": event["message"],
             "direction": event["direction"],
             "sender": event["sender"],
         }))
 
-    def typing_indicator(self, event):
+    async def typing_indicator(self, event):
         """Send typing indicator to WebSocket."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "typing",
             "is_typing": event["is_typing"],
             "sender": event["sender"],
         }))
 
-    def new_message(self, event):
+    async def new_message(self, event):
         """Notify about a new message (sent from HTTP API)."""
-        self.send(text_data=json.dumps({
+        await self.send(text_data=json.dumps({
             "type": "new_message",
             "message_id": event.get("message_id"),
             "message": event.get("message"),
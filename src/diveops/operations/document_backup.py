@@ -1,17 +1,21 @@
 """Document backup service for exporting virtual folder structure as filesystem archive or S3."""
 
+import io
+import logging
 import os
 import shutil
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZIP64_LIMIT, ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 
 from django.conf import settings
 from django.utils import timezone
 
 from django_documents.models import Document, DocumentFolder
 
+logger = logging.getLogger(__name__)
+
 
 # S3 client singleton
 _s3_client = None
@@ -35,6 +39,13 @@ def get_s3_client():
     return _s3_client
 
 
+# S3 allows at most this many keys per DeleteObjects request
+S3_DELETE_BATCH = 1000
+
+# Manifest rows written per query while uploads complete
+SYNC_RECORD_BATCH = 500
+
+
 def sync_to_s3(
     bucket: str,
     prefix: str = "document-backup/",
@@ -42,10 +53,17 @@ def sync_to_s3(
     folder_ids: list[str] | None = None,
     document_ids: list[str] | None = None,
     delete_removed: bool = False,
+    full: bool = False,
+    client=None,
 ) -> dict:
     """
     Sync the virtual folder structure to an S3 bucket.
 
+    Incremental: every upload is recorded in DocumentSyncRecord, and a
+    document whose checksum and key match its record costs no S3 request.
+    Changed documents are uploaded in parallel (S3_SYNC_WORKERS), large
+    files in multipart chunks (S3_SYNC_MULTIPART_MB).
+
     Args:
         bucket: S3 bucket name.
         prefix: Prefix for all objects (like a folder path).
@@ -53,11 +71,17 @@ def sync_to_s3(
         folder_ids: List of specific folder UUIDs to include.
         document_ids: List of specific document UUIDs to include.
         delete_removed: If True, delete S3 objects not in current selection.
+            The listing is also used to re-upload recorded objects that
+            were removed from the bucket.
+        full: Ignore the sync records and upload every document.
+        client: S3 client to use instead of get_s3_client().
 
     Returns:
         Statistics about the sync operation.
     """
-    s3 = get_s3_client()
+    from .models import DocumentSyncRecord
+
+    s3 = client or get_s3_client()
 
     stats = {
         "uploaded": 0,
@@ -71,127 +95,177 @@ def sync_to_s3(
     if prefix and not prefix.endswith('/'):
         prefix = prefix + '/'
 
-    # Track uploaded keys for deletion detection
-    uploaded_keys = set()
-
-    # Get documents to sync
-    if folder_ids or document_ids:
-        documents = _get_selection_documents(folder_ids or [], document_ids or [], include_trash)
-    else:
-        documents = Document.objects.filter(deleted_at__isnull=True)
-        if not include_trash:
-            documents = documents.exclude(folder__slug="trash", folder__parent__isnull=True)
-
-    # Upload each document
-    for doc in documents:
-        try:
-            if not doc.file or not os.path.exists(doc.file.path):
-                stats["errors"] += 1
-                continue
-
-            # Build the S3 key (preserving folder structure)
-            s3_key = _build_s3_key(doc, prefix)
-            uploaded_keys.add(s3_key)
-
-            # Check if file needs upload (by comparing ETags/checksums)
-            needs_upload = True
-            try:
-                head = s3.head_object(Bucket=bucket, Key=s3_key)
-                existing_size = head.get('ContentLength', 0)
-                if existing_size == doc.file_size:
-                    # Size matches, check ETag if we have checksum
-                    if doc.checksum:
-                        etag = head.get('ETag', '').strip('"')
-                        if etag == doc.checksum:
-                            needs_upload = False
-                            stats["skipped"] += 1
-            except s3.exceptions.ClientError:
-                pass  # Object doesn't exist, needs upload
-
-            if needs_upload:
-                # Upload with metadata
-                extra_args = {
-                    'ContentType': doc.content_type or 'application/octet-stream',
-                    'Metadata': {
-                        'document-id': str(doc.pk),
-                        'original-filename': doc.filename,
-                        'document-type': doc.document_type or '',
-                    }
-                }
-                s3.upload_file(doc.file.path, bucket, s3_key, ExtraArgs=extra_args)
-                stats["uploaded"] += 1
-                stats["total_size"] += doc.file_size or 0
-
-        except Exception as e:
-            stats["errors"] += 1
-
-    # Delete removed files if requested
+    # Folder paths are resolved once for the whole run
+    plan = plan_backup(
+        include_trash=include_trash,
+        folder_ids=folder_ids,
+        document_ids=document_ids,
+    )
+    targets = {}  # key -> document
+    used_keys = set()
+    for doc, directory in plan["documents"]:
+        targets[_build_s3_key(doc, directory, prefix, used_keys)] = doc
+
+    existing_keys = None
     if delete_removed:
         try:
-            paginator = s3.get_paginator('list_objects_v2')
-            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-                for obj in page.get('Contents', []):
-                    if obj['Key'] not in uploaded_keys:
-                        s3.delete_object(Bucket=bucket, Key=obj['Key'])
-                        stats["deleted"] += 1
-        except Exception as e:
+            existing_keys = _list_keys(s3, bucket, prefix)
+        except Exception:
             stats["errors"] += 1
 
+    records = {
+        record.key: record
+        for record in DocumentSyncRecord.objects.filter(bucket=bucket, key__startswith=prefix)
+    }
+    pending = []
+    for key, doc in targets.items():
+        checksum = _sync_checksum(doc)
+        record = records.get(key)
+        unchanged = (
+            record is not None
+            and record.document_id == doc.pk
+            and record.checksum == checksum
+            and (existing_keys is None or key in existing_keys)
+        )
+        if unchanged and not full:
+            stats["skipped"] += 1
+        else:
+            pending.append((key, doc, checksum))
+
+    _upload_pending(s3, bucket, pending, stats)
+
+    # Delete removed files if requested (in batches, not one request per key)
+    if existing_keys is not None:
+        stale = sorted(existing_keys - targets.keys())
+        for start in range(0, len(stale), S3_DELETE_BATCH):
+            batch = stale[start:start + S3_DELETE_BATCH]
+            try:
+                response = s3.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except Exception:
+                stats["errors"] += len(batch)
+                continue
+            failed = {error["Key"] for error in response.get("Errors", [])}
+            deleted = [key for key in batch if key not in failed]
+            DocumentSyncRecord.objects.filter(bucket=bucket, key__in=deleted).delete()
+            stats["deleted"] += len(deleted)
+            stats["errors"] += len(failed)
+
     return stats
 
 
-def _build_s3_key(doc: Document, prefix: str) -> str:
-    """Build the S3 key for a document, preserving folder structure."""
-    path_parts = [prefix.rstrip('/')]
+def _sync_checksum(doc: Document) -> str:
+    """What identifies a document's content for the sync manifest."""
+    return doc.checksum or f"{doc.file.name}:{doc.file_size or 0}"
 
-    if doc.folder:
-        # Walk up the folder hierarchy
-        folder_parts = []
-        current = doc.folder
-        while current is not None:
-            folder_parts.insert(0, sanitize_filename(current.name))
-            current = current.parent
-        path_parts.extend(folder_parts)
-    else:
-        path_parts.append("_unfiled")
 
-    path_parts.append(sanitize_filename(doc.filename))
-    return '/'.join(path_parts)
+def _list_keys(s3, bucket: str, prefix: str) -> set:
+    """Every key under prefix (one request per 1000 objects)."""
+    paginator = s3.get_paginator('list_objects_v2')
+    return {
+        obj['Key']
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get('Contents', [])
+    }
 
 
-def _get_selection_documents(folder_ids: list, document_ids: list, include_trash: bool):
-    """Get documents based on folder and document selection."""
-    from django.db.models import Q
+def _upload_pending(s3, bucket: str, pending: list, stats: dict):
+    """Upload (key, document, checksum) entries in parallel and record them."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    doc_pks = set()
+    from .models import DocumentSyncRecord
 
-    # Get documents from selected folders (recursively)
-    if folder_ids:
-        folders = DocumentFolder.objects.filter(pk__in=folder_ids, deleted_at__isnull=True)
-        if not include_trash:
-            folders = folders.exclude(slug="trash")
+    if not pending:
+        return
 
-        for folder in folders:
-            _collect_folder_docs(folder, doc_pks, include_trash)
+    transfer_config = _transfer_config()
+    workers = max(1, getattr(settings, "S3_SYNC_WORKERS", 8))
+    synced = []
+
+    def save_records():
+        DocumentSyncRecord.objects.bulk_create(
+            synced,
+            update_conflicts=True,
+            unique_fields=["bucket", "key"],
+            update_fields=["document", "checksum", "size", "synced_at"],
+        )
+        synced.clear()
+
+    # Workers only read files and talk to S3; the database is used from
+    # this thread
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-sync") as pool:
+        futures = {
+            pool.submit(_upload_document, s3, bucket, key, doc, transfer_config): (key, doc, checksum)
+            for key, doc, checksum in pending
+        }
+        for future in as_completed(futures):
+            key, doc, checksum = futures[future]
+            try:
+                future.result()
+            except Exception:
+                stats["errors"] += 1
+                continue
+            stats["uploaded"] += 1
+            stats["total_size"] += doc.file_size or 0
+            synced.append(DocumentSyncRecord(
+                bucket=bucket,
+                key=key,
+                document=doc,
+                checksum=checksum,
+                size=doc.file_size or 0,
+                synced_at=timezone.now(),
+            ))
+            if len(synced) >= SYNC_RECORD_BATCH:
+                save_records()
+
+    if synced:
+        save_records()
+
+
+def _upload_document(s3, bucket: str, key: str, doc: Document, transfer_config):
+    """Upload one document file from storage (runs on a worker thread)."""
+    if not doc.file:
+        raise FileNotFoundError(f"Document {doc.pk} has no file")
+
+    # Upload with metadata
+    extra_args = {
+        'ContentType': doc.content_type or 'application/octet-stream',
+        'Metadata': {
+            'document-id': str(doc.pk),
+            'original-filename': doc.filename,
+            'document-type': doc.document_type or '',
+        }
+    }
+    # A storage file object of its own, not the shared FieldFile
+    with doc.file.storage.open(doc.file.name, "rb") as f:
+        s3.upload_fileobj(f, bucket, key, ExtraArgs=extra_args, Config=transfer_config)
 
-    # Add individually selected documents
-    if document_ids:
-        doc_pks.update(document_ids)
 
-    return Document.objects.filter(pk__in=doc_pks, deleted_at__isnull=True)
+def _transfer_config():
+    """boto3 transfer settings: multipart above S3_SYNC_MULTIPART_MB."""
+    try:
+        from boto3.s3.transfer import TransferConfig
+    except ImportError:
+        return None
 
+    part_size = max(5, getattr(settings, "S3_SYNC_MULTIPART_MB", 16)) * 1024 * 1024
+    # Files are already uploaded in parallel; keep per-file part threads low
+    return TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size, max_concurrency=4)
 
-def _collect_folder_docs(folder: DocumentFolder, doc_pks: set, include_trash: bool):
-    """Recursively collect document PKs from a folder."""
-    for doc in folder.documents.filter(deleted_at__isnull=True):
-        doc_pks.add(doc.pk)
 
-    children = folder.children.filter(deleted_at__isnull=True)
-    if not include_trash:
-        children = children.exclude(slug="trash")
+def _build_s3_key(doc: Document, directory: str, prefix: str, used_keys: set) -> str:
+    """Build the S3 key for a document, preserving folder structure.
 
-    for child in children:
-        _collect_folder_docs(child, doc_pks, include_trash)
+    directory is the document's folder path from plan_backup; documents
+    without a folder go to _unfiled. Documents with the same name in one
+    folder get numbered suffixes, as in ZIP backups, instead of
+    overwriting each other.
+    """
+    if not doc.folder_id:
+        directory = "_unfiled"
+    return prefix + _unique_path(used_keys, directory, sanitize_filename(doc.filename))
 
 
 def download_from_s3(
@@ -257,14 +331,12 @@ def download_from_s3(
 
 
 def build_folder_path(folder: DocumentFolder) -> str:
-    """Build the full path for a folder by walking up the parent chain."""
-    parts = []
-    current = folder
-    while current is not None:
-        # Sanitize folder name for filesystem
-        safe_name = sanitize_filename(current.name)
-        parts.insert(0, safe_name)
-        current = current.parent
+    """Build the full path for a folder from its (cached) ancestor chain."""
+    from .services.folder_tree import FolderTreeService
+
+    names = FolderTreeService.paths([folder.pk]).get(folder.pk, (folder.name,))
+    # Sanitize folder names for filesystem
+    parts = [sanitize_filename(name) for name in names]
     return os.path.join(*parts) if parts else ""
 
 
@@ -282,328 +354,326 @@ def sanitize_filename(name: str) -> str:
     return name or "unnamed"
 
 
-def backup_documents(
-    output_path: str | None = None,
+# Formats that are compressed already; deflating them again only costs CPU
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".heic", ".heif",
+    ".mp4", ".mov", ".m4v", ".webm", ".mkv", ".avi",
+    ".mp3", ".m4a", ".aac", ".ogg",
+    ".pdf", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp",
+}
+
+# Bytes read from storage, and buffered before yielding, per step
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Top-level directory inside backup archives
+ARCHIVE_ROOT = "documents"
+
+
+class _ArchiveSink(io.RawIOBase):
+    """Unseekable sink for ZipFile; the generator drains what was written.
+
+    Without seek/tell, ZipFile writes each entry's sizes and CRC in a
+    data descriptor after the data, so nothing needs to be rewritten.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self.buffered = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.buffered += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.buffered = 0
+        return data
+
+
+def plan_backup(
     include_trash: bool = False,
     folder_id: str | None = None,
-    include_metadata: bool = True,
     folder_ids: list[str] | None = None,
     document_ids: list[str] | None = None,
-) -> str:
-    """
-    Export the virtual folder structure as a filesystem archive.
+) -> dict:
+    """Decide what goes into a backup and where, without reading any files.
+
+    Folders come from one recursive query (FolderTreeService); documents
+    are fetched with one query per selection mode.
 
     Args:
-        output_path: Path to write the ZIP file. If None, uses temp directory.
         include_trash: Whether to include Trash folder contents.
-        folder_id: If provided, only backup this folder and its contents (legacy).
-        include_metadata: If True, include a manifest.json with document metadata.
-        folder_ids: List of specific folder UUIDs to include (with contents).
-        document_ids: List of specific document UUIDs to include.
+        folder_id: If provided, only this folder and its contents (legacy);
+            paths start at the folder itself.
+        folder_ids: Specific folder UUIDs to include (with contents).
+        document_ids: Specific document UUIDs to include.
 
     Returns:
-        Path to the created ZIP archive.
+        Dict with "folders" (manifest entries), "documents" (list of
+        (Document, directory) pairs) and "selection_mode".
     """
-    # Create temp directory for building the archive
-    temp_dir = tempfile.mkdtemp(prefix="document_backup_")
-    backup_root = os.path.join(temp_dir, "documents")
-    os.makedirs(backup_root)
+    from .services.folder_tree import FolderTreeService
+
+    folders = []  # (folder, directory)
+    documents = []
+    extra_dirs = []
+
+    def folder_docs(folder_dirs):
+        by_folder = dict(folder_dirs)
+        docs = Document.objects.filter(folder_id__in=by_folder, deleted_at__isnull=True).order_by("folder_id", "filename", "created_at")
+        return [(doc, by_folder[doc.folder_id]) for doc in docs]
+
+    if folder_ids or document_ids:
+        for folder in FolderTreeService.subtree(folder_ids or [], include_trash=include_trash):
+            folders.append((folder, _folder_directory(folder.tree_path)))
+        documents = folder_docs((folder.pk, path) for folder, path in folders)
+
+        included = {doc.pk for doc, _ in documents}
+        extra = Document.objects.filter(pk__in=document_ids or [], deleted_at__isnull=True).exclude(pk__in=included)
+        extra = list(extra.order_by("filename", "created_at"))
+        paths = FolderTreeService.paths(doc.folder_id for doc in extra)
+        for doc in extra:
+            if doc.folder_id:
+                documents.append((doc, _folder_directory(paths.get(doc.folder_id, ()))))
+            else:
+                documents.append((doc, "_selected"))
+                if "_selected" not in extra_dirs:
+                    extra_dirs.append("_selected")
+    else:
+        roots = [folder_id] if folder_id else None
+        subtree = FolderTreeService.subtree(roots, include_trash=include_trash)
+        # Legacy single-folder backups are rooted at the folder itself
+        skip = len(subtree[0].tree_path) - 1 if folder_id and subtree else 0
+        for folder in subtree:
+            folders.append((folder, _folder_directory(folder.tree_path[skip:])))
+        documents = folder_docs((folder.pk, path) for folder, path in folders)
+
+        if not folder_id:
+            orphans = Document.objects.filter(folder__isnull=True, deleted_at__isnull=True).order_by("filename", "created_at")
+            orphans = [(doc, "_unfiled") for doc in orphans]
+            if orphans:
+                extra_dirs.append("_unfiled")
+                documents.extend(orphans)
+
+    manifest_folders = [
+        {
+            "id": str(folder.pk),
+            "name": folder.name,
+            "path": path,
+            "description": folder.description or "",
+            "slug": folder.slug or "",
+        }
+        for folder, path in folders
+    ]
+    for directory in extra_dirs:
+        manifest_folders.append({
+            "id": None,
+            "name": directory,
+            "path": directory,
+            "description": "Documents without folder assignment",
+        })
+
+    return {
+        "selection_mode": "custom" if (folder_ids or document_ids) else "all",
+        "folders": manifest_folders,
+        "documents": documents,
+    }
+
+
+def _folder_directory(tree_path) -> str:
+    """Archive/S3 directory for a folder's names, root first."""
+    return "/".join(sanitize_filename(name) for name in tree_path)
+
+
+def _unique_path(used: set, directory: str, filename: str) -> str:
+    """directory/filename, numbered (name_1.ext, ...) if already used."""
+    path = f"{directory}/{filename}"
+    base, ext = os.path.splitext(filename)
+    counter = 1
+    while path.lower() in used:
+        path = f"{directory}/{base}_{counter}{ext}"
+        counter += 1
+    used.add(path.lower())
+    return path
 
-    # Track statistics
+
+def _zip_date(value):
+    """ZIP timestamps start in 1980 and have no time zone."""
+    if value is None:
+        return (1980, 1, 1, 0, 0, 0)
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    return max(value.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def stream_backup(plan: dict, include_trash: bool = False, include_metadata: bool = True):
+    """Yield a ZIP archive of a backup plan, chunk by chunk.
+
+    Each document file is read from storage straight into the archive;
+    nothing is copied to disk. Already-compressed formats are stored,
+    everything else deflated. A file that cannot be opened or read
+    (missing file, storage backend error) is counted as missing and
+    listed under "errors" in the manifest; the archive carries on.
+
+    Args:
+        plan: Result of plan_backup().
+        include_trash: Recorded in the manifest.
+        include_metadata: If True, end with a manifest.json of document metadata.
+
+    Yields:
+        Bytes of the ZIP archive.
+    """
     stats = {
-        "folders_created": 0,
+        "folders_created": len(plan["folders"]),
         "documents_copied": 0,
         "documents_missing": 0,
         "total_size": 0,
     }
-
-    # Metadata for manifest
     manifest = {
         "backup_date": timezone.now().isoformat(),
         "include_trash": include_trash,
-        "selection_mode": "custom" if (folder_ids or document_ids) else "all",
-        "folders": [],
+        "selection_mode": plan["selection_mode"],
+        "folders": plan["folders"],
         "documents": [],
+        "errors": [],
     }
 
-    # Mode 1: Specific selection of folders and/or documents
-    if folder_ids or document_ids:
-        _backup_selection(
-            backup_root, stats, manifest,
-            folder_ids=folder_ids or [],
-            document_ids=document_ids or [],
-            include_trash=include_trash,
-        )
-    # Mode 2: Single folder (legacy)
-    elif folder_id:
-        root_folders = DocumentFolder.objects.filter(pk=folder_id, deleted_at__isnull=True)
-        for root_folder in root_folders:
-            _process_folder(root_folder, backup_root, stats, manifest, include_trash)
-    # Mode 3: Everything
-    else:
-        root_folders = DocumentFolder.objects.filter(parent__isnull=True, deleted_at__isnull=True)
-        if not include_trash:
-            root_folders = root_folders.exclude(slug="trash")
-
-        for root_folder in root_folders:
-            _process_folder(root_folder, backup_root, stats, manifest, include_trash)
-
-        # Handle documents without folders (orphans)
-        orphan_docs = Document.objects.filter(folder__isnull=True, deleted_at__isnull=True)
-        if orphan_docs.exists():
-            orphan_dir = os.path.join(backup_root, "_unfiled")
-            os.makedirs(orphan_dir, exist_ok=True)
-            stats["folders_created"] += 1
-            manifest["folders"].append({
-                "id": None,
-                "name": "_unfiled",
-                "path": "_unfiled",
-                "description": "Documents without folder assignment",
-            })
+    def record_error(doc, rel_path, error):
+        stats["documents_missing"] += 1
+        manifest["errors"].append({
+            "id": str(doc.pk),
+            "filename": doc.filename,
+            "path": rel_path,
+            "error": f"{type(error).__name__}: {error}",
+        })
+        logger.warning(f"Backup could not read document {doc.pk}: {error}")
+
+    sink = _ArchiveSink()
+    used_names = set()
+    with ZipFile(sink, "w", ZIP_DEFLATED) as zipf:
+        for doc, directory in plan["documents"]:
+            if not doc.file:
+                stats["documents_missing"] += 1
+                continue
+            try:
+                source = doc.file.open("rb")
+            except Exception as e:
+                record_error(doc, None, e)
+                continue
 
-            for doc in orphan_docs:
-                _copy_document(doc, orphan_dir, stats, manifest)
+            # Use original filename, handle duplicates
+            rel_path = _unique_path(used_names, directory, sanitize_filename(doc.filename))
+            ext = os.path.splitext(rel_path)[1]
 
-    # Write manifest if requested
-    if include_metadata:
-        import json
-        manifest["statistics"] = stats
-        manifest_path = os.path.join(backup_root, "manifest.json")
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2, default=str)
+            info = ZipInfo(f"{ARCHIVE_ROOT}/{rel_path}", date_time=_zip_date(doc.updated_at or doc.created_at))
+            info.compress_type = ZIP_STORED if ext.lower() in STORED_EXTENSIONS else ZIP_DEFLATED
+            # ZipFile sizes the local header from this; zip64 for very large files
+            info.file_size = doc.file_size or 0
+            info.external_attr = 0o644 << 16
 
-    # Create ZIP archive
-    if output_path is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(tempfile.gettempdir(), f"document_backup_{timestamp}.zip")
+            size = 0
+            try:
+                with source, zipf.open(info, "w", force_zip64=info.file_size > ZIP64_LIMIT // 2) as dest:
+                    for chunk in iter(lambda: source.read(STREAM_CHUNK_SIZE), b""):
+                        dest.write(chunk)
+                        size += len(chunk)
+                        if sink.buffered >= STREAM_CHUNK_SIZE:
+                            yield sink.drain()
+            except Exception as e:
+                # Storage failed mid-file (OSError, botocore errors, ...);
+                # the partial entry is already in the archive
+                record_error(doc, rel_path, e)
+                continue
 
-    with ZipFile(output_path, "w", ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(backup_root):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, temp_dir)
-                zipf.write(file_path, arcname)
+            stats["documents_copied"] += 1
+            stats["total_size"] += size
+            manifest["documents"].append({
+                "id": str(doc.pk),
+                "filename": doc.filename,
+                "path": rel_path,
+                "document_type": doc.document_type,
+                "content_type": doc.content_type,
+                "size": doc.file_size,
+                "created_at": doc.created_at.isoformat() if doc.created_at else None,
+                "checksum": doc.checksum,
+            })
 
-    # Cleanup temp directory
-    shutil.rmtree(temp_dir)
+        # Write manifest if requested
+        if include_metadata:
+            import json
+            manifest["statistics"] = stats
+            zipf.writestr(f"{ARCHIVE_ROOT}/manifest.json", json.dumps(manifest, indent=2, default=str))
 
-    return output_path
+    yield sink.drain()
 
 
-def _backup_selection(
-    backup_root: str,
-    stats: dict,
-    manifest: dict,
-    folder_ids: list[str],
-    document_ids: list[str],
-    include_trash: bool,
-):
-    """Backup a specific selection of folders and documents."""
-    # Track which documents are already included via folder selection
-    included_doc_ids = set()
-
-    # Process selected folders (with their full contents)
-    if folder_ids:
-        folders = DocumentFolder.objects.filter(pk__in=folder_ids, deleted_at__isnull=True)
-        if not include_trash:
-            folders = folders.exclude(slug="trash")
-
-        for folder in folders:
-            # Build the full path for this folder
-            folder_path_parts = []
-            current = folder
-            while current is not None:
-                folder_path_parts.insert(0, sanitize_filename(current.name))
-                current = current.parent
-
-            # Create the folder structure
-            current_path = backup_root
-            for part in folder_path_parts:
-                current_path = os.path.join(current_path, part)
-                if not os.path.exists(current_path):
-                    os.makedirs(current_path)
-                    stats["folders_created"] += 1
-
-            # Add folder to manifest
-            rel_path = os.path.relpath(current_path, backup_root)
-            manifest["folders"].append({
-                "id": str(folder.pk),
-                "name": folder.name,
-                "path": rel_path,
-                "description": folder.description or "",
-            })
+def backup_documents(
+    output_path: str | None = None,
+    include_trash: bool = False,
+    folder_id: str | None = None,
+    include_metadata: bool = True,
+    folder_ids: list[str] | None = None,
+    document_ids: list[str] | None = None,
+) -> str:
+    """
+    Export the virtual folder structure as a filesystem archive.
 
-            # Copy all documents in this folder (recursively)
-            _copy_folder_contents(folder, current_path, stats, manifest, included_doc_ids, include_trash)
-
-    # Process individually selected documents (not already included via folders)
-    if document_ids:
-        docs = Document.objects.filter(pk__in=document_ids, deleted_at__isnull=True)
-        docs = docs.exclude(pk__in=included_doc_ids)
-
-        for doc in docs:
-            # Determine the target path
-            if doc.folder:
-                # Build folder path for this document
-                folder_path_parts = []
-                current = doc.folder
-                while current is not None:
-                    folder_path_parts.insert(0, sanitize_filename(current.name))
-                    current = current.parent
-
-                current_path = backup_root
-                for part in folder_path_parts:
-                    current_path = os.path.join(current_path, part)
-                    if not os.path.exists(current_path):
-                        os.makedirs(current_path)
-                        stats["folders_created"] += 1
-            else:
-                # Orphan document - put in _selected folder
-                current_path = os.path.join(backup_root, "_selected")
-                if not os.path.exists(current_path):
-                    os.makedirs(current_path)
-                    stats["folders_created"] += 1
-
-            _copy_document(doc, current_path, stats, manifest)
-
-
-def _copy_folder_contents(
-    folder: DocumentFolder,
-    target_path: str,
-    stats: dict,
-    manifest: dict,
-    included_doc_ids: set,
-    include_trash: bool,
-):
-    """Copy all documents in a folder and recurse into subfolders."""
-    # Copy documents
-    for doc in folder.documents.filter(deleted_at__isnull=True):
-        _copy_document(doc, target_path, stats, manifest)
-        included_doc_ids.add(doc.pk)
-
-    # Recurse into subfolders
-    children = folder.children.filter(deleted_at__isnull=True)
-    if not include_trash:
-        children = children.exclude(slug="trash")
-
-    for child in children:
-        child_path = os.path.join(target_path, sanitize_filename(child.name))
-        if not os.path.exists(child_path):
-            os.makedirs(child_path)
-            stats["folders_created"] += 1
-
-        rel_path = os.path.relpath(child_path, os.path.dirname(os.path.dirname(target_path)))
-        manifest["folders"].append({
-            "id": str(child.pk),
-            "name": child.name,
-            "path": rel_path,
-            "description": child.description or "",
-        })
+    Args:
+        output_path: Path to write the ZIP file. If None, uses temp directory.
+        include_trash: Whether to include Trash folder contents.
+        folder_id: If provided, only backup this folder and its contents (legacy).
+        include_metadata: If True, include a manifest.json with document metadata.
+        folder_ids: List of specific folder UUIDs to include (with contents).
+        document_ids: List of specific document UUIDs to include.
 
-        _copy_folder_contents(child, child_path, stats, manifest, included_doc_ids, include_trash)
-
-
-def _process_folder(
-    folder: DocumentFolder,
-    parent_path: str,
-    stats: dict,
-    manifest: dict,
-    include_trash: bool,
-):
-    """Recursively process a folder and its contents."""
-    # Build folder path
-    folder_name = sanitize_filename(folder.name)
-    folder_path = os.path.join(parent_path, folder_name)
-    os.makedirs(folder_path, exist_ok=True)
-    stats["folders_created"] += 1
-
-    # Get relative path from backup root
-    rel_path = os.path.relpath(folder_path, os.path.dirname(parent_path))
-
-    manifest["folders"].append({
-        "id": str(folder.pk),
-        "name": folder.name,
-        "path": rel_path,
-        "description": folder.description or "",
-        "slug": folder.slug or "",
-    })
-
-    # Copy documents in this folder
-    for doc in folder.documents.filter(deleted_at__isnull=True):
-        _copy_document(doc, folder_path, stats, manifest)
-
-    # Process child folders
-    children = folder.children.filter(deleted_at__isnull=True)
-    if not include_trash:
-        children = children.exclude(slug="trash")
-
-    for child in children:
-        _process_folder(child, folder_path, stats, manifest, include_trash)
-
-
-def _copy_document(doc: Document, target_dir: str, stats: dict, manifest: dict):
-    """Copy a document file to the target directory."""
-    if not doc.file:
-        stats["documents_missing"] += 1
-        return
+    Returns:
+        Path to the created ZIP archive.
+    """
+    plan = plan_backup(
+        include_trash=include_trash,
+        folder_id=folder_id,
+        folder_ids=folder_ids,
+        document_ids=document_ids,
+    )
 
-    try:
-        source_path = doc.file.path
-        if not os.path.exists(source_path):
-            stats["documents_missing"] += 1
-            return
-
-        # Use original filename, handle duplicates
-        target_filename = sanitize_filename(doc.filename)
-        target_path = os.path.join(target_dir, target_filename)
-
-        # Handle duplicate filenames
-        if os.path.exists(target_path):
-            base, ext = os.path.splitext(target_filename)
-            counter = 1
-            while os.path.exists(target_path):
-                target_filename = f"{base}_{counter}{ext}"
-                target_path = os.path.join(target_dir, target_filename)
-                counter += 1
-
-        # Copy the file
-        shutil.copy2(source_path, target_path)
-        stats["documents_copied"] += 1
-        stats["total_size"] += os.path.getsize(target_path)
-
-        # Add to manifest
-        rel_path = os.path.relpath(target_path, os.path.dirname(os.path.dirname(target_dir)))
-        manifest["documents"].append({
-            "id": str(doc.pk),
-            "filename": doc.filename,
-            "path": rel_path,
-            "document_type": doc.document_type,
-            "content_type": doc.content_type,
-            "size": doc.file_size,
-            "created_at": doc.created_at.isoformat() if doc.created_at else None,
-            "checksum": doc.checksum,
-        })
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(tempfile.gettempdir(), f"document_backup_{timestamp}.zip")
 
-    except Exception as e:
-        stats["documents_missing"] += 1
+    with open(output_path, "wb") as f:
+        for chunk in stream_backup(plan, include_trash=include_trash, include_metadata=include_metadata):
+            f.write(chunk)
+
+    return output_path
 
 
 def get_backup_stats() -> dict:
     """Get statistics about what would be backed up."""
+    from django.db.models import Sum
+
+    from .services.folder_tree import TRASH_SLUG, FolderTreeService
+
     total_docs = Document.objects.filter(deleted_at__isnull=True).count()
+    # Trash and everything filed under it
+    trash_roots = DocumentFolder.objects.filter(slug=TRASH_SLUG, parent__isnull=True).values_list("pk", flat=True)
+    trash_folders = [folder.pk for folder in FolderTreeService.subtree(list(trash_roots))]
     trash_docs = Document.objects.filter(
-        folder__slug="trash",
-        folder__parent__isnull=True,
+        folder_id__in=trash_folders,
         deleted_at__isnull=True,
     ).count()
     orphan_docs = Document.objects.filter(folder__isnull=True, deleted_at__isnull=True).count()
     total_folders = DocumentFolder.objects.filter(deleted_at__isnull=True).count()
 
     # Calculate total size
-    total_size = 0
-    for doc in Document.objects.filter(deleted_at__isnull=True):
-        if doc.file and doc.file_size:
-            total_size += doc.file_size
+    total_size = Document.objects.filter(deleted_at__isnull=True).exclude(file="").aggregate(
+        total=Sum("file_size")
+    )["total"] or 0
 
     return {
         "total_documents": total_docs,
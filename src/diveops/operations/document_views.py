@@ -113,7 +113,7 @@ class FolderDetailView(StaffPortalMixin, DetailView):
         context["subfolders"] = folder.children.order_by("name")
         context["documents"] = documents
         context["breadcrumbs"] = self._build_breadcrumbs(folder)
-        context["is_trash"] = folder.slug == "trash" and folder.parent is None
+        context["is_trash"] = self._is_in_trash(folder)
         context["sort"] = sort
         context["sort_display"] = self.SORT_OPTIONS.get(sort, "Newest First")
         context["view"] = view
@@ -121,12 +121,15 @@ class FolderDetailView(StaffPortalMixin, DetailView):
 
     def _build_breadcrumbs(self, folder):
         """Build breadcrumb trail from root to current folder."""
-        breadcrumbs = []
-        current = folder
-        while current is not None:
-            breadcrumbs.insert(0, current)
-            current = current.parent
-        return breadcrumbs
+        from .services.folder_tree import FolderTreeService
+
+        return FolderTreeService.ancestors(folder)
+
+    def _is_in_trash(self, folder):
+        """Trash and its subfolders get the restore / delete forever actions."""
+        from .services.folder_tree import FolderTreeService
+
+        return FolderTreeService.is_in_trash(folder)
 
 
 # =============================================================================
@@ -401,12 +404,9 @@ class DocumentDetailView(StaffPortalMixin, DetailView):
 
     def _build_breadcrumbs(self, folder):
         """Build breadcrumb trail from root to folder."""
-        breadcrumbs = []
-        current = folder
-        while current is not None:
-            breadcrumbs.insert(0, current)
-            current = current.parent
-        return breadcrumbs
+        from .services.folder_tree import FolderTreeService
+
+        return FolderTreeService.ancestors(folder)
 
     def _get_document_notes(self, document):
         """Get notes for a document from metadata."""
@@ -483,12 +483,10 @@ class DocumentUploadView(StaffPortalMixin, FormView):
         return context
 
     def _build_breadcrumbs(self, folder):
-        breadcrumbs = []
-        current = folder
-        while current is not None:
-            breadcrumbs.insert(0, current)
-            current = current.parent
-        return breadcrumbs
+        """Build breadcrumb trail from root to folder."""
+        from .services.folder_tree import FolderTreeService
+
+        return FolderTreeService.ancestors(folder)
 
     def _get_category_from_mime(self, mime_type):
         """Determine document category from mime type."""
@@ -715,10 +713,17 @@ class DocumentDeleteView(StaffPortalMixin, DeleteView):
         return context
 
     def form_valid(self, form):
+        from .services.folder_tree import FolderTreeService
+
         document = self.object
         filename = document.filename
         original_folder_pk = document.folder_id if document.folder else None
 
+        # Already trashed: moving it again would overwrite its original folder
+        if document.folder and FolderTreeService.is_in_trash(document.folder):
+            messages.error(self.request, f"'{filename}' is already in the Trash.")
+            return redirect("diveops:document-detail", pk=document.pk)
+
         # Check for legal hold
         if DocumentLegalHold.document_has_active_hold(document):
             messages.error(
@@ -775,10 +780,12 @@ class DocumentRestoreView(StaffPortalMixin, View):
     """Restore a document from Trash to its original folder."""
 
     def post(self, request, pk):
+        from .services.folder_tree import FolderTreeService
+
         document = get_object_or_404(Document, pk=pk)
 
-        # Check if document is in Trash
-        if not document.folder or document.folder.slug != "trash":
+        # Check if document is in Trash (or one of its subfolders)
+        if not document.folder or not FolderTreeService.is_in_trash(document.folder):
             messages.error(request, "This document is not in the Trash.")
             return redirect("diveops:document-detail", pk=pk)
 
@@ -839,11 +846,13 @@ class DocumentPermanentDeleteView(StaffPortalMixin, DeleteView):
         return context
 
     def form_valid(self, form):
+        from .services.folder_tree import FolderTreeService
+
         document = self.object
         filename = document.filename
 
-        # Check if document is in Trash
-        if not document.folder or document.folder.slug != "trash":
+        # Check if document is in Trash (or one of its subfolders)
+        if not document.folder or not FolderTreeService.is_in_trash(document.folder):
             messages.error(self.request, "Only documents in Trash can be permanently deleted.")
             return redirect("diveops:document-detail", pk=document.pk)
 
@@ -878,14 +887,17 @@ class EmptyTrashView(StaffPortalMixin, View):
     """Empty all documents from Trash, respecting legal holds."""
 
     def post(self, request):
+        from .services.folder_tree import FolderTreeService
+
         trash_folder = DocumentFolder.objects.filter(slug="trash", parent__isnull=True).first()
 
         if not trash_folder:
             messages.error(request, "Trash folder not found.")
             return redirect("diveops:document-browser")
 
-        # Get all documents in trash
-        documents = list(Document.objects.filter(folder=trash_folder))
+        # Get all documents in trash, subfolders included
+        trash_ids = [folder.pk for folder in FolderTreeService.subtree([trash_folder.pk])]
+        documents = list(Document.objects.filter(folder_id__in=trash_ids))
 
         deleted_count = 0
         held_count = 0
@@ -1273,28 +1285,40 @@ class DocumentBackupView(StaffPortalMixin, TemplateView):
 
     def _build_folder_tree(self):
         """Build a nested folder structure for display."""
-        root_folders = DocumentFolder.objects.filter(
-            parent__isnull=True, deleted_at__isnull=True
-        ).order_by("name")
+        from django.db.models import Count
+
+        from .services.folder_tree import FolderTreeService
 
-        def build_tree(folder):
-            return {
+        folders = FolderTreeService.subtree()
+        counts = dict(
+            Document.objects.filter(folder_id__in=[f.pk for f in folders], deleted_at__isnull=True)
+            .values_list("folder_id")
+            .annotate(count=Count("pk"))
+        )
+
+        # Sorted by path, so parents come before their children
+        nodes = {}
+        roots = []
+        for folder in folders:
+            node = {
                 "id": str(folder.pk),
                 "name": folder.name,
                 "slug": folder.slug,
-                "document_count": folder.documents.filter(deleted_at__isnull=True).count(),
-                "children": [build_tree(child) for child in folder.children.filter(deleted_at__isnull=True).order_by("name")],
+                "document_count": counts.get(folder.pk, 0),
+                "children": [],
             }
-
-        return [build_tree(f) for f in root_folders]
+            nodes[folder.pk] = node
+            parent = nodes.get(folder.parent_id)
+            (parent["children"] if parent else roots).append(node)
+        return roots
 
 
 class DocumentBackupDownloadView(StaffPortalMixin, View):
     """Generate and download a backup ZIP file."""
 
     def post(self, request):
-        from .document_backup import backup_documents
-        import json
+        from .document_backup import plan_backup, stream_backup
+        from .services.streaming import streaming_response
 
         # Get selection from form
         folder_ids = request.POST.getlist("folders")
@@ -1308,36 +1332,25 @@ class DocumentBackupDownloadView(StaffPortalMixin, View):
             document_ids = None
 
         try:
-            # Generate the backup
-            zip_path = backup_documents(
+            # Resolve folders and documents up front; only file reads happen while streaming
+            plan = plan_backup(
                 folder_ids=folder_ids if folder_ids else None,
                 document_ids=document_ids if document_ids else None,
                 include_trash=include_trash,
             )
-
-            # Serve the file
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"document_backup_{timestamp}.zip"
-
-            response = FileResponse(
-                open(zip_path, "rb"),
-                as_attachment=True,
-                filename=filename,
-            )
-            response["Content-Type"] = "application/zip"
-
-            # Schedule temp file cleanup (file will be deleted when response is closed)
-            import os
-            import atexit
-            atexit.register(lambda: os.unlink(zip_path) if os.path.exists(zip_path) else None)
-
-            return response
-
         except Exception as e:
             messages.error(request, f"Backup failed: {str(e)}")
             return redirect("diveops:document-backup")
 
+        timestamp = timezone.localtime().strftime("%Y%m%d_%H%M%S")
+        response = streaming_response(
+            request,
+            stream_backup(plan, include_trash=include_trash),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = f'attachment; filename="document_backup_{timestamp}.zip"'
+        return response
+
 
 class DocumentS3SyncView(StaffPortalMixin, View):
     """Trigger S3 sync for documents."""
@@ -72,3 +72,12 @@ class AgreementAlreadySigned(AgreementError):
 
 class InvalidStateTransition(AgreementError):
     """Invalid state transition attempted (e.g., voiding a signed agreement)."""
+
+
+# =============================================================================
+# Chat Exceptions
+# =============================================================================
+
+
+class InvalidCursor(DiveOpsError):
+    """Pagination cursor is malformed or was not issued by this server."""
@@ -0,0 +1,31 @@
+"""Management command to build ConversationSummary rows.
+
+Recomputes the denormalized inbox summary (last message, unread inbound
+count, needs_reply) for every conversation. Run once before setting
+CHAT_SUMMARY_ENABLED, and again any time summaries may have drifted
+(it is safe to re-run).
+
+Usage:
+    python manage.py backfill_conversation_summaries
+    python manage.py backfill_conversation_summaries --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from diveops.operations.services.chat_summary import ConversationSummaryService
+
+
+class Command(BaseCommand):
+    help = "Build or rebuild conversation inbox summaries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Conversations per refresh query (default 500)",
+        )
+
+    def handle(self, *args, **options):
+        total = ConversationSummaryService.backfill(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {total} conversation summaries"))
@@ -13,6 +13,9 @@ Usage examples:
     # Sync specific folders to S3
     python manage.py backup_documents --folders abc123 --s3-bucket my-bucket
 
+    # Re-upload everything, not only documents changed since the last sync
+    python manage.py backup_documents --s3-bucket my-bucket --s3-full
+
     # Include trash in backup
     python manage.py backup_documents --include-trash --output backup.zip
 """
@@ -73,6 +76,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete S3 objects not in current selection (sync delete)",
         )
+        parser.add_argument(
+            "--s3-full",
+            action="store_true",
+            help="Upload every document, ignoring the record of previous syncs",
+        )
 
         # Other options
         parser.add_argument(
@@ -134,6 +142,7 @@ class Command(BaseCommand):
                 folder_ids=options["folders"],
                 document_ids=options["documents"],
                 delete_removed=options["s3_delete"],
+                full=options["s3_full"],
             )
 
             self.stdout.write("")
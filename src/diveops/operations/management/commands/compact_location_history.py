@@ -0,0 +1,70 @@
+"""Management command to apply location history retention.
+
+Deletes location points past their policy's delete_after_days (dropping
+whole monthly partitions when the table is partitioned) and downsamples
+raw tracks past downsample_after_days with Douglas-Peucker. Policies are
+set per sharing visibility in LOCATION_RETENTION_POLICIES.
+
+Work is done in bounded batches, each in its own transaction, so the
+command can be stopped and re-run at any time.
+
+Run daily via cron:
+    30 3 * * * /path/to/manage.py compact_location_history --max-batches 2000
+
+Usage:
+    python manage.py compact_location_history
+    python manage.py compact_location_history --batch-size 200 --max-batches 100
+    python manage.py compact_location_history --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from diveops.operations.services.location_partitions import ensure_partitions
+from diveops.operations.services.location_retention import LocationRetentionService
+
+
+class Command(BaseCommand):
+    help = "Expire and downsample location history per retention policy"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Points to expire or tracks to downsample per batch (default 500)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: run until done)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report one batch per policy without changing anything",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN - No points will be changed"))
+        else:
+            for name in ensure_partitions():
+                self.stdout.write(f"Created partition {name}")
+
+        result = LocationRetentionService.compact(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            dry_run=dry_run,
+        )
+
+        self.stdout.write(f"Partitions dropped: {result.partitions_dropped}")
+        self.stdout.write(f"Points expired:     {result.points_expired}")
+        self.stdout.write(f"Tracks downsampled: {result.tracks}")
+        self.stdout.write(f"Points removed:     {result.points_removed}")
+        self.stdout.write(f"Points kept:        {result.points_kept}")
+        if result.complete:
+            self.stdout.write(self.style.SUCCESS(f"Done in {result.batches} batch(es)"))
+        else:
+            self.stdout.write(self.style.WARNING(f"Stopped after {result.batches} batch(es); run again to continue"))
@@ -0,0 +1,61 @@
+"""Generate WebP/AVIF thumbnail variants for existing images."""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Write modern-format thumbnail variants for image documents that lack them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Process at most this many documents",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants that already exist",
+        )
+
+    def handle(self, *args, **options):
+        from django_documents.models import MediaAsset
+
+        from diveops.operations.thumbnails import VARIANTS_METADATA_KEY, generate_variants, supported_formats
+
+        formats = [fmt for fmt in supported_formats() if fmt != "jpeg"]
+        if not formats:
+            self.stdout.write(self.style.WARNING("No variant formats configured or supported (THUMBNAIL_FORMATS)"))
+            return
+        self.stdout.write(f"Formats: {', '.join(formats)}")
+
+        assets = MediaAsset.objects.select_related("document").filter(
+            document__content_type__startswith="image/",
+            document__deleted_at__isnull=True,
+        ).order_by("-created_at")
+
+        done = errors = 0
+        for asset in assets.iterator(chunk_size=200):
+            if options["limit"] is not None and done + errors >= options["limit"]:
+                break
+            doc = asset.document
+            record = (doc.metadata or {}).get(VARIANTS_METADATA_KEY)
+            if record and record.get("source") == doc.file.name and not options["force"]:
+                continue
+            try:
+                record = generate_variants(doc, formats)
+            except Exception as e:
+                errors += 1
+                self.stdout.write(self.style.ERROR(f"  {doc.filename}: {e}"))
+                continue
+            if record is None:
+                continue
+            done += 1
+            stats = record["stats"]
+            self.stdout.write(
+                f"  {doc.filename}: {stats['source_size'][0]}x{stats['source_size'][1]} decoded at "
+                f"{stats['decoded_size'][0]}x{stats['decoded_size'][1]} in {stats['decode_ms']} ms, "
+                f"{stats['decoded_bytes'] / 2**20:.1f} MB; encoded in {stats['encode_ms']} ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"\nDone! {done} documents, {errors} errors"))
@@ -0,0 +1,64 @@
+"""Management command to manage monthly LocationUpdate partitions.
+
+Without options, creates partitions for the current month and the next
+LOCATION_PARTITION_MONTHS_AHEAD months (run monthly, or rely on
+compact_location_history, which does the same).
+
+--convert switches an unpartitioned table to monthly partitions once. It
+copies every row under an exclusive lock: location uploads fail while it
+runs, so schedule a maintenance window. PostgreSQL only.
+
+Usage:
+    python manage.py partition_location_updates
+    python manage.py partition_location_updates --months-ahead 6
+    python manage.py partition_location_updates --convert
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from diveops.operations.services.location_partitions import (
+    convert_to_partitioned,
+    ensure_partitions,
+    is_partitioned,
+    monthly_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "Create upcoming LocationUpdate partitions, or convert the table to partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the unpartitioned table (one-time, locks the table)",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=None,
+            help="Future months to create (default LOCATION_PARTITION_MONTHS_AHEAD)",
+        )
+
+    def handle(self, *args, **options):
+        months_ahead = options["months_ahead"]
+
+        if options["convert"]:
+            try:
+                created = convert_to_partitioned(months_ahead=months_ahead)
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Converted to {created} monthly partitions"))
+            return
+
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("Table is not partitioned; run with --convert first"))
+            return
+
+        for name in ensure_partitions(months_ahead=months_ahead):
+            self.stdout.write(f"Created partition {name}")
+        months = monthly_partitions()
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(months)} monthly partitions, {months[0]:%Y-%m} to {months[-1]:%Y-%m}" if months
+            else "No monthly partitions"
+        ))
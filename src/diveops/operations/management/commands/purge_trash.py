@@ -1,7 +1,7 @@
 """Management command to purge expired documents from Trash.
 
 This command enforces data retention policies by:
-1. Finding documents in Trash folder older than retention period
+1. Finding documents in Trash (or its subfolders) older than retention period
 2. Checking for legal holds (documents with active holds are skipped)
 3. Applying document-type specific retention policies
 4. Permanently deleting eligible documents
@@ -30,6 +30,7 @@ from diveops.operations.models import (
     DocumentLegalHold,
     DocumentRetentionPolicy,
 )
+from diveops.operations.services.folder_tree import FolderTreeService
 
 
 # Default trash retention if no policy defined
@@ -86,8 +87,9 @@ class Command(BaseCommand):
             )
         }
 
-        # Get all documents in Trash
-        trash_documents = Document.objects.filter(folder=trash_folder)
+        # Get all documents in Trash, subfolders included
+        trash_ids = [folder.pk for folder in FolderTreeService.subtree([trash_folder.pk])]
+        trash_documents = Document.objects.filter(folder_id__in=trash_ids)
         total_count = trash_documents.count()
 
         self.stdout.write(f"Found {total_count} document(s) in Trash")
@@ -0,0 +1,66 @@
+"""Management command to show the Rust sidecar circuit breakers.
+
+Breaker state and counters live in the shared cache, so this reports what
+every gunicorn/daphne worker sees: per endpoint the circuit state,
+consecutive failures and fallbacks taken, and per service the result of
+the last background health probe.
+
+Usage:
+    python manage.py rust_circuits
+    python manage.py rust_circuits --probe
+    python manage.py rust_circuits --json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from diveops.operations.pricing.circuit_breaker import (
+    CLOSED,
+    get_cached_health,
+    get_circuit_stats,
+    probe_health,
+    registered_services,
+)
+
+
+class Command(BaseCommand):
+    help = "Show Rust pricing/deco circuit breaker state, fallback counters and health"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--probe",
+            action="store_true",
+            help="Check each service's health endpoint now (closes its breakers if healthy)",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the report as JSON",
+        )
+
+    def handle(self, *args, **options):
+        # Importing the clients registers their health checks and endpoints
+        from diveops.operations.planning import deco_runner  # noqa: F401
+        from diveops.operations.pricing import rust_client  # noqa: F401
+
+        health = {}
+        for service in registered_services():
+            health[service] = probe_health(service) if options["probe"] else get_cached_health(service)
+        circuits = get_circuit_stats()
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"health": health, "circuits": circuits}, indent=2))
+            return
+
+        self.stdout.write(self.style.NOTICE("Rust Sidecar Circuits"))
+        self.stdout.write("=" * 50)
+        for service, healthy in health.items():
+            label = {True: "healthy", False: "down", None: "not probed"}[healthy]
+            style = self.style.SUCCESS if healthy else self.style.WARNING
+            self.stdout.write(style(f"  {service}: {label}"))
+
+        self.stdout.write("")
+        for name, stats in circuits.items():
+            line = f"  {name}: {stats['state']} (failures: {stats['failures']}, fallbacks: {stats['fallbacks']})"
+            self.stdout.write(line if stats["state"] == CLOSED else self.style.ERROR(line))
@@ -0,0 +1,69 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0073_mobile_app_features"),
+        ("django_communication", "0008_flow_types"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConversationSummary",
+            fields=[
+                (
+                    "conversation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="inbox_summary",
+                        serialize=False,
+                        to="django_communication.conversation",
+                    ),
+                ),
+                (
+                    "last_message_id",
+                    models.UUIDField(blank=True, help_text="Most recent message in the conversation", null=True),
+                ),
+                (
+                    "last_message_preview",
+                    models.CharField(
+                        blank=True, default="", help_text="First 200 characters of the last message", max_length=200
+                    ),
+                ),
+                (
+                    "last_message_at",
+                    models.DateTimeField(blank=True, help_text="When the last message was created", null=True),
+                ),
+                (
+                    "last_message_direction",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Direction of the last message (inbound/outbound)",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "last_message_sender_id",
+                    models.UUIDField(blank=True, help_text="Person who sent the last message", null=True),
+                ),
+                (
+                    "unread_inbound_count",
+                    models.PositiveIntegerField(default=0, help_text="Inbound messages not yet read"),
+                ),
+                (
+                    "needs_reply",
+                    models.BooleanField(default=False, help_text="True if the last message was inbound"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Conversation Summary",
+                "verbose_name_plural": "Conversation Summaries",
+                "indexes": [models.Index(fields=["-last_message_at"], name="convsummary_last_msg_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+"""Indexes for keyset pagination of chat messages and the mobile inbox.
+
+Message lives in django_communication, so its (conversation, created_at, id)
+index is created here with SQL against that app's table. Both indexes are
+built CONCURRENTLY so the message table stays writable meanwhile, which is
+why this migration is not atomic.
+"""
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+from django.db.models import F, OrderBy
+
+MESSAGE_INDEX = "diveops_msg_conv_created_id_idx"
+
+
+def create_message_index(apps, schema_editor):
+    Message = apps.get_model("django_communication", "Message")
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(MESSAGE_INDEX)} ON {quote(Message._meta.db_table)} "
+        f"({quote('conversation_id')}, {quote('created_at')} DESC, {quote('id')} DESC)"
+    )
+
+
+def drop_message_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(MESSAGE_INDEX)}")
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("diveops", "0074_conversation_summary"),
+        ("django_communication", "0008_flow_types"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="conversationsummary",
+            name="convsummary_last_msg_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="conversationsummary",
+            index=models.Index(
+                OrderBy(F("last_message_at"), descending=True, nulls_last=True),
+                F("conversation").desc(),
+                name="convsummary_keyset_idx",
+            ),
+        ),
+        migrations.RunPython(create_message_index, drop_message_index),
+    ]
@@ -0,0 +1,34 @@
+"""Make (person, recorded_at) unique on LocationUpdate.
+
+Batch uploads deduplicate on these columns. Existing duplicates are
+removed first, keeping the earliest received row of each pair.
+"""
+
+from django.db import migrations, models
+
+
+def delete_duplicate_locations(apps, schema_editor):
+    LocationUpdate = apps.get_model("diveops", "LocationUpdate")
+    table = schema_editor.quote_name(LocationUpdate._meta.db_table)
+    schema_editor.execute(
+        f"DELETE FROM {table} a USING {table} b "
+        "WHERE a.person_id = b.person_id AND a.recorded_at = b.recorded_at "
+        "AND (a.created_at, a.id) > (b.created_at, b.id)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0075_chat_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_locations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="locationupdate",
+            constraint=models.UniqueConstraint(
+                fields=("person", "recorded_at"), name="location_update_unique_person_recorded_at"
+            ),
+        ),
+    ]
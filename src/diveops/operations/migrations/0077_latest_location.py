@@ -0,0 +1,85 @@
+"""Last-known position table, backfilled from LocationUpdate history."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_latest_locations(apps, schema_editor):
+    LocationUpdate = apps.get_model("diveops", "LocationUpdate")
+    LatestLocation = apps.get_model("diveops", "LatestLocation")
+
+    latest = (
+        LocationUpdate.objects.filter(deleted_at__isnull=True)
+        .order_by("person_id", "-recorded_at")
+        .distinct("person_id")
+    )
+    LatestLocation.objects.bulk_create(
+        (
+            LatestLocation(
+                person_id=loc.person_id,
+                location_id=loc.pk,
+                latitude=loc.latitude,
+                longitude=loc.longitude,
+                accuracy_meters=loc.accuracy_meters,
+                source=loc.source,
+                recorded_at=loc.recorded_at,
+            )
+            for loc in latest.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0076_location_update_unique_recorded_at"),
+        ("django_parties", "0004_add_lead_note"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestLocation",
+            fields=[
+                (
+                    "person",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="latest_location",
+                        serialize=False,
+                        to="django_parties.person",
+                    ),
+                ),
+                (
+                    "location_id",
+                    models.UUIDField(blank=True, help_text="LocationUpdate this position was taken from", null=True),
+                ),
+                ("latitude", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("longitude", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("accuracy_meters", models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("gps", "GPS"),
+                            ("network", "Network"),
+                            ("fused", "Fused (GPS+Network)"),
+                            ("manual", "Manual Entry"),
+                        ],
+                        default="fused",
+                        max_length=10,
+                    ),
+                ),
+                ("recorded_at", models.DateTimeField(help_text="Device timestamp of the position")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["latitude", "longitude"], name="latest_location_coords_idx"),
+                    models.Index(fields=["updated_at"], name="latest_location_updated_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_latest_locations, migrations.RunPython.noop),
+    ]
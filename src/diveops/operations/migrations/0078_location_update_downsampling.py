@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0077_latest_location"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="locationupdate",
+            name="is_downsampled",
+            field=models.BooleanField(
+                default=False, help_text="Point kept when its track was downsampled by retention"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locationupdate",
+            index=models.Index(
+                condition=models.Q(("is_downsampled", False)),
+                fields=["recorded_at"],
+                name="location_update_raw_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0078_location_update_downsampling"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="locationupdate",
+            index=models.Index(
+                fields=["excursion", "person", "recorded_at"],
+                name="location_update_track_idx",
+            ),
+        ),
+    ]
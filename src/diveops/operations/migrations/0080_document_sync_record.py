@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diveops", "0079_location_update_track_index"),
+        ("django_documents", "0010_add_mediaasset_captured_at_visibility"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentSyncRecord",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("bucket", models.CharField(max_length=255)),
+                ("key", models.CharField(max_length=1024)),
+                (
+                    "checksum",
+                    models.CharField(
+                        help_text="Document checksum (or file name and size) at upload time",
+                        max_length=255,
+                    ),
+                ),
+                ("size", models.BigIntegerField(default=0)),
+                ("synced_at", models.DateTimeField()),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_records",
+                        to="django_documents.document",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Document Sync Record",
+                "verbose_name_plural": "Document Sync Records",
+                "constraints": [
+                    models.UniqueConstraint(fields=("bucket", "key"), name="document_sync_record_key_uniq"),
+                ],
+            },
+        ),
+    ]
@@ -34,7 +34,10 @@ from django_communication.models import (
 )
 
 from .audit import Actions, log_diver_event
+from .exceptions import InvalidCursor
 from .services.chat_queries import ConversationQueryService, MessageQueryService
+from .services.locations import LocationIngestService, max_batch_updates, parse_location
+from .services.pagination import page_params
 from .models import (
     AppVersion,
     Booking,
@@ -230,20 +233,40 @@ class MobileConversationsView(View):
     GET /api/mobile/conversations/
     Headers: Authorization: Bearer <token>
 
-    Returns list of conversations with last message and unread count.
+    Query params (all optional):
+        limit: Page size (max 100)
+        cursor: next_cursor from the previous page
+        since: ISO 8601 timestamp; only conversations with activity after it
+
+    Returns list of conversations with last message and unread count,
+    newest activity first, plus next_cursor (null on the last page).
 
     Uses ConversationQueryService to avoid N+1 queries - all conversation
     data is fetched in a single optimized query with Subquery annotations.
     """
 
+    PAGE_SIZE = 100
+
     @method_decorator(require_auth_token)
     def get(self, request):
-        # Use optimized service - single query with Subquery annotations
-        # This eliminates N+1 queries for last_message and unread_count
-        conversations = ConversationQueryService.list_for_mobile(
-            user=request.user,
-            limit=100,
-        )
+        try:
+            params = page_params(request.GET, max_limit=self.PAGE_SIZE)
+            # Use optimized service - single query with Subquery annotations
+            # This eliminates N+1 queries for last_message and unread_count.
+            # One extra row tells whether another page exists.
+            conversations = list(ConversationQueryService.list_for_mobile(
+                user=request.user,
+                limit=params["limit"] + 1,
+                cursor=request.GET.get("cursor") or None,
+                since=params["since"],
+            ))
+        except InvalidCursor as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        next_cursor = None
+        if len(conversations) > params["limit"]:
+            conversations = conversations[:params["limit"]]
+            next_cursor = ConversationQueryService.conversation_cursor(conversations[-1])
 
         # Batch fetch all persons to avoid N+1 queries for person data
         person_ids = [conv.related_object_id for conv in conversations if conv.related_object_id]
@@ -285,7 +308,7 @@ class MobileConversationsView(View):
                 "status": conv.status,
             })
 
-        return JsonResponse({"conversations": result})
+        return JsonResponse({"conversations": result, "next_cursor": next_cursor})
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -295,7 +318,14 @@ class MobileMessagesView(View):
     GET /api/mobile/conversations/<conversation_id>/messages/
     Headers: Authorization: Bearer <token>
 
-    Returns messages in chronological order.
+    Query params (all optional):
+        limit: Page size (max 200)
+        before: before_cursor from a previous response; load older messages
+        after: after_cursor from a previous response; poll for newer messages
+        since: ISO 8601 timestamp; messages created after it
+
+    Returns the latest messages (or the requested page) in chronological
+    order, with has_more and the cursors for the next requests.
 
     Uses MessageQueryService for consistent message retrieval.
     """
@@ -311,16 +341,19 @@ class MobileMessagesView(View):
             return JsonResponse({"error": "Conversation not found"}, status=404)
 
         # Use service for message retrieval
-        messages = MessageQueryService.get_messages(
-            conversation=conversation,
-            limit=MessageQueryService.DEFAULT_LIMIT_MOBILE,
-        )
+        try:
+            page = MessageQueryService.get_message_page(
+                conversation=conversation,
+                **page_params(request.GET, max_limit=MessageQueryService.DEFAULT_LIMIT_MOBILE),
+            )
+        except InvalidCursor as e:
+            return JsonResponse({"error": str(e)}, status=400)
 
         # Mark inbound messages as read using service
         MessageQueryService.mark_inbound_read(conversation)
 
         result = []
-        for msg in messages:
+        for msg in page.messages:
             result.append({
                 "id": str(msg.pk),
                 "body": msg.body_text or "",
@@ -330,7 +363,12 @@ class MobileMessagesView(View):
                 "sender_name": _get_sender_name(msg),
             })
 
-        return JsonResponse({"messages": result})
+        return JsonResponse({
+            "messages": result,
+            "has_more": page.has_more,
+            "before_cursor": page.before_cursor,
+            "after_cursor": page.after_cursor,
+        })
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -698,59 +736,20 @@ class LocationUpdateView(View):
         except Person.DoesNotExist:
             return JsonResponse({"error": "No profile found"}, status=404)
 
-        # Parse and validate coordinates
+        # Parse and validate coordinates and optional fields
         try:
-            latitude = Decimal(str(data.get("latitude", "")))
-            longitude = Decimal(str(data.get("longitude", "")))
-        except (InvalidOperation, TypeError):
-            return JsonResponse({"error": "Invalid coordinates"}, status=400)
-
-        if not (-90 <= latitude <= 90):
-            return JsonResponse({"error": "Latitude must be between -90 and 90"}, status=400)
-        if not (-180 <= longitude <= 180):
-            return JsonResponse({"error": "Longitude must be between -180 and 180"}, status=400)
-
-        # Parse optional fields
-        accuracy_meters = None
-        if data.get("accuracy_meters"):
-            try:
-                accuracy_meters = Decimal(str(data["accuracy_meters"]))
-            except (InvalidOperation, TypeError):
-                pass
+            values = parse_location(data)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
 
-        altitude_meters = None
-        if data.get("altitude_meters"):
-            try:
-                altitude_meters = Decimal(str(data["altitude_meters"]))
-            except (InvalidOperation, TypeError):
-                pass
-
-        source = data.get("source", "fused")
-        if source not in ["gps", "network", "fused", "manual"]:
-            source = "fused"
-
-        # Parse recorded_at or use current time
-        recorded_at_str = data.get("recorded_at")
-        if recorded_at_str:
-            from django.utils.dateparse import parse_datetime
-            recorded_at = parse_datetime(recorded_at_str)
-            if not recorded_at:
-                recorded_at = timezone.now()
-        else:
-            recorded_at = timezone.now()
-
-        # Create location update
-        location = LocationUpdate.objects.create(
+        # Create location update (a retried upload returns the stored one)
+        location, created = LocationUpdate.all_objects.get_or_create(
             person=person,
-            latitude=latitude,
-            longitude=longitude,
-            accuracy_meters=accuracy_meters,
-            altitude_meters=altitude_meters,
-            source=source,
-            recorded_at=recorded_at,
+            recorded_at=values.pop("recorded_at"),
+            defaults=values,
         )
 
-        return JsonResponse({"id": str(location.pk)}, status=201)
+        return JsonResponse({"id": str(location.pk)}, status=201 if created else 200)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -765,6 +764,16 @@ class LocationBatchUpdateView(View):
             ...
         ]
     }
+
+    At most LOCATION_BATCH_MAX_UPDATES updates per request (413 otherwise).
+    Valid updates are written in one bulk insert; updates whose
+    recorded_at is already stored for this person are skipped.
+
+    Returns:
+    {
+        "created": 2, "accepted": 2, "rejected": 1, "duplicates": 0,
+        "results": [{"index": 0, "status": "accepted", "error": null}, ...]
+    }
     """
 
     @method_decorator(require_auth_token_any)
@@ -777,6 +786,12 @@ class LocationBatchUpdateView(View):
         updates = data.get("updates", [])
         if not isinstance(updates, list):
             return JsonResponse({"error": "updates must be an array"}, status=400)
+        max_updates = max_batch_updates()
+        if len(updates) > max_updates:
+            return JsonResponse(
+                {"error": f"At most {max_updates} updates per request", "max_updates": max_updates},
+                status=413,
+            )
 
         # Get person for this user
         try:
@@ -784,55 +799,9 @@ class LocationBatchUpdateView(View):
         except Person.DoesNotExist:
             return JsonResponse({"error": "No profile found"}, status=404)
 
-        created_count = 0
-        from django.utils.dateparse import parse_datetime
-
-        for update in updates:
-            try:
-                latitude = Decimal(str(update.get("latitude", "")))
-                longitude = Decimal(str(update.get("longitude", "")))
-
-                if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-                    continue
-
-                accuracy_meters = None
-                if update.get("accuracy_meters"):
-                    try:
-                        accuracy_meters = Decimal(str(update["accuracy_meters"]))
-                    except (InvalidOperation, TypeError):
-                        pass
-
-                altitude_meters = None
-                if update.get("altitude_meters"):
-                    try:
-                        altitude_meters = Decimal(str(update["altitude_meters"]))
-                    except (InvalidOperation, TypeError):
-                        pass
-
-                source = update.get("source", "fused")
-                if source not in ["gps", "network", "fused", "manual"]:
-                    source = "fused"
-
-                recorded_at_str = update.get("recorded_at")
-                recorded_at = parse_datetime(recorded_at_str) if recorded_at_str else timezone.now()
-                if not recorded_at:
-                    recorded_at = timezone.now()
-
-                LocationUpdate.objects.create(
-                    person=person,
-                    latitude=latitude,
-                    longitude=longitude,
-                    accuracy_meters=accuracy_meters,
-                    altitude_meters=altitude_meters,
-                    source=source,
-                    recorded_at=recorded_at,
-                )
-                created_count += 1
-
-            except (InvalidOperation, TypeError):
-                continue
+        result = LocationIngestService.ingest_batch(person, updates)
 
-        return JsonResponse({"created": created_count}, status=201)
+        return JsonResponse({"created": result.accepted, **result.to_dict()}, status=201)
 
 
 # =============================================================================
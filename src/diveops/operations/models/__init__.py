@@ -14,9 +14,10 @@ This package structure splits the models into logical modules:
 - bookings.py: Booking, EligibilityOverride
 - roster.py: ExcursionRoster, DiveAssignment, DiveLog
 - permits.py: ProtectedArea*, GuidePermitDetails
-- agreements.py: AgreementTemplate, SignableAgreement*, DocumentRetention*
+- agreements.py: AgreementTemplate, SignableAgreement*, DocumentRetention*, DocumentSyncRecord
 - media.py: PhotoTag, DiveSitePhotoTag, MediaLink*
 - misc.py: Settlement*, AISettings, Medical*, Contact, Buddy*, DiveTeam*
+- chat.py: ConversationSummary
 """
 
 # Base constants
@@ -89,6 +90,7 @@ from .agreements import (
     AgreementTemplate,
     DocumentLegalHold,
     DocumentRetentionPolicy,
+    DocumentSyncRecord,
     SignableAgreement,
     SignableAgreementRevision,
 )
@@ -134,8 +136,14 @@ from .app import (
     AppVersion,
 )
 
+# Chat
+from .chat import (
+    ConversationSummary,
+)
+
 # Location Tracking
 from .location import (
+    LatestLocation,
     LocationSharingPreference,
     LocationUpdate,
 )
@@ -182,6 +190,7 @@ __all__ = [
     # Documents
     "DocumentRetentionPolicy",
     "DocumentLegalHold",
+    "DocumentSyncRecord",
     # Protected Areas
     "ProtectedArea",
     "ProtectedAreaZone",
@@ -224,7 +233,10 @@ __all__ = [
     "FlowThread",
     # App & Mobile
     "AppVersion",
+    # Chat
+    "ConversationSummary",
     # Location Tracking
     "LocationUpdate",
     "LocationSharingPreference",
+    "LatestLocation",
 ]
@@ -1,7 +1,8 @@
 """Agreement-related models for diveops.
 
 This module contains models for agreement templates, signable agreements,
-agreement revisions, and document retention/legal hold policies.
+agreement revisions, document retention/legal hold policies, and the
+S3 sync manifest.
 """
 
 import hashlib
@@ -687,3 +688,35 @@ class DocumentLegalHold(BaseModel):
             released_at__isnull=True,
             deleted_at__isnull=True,
         ).exists()
+
+
+class DocumentSyncRecord(models.Model):
+    """What was last uploaded to an S3 key.
+
+    The local manifest for document_backup.sync_to_s3: a document whose
+    checksum and key match its record is skipped without any S3 request.
+    """
+
+    bucket = models.CharField(max_length=255)
+    key = models.CharField(max_length=1024)
+    document = models.ForeignKey(
+        "django_documents.Document",
+        on_delete=models.CASCADE,
+        related_name="sync_records",
+    )
+    checksum = models.CharField(
+        max_length=255,
+        help_text="Document checksum (or file name and size) at upload time",
+    )
+    size = models.BigIntegerField(default=0)
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Document Sync Record"
+        verbose_name_plural = "Document Sync Records"
+        constraints = [
+            models.UniqueConstraint(fields=["bucket", "key"], name="document_sync_record_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"s3://{self.bucket}/{self.key}"
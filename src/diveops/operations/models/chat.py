@@ -0,0 +1,79 @@
+"""Chat inbox models.
+
+This module contains:
+- ConversationSummary: Denormalized per-conversation inbox row
+"""
+
+from django.db import models
+from django.db.models import F, OrderBy
+
+
+class ConversationSummary(models.Model):
+    """Denormalized inbox data for one conversation.
+
+    Holds what the inbox lists would otherwise compute with correlated
+    subqueries against Message on every page: the last message and the
+    unread inbound count. Rows are maintained by
+    services.chat_summary.ConversationSummaryService after each message
+    change commits (while CHAT_SUMMARY_ENABLED is set), and can be rebuilt
+    with the backfill_conversation_summaries command.
+    """
+
+    conversation = models.OneToOneField(
+        "django_communication.Conversation",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="inbox_summary",
+    )
+
+    last_message_id = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Most recent message in the conversation",
+    )
+    last_message_preview = models.CharField(
+        max_length=200,
+        blank=True,
+        default="",
+        help_text="First 200 characters of the last message",
+    )
+    last_message_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the last message was created",
+    )
+    last_message_direction = models.CharField(
+        max_length=20,
+        blank=True,
+        default="",
+        help_text="Direction of the last message (inbound/outbound)",
+    )
+    last_message_sender_id = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Person who sent the last message",
+    )
+    unread_inbound_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Inbound messages not yet read",
+    )
+    needs_reply = models.BooleanField(
+        default=False,
+        help_text="True if the last message was inbound",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Conversation Summary"
+        verbose_name_plural = "Conversation Summaries"
+        indexes = [
+            # Matches the mobile inbox keyset order (last message time, id)
+            models.Index(
+                OrderBy(F("last_message_at"), descending=True, nulls_last=True),
+                F("conversation").desc(),
+                name="convsummary_keyset_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Summary of {self.conversation_id}"
@@ -3,6 +3,7 @@
 This module contains:
 - LocationUpdate: GPS location recording from mobile devices
 - LocationSharingPreference: Privacy controls for location sharing
+- LatestLocation: Last known position per person
 """
 
 from django.db import models
@@ -85,6 +86,12 @@ class LocationUpdate(BaseModel):
         help_text="Active excursion when location was recorded",
     )
 
+    # Retention (see services.location_retention)
+    is_downsampled = models.BooleanField(
+        default=False,
+        help_text="Point kept when its track was downsampled by retention",
+    )
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -95,11 +102,24 @@ class LocationUpdate(BaseModel):
                 condition=Q(longitude__gte=-180) & Q(longitude__lte=180),
                 name="location_update_valid_longitude",
             ),
+            # One fix per device timestamp; batch retries are deduplicated
+            models.UniqueConstraint(
+                fields=["person", "recorded_at"],
+                name="location_update_unique_person_recorded_at",
+            ),
         ]
         indexes = [
             models.Index(fields=["person", "-recorded_at"]),
             models.Index(fields=["recorded_at"]),
             models.Index(fields=["excursion", "recorded_at"]),
+            # Excursion track replay reads each person's points in order
+            models.Index(fields=["excursion", "person", "recorded_at"], name="location_update_track_idx"),
+            # Raw points still waiting for retention downsampling
+            models.Index(
+                fields=["recorded_at"],
+                condition=Q(is_downsampled=False),
+                name="location_update_raw_idx",
+            ),
         ]
         ordering = ["-recorded_at"]
 
@@ -202,3 +222,51 @@ class LocationSharingPreference(BaseModel):
             return True
 
         return False
+
+
+class LatestLocation(models.Model):
+    """Last known position of a person.
+
+    One row per person, advanced whenever a newer LocationUpdate is
+    ingested (services.locations.LatestLocationService), so maps read
+    O(people) rows instead of scanning the LocationUpdate history.
+    """
+
+    person = models.OneToOneField(
+        "django_parties.Person",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="latest_location",
+    )
+
+    location_id = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="LocationUpdate this position was taken from",
+    )
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    accuracy_meters = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+    source = models.CharField(
+        max_length=10,
+        choices=LocationUpdate.Source.choices,
+        default=LocationUpdate.Source.FUSED,
+    )
+    recorded_at = models.DateTimeField(
+        help_text="Device timestamp of the position",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="latest_location_coords_idx"),
+            models.Index(fields=["updated_at"], name="latest_location_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.person_id} @ ({self.latitude}, {self.longitude})"
@@ -2,10 +2,10 @@
 
 This module provides:
 - segment_converter: Convert route_segments to deco validator input
-- deco_runner: Execute Rust validator binary
+- deco_runner: Execute Rust validator (HTTP or binary)
 """
 
 from .segment_converter import build_validator_input, segments_to_steps
-from .deco_runner import run_deco_validator
+from .deco_runner import run_deco_validator, run_deco_validators
 
-__all__ = ["build_validator_input", "segments_to_steps", "run_deco_validator"]
+__all__ = ["build_validator_input", "segments_to_steps", "run_deco_validator", "run_deco_validators"]
@@ -1,15 +1,27 @@
 """Decompression validator runner.
 
 Calls the Rust deco validation HTTP endpoint for optimal performance.
-Falls back to subprocess binary if HTTP is unavailable.
+Falls back to a one-shot diveops-deco-validate subprocess per input if
+HTTP is unavailable.
+
+Successful results are cached in the Django cache keyed by the content
+hash of the validator input, so validating an unchanged plan again makes
+no sidecar call. Keys also carry DECO_RESULT_CACHE_VERSION; bump it when
+the validator tool or model changes so cached results are recomputed.
 """
 
 import json
 import logging
+import os
 import subprocess
+import threading
 
 import httpx
 from django.conf import settings
+from django.core.cache import cache
+
+from ..pricing.circuit_breaker import get_breaker, register_health_check
+from .segment_converter import content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +30,111 @@ RUST_DECO_URL = getattr(settings, "RUST_DECO_URL", None) or getattr(
     settings, "RUST_PRICING_URL", "http://localhost:8080/api/pricing"
 ).replace("/api/pricing", "/api/deco")
 
+RESULT_CACHE_PREFIX = "diveops:deco:result"
+
+
+def result_cache_version() -> str:
+    """Return the validator result version (DECO_RESULT_CACHE_VERSION)."""
+    return str(getattr(settings, "DECO_RESULT_CACHE_VERSION", "1"))
+
+# Process-wide keep-alive client for the deco endpoint, shared by all threads
+_client_lock = threading.Lock()
+_client: httpx.Client | None = None
+
+
+def _get_client() -> httpx.Client:
+    """Return the pooled deco HTTP client, creating it on first use."""
+    global _client
+
+    client = _client
+    if client is not None and not client.is_closed:
+        return client
+
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(timeout=getattr(settings, "RUST_DECO_TIMEOUT", 5.0))
+        return _client
+
+
+def close_client() -> None:
+    """Close the pooled deco HTTP client (gunicorn ``worker_exit``)."""
+    global _client
+
+    with _client_lock:
+        client, _client = _client, None
+
+    if client is not None:
+        client.close()
+
+
+def _reset_after_fork() -> None:
+    """Drop the client inherited from the parent; its sockets are shared."""
+    global _client_lock, _client
+
+    _client_lock = threading.Lock()
+    _client = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def check_health() -> bool:
+    """Check if the Rust deco endpoint is healthy.
+
+    Returns:
+        True if service is healthy, False otherwise.
+    """
+    try:
+        response = _get_client().get(f"{RUST_DECO_URL}/health")
+        if response.status_code == 200:
+            return response.json().get("status") == "ok"
+        return False
+    except (httpx.RequestError, ValueError) as e:
+        logger.warning(f"Deco health check failed: {e}")
+        return False
+
+
+register_health_check("deco", check_health, endpoints=("validate",))
+
 
 def _run_deco_http(input_data: dict) -> dict | None:
-    """Call Rust deco HTTP endpoint. Returns None if unavailable."""
+    """Call Rust deco HTTP endpoint. Returns None if unavailable.
+
+    Skips the call entirely while the deco/validate circuit is open, so a
+    down sidecar costs nothing instead of RUST_DECO_TIMEOUT per validation.
+    Connection errors, timeouts and 5xx responses count as breaker failures
+    and fall back to the binary; only a 2xx response closes the circuit.
+    """
+    breaker = get_breaker("deco/validate")
+    if not breaker.allow_request():
+        logger.debug("Deco HTTP circuit open, using binary")
+        return None
+
     try:
-        timeout = getattr(settings, "RUST_DECO_TIMEOUT", 5.0)
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(f"{RUST_DECO_URL}/validate", json=input_data)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(f"Deco HTTP returned {response.status_code}: {response.text[:200]}")
-                return response.json()  # Return error response from Rust
-    except httpx.ConnectError:
-        logger.debug("Deco HTTP endpoint unavailable, falling back to binary")
+        response = _get_client().post(f"{RUST_DECO_URL}/validate", json=input_data)
+    except httpx.RequestError as e:
+        breaker.record_failure()
+        logger.debug(f"Deco HTTP endpoint unavailable ({e}), falling back to binary")
         return None
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+        logger.warning(f"Deco HTTP returned {response.status_code}, falling back to binary")
+        return None
+    if response.is_success:
+        breaker.record_success()
+    try:
+        if response.status_code != 200:
+            logger.warning(f"Deco HTTP returned {response.status_code}: {response.text[:200]}")
+        return response.json()  # Error responses from Rust are returned as-is
     except Exception as e:
         logger.warning(f"Deco HTTP error: {e}, falling back to binary")
         return None
 
 
 def _run_deco_binary(input_data: dict) -> dict:
-    """Call Rust deco binary via subprocess (fallback)."""
+    """Call Rust deco binary via a one-shot subprocess (fallback)."""
     validator_path = getattr(
         settings, "DECO_VALIDATOR_PATH", "/usr/local/bin/diveops-deco-validate"
     )
@@ -87,7 +182,7 @@ def run_deco_validator(input_data: dict) -> dict:
     """Run deco validator, return normalized result.
 
     Tries HTTP endpoint first for optimal performance (~1ms vs ~50ms subprocess).
-    Falls back to subprocess binary if HTTP is unavailable.
+    Falls back to the subprocess binary if HTTP is unavailable.
 
     Args:
         input_data: Dict with segments, gas, gf_low, gf_high
@@ -98,12 +193,72 @@ def run_deco_validator(input_data: dict) -> dict:
         - ceiling_m, tts_min, ndl_min, deco_required
         - stops (list of depth_m/duration_min dicts)
         - input_hash
+        - input_key (content hash of input_data, used as the cache key)
+        - cache_version (DECO_RESULT_CACHE_VERSION the result was made under)
         - error (if validation failed)
     """
+    return run_deco_validators([input_data])[0]
+
+
+def run_deco_validators(inputs: list[dict]) -> list[dict]:
+    """Run the deco validator for several dives, return results in order.
+
+    Cached results are reused. Remaining inputs go to the HTTP endpoint;
+    once it is unavailable, the rest of the batch skips it and goes
+    straight to the subprocess binary.
+
+    Args:
+        inputs: Validator inputs (see run_deco_validator)
+
+    Returns:
+        One result dict per input (see run_deco_validator)
+    """
+    version = result_cache_version()
+    prefix = f"{RESULT_CACHE_PREFIX}:v{version}"
+    keys = [content_hash(input_data) for input_data in inputs]
+    results: list[dict | None] = [None] * len(inputs)
+
+    try:
+        cached = cache.get_many([f"{prefix}:{key}" for key in keys])
+    except Exception as e:
+        logger.warning(f"Deco result cache unavailable: {e}")
+        cached = {}
+
+    pending = []
+    for i, key in enumerate(keys):
+        hit = cached.get(f"{prefix}:{key}")
+        if hit is not None:
+            results[i] = dict(hit)
+        else:
+            pending.append(i)
+
     # Try HTTP first (much faster - no subprocess overhead)
-    result = _run_deco_http(input_data)
-    if result is not None:
-        return result
+    fallback = []
+    for i in pending:
+        result = _run_deco_http(inputs[i]) if not fallback else None
+        if result is None:
+            fallback.append(i)
+        else:
+            results[i] = result
+
+    if fallback:
+        breaker = get_breaker("deco/validate")
+        for _ in fallback:
+            breaker.record_fallback()
+        for i in fallback:
+            results[i] = _run_deco_binary(inputs[i])
+
+    to_cache = {}
+    for i in pending:
+        results[i]["input_key"] = keys[i]
+        results[i]["cache_version"] = version
+        # Only cache real results; errors may be transient (timeouts, missing binary)
+        if "error" not in results[i]:
+            to_cache[f"{prefix}:{keys[i]}"] = results[i]
+    if to_cache:
+        try:
+            cache.set_many(to_cache, timeout=getattr(settings, "DECO_RESULT_CACHE_TIMEOUT", 7 * 24 * 3600))
+        except Exception as e:
+            logger.warning(f"Deco result cache unavailable: {e}")
 
-    # Fall back to binary
-    return _run_deco_binary(input_data)
+    return [dict(result) for result in results]
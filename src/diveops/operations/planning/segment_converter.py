@@ -2,8 +2,54 @@
 
 Converts route_segments from dive templates into flat depth/time steps
 for the Bühlmann ZHL-16C validator.
+
+Converted steps and validator payloads are memoized per process, keyed
+by a content hash of the route_segments JSON (plus slicing, gas and GF
+parameters), so viewing, validating, locking and tissue-profiling the
+same template only slices its ramps once.
 """
 
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# Max memoized step lists / validator payloads per process
+MEMO_MAX_ENTRIES = 2048
+
+_memo_lock = threading.Lock()
+_steps_memo: OrderedDict = OrderedDict()
+_input_memo: OrderedDict = OrderedDict()
+
+
+def content_hash(data) -> str:
+    """Return "sha256:<hex>" of the canonical JSON encoding of data."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha256:" + hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _memo_get(memo: OrderedDict, key):
+    with _memo_lock:
+        value = memo.get(key)
+        if value is not None:
+            memo.move_to_end(key)
+        return value
+
+
+def _memo_put(memo: OrderedDict, key, value) -> None:
+    with _memo_lock:
+        memo[key] = value
+        memo.move_to_end(key)
+        while len(memo) > MEMO_MAX_ENTRIES:
+            memo.popitem(last=False)
+
+
+def clear_memo() -> None:
+    """Drop memoized step lists and validator payloads."""
+    with _memo_lock:
+        _steps_memo.clear()
+        _input_memo.clear()
+
 
 def segments_to_steps(
     route_segments: list[dict], slice_min: int = 3, slice_max: int = 10
@@ -13,6 +59,9 @@ def segments_to_steps(
     Drops final surface segment (ends at 0m) per locked decision #2.
     We compute ceiling BEFORE surfacing, not after.
 
+    Results are memoized by content hash; callers get fresh dicts and may
+    mutate them.
+
     Args:
         route_segments: List of segment dicts with phase, depth, duration
         slice_min: Minimum slices for ramp segments
@@ -21,6 +70,16 @@ def segments_to_steps(
     Returns:
         List of {depth_m: float, duration_min: float} dicts
     """
+    key = (content_hash(route_segments), slice_min, slice_max)
+    steps = _memo_get(_steps_memo, key)
+    if steps is None:
+        steps = tuple(_convert_segments(route_segments, slice_min, slice_max))
+        _memo_put(_steps_memo, key, steps)
+    return [dict(step) for step in steps]
+
+
+def _convert_segments(route_segments: list[dict], slice_min: int, slice_max: int) -> list[dict]:
+    """Uncached segments_to_steps."""
     # Filter out final surface segment
     filtered = _drop_surface_segment(route_segments)
 
@@ -100,6 +159,8 @@ def build_validator_input(
     """Build input for deco validator binary.
 
     Note: input_hash is computed by Rust binary, not here (locked decision #3).
+    Payloads are memoized by content hash of the route_segments plus gas
+    and GF parameters.
 
     Args:
         route_segments: List of segment dicts from dive template
@@ -111,9 +172,18 @@ def build_validator_input(
     Returns:
         Dict ready to serialize and send to validator binary
     """
+    key = (content_hash(route_segments), gas_o2, gas_he, gf_low, gf_high)
+    payload = _memo_get(_input_memo, key)
+    if payload is None:
+        payload = {
+            "segments": segments_to_steps(route_segments),
+            "gas": {"o2": gas_o2, "he": gas_he},
+            "gf_low": gf_low,
+            "gf_high": gf_high,
+        }
+        _memo_put(_input_memo, key, payload)
     return {
-        "segments": segments_to_steps(route_segments),
-        "gas": {"o2": gas_o2, "he": gas_he},
-        "gf_low": gf_low,
-        "gf_high": gf_high,
+        **payload,
+        "segments": [dict(step) for step in payload["segments"]],
+        "gas": dict(payload["gas"]),
     }
@@ -0,0 +1,181 @@
+"""Vectorized Bühlmann ZHL-16C tissue engine.
+
+NumPy implementation of the tissue functions in operations._services
+(calculate_dive_tissue_loading, calculate_surface_interval_offgassing,
+calculate_ndl). All 16 N2 compartments are held in one array and the
+rate constants k = ln(2) / half-time are computed once at import.
+
+A whole list of constant-depth steps is applied in one update. Each
+step j moves a compartment toward its ambient pressure P_j, and the
+effect of step j on the final pressure is decayed by every later step:
+
+    P_end = P_0 * e^(-k*T) + sum_j P_j * (e^(-k*(T - t_end_j)) - e^(-k*(T - t_start_j)))
+
+where T is total runtime. This is algebraically identical to applying the
+Haldane equation step by step, but evaluates as one (steps x 16) matrix
+product instead of a Python loop per step per compartment.
+
+WARNING: Like the scalar functions, everything here is EPHEMERAL planning
+data. Do NOT persist.
+"""
+
+import numpy as np
+
+from .._services import (
+    BUHLMANN_A_VALUES,
+    BUHLMANN_B_VALUES,
+    BUHLMANN_N2_HALFTIMES,
+    DEFAULT_GF_HIGH,
+    DEFAULT_GF_LOW,
+    SURFACE_N2_PP,
+    SURFACE_PRESSURE,
+    WATER_VAPOR_PP,
+    TissueState,
+)
+
+# Rate constants per compartment (1/min)
+N2_RATE_CONSTANTS = np.log(2.0) / np.asarray(BUHLMANN_N2_HALFTIMES, dtype=np.float64)
+
+# Surface M-values without gradient factors: a + P_surface / b
+_SURFACE_M_VALUES = np.asarray(BUHLMANN_A_VALUES) + SURFACE_PRESSURE / np.asarray(BUHLMANN_B_VALUES)
+
+# Returned when no compartment limits the dive (matches calculate_ndl)
+UNLIMITED_NDL = 999
+
+
+def _ambient_n2_pp(depths_m: np.ndarray, gas_n2_fraction: float) -> np.ndarray:
+    """Vectorized _depth_to_ambient_n2_pp."""
+    return (SURFACE_PRESSURE + depths_m / 10.0 - WATER_VAPOR_PP) * gas_n2_fraction
+
+
+def apply_steps(
+    pressures: np.ndarray,
+    depths_m: np.ndarray,
+    durations_min: np.ndarray,
+    gas_n2_fraction: float,
+) -> np.ndarray:
+    """Apply a sequence of constant-depth steps to all compartments at once.
+
+    Args:
+        pressures: Initial N2 pressures, shape (16,)
+        depths_m: Step depths, shape (n,)
+        durations_min: Step durations, shape (n,); steps <= 0 are ignored
+        gas_n2_fraction: N2 fraction in breathing gas
+
+    Returns:
+        Final N2 pressures, shape (16,)
+    """
+    keep = durations_min > 0
+    depths_m = depths_m[keep]
+    durations_min = durations_min[keep]
+    if durations_min.size == 0:
+        return pressures.copy()
+
+    ambient = _ambient_n2_pp(depths_m, gas_n2_fraction)
+
+    # Time remaining after each step ends / starts
+    remaining_after = np.cumsum(durations_min[::-1])[::-1] - durations_min
+    remaining_before = remaining_after + durations_min
+    total = remaining_before[0]
+
+    weights = np.exp(-np.outer(remaining_after, N2_RATE_CONSTANTS)) - np.exp(
+        -np.outer(remaining_before, N2_RATE_CONSTANTS)
+    )
+    return pressures * np.exp(-N2_RATE_CONSTANTS * total) + ambient @ weights
+
+
+def offgas(pressures: np.ndarray, duration_min: float) -> np.ndarray:
+    """Off-gas all compartments toward surface saturation."""
+    if duration_min <= 0:
+        return pressures.copy()
+    decay = np.exp(-N2_RATE_CONSTANTS * duration_min)
+    return SURFACE_N2_PP + (pressures - SURFACE_N2_PP) * decay
+
+
+def ndl_minutes(
+    pressures: np.ndarray,
+    depth_m: float,
+    gas_o2_fraction: float = 0.21,
+    gf_high: int = DEFAULT_GF_HIGH,
+) -> int:
+    """Solve NDL for all compartments at once.
+
+    Same model as calculate_ndl: surfacing directly, so only GF High at
+    the surface applies.
+    """
+    ambient = float(_ambient_n2_pp(np.float64(depth_m), 1.0 - gas_o2_fraction))
+    m_values = SURFACE_PRESSURE + (_SURFACE_M_VALUES - SURFACE_PRESSURE) * (gf_high / 100.0)
+
+    if np.any(pressures >= m_values):
+        return 0
+
+    denominator = pressures - ambient
+    limiting = (ambient >= m_values) & (denominator != 0)
+    if not limiting.any():
+        return UNLIMITED_NDL
+
+    ratio = (m_values[limiting] - ambient) / denominator[limiting]
+    with np.errstate(divide="ignore"):
+        times = np.where(ratio > 0, -np.log(np.where(ratio > 0, ratio, 1.0)) / N2_RATE_CONSTANTS[limiting], 0.0)
+    return max(0, int(times.min()))
+
+
+# =============================================================================
+# Drop-in replacements for the scalar functions in operations._services
+# =============================================================================
+
+
+def calculate_dive_tissue_loading(
+    *,
+    route_segments: list[dict],
+    gas_o2_fraction: float = 0.21,
+    initial_tissue_state: TissueState | None = None,
+) -> tuple[TissueState, dict]:
+    """Vectorized calculate_dive_tissue_loading (same arguments and result)."""
+    if initial_tissue_state is None:
+        pressures = np.full(16, SURFACE_N2_PP)
+    else:
+        pressures = np.asarray(initial_tissue_state.n2_pressures, dtype=np.float64)
+
+    depths = np.fromiter((float(s.get("depth_m", 0)) for s in route_segments), dtype=np.float64)
+    durations = np.fromiter((float(s.get("duration_min", 0)) for s in route_segments), dtype=np.float64)
+
+    pressures = apply_steps(pressures, depths, durations, 1.0 - gas_o2_fraction)
+    tissue_state = TissueState(n2_pressures=pressures.tolist())
+
+    active = durations > 0
+    metrics = {
+        "max_depth_m": max(0.0, float(depths[active].max())) if active.any() else 0.0,
+        "runtime_min": float(durations[active].sum()),
+        "max_loading_percent": tissue_state.max_loading_percent(),
+        "gas_o2_fraction": gas_o2_fraction,
+    }
+    return tissue_state, metrics
+
+
+def calculate_surface_interval_offgassing(
+    *,
+    tissue_state: TissueState,
+    duration_min: float,
+) -> TissueState:
+    """Vectorized calculate_surface_interval_offgassing."""
+    if duration_min <= 0:
+        return tissue_state
+    pressures = offgas(np.asarray(tissue_state.n2_pressures, dtype=np.float64), duration_min)
+    return TissueState(n2_pressures=pressures.tolist())
+
+
+def calculate_ndl(
+    tissue_state: TissueState,
+    depth_m: float,
+    gas_o2_fraction: float = 0.21,
+    gf_low: int = DEFAULT_GF_LOW,
+    gf_high: int = DEFAULT_GF_HIGH,
+) -> int | None:
+    """Vectorized calculate_ndl. gf_low is accepted for signature parity only."""
+    return ndl_minutes(
+        np.asarray(tissue_state.n2_pressures, dtype=np.float64),
+        depth_m,
+        gas_o2_fraction=gas_o2_fraction,
+        gf_high=gf_high,
+    )
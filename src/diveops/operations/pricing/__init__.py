@@ -5,7 +5,7 @@ django-primitives (catalog, agreements, ledger, money) with diveops domain.
 
 Key components:
 - calculators: Boat cost tiers, gas pricing calculations
-- services: quote_excursion, snapshot_booking_pricing, add_equipment_rental
+- services: quote_excursion, quote_excursions, snapshot_booking_pricing, add_equipment_rental
 - models: DiverEquipmentRental (glue model for equipment tracking)
 - snapshots: Build immutable pricing snapshots
 """
@@ -19,6 +19,7 @@ from .exceptions import (
 )
 from .services import (
     quote_excursion,
+    quote_excursions,
     snapshot_booking_pricing,
     add_equipment_rental,
     validate_pricing_configuration,
@@ -33,6 +34,7 @@ __all__ = [
     "MissingPriceError",
     # Services
     "quote_excursion",
+    "quote_excursions",
     "snapshot_booking_pricing",
     "add_equipment_rental",
     "validate_pricing_configuration",
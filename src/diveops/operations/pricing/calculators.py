@@ -13,14 +13,17 @@ from typing import NamedTuple
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
 
 from django_agreements.models import Agreement
 from django_money import Money
 
 from .exceptions import (
+    PricingError,
     MissingVendorAgreementError,
     MissingPriceError,
+    MissingCatalogItemError,
     CurrencyMismatchError,
     ConfigurationError,
 )
@@ -145,6 +148,11 @@ def calculate_boat_cost(
             scope_ref=f"DiveSite:{dive_site.pk}",
         )
 
+    return _boat_cost_from_agreement(agreement, diver_count)
+
+
+def _boat_cost_from_agreement(agreement, diver_count: int) -> BoatCostResult:
+    """Apply the boat_charter tier from an agreement's terms to a diver count."""
     # Extract boat tier from agreement terms
     boat_tier = agreement.terms.get("boat_charter")
     if not boat_tier:
@@ -270,6 +278,16 @@ def calculate_gas_fills(
             scope_ref=f"Organization:{dive_shop.pk}",
         )
 
+    return _gas_fills_from_agreement(agreement, gas_type, fills_count, customer_charge_amount)
+
+
+def _gas_fills_from_agreement(
+    agreement,
+    gas_type: str,
+    fills_count: int,
+    customer_charge_amount: Decimal | None = None,
+) -> GasFillResult:
+    """Apply the gas_fills pricing from an agreement's terms to a fill count."""
     # Extract gas pricing from agreement terms
     gas_fills = agreement.terms.get("gas_fills", {})
     gas_pricing = gas_fills.get(gas_type.lower())
@@ -404,6 +422,11 @@ def resolve_component_pricing(
             context=catalog_item.display_name,
         )
 
+    return _component_pricing_from_price(price)
+
+
+def _component_pricing_from_price(price) -> dict:
+    """Build the resolve_component_pricing result dict from a Price."""
     return {
         "charge_amount": price.amount,
         "charge_currency": price.currency,
@@ -414,6 +437,254 @@ def resolve_component_pricing(
     }
 
 
+def _select_price(prices, dive_shop=None, party=None, agreement=None):
+    """Pick the winning price from candidates already ordered by -priority, -valid_from.
+
+    Applies the same agreement → party → organization → global cascade as
+    resolve_component_pricing, in memory.
+    """
+
+    def first(predicate):
+        return next((p for p in prices if predicate(p)), None)
+
+    price = None
+
+    if agreement:
+        price = first(lambda p: p.agreement_id == agreement.pk)
+
+    if not price and party:
+        price = first(lambda p: p.party_id == party.pk and p.agreement_id is None)
+
+    if not price and dive_shop:
+        price = first(
+            lambda p: p.organization_id == dive_shop.pk and p.party_id is None and p.agreement_id is None
+        )
+
+    if not price:
+        price = first(lambda p: p.organization_id is None and p.party_id is None and p.agreement_id is None)
+
+    return price
+
+
+def _first_per_key(queryset, key):
+    """Return {key(obj): obj} keeping the row ``.first()`` would have picked."""
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+    result = {}
+    for obj in queryset:
+        result.setdefault(key(obj), obj)
+    return result
+
+
+class ExcursionPricingResult(NamedTuple):
+    """Every pricing input for one excursion, resolved in a single pass.
+
+    ``components`` maps catalog display name to the resolve_component_pricing
+    dict (plus ``catalog_item_id``). ``errors`` maps "boat", "gas" or a
+    display name to the missing-configuration error for that line.
+    """
+
+    boat: BoatCostResult | None
+    gas: GasFillResult | None
+    components: dict[str, dict]
+    errors: dict[str, PricingError]
+
+
+class PricingContext(NamedTuple):
+    """Agreements, catalog items and prices preloaded for a set of excursions.
+
+    Agreement maps are keyed by the string scope id stored on the agreement
+    (dive site pk for boats, dive shop pk for gas).
+    """
+
+    boat_agreements: dict
+    gas_agreements: dict
+    catalog_items: dict
+    prices_by_item: dict
+    as_of: object
+
+
+def load_pricing_context(
+    *,
+    dive_sites,
+    dive_shops,
+    component_names: tuple[str, ...] = (),
+    as_of=None,
+) -> PricingContext:
+    """Load everything price_excursion needs for many sites and shops.
+
+    Runs at most three queries regardless of how many excursions will be
+    priced: vendor agreements, catalog items, and candidate prices (global
+    or scoped to one of the given dive shops).
+
+    Args:
+        dive_sites: DiveSite instances (None entries are ignored)
+        dive_shops: Organization instances
+        component_names: Catalog item display names to price
+        as_of: Point in time for pricing (default: now)
+
+    Returns:
+        PricingContext
+    """
+    from django_catalog.models import CatalogItem
+
+    from diveops.pricing.models import Price
+
+    check_time = as_of or timezone.now()
+    dive_sites = [site for site in dive_sites if site is not None]
+    dive_shops = [shop for shop in dive_shops if shop is not None]
+
+    # 1. Boat and gas vendor agreements in one query
+    agreement_filter = Q()
+    if dive_sites:
+        agreement_filter |= Q(
+            scope_type="vendor_pricing",
+            scope_ref_content_type=ContentType.objects.get_for_model(dive_sites[0]),
+            scope_ref_id__in={str(site.pk) for site in dive_sites},
+        )
+    if dive_shops:
+        agreement_filter |= Q(
+            scope_type="gas_vendor_pricing",
+            party_a_content_type=ContentType.objects.get_for_model(dive_shops[0]),
+            party_a_id__in={str(shop.pk) for shop in dive_shops},
+        )
+
+    agreements = {}
+    if agreement_filter:
+        agreements = _first_per_key(
+            Agreement.objects.filter(agreement_filter).as_of(check_time),
+            key=lambda a: (
+                a.scope_type,
+                a.scope_ref_id if a.scope_type == "vendor_pricing" else a.party_a_id,
+            ),
+        )
+    boat_agreements = {ref: a for (scope, ref), a in agreements.items() if scope == "vendor_pricing"}
+    gas_agreements = {ref: a for (scope, ref), a in agreements.items() if scope == "gas_vendor_pricing"}
+
+    # 2. Catalog items and their candidate prices, one query each
+    catalog_items = {}
+    prices_by_item: dict = {}
+    if component_names:
+        catalog_items = _first_per_key(
+            CatalogItem.objects.filter(display_name__in=component_names, active=True),
+            key=lambda i: i.display_name,
+        )
+    if catalog_items:
+        prices = (
+            Price.objects.filter(
+                catalog_item__in=list(catalog_items.values()),
+                party__isnull=True,
+                agreement__isnull=True,
+            )
+            .filter(Q(organization__isnull=True) | Q(organization__in=dive_shops))
+            .current(as_of=check_time)
+            .order_by("-priority", "-valid_from")
+        )
+        for price in prices:
+            prices_by_item.setdefault(price.catalog_item_id, []).append(price)
+
+    return PricingContext(
+        boat_agreements=boat_agreements,
+        gas_agreements=gas_agreements,
+        catalog_items=catalog_items,
+        prices_by_item=prices_by_item,
+        as_of=check_time,
+    )
+
+
+def price_excursion(
+    *,
+    dive_site,
+    dive_shop,
+    diver_count: int,
+    gas_type: str,
+    fills_count: int,
+    gas_charge_amount: Decimal | None = None,
+    component_names: tuple[str, ...] = (),
+    as_of=None,
+    context: PricingContext | None = None,
+) -> ExcursionPricingResult:
+    """Resolve boat, gas and catalog component pricing for an excursion at once.
+
+    Replaces one calculate_boat_cost + calculate_gas_fills +
+    resolve_component_pricing call per line with the three set-based
+    queries of load_pricing_context(). Pass a preloaded ``context`` to price
+    many excursions without further queries. Missing configuration is
+    reported per line in ``errors`` so callers can decide whether to warn
+    or raise.
+
+    Args:
+        dive_site: DiveSite for the boat vendor agreement
+        dive_shop: Organization for gas agreement and org-scoped prices
+        diver_count: Number of divers on the excursion
+        gas_type: Type of gas (air, ean32, ean36)
+        fills_count: Number of tank fills per diver
+        gas_charge_amount: Optional override for customer charge per fill
+        component_names: Catalog item display names to price
+        as_of: Point in time for pricing (default: now; ignored with context)
+        context: Optional preloaded PricingContext covering this excursion
+
+    Returns:
+        ExcursionPricingResult
+
+    Raises:
+        ConfigurationError: Invalid counts or malformed agreement terms
+    """
+    if diver_count <= 0:
+        raise ConfigurationError("Diver count must be positive")
+    if fills_count <= 0:
+        raise ConfigurationError("Fills count must be positive")
+
+    if context is None:
+        context = load_pricing_context(
+            dive_sites=[dive_site],
+            dive_shops=[dive_shop],
+            component_names=component_names,
+            as_of=as_of,
+        )
+
+    errors: dict[str, PricingError] = {}
+
+    boat = None
+    boat_agreement = context.boat_agreements.get(str(dive_site.pk)) if dive_site is not None else None
+    if boat_agreement:
+        boat = _boat_cost_from_agreement(boat_agreement, diver_count)
+    else:
+        errors["boat"] = MissingVendorAgreementError(
+            scope_type="vendor_pricing",
+            scope_ref=f"DiveSite:{dive_site.pk if dive_site is not None else None}",
+        )
+
+    gas = None
+    gas_agreement = context.gas_agreements.get(str(dive_shop.pk))
+    if gas_agreement:
+        gas = _gas_fills_from_agreement(gas_agreement, gas_type, fills_count, gas_charge_amount)
+    else:
+        errors["gas"] = MissingVendorAgreementError(
+            scope_type="gas_vendor_pricing",
+            scope_ref=f"Organization:{dive_shop.pk}",
+        )
+
+    components: dict[str, dict] = {}
+    for name in component_names:
+        item = context.catalog_items.get(name)
+        if item is None:
+            errors[name] = MissingCatalogItemError(name)
+            continue
+        price = _select_price(context.prices_by_item.get(item.pk, []), dive_shop=dive_shop)
+        if price is None:
+            errors[name] = MissingPriceError(
+                catalog_item_id=str(item.pk),
+                context=item.display_name,
+            )
+            continue
+        pricing = _component_pricing_from_price(price)
+        pricing["catalog_item_id"] = str(item.pk)
+        components[name] = pricing
+
+    return ExcursionPricingResult(boat=boat, gas=gas, components=components, errors=errors)
+
+
 def allocate_shared_costs(
     shared_total: Decimal,
     diver_count: int,
@@ -0,0 +1,278 @@
+"""Circuit breaker for calls to the Rust pricing/deco sidecar.
+
+When the sidecar is down, every call would otherwise wait out the full
+RUST_PRICING_TIMEOUT / RUST_DECO_TIMEOUT before falling back to Python or
+the subprocess binary. A breaker per endpoint trips after
+RUST_CIRCUIT_FAILURE_THRESHOLD consecutive failures (connection errors,
+timeouts or 5xx responses); while open, callers fall back immediately.
+
+State lives in the Django cache (Redis in production), so one worker
+tripping the breaker spares every other gunicorn worker the timeout.
+
+States:
+- closed: calls go through; failures are counted
+- open: calls are refused until RUST_CIRCUIT_RESET_TIMEOUT has elapsed
+- half_open: one trial call (across all workers) is let through; success
+  closes the circuit, failure re-opens it. While the last health probe
+  of the service (cached) says it is down, no trial call is made.
+
+Breakers are named "<service>/<endpoint>". Each service registers a
+check of its own health endpoint (register_health_check): "pricing" is
+rust_client.check_health (/api/pricing/health), "deco" is
+deco_runner.check_health (/api/deco/health). A background health probe
+(one daemon thread per process) checks every service with a breaker that
+is not closed every RUST_HEALTH_PROBE_INTERVAL seconds, and closes that
+service's breakers as soon as its own endpoint reports healthy again.
+
+`manage.py rust_circuits` shows every endpoint's state and fallback
+counters, and the cached health of each service.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CACHE_PREFIX = "diveops:circuit"
+HEALTH_CACHE_PREFIX = "diveops:rust:health"
+
+
+class CircuitBreaker:
+    """Cache-backed circuit breaker for one sidecar endpoint.
+
+    Cache errors never block a call: if the shared state cannot be read
+    the breaker behaves as closed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int | None = None,
+        reset_timeout: float | None = None,
+    ):
+        self.name = name
+        self.service = name.split("/", 1)[0]
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._key = f"{CACHE_PREFIX}:{name}"
+
+    @property
+    def failure_threshold(self) -> int:
+        if self._failure_threshold is not None:
+            return self._failure_threshold
+        return getattr(settings, "RUST_CIRCUIT_FAILURE_THRESHOLD", 3)
+
+    @property
+    def reset_timeout(self) -> float:
+        if self._reset_timeout is not None:
+            return self._reset_timeout
+        return getattr(settings, "RUST_CIRCUIT_RESET_TIMEOUT", 30.0)
+
+    def _k(self, suffix: str) -> str:
+        return f"{self._key}:{suffix}"
+
+    def _state_from(self, opened_at: float | None) -> str:
+        if opened_at is None:
+            return CLOSED
+        if time.time() - opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        try:
+            opened_at = cache.get(self._k("opened_at"))
+        except Exception as e:
+            logger.warning("Circuit %s state unavailable: %s", self.name, e)
+            return CLOSED
+        return self._state_from(opened_at)
+
+    def allow_request(self) -> bool:
+        """Return True if a call to the endpoint should be attempted now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+
+        # Half-open: no trial while the service's last probe found it down
+        if get_cached_health(self.service) is False:
+            return False
+
+        # Half-open: exactly one trial call across all workers
+        try:
+            return cache.add(self._k("trial"), 1, timeout=self.reset_timeout)
+        except Exception:
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        try:
+            values = cache.get_many([self._k("opened_at"), self._k("failures")])
+            if not values:
+                return  # Already closed with no failures - one round trip
+            cache.delete_many([self._k("opened_at"), self._k("failures"), self._k("trial")])
+        except Exception as e:
+            logger.warning("Circuit %s could not record success: %s", self.name, e)
+            return
+        if self._k("opened_at") in values:
+            logger.info("Circuit %s closed", self.name)
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        try:
+            opened_at = cache.get(self._k("opened_at"))
+            cache.add(self._k("failures"), 0, timeout=None)
+            failures = cache.incr(self._k("failures"))
+        except Exception as e:
+            logger.warning("Circuit %s could not record failure: %s", self.name, e)
+            return
+
+        if self._state_from(opened_at) == HALF_OPEN or failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        """Open the circuit now."""
+        try:
+            cache.set(self._k("opened_at"), time.time(), timeout=None)
+            cache.delete_many([self._k("failures"), self._k("trial")])
+        except Exception as e:
+            logger.warning("Circuit %s could not open: %s", self.name, e)
+            return
+        logger.warning("Circuit %s opened; falling back for %ss", self.name, self.reset_timeout)
+        _ensure_health_probe()
+
+    def record_fallback(self) -> None:
+        """Count a call that fell back instead of using the sidecar."""
+        try:
+            cache.add(self._k("fallbacks"), 0, timeout=None)
+            cache.incr(self._k("fallbacks"))
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        """Return state and counters for this breaker."""
+        try:
+            values = cache.get_many([self._k("opened_at"), self._k("failures"), self._k("fallbacks")])
+        except Exception:
+            values = {}
+        return {
+            "state": self._state_from(values.get(self._k("opened_at"))),
+            "failures": values.get(self._k("failures"), 0),
+            "fallbacks": values.get(self._k("fallbacks"), 0),
+        }
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an endpoint name.
+
+    Names are "<service>/<endpoint>", e.g. "pricing/boat-cost" or
+    "deco/validate".
+    """
+    breaker = _registry.get(name)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _registry.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def get_circuit_stats() -> dict:
+    """Return {endpoint: {state, failures, fallbacks}} for known breakers."""
+    return {name: breaker.stats() for name, breaker in sorted(_registry.items())}
+
+
+_health_checks: dict[str, Callable[[], bool]] = {}
+
+
+def register_health_check(service: str, check: Callable[[], bool], endpoints=()) -> None:
+    """Register the check of a service's own health endpoint.
+
+    Breakers for the given endpoints are created up front, so stats list
+    them in processes that have not called them yet.
+    """
+    _health_checks[service] = check
+    for endpoint in endpoints:
+        get_breaker(f"{service}/{endpoint}")
+
+
+def registered_services() -> list[str]:
+    """Services with a registered health check."""
+    return sorted(_health_checks)
+
+
+def get_cached_health(service: str) -> bool | None:
+    """Return the service's last health probe result, or None if not probed recently."""
+    try:
+        return cache.get(f"{HEALTH_CACHE_PREFIX}:{service}")
+    except Exception:
+        return None
+
+
+def probe_health(service: str) -> bool | None:
+    """Check one service's health once, cache the result, and close its breakers if healthy.
+
+    Returns None if the service has no registered health check.
+    """
+    check = _health_checks.get(service)
+    if check is None:
+        return None
+
+    healthy = check()
+    interval = getattr(settings, "RUST_HEALTH_PROBE_INTERVAL", 10.0)
+    try:
+        cache.set(f"{HEALTH_CACHE_PREFIX}:{service}", healthy, timeout=interval * 2)
+    except Exception:
+        pass
+
+    if healthy:
+        for breaker in list(_registry.values()):
+            if breaker.service == service and breaker.state != CLOSED:
+                breaker.record_success()
+    return healthy
+
+
+_probe_thread: threading.Thread | None = None
+_probe_lock = threading.Lock()
+
+
+def _probe_loop() -> None:
+    interval = getattr(settings, "RUST_HEALTH_PROBE_INTERVAL", 10.0)
+    while True:
+        time.sleep(interval)
+        services = {breaker.service for breaker in list(_registry.values()) if breaker.state != CLOSED}
+        for service in sorted(services):
+            try:
+                probe_health(service)
+            except Exception as e:
+                logger.warning("Rust %s health probe failed: %s", service, e)
+
+
+def _ensure_health_probe() -> None:
+    """Start the background health probe thread for this process."""
+    global _probe_thread
+
+    if _probe_thread is not None and _probe_thread.is_alive():
+        return
+    with _probe_lock:
+        if _probe_thread is None or not _probe_thread.is_alive():
+            _probe_thread = threading.Thread(
+                target=_probe_loop,
+                name="rust-health-probe",
+                daemon=True,
+            )
+            _probe_thread.start()
@@ -3,17 +3,29 @@
 This module provides sync and async clients for calling the Rust pricing
 service. When USE_RUST_PRICING is enabled, pricing calculations are
 delegated to the high-performance Rust implementation.
+
+Sync calls share one pooled, keep-alive client per process, so a quote that
+makes several calls pays for a single connection setup. Pool limits come
+from RUST_PRICING_POOL_* settings. Async calls open a client per call and
+close it when done, so no connection outlives the event loop it was made on.
 """
 
+import atexit
+import contextlib
 import logging
+import os
+import threading
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
 import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+from .circuit_breaker import get_breaker, register_health_check
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,22 +93,179 @@ class ComponentPricingResult:
     has_cost: bool
 
 
-def _get_client() -> httpx.Client:
-    """Get a configured httpx client."""
-    return httpx.Client(
-        base_url=settings.RUST_PRICING_URL,
-        timeout=settings.RUST_PRICING_TIMEOUT,
+@dataclass
+class PoolStats:
+    """Connection-reuse counters for the pooled Rust pricing clients.
+
+    ``requests`` counts every request sent through a pooled client and
+    ``connections_opened`` counts new TCP (or unix socket) connections made
+    by the transport. Every request that did not open a connection was
+    served over a kept-alive one.
+    """
+
+    requests: int = 0
+    connections_opened: int = 0
+    clients_created: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.connections_reused / self.requests
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "clients_created": self.clients_created,
+        }
+
+
+# Process-wide pooled client, shared by every thread in the worker.
+_pool_lock = threading.Lock()
+_sync_client: httpx.Client | None = None
+_stats = PoolStats()
+
+
+def _pool_limits() -> httpx.Limits:
+    """Build connection pool limits from settings."""
+    return httpx.Limits(
+        max_connections=getattr(settings, "RUST_PRICING_POOL_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=getattr(settings, "RUST_PRICING_POOL_MAX_KEEPALIVE", 10),
+        keepalive_expiry=getattr(settings, "RUST_PRICING_KEEPALIVE_EXPIRY", 30.0),
     )
 
 
+def _is_connect_event(event_name: str) -> bool:
+    """True for httpcore trace events marking a completed new connection."""
+    return event_name.startswith("connection.connect_") and event_name.endswith(".complete")
+
+
+def _trace(event_name: str, info: dict) -> None:
+    if _is_connect_event(event_name):
+        with _pool_lock:
+            _stats.connections_opened += 1
+
+
+async def _async_trace(event_name: str, info: dict) -> None:
+    _trace(event_name, info)
+
+
+def _on_request(request: httpx.Request) -> None:
+    request.extensions["trace"] = _trace
+    with _pool_lock:
+        _stats.requests += 1
+
+
+async def _on_async_request(request: httpx.Request) -> None:
+    request.extensions["trace"] = _async_trace
+    with _pool_lock:
+        _stats.requests += 1
+
+
+def get_sync_client() -> httpx.Client:
+    """Return the process-wide pooled httpx client, creating it on first use.
+
+    The client keeps connections to the Rust service alive between calls,
+    so repeated pricing calls in one request reuse a single connection.
+    Safe to share across threads.
+    """
+    global _sync_client
+
+    client = _sync_client
+    if client is not None and not client.is_closed:
+        return client
+
+    with _pool_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                base_url=settings.RUST_PRICING_URL,
+                timeout=settings.RUST_PRICING_TIMEOUT,
+                limits=_pool_limits(),
+                event_hooks={"request": [_on_request]},
+            )
+            _stats.clients_created += 1
+        return _sync_client
+
+
+def _get_client() -> contextlib.nullcontext:
+    """Get the pooled httpx client as a context manager.
+
+    Leaving the ``with`` block does not close the client; connections stay
+    in the pool for the next call.
+    """
+    return contextlib.nullcontext(get_sync_client())
+
+
 def _get_async_client() -> httpx.AsyncClient:
-    """Get a configured async httpx client."""
+    """Get a new async httpx client, closed when its ``async with`` block exits.
+
+    Async connections are bound to the event loop they were opened on, and
+    daphne does not send ASGI lifespan events that could close a per-loop
+    pool, so async calls do not share connections.
+    """
+    with _pool_lock:
+        _stats.clients_created += 1
     return httpx.AsyncClient(
         base_url=settings.RUST_PRICING_URL,
         timeout=settings.RUST_PRICING_TIMEOUT,
+        limits=_pool_limits(),
+        event_hooks={"request": [_on_async_request]},
     )
 
 
+def get_pool_stats() -> dict:
+    """Return a snapshot of connection-reuse counters for this process."""
+    with _pool_lock:
+        return _stats.as_dict()
+
+
+def reset_pool_stats() -> None:
+    """Zero the connection-reuse counters."""
+    global _stats
+
+    with _pool_lock:
+        _stats = PoolStats()
+
+
+def close_clients() -> None:
+    """Close the pooled sync client.
+
+    Call from a worker shutdown hook (gunicorn ``worker_exit``).
+    """
+    global _sync_client
+
+    with _pool_lock:
+        client, _sync_client = _sync_client, None
+
+    if client is not None:
+        client.close()
+
+
+def _reset_after_fork() -> None:
+    """Drop the pooled client inherited from the parent process.
+
+    Sockets opened before a fork are shared with the parent, so the child
+    starts with an empty pool instead of closing it.
+    """
+    global _pool_lock, _sync_client, _stats
+
+    _pool_lock = threading.Lock()
+    _sync_client = None
+    _stats = PoolStats()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(close_clients)
+
+
 def _handle_response(response: httpx.Response) -> dict:
     """Handle response from Rust service."""
     if response.status_code == 200:
@@ -114,6 +283,58 @@ def _handle_response(response: httpx.Response) -> dict:
         response.raise_for_status()
 
 
+def _post(path: str, payload: dict) -> dict:
+    """POST to the Rust service through the endpoint's circuit breaker.
+
+    Raises RustPricingUnavailable immediately while the circuit is open,
+    so callers fall back without waiting out RUST_PRICING_TIMEOUT.
+    Connection errors, timeouts and 5xx responses count as failures; only
+    a 2xx response closes the circuit.
+    """
+    breaker = get_breaker(f"pricing{path}")
+    if not breaker.allow_request():
+        breaker.record_fallback()
+        raise RustPricingUnavailable(f"Circuit open for {breaker.name}")
+
+    try:
+        with _get_client() as client:
+            response = client.post(path, json=payload)
+    except httpx.RequestError as e:
+        breaker.record_failure()
+        breaker.record_fallback()
+        logger.error("Rust pricing service unavailable: %s", e)
+        raise RustPricingUnavailable(str(e)) from e
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+    elif response.is_success:
+        breaker.record_success()
+    return _handle_response(response)
+
+
+async def _apost(path: str, payload: dict) -> dict:
+    """Async version of _post."""
+    breaker = get_breaker(f"pricing{path}")
+    if not await sync_to_async(breaker.allow_request)():
+        await sync_to_async(breaker.record_fallback)()
+        raise RustPricingUnavailable(f"Circuit open for {breaker.name}")
+
+    try:
+        async with _get_async_client() as client:
+            response = await client.post(path, json=payload)
+    except httpx.RequestError as e:
+        await sync_to_async(breaker.record_failure)()
+        await sync_to_async(breaker.record_fallback)()
+        logger.error("Rust pricing service unavailable: %s", e)
+        raise RustPricingUnavailable(str(e)) from e
+
+    if response.status_code >= 500:
+        await sync_to_async(breaker.record_failure)()
+    elif response.is_success:
+        await sync_to_async(breaker.record_success)()
+    return _handle_response(response)
+
+
 def check_health() -> bool:
     """Check if Rust pricing service is healthy.
 
@@ -132,6 +353,9 @@ def check_health() -> bool:
         return False
 
 
+register_health_check("pricing", check_health, endpoints=("allocate", "boat-cost", "gas-fills", "resolve", "totals"))
+
+
 def calculate_boat_cost(
     dive_site_id: UUID,
     diver_count: int,
@@ -158,13 +382,7 @@ def calculate_boat_cost(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        with _get_client() as client:
-            response = client.post("/boat-cost", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = _post("/boat-cost", payload)
 
     return BoatCostResult(
         total_amount=Decimal(data["total"]["amount"]),
@@ -215,13 +433,7 @@ def calculate_gas_fills(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        with _get_client() as client:
-            response = client.post("/gas-fills", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = _post("/gas-fills", payload)
 
     return GasFillResult(
         cost_per_fill_amount=Decimal(data["cost_per_fill"]["amount"]),
@@ -274,13 +486,7 @@ def resolve_component_pricing(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        with _get_client() as client:
-            response = client.post("/resolve", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = _post("/resolve", payload)
 
     return ComponentPricingResult(
         charge_amount=Decimal(data["charge_amount"]),
@@ -317,13 +523,7 @@ def allocate_shared_costs(
         "currency": currency,
     }
 
-    try:
-        with _get_client() as client:
-            response = client.post("/allocate", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = _post("/allocate", payload)
 
     per_diver = Decimal(data["per_diver"]["amount"])
     amounts = [Decimal(m["amount"]) for m in data["amounts"]]
@@ -359,13 +559,7 @@ def calculate_totals(
         "equipment_rentals": equipment_rentals or [],
     }
 
-    try:
-        with _get_client() as client:
-            response = client.post("/totals", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = _post("/totals", payload)
 
     return {
         "shared_cost": Decimal(data["shared_cost"]["amount"]),
@@ -412,13 +606,7 @@ async def async_calculate_boat_cost(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        async with _get_async_client() as client:
-            response = await client.post("/boat-cost", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = await _apost("/boat-cost", payload)
 
     return BoatCostResult(
         total_amount=Decimal(data["total"]["amount"]),
@@ -454,13 +642,7 @@ async def async_calculate_gas_fills(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        async with _get_async_client() as client:
-            response = await client.post("/gas-fills", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = await _apost("/gas-fills", payload)
 
     return GasFillResult(
         cost_per_fill_amount=Decimal(data["cost_per_fill"]["amount"]),
@@ -498,13 +680,7 @@ async def async_resolve_component_pricing(
     if as_of:
         payload["as_of"] = as_of
 
-    try:
-        async with _get_async_client() as client:
-            response = await client.post("/resolve", json=payload)
-            data = _handle_response(response)
-    except httpx.RequestError as e:
-        logger.error("Rust pricing service unavailable: %s", e)
-        raise RustPricingUnavailable(str(e)) from e
+    data = await _apost("/resolve", payload)
 
     return ComponentPricingResult(
         charge_amount=Decimal(data["charge_amount"]),
@@ -11,6 +11,7 @@ from uuid import UUID
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from django_catalog.models import CatalogItem
@@ -21,6 +22,7 @@ from ..models import Excursion, Booking, DiverProfile
 from ..audit import (
     log_booking_event,
     log_diver_event,
+    log_excursion_events,
     Actions,
 )
 
@@ -28,6 +30,9 @@ from .calculators import (
     calculate_boat_cost,
     calculate_gas_fills,
     resolve_component_pricing,
+    load_pricing_context,
+    price_excursion,
+    PricingContext,
     allocate_shared_costs,
     round_money,
 )
@@ -57,6 +62,10 @@ User = get_user_model()
 # Using exact display_name match (not substring) for deterministic lookup
 CATALOG_DISPLAY_NAME_GUIDE_FEE = "Guide Fee"
 CATALOG_DISPLAY_NAME_PARK_FEE = "Park Entry Fee"
+QUOTE_COMPONENT_NAMES = (CATALOG_DISPLAY_NAME_GUIDE_FEE, CATALOG_DISPLAY_NAME_PARK_FEE)
+
+# Booking statuses that count toward an excursion's diver count
+COUNTED_BOOKING_STATUSES = ["confirmed", "checked_in"]
 
 # Gas type to O2/He fraction mapping
 GAS_FRACTIONS = {
@@ -124,7 +133,7 @@ def quote_excursion(
     if diver_count is None:
         # Count confirmed bookings
         diver_count = excursion.bookings.filter(
-            status__in=["confirmed", "checked_in"],
+            status__in=COUNTED_BOOKING_STATUSES,
             deleted_at__isnull=True,
         ).count()
 
@@ -134,108 +143,13 @@ def quote_excursion(
     gas_type = options.get("gas_type", "air")
     dives_count = excursion.excursion_type.dives_per_excursion if excursion.excursion_type else 2
 
-    # Calculate pricing
-    lines = []
-    warnings = []
-
-    currency = "MXN"  # Default currency
-
-    # 1. Boat cost (shared)
-    try:
-        boat_result = calculate_boat_cost(
-            dive_site=excursion.dive_site,
-            diver_count=diver_count,
-        )
-        currency = boat_result.total.currency
-        lines.append(PricingLineSnapshot(
-            key="boat_share",
-            label=f"Boat Charter - {excursion.dive_site.name if excursion.dive_site else 'Unknown'}",
-            allocation="shared",
-            shop_cost=MoneySnapshot.from_money(boat_result.total),
-            customer_charge=MoneySnapshot.from_money(boat_result.total),  # Boat cost passed through
-            refs={
-                "vendor_agreement_id": boat_result.agreement_id,
-                "dive_site_id": str(excursion.dive_site.pk) if excursion.dive_site else None,
-            },
-        ))
-    except MissingVendorAgreementError as e:
-        warnings.append(f"Boat pricing not configured: {e}")
-
-    # 2. Gas fills (per diver)
-    try:
-        fills_per_diver = dives_count
-        gas_result = calculate_gas_fills(
-            dive_shop=excursion.dive_shop,
-            gas_type=gas_type,
-            fills_count=fills_per_diver,
-            customer_charge_amount=Decimal("0"),  # Gas typically included
-        )
-        lines.append(PricingLineSnapshot(
-            key="gas_fill",
-            label=f"{gas_type.upper()} Fill x{fills_per_diver}",
-            allocation="per_diver",
-            shop_cost=MoneySnapshot.from_money(gas_result.total_cost),
-            customer_charge=MoneySnapshot.from_money(gas_result.total_charge),
-            refs={
-                "vendor_agreement_id": gas_result.agreement_id,
-            },
-        ))
-    except MissingVendorAgreementError as e:
-        warnings.append(f"Gas pricing not configured: {e}")
-
-    # 3. Guide fee (shared) - look up from catalog by exact display name
-    try:
-        guide_item = _get_catalog_item(CATALOG_DISPLAY_NAME_GUIDE_FEE)
-        pricing = resolve_component_pricing(
-            catalog_item=guide_item,
-            dive_shop=excursion.dive_shop,
-        )
-        lines.append(PricingLineSnapshot(
-            key="guide_fee",
-            label="Guide Fee",
-            allocation="shared",
-            shop_cost=MoneySnapshot.from_decimal(
-                pricing["cost_amount"] or pricing["charge_amount"],
-                pricing["cost_currency"],
-            ),
-            customer_charge=MoneySnapshot.from_decimal(
-                pricing["charge_amount"],
-                pricing["charge_currency"],
-            ),
-            refs={
-                "price_rule_id": pricing["price_rule_id"],
-                "catalog_item_id": str(guide_item.pk),
-            },
-        ))
-    except (MissingPriceError, MissingCatalogItemError) as e:
-        warnings.append(f"Guide fee not configured: {e}")
-
-    # 4. Park bracelet (per diver) - look up from catalog by exact display name
-    try:
-        park_item = _get_catalog_item(CATALOG_DISPLAY_NAME_PARK_FEE)
-        pricing = resolve_component_pricing(
-            catalog_item=park_item,
-            dive_shop=excursion.dive_shop,
-        )
-        lines.append(PricingLineSnapshot(
-            key="park_bracelet",
-            label="Park Entry Fee",
-            allocation="per_diver",
-            shop_cost=MoneySnapshot.from_decimal(
-                pricing["cost_amount"] or pricing["charge_amount"],
-                pricing["cost_currency"],
-            ),
-            customer_charge=MoneySnapshot.from_decimal(
-                pricing["charge_amount"],
-                pricing["charge_currency"],
-            ),
-            refs={
-                "price_rule_id": pricing["price_rule_id"],
-                "catalog_item_id": str(park_item.pk),
-            },
-        ))
-    except (MissingPriceError, MissingCatalogItemError) as e:
-        warnings.append(f"Park fee not configured: {e}")
+    # Calculate pricing - every line resolved in one pass
+    lines, warnings, currency = _build_excursion_lines(
+        excursion=excursion,
+        diver_count=diver_count,
+        gas_type=gas_type,
+        fills_per_diver=dives_count,
+    )
 
     # Calculate totals
     totals = _calculate_totals(lines, diver_count, currency)
@@ -271,6 +185,116 @@ def quote_excursion(
     return result
 
 
+def quote_excursions(
+    *,
+    excursion_ids: list[UUID],
+    actor_id: UUID,
+    options: dict | None = None,
+) -> dict[UUID, dict]:
+    """Generate pricing quotes for many excursions at once.
+
+    Bulk counterpart of quote_excursion() for calendar previews. Excursions
+    and their diver counts are loaded in one query, agreements, catalog
+    items and prices for all of them in three more (load_pricing_context),
+    and every quote is then computed in memory. Audit events are written
+    together at the end.
+
+    Args:
+        excursion_ids: Excursions to quote
+        actor_id: User requesting quotes
+        options: Same options as quote_excursion(), applied to every excursion
+
+    Returns:
+        dict: excursion_id -> quote dict (as returned by quote_excursion).
+            Excursions that cannot be quoted (e.g. no divers yet) map to
+            {"is_quote": True, "error": message, "warnings": []}.
+            Unknown ids are omitted.
+
+    Emits:
+        audit: excursion.quote.generated (one per successful quote)
+    """
+    options = options or {}
+    actor = User.objects.get(pk=actor_id)
+    gas_type = options.get("gas_type", "air")
+    diver_count_override = options.get("diver_count")
+
+    excursions = list(
+        Excursion.objects.filter(pk__in=excursion_ids)
+        .select_related("dive_site", "dive_shop", "excursion_type")
+        .annotate(
+            counted_divers=Count(
+                "bookings",
+                filter=Q(
+                    bookings__status__in=COUNTED_BOOKING_STATUSES,
+                    bookings__deleted_at__isnull=True,
+                ),
+            )
+        )
+    )
+
+    context = load_pricing_context(
+        dive_sites={e.dive_site_id: e.dive_site for e in excursions}.values(),
+        dive_shops={e.dive_shop_id: e.dive_shop for e in excursions}.values(),
+        component_names=QUOTE_COMPONENT_NAMES,
+    )
+
+    results: dict[UUID, dict] = {}
+    audit_entries = []
+
+    for excursion in excursions:
+        diver_count = diver_count_override
+        if diver_count is None:
+            diver_count = excursion.counted_divers
+        dives_count = excursion.excursion_type.dives_per_excursion if excursion.excursion_type else 2
+
+        try:
+            if diver_count <= 0:
+                raise ConfigurationError("Diver count must be positive for quote")
+
+            lines, warnings, currency = _build_excursion_lines(
+                excursion=excursion,
+                diver_count=diver_count,
+                gas_type=gas_type,
+                fills_per_diver=dives_count,
+                context=context,
+            )
+        except ConfigurationError as e:
+            results[excursion.pk] = {"is_quote": True, "error": str(e), "warnings": []}
+            continue
+
+        totals = _calculate_totals(lines, diver_count, currency)
+        snapshot = build_pricing_snapshot(
+            excursion=excursion,
+            lines=lines,
+            equipment_rentals=[],  # Quotes don't include equipment
+            totals=totals,
+            gas_type=gas_type,
+        )
+
+        result = snapshot.to_dict()
+        result["warnings"] = warnings
+        result["is_quote"] = True
+        results[excursion.pk] = result
+
+        audit_entries.append((
+            excursion,
+            {
+                "diver_count": diver_count,
+                "gas_type": gas_type,
+                "output_hash": snapshot.metadata.output_hash,
+                "warnings": warnings,
+            },
+        ))
+
+    log_excursion_events(
+        action=Actions.EXCURSION_QUOTE_GENERATED,
+        entries=audit_entries,
+        actor=actor,
+    )
+
+    return results
+
+
 @transaction.atomic
 def snapshot_booking_pricing(
     *,
@@ -326,7 +350,7 @@ def snapshot_booking_pricing(
 
     # Count divers for this excursion
     diver_count = excursion.bookings.filter(
-        status__in=["confirmed", "checked_in"],
+        status__in=COUNTED_BOOKING_STATUSES,
         deleted_at__isnull=True,
     ).count()
 
@@ -344,118 +368,20 @@ def snapshot_booking_pricing(
 
     gas_fractions = GAS_FRACTIONS[gas_type]
     dives_count = excursion.excursion_type.dives_per_excursion if excursion.excursion_type else 2
-    currency = "MXN"
-
-    lines = []
-    warnings = []
 
-    # 1. Boat cost (shared) - REQUIRED
-    try:
-        boat_result = calculate_boat_cost(
-            dive_site=excursion.dive_site,
-            diver_count=diver_count,
-        )
-        currency = boat_result.total.currency
-        lines.append(PricingLineSnapshot(
-            key="boat_share",
-            label=f"Boat Charter - {excursion.dive_site.name if excursion.dive_site else 'Unknown'}",
-            allocation="shared",
-            shop_cost=MoneySnapshot.from_money(boat_result.total),
-            customer_charge=MoneySnapshot.from_money(boat_result.total),
-            refs={
-                "vendor_agreement_id": boat_result.agreement_id,
-                "dive_site_id": str(excursion.dive_site.pk) if excursion.dive_site else None,
-            },
-        ))
-    except MissingVendorAgreementError as e:
-        if not allow_incomplete:
-            raise
-        warnings.append(f"Boat pricing not configured: {e}")
-
-    # 2. Gas fills (per diver) - REQUIRED
-    try:
-        fills_per_diver = dives_count
-        gas_result = calculate_gas_fills(
-            dive_shop=excursion.dive_shop,
-            gas_type=gas_type,
-            fills_count=fills_per_diver,
-            customer_charge_amount=Decimal("0"),
-        )
-        lines.append(PricingLineSnapshot(
-            key="gas_fill",
-            label=f"{gas_type.upper()} Fill x{fills_per_diver}",
-            allocation="per_diver",
-            shop_cost=MoneySnapshot.from_money(gas_result.total_cost),
-            customer_charge=MoneySnapshot.from_money(gas_result.total_charge),
-            refs={
-                "vendor_agreement_id": gas_result.agreement_id,
-                "gas_type": gas_type,
-                "gas_o2": gas_fractions["o2"],
-                "gas_he": gas_fractions["he"],
-            },
-        ))
-    except MissingVendorAgreementError as e:
-        if not allow_incomplete:
-            raise
-        warnings.append(f"Gas pricing not configured: {e}")
-
-    # 3. Guide fee (shared) - look up from catalog by exact display name
-    try:
-        guide_item = _get_catalog_item(CATALOG_DISPLAY_NAME_GUIDE_FEE)
-        pricing = resolve_component_pricing(
-            catalog_item=guide_item,
-            dive_shop=excursion.dive_shop,
-        )
-        lines.append(PricingLineSnapshot(
-            key="guide_fee",
-            label="Guide Fee",
-            allocation="shared",
-            shop_cost=MoneySnapshot.from_decimal(
-                pricing["cost_amount"] or pricing["charge_amount"],
-                pricing["cost_currency"],
-            ),
-            customer_charge=MoneySnapshot.from_decimal(
-                pricing["charge_amount"],
-                pricing["charge_currency"],
-            ),
-            refs={
-                "price_rule_id": pricing["price_rule_id"],
-                "catalog_item_id": str(guide_item.pk),
-            },
-        ))
-    except (MissingPriceError, MissingCatalogItemError) as e:
-        if not allow_incomplete:
-            raise
-        warnings.append(f"Guide fee not configured: {e}")
-
-    # 4. Park bracelet (per diver) - look up from catalog by exact display name
-    try:
-        park_item = _get_catalog_item(CATALOG_DISPLAY_NAME_PARK_FEE)
-        pricing = resolve_component_pricing(
-            catalog_item=park_item,
-            dive_shop=excursion.dive_shop,
-        )
-        lines.append(PricingLineSnapshot(
-            key="park_bracelet",
-            label="Park Entry Fee",
-            allocation="per_diver",
-            shop_cost=MoneySnapshot.from_decimal(
-                pricing["cost_amount"] or pricing["charge_amount"],
-                pricing["cost_currency"],
-            ),
-            customer_charge=MoneySnapshot.from_decimal(
-                pricing["charge_amount"],
-                pricing["charge_currency"],
-            ),
-            refs={
-                "price_rule_id": pricing["price_rule_id"],
-                "catalog_item_id": str(park_item.pk),
-            },
-        ))
-    except (MissingPriceError, MissingCatalogItemError) as e:
-        if not allow_incomplete:
-            raise
-        warnings.append(f"Park fee not configured: {e}")
+    # 1-4. Boat, gas, guide and park lines - resolved in one pass
+    lines, warnings, currency = _build_excursion_lines(
+        excursion=excursion,
+        diver_count=diver_count,
+        gas_type=gas_type,
+        fills_per_diver=dives_count,
+        strict=not allow_incomplete,
+        gas_refs={
+            "gas_type": gas_type,
+            "gas_o2": gas_fractions["o2"],
+            "gas_he": gas_fractions["he"],
+        },
+    )
 
     # 5. Equipment rentals for this diver
     equipment_rentals = []
@@ -694,6 +620,122 @@ def validate_pricing_configuration(
     return errors
 
 
+def _build_excursion_lines(
+    *,
+    excursion: Excursion,
+    diver_count: int,
+    gas_type: str,
+    fills_per_diver: int,
+    strict: bool = False,
+    gas_refs: dict | None = None,
+    context: PricingContext | None = None,
+) -> tuple[list[PricingLineSnapshot], list[str], str]:
+    """Build the boat, gas, guide fee and park fee lines for an excursion.
+
+    All four lines come from a single price_excursion() pass instead of one
+    agreement/price lookup per line.
+
+    Args:
+        excursion: Excursion with dive_site and dive_shop loaded
+        diver_count: Number of divers sharing the excursion
+        gas_type: Gas type for fills
+        fills_per_diver: Tank fills per diver
+        strict: If True, raise the first missing-configuration error
+        gas_refs: Extra refs recorded on the gas line
+        context: Optional preloaded PricingContext (see quote_excursions)
+
+    Returns:
+        Tuple of (lines, warnings, currency)
+
+    Raises:
+        MissingVendorAgreementError, MissingCatalogItemError, MissingPriceError:
+            Only when strict=True
+    """
+    pricing = price_excursion(
+        dive_site=excursion.dive_site,
+        dive_shop=excursion.dive_shop,
+        diver_count=diver_count,
+        gas_type=gas_type,
+        fills_count=fills_per_diver,
+        gas_charge_amount=Decimal("0"),  # Gas typically included
+        component_names=QUOTE_COMPONENT_NAMES,
+        context=context,
+    )
+
+    lines = []
+    warnings = []
+    currency = "MXN"  # Default currency
+
+    def missing(key: str, label: str) -> bool:
+        error = pricing.errors.get(key)
+        if error is None:
+            return False
+        if strict:
+            raise error
+        warnings.append(f"{label} not configured: {error}")
+        return True
+
+    # 1. Boat cost (shared) - passed through to customer
+    if not missing("boat", "Boat pricing"):
+        boat_result = pricing.boat
+        currency = boat_result.total.currency
+        lines.append(PricingLineSnapshot(
+            key="boat_share",
+            label=f"Boat Charter - {excursion.dive_site.name if excursion.dive_site else 'Unknown'}",
+            allocation="shared",
+            shop_cost=MoneySnapshot.from_money(boat_result.total),
+            customer_charge=MoneySnapshot.from_money(boat_result.total),
+            refs={
+                "vendor_agreement_id": boat_result.agreement_id,
+                "dive_site_id": str(excursion.dive_site.pk) if excursion.dive_site else None,
+            },
+        ))
+
+    # 2. Gas fills (per diver)
+    if not missing("gas", "Gas pricing"):
+        gas_result = pricing.gas
+        lines.append(PricingLineSnapshot(
+            key="gas_fill",
+            label=f"{gas_type.upper()} Fill x{fills_per_diver}",
+            allocation="per_diver",
+            shop_cost=MoneySnapshot.from_money(gas_result.total_cost),
+            customer_charge=MoneySnapshot.from_money(gas_result.total_charge),
+            refs={
+                "vendor_agreement_id": gas_result.agreement_id,
+                **(gas_refs or {}),
+            },
+        ))
+
+    # 3. Guide fee (shared), 4. Park bracelet (per diver)
+    components = [
+        (CATALOG_DISPLAY_NAME_GUIDE_FEE, "guide_fee", "Guide Fee", "shared", "Guide fee"),
+        (CATALOG_DISPLAY_NAME_PARK_FEE, "park_bracelet", "Park Entry Fee", "per_diver", "Park fee"),
+    ]
+    for display_name, key, label, allocation, warning_label in components:
+        if missing(display_name, warning_label):
+            continue
+        component = pricing.components[display_name]
+        lines.append(PricingLineSnapshot(
+            key=key,
+            label=label,
+            allocation=allocation,
+            shop_cost=MoneySnapshot.from_decimal(
+                component["cost_amount"] or component["charge_amount"],
+                component["cost_currency"],
+            ),
+            customer_charge=MoneySnapshot.from_decimal(
+                component["charge_amount"],
+                component["charge_currency"],
+            ),
+            refs={
+                "price_rule_id": component["price_rule_id"],
+                "catalog_item_id": component["catalog_item_id"],
+            },
+        ))
+
+    return lines, warnings, currency
+
+
 def _calculate_totals(
     lines: list[PricingLineSnapshot],
     diver_count: int,
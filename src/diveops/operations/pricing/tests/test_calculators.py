@@ -4,6 +4,7 @@ Tests cover:
 - Tiered boat cost calculation
 - Gas fill pricing
 - Component pricing resolution
+- Single-pass excursion pricing
 - Shared cost allocation and rounding
 """
 
@@ -20,6 +21,9 @@ from ..calculators import (
     resolve_component_pricing,
     allocate_shared_costs,
     round_money,
+    price_excursion,
+    PricingContext,
+    _select_price,
     BoatCostResult,
     GasFillResult,
 )
@@ -475,3 +479,148 @@ class TestGasPricingExamples:
         assert shop_cost == Decimal("200")
         assert customer_charge == Decimal("400")
         assert margin == Decimal("200")  # 100% markup
+
+
+class TestSelectPrice:
+    """Tests for in-memory price scope cascade."""
+
+    def _price(self, pk, organization_id=None, party_id=None, agreement_id=None):
+        price = MagicMock()
+        price.pk = pk
+        price.organization_id = organization_id
+        price.party_id = party_id
+        price.agreement_id = agreement_id
+        return price
+
+    def test_organization_price_beats_global(self):
+        """Org-scoped price wins over global when the org is given."""
+        shop = MagicMock(pk="shop")
+        prices = [self._price("global"), self._price("org", organization_id="shop")]
+
+        assert _select_price(prices, dive_shop=shop).pk == "org"
+
+    def test_falls_back_to_global(self):
+        """Global price is used when no scoped price matches."""
+        shop = MagicMock(pk="shop")
+        prices = [self._price("other-org", organization_id="other"), self._price("global")]
+
+        assert _select_price(prices, dive_shop=shop).pk == "global"
+
+    def test_candidate_order_breaks_ties(self):
+        """First candidate (highest priority) wins within a scope."""
+        prices = [self._price("high"), self._price("low")]
+
+        assert _select_price(prices).pk == "high"
+
+    def test_no_match_returns_none(self):
+        """No candidates means no price."""
+        assert _select_price([], dive_shop=MagicMock(pk="shop")) is None
+
+
+class TestPriceExcursion:
+    """Tests for single-pass excursion pricing."""
+
+    def _agreement(self, scope_type, terms):
+        agreement = MagicMock()
+        agreement.pk = f"{scope_type}-uuid"
+        agreement.scope_type = scope_type
+        agreement.scope_ref_id = "site"
+        agreement.party_a_id = "shop"
+        agreement.terms = terms
+        return agreement
+
+    def _run(self, agreements, **kwargs):
+        with patch("diveops.operations.pricing.calculators.ContentType") as mock_ct:
+            with patch("diveops.operations.pricing.calculators.Agreement") as mock_agreement_cls:
+                mock_ct.objects.get_for_model.return_value = MagicMock()
+                mock_qs = MagicMock()
+                mock_qs.as_of.return_value.__iter__.return_value = iter(agreements)
+                mock_agreement_cls.objects.filter.return_value = mock_qs
+
+                result = price_excursion(
+                    dive_site=MagicMock(pk="site"),
+                    dive_shop=MagicMock(pk="shop"),
+                    gas_type="air",
+                    fills_count=2,
+                    **kwargs,
+                )
+
+                # Both agreements come from a single query
+                assert mock_agreement_cls.objects.filter.call_count == 1
+                return result
+
+    def test_boat_and_gas_from_one_query(self):
+        """Boat and gas lines are priced from one agreement query."""
+        boat = self._agreement("vendor_pricing", {
+            "boat_charter": {"base_cost": "1800", "included_divers": 4, "currency": "MXN"},
+        })
+        gas = self._agreement("gas_vendor_pricing", {
+            "gas_fills": {"air": {"cost": "50", "charge": "100", "currency": "MXN"}},
+        })
+
+        result = self._run([boat, gas], diver_count=4)
+
+        assert result.errors == {}
+        assert result.boat.total.amount == Decimal("1800")
+        assert result.boat.agreement_id == "vendor_pricing-uuid"
+        assert result.gas.total_cost.amount == Decimal("100")
+        assert result.gas.total_charge.amount == Decimal("200")
+
+    def test_missing_agreements_reported_per_line(self):
+        """Missing agreements are reported, not raised."""
+        result = self._run([], diver_count=4)
+
+        assert result.boat is None
+        assert result.gas is None
+        assert isinstance(result.errors["boat"], MissingVendorAgreementError)
+        assert isinstance(result.errors["gas"], MissingVendorAgreementError)
+
+    def test_zero_divers_raises(self):
+        """Diver count must be positive."""
+        with pytest.raises(ConfigurationError):
+            price_excursion(
+                dive_site=MagicMock(),
+                dive_shop=MagicMock(),
+                diver_count=0,
+                gas_type="air",
+                fills_count=2,
+            )
+
+    @pytest.mark.django_db
+    def test_preloaded_context_prices_calendar_week(self, django_assert_num_queries):
+        """200 excursions price from one preloaded context without queries."""
+        agreements = {}
+        gas_agreements = {}
+        for i in range(20):
+            agreements[f"site-{i}"] = self._agreement("vendor_pricing", {
+                "boat_charter": {"base_cost": "1800", "included_divers": 4,
+                                 "overage_per_diver": "150", "currency": "MXN"},
+            })
+        gas_agreements["shop"] = self._agreement("gas_vendor_pricing", {
+            "gas_fills": {"air": {"cost": "50", "charge": "100", "currency": "MXN"}},
+        })
+        context = PricingContext(
+            boat_agreements=agreements,
+            gas_agreements=gas_agreements,
+            catalog_items={},
+            prices_by_item={},
+            as_of=None,
+        )
+
+        with patch("diveops.operations.pricing.calculators.Agreement") as mock_agreement_cls:
+            with django_assert_num_queries(0):
+                results = [
+                    price_excursion(
+                        dive_site=MagicMock(pk=f"site-{i % 20}"),
+                        dive_shop=MagicMock(pk="shop"),
+                        diver_count=6,
+                        gas_type="air",
+                        fills_count=2,
+                        context=context,
+                    )
+                    for i in range(200)
+                ]
+
+            mock_agreement_cls.objects.filter.assert_not_called()
+
+        assert all(r.boat.total.amount == Decimal("2100") for r in results)
@@ -0,0 +1,264 @@
+"""Tests for the Rust sidecar circuit breaker.
+
+Tests cover:
+- closed → open after consecutive failures
+- open → half-open after the reset timeout, with a single trial call
+- Success closing the circuit
+- Fallback counters
+- rust_client short-circuiting while open
+- 5xx responses and timeouts counted as failures
+- Health probes close only the probed service's breakers
+- Half-open trials skipped while the cached health says the service is down
+- The rust_circuits command reporting state, fallbacks and health
+"""
+
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import json
+from io import StringIO
+
+import httpx
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from .. import circuit_breaker
+from ..circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker, get_circuit_stats
+from ..rust_client import RustPricingError, RustPricingUnavailable
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Breaker state lives in the cache; isolate each test."""
+    cache.clear()
+    with patch.object(circuit_breaker, "_ensure_health_probe"):
+        yield
+    cache.clear()
+
+
+class TestCircuitBreakerStates:
+    """Tests for breaker state transitions."""
+
+    def test_starts_closed(self):
+        """A new breaker allows calls."""
+        breaker = CircuitBreaker("test/closed", failure_threshold=2, reset_timeout=30)
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request() is True
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures at the threshold open the circuit."""
+        breaker = CircuitBreaker("test/open", failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failures(self):
+        """A success between failures resets the count."""
+        breaker = CircuitBreaker("test/reset", failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        """After the reset timeout exactly one trial call is allowed."""
+        breaker = CircuitBreaker("test/half", failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        with patch.object(circuit_breaker.time, "time", return_value=circuit_breaker.time.time() + 31):
+            assert breaker.state == HALF_OPEN
+            assert breaker.allow_request() is True
+            assert breaker.allow_request() is False
+
+    def test_half_open_failure_reopens(self):
+        """A failed trial call re-opens the circuit."""
+        breaker = CircuitBreaker("test/reopen", failure_threshold=5, reset_timeout=30)
+        breaker.trip()
+
+        later = circuit_breaker.time.time() + 31
+        with patch.object(circuit_breaker.time, "time", return_value=later):
+            breaker.allow_request()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+
+    def test_state_shared_between_instances(self):
+        """Two breakers with the same name share state through the cache."""
+        CircuitBreaker("test/shared", failure_threshold=1).record_failure()
+
+        assert CircuitBreaker("test/shared").state == OPEN
+
+
+class TestFallbackCounters:
+    """Tests for fallback counters and stats."""
+
+    def test_stats_report_fallbacks(self):
+        """Fallbacks are counted per endpoint."""
+        breaker = get_breaker("test/stats")
+        breaker.record_fallback()
+        breaker.record_fallback()
+
+        stats = get_circuit_stats()["test/stats"]
+
+        assert stats["fallbacks"] == 2
+        assert stats["state"] == CLOSED
+
+
+class TestHealthProbe:
+    """Tests for per-service health probes."""
+
+    def test_probe_closes_only_its_service(self):
+        """A healthy pricing sidecar does not close the deco breaker."""
+        get_breaker("pricing/boat-cost").trip()
+        get_breaker("deco/validate").trip()
+
+        with patch.dict(circuit_breaker._health_checks, {"pricing": lambda: True, "deco": lambda: False}):
+            assert circuit_breaker.probe_health("pricing") is True
+            assert circuit_breaker.probe_health("deco") is False
+
+        assert get_breaker("pricing/boat-cost").state == CLOSED
+        assert get_breaker("deco/validate").state == OPEN
+        assert circuit_breaker.get_cached_health("pricing") is True
+        assert circuit_breaker.get_cached_health("deco") is False
+
+    def test_services_register_their_own_endpoints(self):
+        """Pricing and deco each probe their own /health endpoint."""
+        from ...planning import deco_runner
+        from .. import rust_client
+
+        assert circuit_breaker._health_checks["pricing"] is rust_client.check_health
+        assert circuit_breaker._health_checks["deco"] is deco_runner.check_health
+
+    def test_half_open_waits_for_healthy_probe(self):
+        """No trial call is spent on a service the last probe found down."""
+        breaker = get_breaker("deco/validate")
+        breaker.trip()
+
+        later = circuit_breaker.time.time() + 31
+        with patch.dict(circuit_breaker._health_checks, {"deco": lambda: False}), \
+                patch.object(circuit_breaker.time, "time", return_value=later):
+            circuit_breaker.probe_health("deco")
+            assert breaker.state == HALF_OPEN
+            assert breaker.allow_request() is False
+
+    def test_rust_circuits_command(self):
+        """The command reports every endpoint and cached service health."""
+        from ...management.commands.rust_circuits import Command
+
+        get_breaker("deco/validate").trip()
+        get_breaker("deco/validate").record_fallback()
+        with patch.dict(circuit_breaker._health_checks, {"pricing": lambda: True, "deco": lambda: False}):
+            out = StringIO()
+            call_command(Command(), "--probe", "--json", stdout=out)
+
+        report = json.loads(out.getvalue())
+        assert report["health"] == {"deco": False, "pricing": True}
+        assert report["circuits"]["deco/validate"] == {"state": OPEN, "failures": 0, "fallbacks": 1}
+        assert report["circuits"]["pricing/boat-cost"]["state"] == CLOSED
+
+    def test_unknown_service_not_probed(self):
+        """A service without a registered check is left alone."""
+        get_breaker("test/unprobed").trip()
+
+        assert circuit_breaker.probe_health("test") is None
+        assert get_breaker("test/unprobed").state == OPEN
+
+
+class TestRustClientShortCircuit:
+    """Tests for rust_client behavior while a circuit is open."""
+
+    @patch("diveops.operations.pricing.rust_client._get_client")
+    def test_open_circuit_skips_http_call(self, mock_get_client):
+        """No HTTP call is made while the endpoint's circuit is open."""
+        from ..rust_client import calculate_boat_cost
+
+        get_breaker("pricing/boat-cost").trip()
+
+        with pytest.raises(RustPricingUnavailable):
+            calculate_boat_cost(
+                dive_site_id=UUID("00000000-0000-0000-0000-000000000001"),
+                diver_count=4,
+            )
+
+        mock_get_client.assert_not_called()
+        assert get_breaker("pricing/boat-cost").stats()["fallbacks"] == 1
+
+    @patch("diveops.operations.pricing.rust_client._get_client")
+    def test_connection_errors_open_circuit(self, mock_get_client, settings):
+        """Repeated connection errors open the circuit."""
+        from ..rust_client import allocate_shared_costs
+
+        settings.RUST_CIRCUIT_FAILURE_THRESHOLD = 2
+        mock_client = MagicMock()
+        mock_client.post.side_effect = httpx.ConnectError("Connection refused")
+        mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_client)
+        mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
+
+        for _ in range(3):
+            with pytest.raises(RustPricingUnavailable):
+                allocate_shared_costs(shared_total=100, diver_count=3)
+
+        assert get_breaker("pricing/allocate").state == OPEN
+        assert mock_client.post.call_count == 2
+
+    def _mock_client(self, mock_get_client, **post):
+        mock_client = MagicMock()
+        mock_client.post = MagicMock(**post)
+        mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_client)
+        mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_client
+
+    @patch("diveops.operations.pricing.rust_client._get_client")
+    def test_server_errors_open_circuit(self, mock_get_client, settings):
+        """5xx responses count as failures instead of closing the circuit."""
+        from ..rust_client import allocate_shared_costs
+
+        settings.RUST_CIRCUIT_FAILURE_THRESHOLD = 2
+        self._mock_client(mock_get_client, return_value=httpx.Response(
+            500, json={"error_type": "configuration_error", "message": "Database error"},
+        ))
+
+        for _ in range(2):
+            with pytest.raises(RustPricingError):
+                allocate_shared_costs(shared_total=100, diver_count=3)
+
+        assert get_breaker("pricing/allocate").state == OPEN
+
+    @patch("diveops.operations.pricing.rust_client._get_client")
+    def test_timeouts_open_circuit(self, mock_get_client, settings):
+        """Read timeouts count as failures."""
+        from ..rust_client import allocate_shared_costs
+
+        settings.RUST_CIRCUIT_FAILURE_THRESHOLD = 2
+        self._mock_client(mock_get_client, side_effect=httpx.ReadTimeout("timed out"))
+
+        for _ in range(2):
+            with pytest.raises(RustPricingUnavailable):
+                allocate_shared_costs(shared_total=100, diver_count=3)
+
+        assert get_breaker("pricing/allocate").state == OPEN
+
+    @patch("diveops.operations.pricing.rust_client._get_client")
+    def test_client_error_does_not_close_circuit(self, mock_get_client, settings):
+        """Only a 2xx response closes a half-open circuit."""
+        from ..rust_client import allocate_shared_costs
+
+        settings.RUST_CIRCUIT_RESET_TIMEOUT = 0
+        breaker = get_breaker("pricing/allocate")
+        breaker.trip()
+        self._mock_client(mock_get_client, return_value=httpx.Response(
+            400, json={"error_type": "validation_error", "message": "diver_count must be positive"},
+        ))
+
+        with pytest.raises(RustPricingError):
+            allocate_shared_costs(shared_total=100, diver_count=3)
+
+        assert breaker.state == HALF_OPEN
@@ -0,0 +1,114 @@
+"""Tests for the pooled Rust pricing HTTP client.
+
+Tests cover:
+- One shared keep-alive client per process, fresh async client per call
+- Pool limits from settings
+- Lifecycle hooks (close, fork reset)
+- Connection-reuse counters
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from .. import rust_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    """Start every test with no pooled clients and zeroed counters."""
+    rust_client.close_clients()
+    rust_client.reset_pool_stats()
+    yield
+    rust_client.close_clients()
+
+
+class TestSyncClientPool:
+    """Tests for the shared sync client."""
+
+    def test_client_is_shared(self):
+        """Repeated calls return the same pooled client."""
+        assert rust_client.get_sync_client() is rust_client.get_sync_client()
+
+    def test_context_exit_keeps_client_open(self):
+        """Leaving the with-block must not close the pooled client."""
+        with rust_client._get_client() as client:
+            pass
+
+        assert not client.is_closed
+        assert rust_client.get_sync_client() is client
+
+    def test_close_clients_replaces_client(self):
+        """After close_clients a new client is created on next use."""
+        first = rust_client.get_sync_client()
+        rust_client.close_clients()
+
+        assert first.is_closed
+        assert rust_client.get_sync_client() is not first
+
+    def test_pool_limits_from_settings(self, settings):
+        """Pool limits are read from RUST_PRICING_POOL_* settings."""
+        settings.RUST_PRICING_POOL_MAX_CONNECTIONS = 7
+        settings.RUST_PRICING_POOL_MAX_KEEPALIVE = 3
+        settings.RUST_PRICING_KEEPALIVE_EXPIRY = 12.5
+
+        limits = rust_client._pool_limits()
+
+        assert limits.max_connections == 7
+        assert limits.max_keepalive_connections == 3
+        assert limits.keepalive_expiry == 12.5
+
+    def test_reset_after_fork_drops_inherited_client(self):
+        """A forked child starts with an empty pool."""
+        inherited = rust_client.get_sync_client()
+        rust_client._reset_after_fork()
+
+        assert rust_client.get_sync_client() is not inherited
+        inherited.close()
+
+
+class TestAsyncClient:
+    """Tests for the per-call async clients."""
+
+    def test_client_closed_after_call(self):
+        """Each async call gets its own client, closed when the call ends."""
+
+        async def run():
+            async with rust_client._get_async_client() as first:
+                pass
+            async with rust_client._get_async_client() as second:
+                pass
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is not second
+        assert first.is_closed
+        assert second.is_closed
+        assert rust_client.get_pool_stats()["clients_created"] == 2
+
+
+class TestPoolStats:
+    """Tests for connection-reuse counters."""
+
+    def test_requests_without_new_connections_count_as_reused(self):
+        """Requests served over kept-alive connections are counted as reused."""
+        request = httpx.Request("GET", "http://rust/health")
+        for _ in range(3):
+            rust_client._on_request(request)
+        rust_client._trace("connection.connect_tcp.started", {})
+        rust_client._trace("connection.connect_tcp.complete", {})
+
+        stats = rust_client.get_pool_stats()
+
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        assert request.extensions["trace"] is rust_client._trace
+
+    def test_empty_stats(self):
+        """Reuse ratio is zero before any request."""
+        stats = rust_client.get_pool_stats()
+
+        assert stats["requests"] == 0
+        assert stats["reuse_ratio"] == 0.0
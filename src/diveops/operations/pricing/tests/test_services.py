@@ -2,7 +2,7 @@
 
 Tests cover:
 - Ledger entry balance verification
-- Quote generation
+- Quote generation (single and bulk)
 - Booking snapshot immutability
 - Equipment rental duplicate detection
 - Strict/lenient snapshot modes
@@ -318,6 +318,71 @@ class TestAddEquipmentRentalValidation:
         assert error.catalog_item_id == "equipment-item-123"
 
 
+class TestQuoteExcursions:
+    """Tests for the bulk quote_excursions service."""
+
+    def _excursion(self, pk, divers):
+        excursion = MagicMock()
+        excursion.pk = pk
+        excursion.dive_site_id = f"site-{pk}"
+        excursion.dive_shop_id = "shop"
+        excursion.counted_divers = divers
+        excursion.excursion_type.dives_per_excursion = 2
+        return excursion
+
+    def _run(self, excursions, excursion_ids, options=None):
+        from ..services import quote_excursions
+
+        with patch("diveops.operations.pricing.services.User") as mock_user, \
+                patch("diveops.operations.pricing.services.Excursion") as mock_excursion_cls, \
+                patch("diveops.operations.pricing.services.load_pricing_context") as mock_load, \
+                patch("diveops.operations.pricing.services._build_excursion_lines") as mock_lines, \
+                patch("diveops.operations.pricing.services._calculate_totals"), \
+                patch("diveops.operations.pricing.services.build_pricing_snapshot") as mock_snapshot, \
+                patch("diveops.operations.pricing.services.log_excursion_events") as mock_log:
+            mock_user.objects.get.return_value = MagicMock()
+            mock_excursion_cls.objects.filter.return_value.select_related.return_value.annotate.return_value = excursions
+            mock_lines.return_value = ([], ["no guide fee"], "MXN")
+            mock_snapshot.return_value.to_dict.side_effect = lambda: {"totals": {}}
+
+            results = quote_excursions(excursion_ids=excursion_ids, actor_id="actor", options=options)
+
+            self.context_loads = mock_load.call_count
+            self.lines_calls = mock_lines.call_args_list
+            self.audit_calls = mock_log.call_args_list
+            return results
+
+    def test_quotes_share_one_context_and_one_audit_write(self):
+        """Every excursion is priced from one context; audit is written once."""
+        excursions = [self._excursion("a", 4), self._excursion("b", 6)]
+
+        results = self._run(excursions, ["a", "b", "unknown"])
+
+        assert set(results) == {"a", "b"}
+        assert results["a"] == {"totals": {}, "warnings": ["no guide fee"], "is_quote": True}
+        assert self.context_loads == 1
+        assert [c.kwargs["diver_count"] for c in self.lines_calls] == [4, 6]
+        assert len(self.audit_calls) == 1
+        assert len(self.audit_calls[0].kwargs["entries"]) == 2
+
+    def test_unquotable_excursion_maps_to_error(self):
+        """An excursion without divers gets an error entry, not an exception."""
+        results = self._run([self._excursion("a", 0), self._excursion("b", 2)], ["a", "b"])
+
+        assert results["a"]["error"] == "Diver count must be positive for quote"
+        assert results["a"]["is_quote"] is True
+        assert "error" not in results["b"]
+        assert len(self.audit_calls[0].kwargs["entries"]) == 1
+
+    def test_options_apply_to_every_excursion(self):
+        """diver_count and gas_type options override every excursion."""
+        self._run([self._excursion("a", 0), self._excursion("b", 9)], ["a", "b"],
+                  options={"diver_count": 3, "gas_type": "ean32"})
+
+        assert [c.kwargs["diver_count"] for c in self.lines_calls] == [3, 3]
+        assert all(c.kwargs["gas_type"] == "ean32" for c in self.lines_calls)
+
+
 class TestSnapshotStrictMode:
     """Tests for snapshot_booking_pricing strict/lenient modes."""
 
@@ -833,7 +833,10 @@ class PublicChatAPIView(View):
     def get(self, request):
         """Get conversation history for visitor.
 
-        Returns conversation ID and messages if visitor has an existing conversation.
+        Returns conversation ID and the latest messages if visitor has an
+        existing conversation. Accepts the keyset paging params `before`,
+        `after`, `since` and `limit` (see MessageQueryService.get_message_page)
+        to load older history or poll for new messages.
         """
         visitor_id = self.get_visitor_id(request)
 
@@ -863,7 +866,7 @@ class PublicChatAPIView(View):
             return self.add_cors_headers(response, request)
 
         # Find their conversation
-        from django_communication.models import Conversation, ConversationStatus, Message, MessageDirection
+        from django_communication.models import Conversation, ConversationStatus, MessageDirection
         from django.contrib.contenttypes.models import ContentType
 
         person_ct = ContentType.objects.get_for_model(Person)
@@ -873,13 +876,23 @@ class PublicChatAPIView(View):
             status=ConversationStatus.ACTIVE,
         ).first()
 
+        from .exceptions import InvalidCursor
+        from .services.chat_queries import MessageQueryService
+        from .services.pagination import page_params
+
         messages_data = []
+        page = None
         if conversation:
-            messages = Message.objects.filter(
-                conversation=conversation,
-            ).order_by("created_at")[:50]
+            try:
+                page = MessageQueryService.get_message_page(
+                    conversation=conversation,
+                    **page_params(request.GET, max_limit=MessageQueryService.DEFAULT_LIMIT_PUBLIC),
+                )
+            except InvalidCursor as e:
+                response = JsonResponse({"error": str(e)}, status=400)
+                return self.add_cors_headers(response, request)
 
-            for msg in messages:
+            for msg in page.messages:
                 messages_data.append({
                     "id": str(msg.pk),
                     "direction": msg.direction,
@@ -898,6 +911,9 @@ class PublicChatAPIView(View):
             },
             "conversation_id": str(conversation.pk) if conversation else None,
             "messages": messages_data,
+            "has_more": page.has_more if page else False,
+            "before_cursor": page.before_cursor if page else None,
+            "after_cursor": page.after_cursor if page else None,
         })
         response.set_cookie(
             self.VISITOR_COOKIE_NAME,
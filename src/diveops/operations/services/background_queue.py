@@ -0,0 +1,79 @@
+"""In-process background job queue drained by a daemon worker thread.
+
+Keeps slow side effects (FCM pushes, image renditions) off the request
+thread without a task broker. Each BackgroundQueue owns one worker thread,
+started on the first put(), that runs jobs one at a time with fresh
+database connections around each job.
+
+Jobs live only in the memory of the process that queued them: anything
+still queued when the process exits or restarts (deploy, gunicorn
+max_requests, OOM kill) is lost and not retried. Only queue work that is
+safe to drop or that can be regenerated later.
+
+Usage:
+    from diveops.operations.services.background_queue import BackgroundQueue
+
+    _queue = BackgroundQueue("media-renditions", generate_asset_renditions)
+
+    transaction.on_commit(lambda: _queue.put(asset.pk))
+"""
+
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundQueue:
+    """FIFO of jobs handled by one daemon thread per process.
+
+    Forked children (gunicorn workers) drop the parent's queue and start
+    their own worker on first use.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Any]):
+        self.name = name
+        self.handler = handler
+        self._queue: "queue.Queue[Any] | None" = None
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def put(self, job: Any) -> None:
+        """Queue a job for the worker thread."""
+        self._get_queue().put(job)
+
+    def join(self) -> None:
+        """Block until every queued job has been handled (tests, shutdown)."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def _get_queue(self) -> "queue.Queue[Any]":
+        if self._queue is None:
+            with self._lock:
+                if self._queue is None:
+                    self._queue = queue.Queue()
+                    threading.Thread(target=self._worker, args=(self._queue,), name=self.name, daemon=True).start()
+        return self._queue
+
+    def _worker(self, jobs: "queue.Queue[Any]") -> None:
+        """Handle queued jobs one at a time."""
+        from django.db import close_old_connections
+
+        while True:
+            job = jobs.get()
+            close_old_connections()
+            try:
+                self.handler(job)
+            except Exception as e:
+                logger.exception(f"Background job failed on {self.name}: {e}")
+            finally:
+                close_old_connections()
+                jobs.task_done()
+
+    def _reset_after_fork(self) -> None:
+        self._queue = None
+        self._lock = threading.Lock()
@@ -30,8 +30,21 @@ Usage:
         message=message_obj,
         rooms=["conversation"],
     )
+
+    # Many messages at once (bulk staff replies, system notices)
+    BroadcastService.broadcast_messages(
+        message_ids=[m.pk for m in messages],
+        rooms=["conversation", "lead"],
+        person_id=person.pk,
+    )
+
+All group_send calls of one broadcast run as a single async task: rooms
+are sent to concurrently (their Redis commands share the layer's
+connection pool instead of one event-loop hop and round trip per room),
+while messages within a room keep their order.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -88,14 +101,6 @@ class BroadcastService:
             created_at: ISO timestamp (optional, defaults to now)
         """
         try:
-            from asgiref.sync import async_to_sync
-            from channels.layers import get_channel_layer
-
-            channel_layer = get_channel_layer()
-            if not channel_layer:
-                logger.warning("No channel layer configured, skipping WebSocket broadcast")
-                return
-
             # Extract fields from Message object if provided
             if message:
                 message_id = message_id or str(message.pk)
@@ -106,40 +111,27 @@ class BroadcastService:
                 status = status or message.status
                 created_at = created_at or (message.created_at.isoformat() if message.created_at else None)
 
-                # Try to get sender name from sender_person
-                if not sender_name and message.sender_person:
-                    sender_name = f"{message.sender_person.first_name} {message.sender_person.last_name}".strip()
-
-            # Build message payload
-            payload = {
-                "type": "new_message",
-                "message_id": message_id,
-                "message": message_text,
-                "body": message_text,  # Alias for compatibility
-                "direction": direction,
-                "status": status,
-                "sender_person_id": sender_person_id,
-                "sender_name": sender_name,
-                "created_at": created_at or timezone.now().isoformat(),
-            }
-
-            # Default to conversation room if no rooms specified
-            if not rooms:
-                rooms = ["conversation"]
-
-            # Build room names and broadcast
-            room_names = []
-            for room_type in rooms:
-                if room_type == "conversation" and conversation_id:
-                    room_names.append(f"chat_conversation_{conversation_id}")
-                elif room_type == "lead" and person_id:
-                    room_names.append(f"chat_lead_{person_id}")
-                elif room_type == "visitor" and visitor_id:
-                    room_names.append(f"chat_visitor_{visitor_id}")
-
-            # Send to all rooms
-            for room_name in room_names:
-                async_to_sync(channel_layer.group_send)(room_name, payload)
+                # Sender name via a two-column lookup unless sender_person is loaded
+                if not sender_name:
+                    sender_name = _sender_name(message)
+
+            payload = _build_payload(
+                message_id=message_id,
+                message_text=message_text,
+                sender_person_id=sender_person_id,
+                sender_name=sender_name,
+                direction=direction,
+                status=status,
+                created_at=created_at,
+            )
+            room_names = _room_names(
+                rooms,
+                conversation_id=conversation_id,
+                person_id=person_id,
+                visitor_id=visitor_id,
+            )
+
+            _send_to_rooms({room_name: [payload] for room_name in room_names})
 
             logger.debug(
                 "Broadcast message via WebSocket",
@@ -154,6 +146,81 @@ class BroadcastService:
             # Never fail the main operation if broadcast fails
             logger.exception(f"Failed to broadcast message: {e}")
 
+    @staticmethod
+    def broadcast_messages(
+        message_ids: list,
+        *,
+        rooms: list[str] = None,
+        person_id: str = None,
+        visitor_id: str = None,
+    ) -> int:
+        """Broadcast many messages in one batch.
+
+        Message data is read with a single values() query (including the
+        sender's name), so no Message or Person instances are loaded. Each
+        message goes to the rooms of its own conversation plus the shared
+        lead/visitor rooms, in created_at order.
+
+        Args:
+            message_ids: Message UUIDs to broadcast
+            rooms: Room types as in broadcast_message() (default ["conversation"])
+            person_id: Person UUID (required for "lead" room)
+            visitor_id: Visitor cookie ID (required for "visitor" room)
+
+        Returns:
+            Number of group sends made (0 on failure)
+        """
+        try:
+            rows = (
+                Message.objects.filter(pk__in=message_ids)
+                .order_by("created_at")
+                .values(
+                    "pk",
+                    "body_text",
+                    "conversation_id",
+                    "sender_person_id",
+                    "sender_person__first_name",
+                    "sender_person__last_name",
+                    "direction",
+                    "status",
+                    "created_at",
+                )
+            )
+
+            sends: dict[str, list[dict]] = {}
+            for row in rows:
+                payload = _build_payload(
+                    message_id=str(row["pk"]),
+                    message_text=row["body_text"] or "",
+                    sender_person_id=str(row["sender_person_id"]) if row["sender_person_id"] else None,
+                    sender_name=(
+                        f"{row['sender_person__first_name'] or ''} {row['sender_person__last_name'] or ''}".strip()
+                    ),
+                    direction=row["direction"],
+                    status=row["status"],
+                    created_at=row["created_at"].isoformat() if row["created_at"] else None,
+                )
+                room_names = _room_names(
+                    rooms,
+                    conversation_id=str(row["conversation_id"]) if row["conversation_id"] else None,
+                    person_id=person_id,
+                    visitor_id=visitor_id,
+                )
+                for room_name in room_names:
+                    sends.setdefault(room_name, []).append(payload)
+
+            count = _send_to_rooms(sends)
+            logger.debug(
+                "Broadcast message batch via WebSocket",
+                extra={"rooms": list(sends), "messages": len(message_ids), "sends": count},
+            )
+            return count
+
+        except Exception as e:
+            # Never fail the main operation if broadcast fails
+            logger.exception(f"Failed to broadcast message batch: {e}")
+            return 0
+
     @staticmethod
     def broadcast_on_commit(
         message: Optional[Message] = None,
@@ -189,8 +256,8 @@ class BroadcastService:
             kwargs.setdefault("status", message.status)
             kwargs.setdefault("created_at", message.created_at.isoformat() if message.created_at else None)
 
-            if message.sender_person and not kwargs.get("sender_name"):
-                kwargs["sender_name"] = f"{message.sender_person.first_name} {message.sender_person.last_name}".strip()
+            if not kwargs.get("sender_name"):
+                kwargs["sender_name"] = _sender_name(message)
 
         def do_broadcast():
             BroadcastService.broadcast_message(**kwargs)
@@ -255,6 +322,92 @@ class BroadcastService:
         )
 
 
+def _sender_name(message: Message) -> str:
+    """Sender display name, without loading a full Person if not cached."""
+    if not message.sender_person_id:
+        return ""
+    if Message.sender_person.is_cached(message):
+        first_name, last_name = message.sender_person.first_name, message.sender_person.last_name
+    else:
+        person_model = Message._meta.get_field("sender_person").related_model
+        names = person_model.objects.filter(pk=message.sender_person_id).values_list("first_name", "last_name").first()
+        if names is None:
+            return ""
+        first_name, last_name = names
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+def _build_payload(
+    *,
+    message_id: str = None,
+    message_text: str = "",
+    sender_person_id: str = None,
+    sender_name: str = "",
+    direction: str = None,
+    status: str = None,
+    created_at: str = None,
+) -> dict:
+    """Build the new_message event sent to chat rooms."""
+    return {
+        "type": "new_message",
+        "message_id": message_id,
+        "message": message_text,
+        "body": message_text,  # Alias for compatibility
+        "direction": direction,
+        "status": status,
+        "sender_person_id": sender_person_id,
+        "sender_name": sender_name,
+        "created_at": created_at or timezone.now().isoformat(),
+    }
+
+
+def _room_names(
+    rooms: list[str] | None,
+    *,
+    conversation_id: str = None,
+    person_id: str = None,
+    visitor_id: str = None,
+) -> list[str]:
+    """Resolve room types to channel group names (default ["conversation"])."""
+    room_names = []
+    for room_type in rooms or ["conversation"]:
+        if room_type == "conversation" and conversation_id:
+            room_names.append(f"chat_conversation_{conversation_id}")
+        elif room_type == "lead" and person_id:
+            room_names.append(f"chat_lead_{person_id}")
+        elif room_type == "visitor" and visitor_id:
+            room_names.append(f"chat_visitor_{visitor_id}")
+    return room_names
+
+
+def _send_to_rooms(sends: dict[str, list[dict]]) -> int:
+    """Send payloads to rooms in one async task.
+
+    Rooms are sent to concurrently; payloads for the same room are sent in
+    order. Returns the number of group sends (0 without a channel layer).
+    """
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    if not sends:
+        return 0
+
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        logger.warning("No channel layer configured, skipping WebSocket broadcast")
+        return 0
+
+    async def send_room(room_name, payloads):
+        for payload in payloads:
+            await channel_layer.group_send(room_name, payload)
+
+    async def send_all():
+        await asyncio.gather(*(send_room(room_name, payloads) for room_name, payloads in sends.items()))
+
+    async_to_sync(send_all)()
+    return sum(len(payloads) for payloads in sends.values())
+
+
 # Module-level compatibility exports
 def broadcast_conversation_message(*args, **kwargs):
     """Deprecated: Use BroadcastService.broadcast_message() instead."""
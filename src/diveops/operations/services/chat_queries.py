@@ -6,14 +6,17 @@ these instead of writing their own queries.
 
 The key optimization is using Subquery annotations to fetch related data
 (last message, unread counts, etc.) in a single query instead of looping.
+With CHAT_SUMMARY_ENABLED the inbox lists instead join the denormalized
+ConversationSummary table (see services.chat_summary), which avoids the
+per-row subqueries entirely.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import BooleanField, Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Count, F, OuterRef, Q, Subquery, Value, When
 from django.db.models.functions import Coalesce, Concat
 from django.utils import timezone
 
@@ -27,6 +30,25 @@ from django_communication.models import (
 )
 from django_parties.models import Person
 
+from .chat_summary import UNREAD_STATUSES, ConversationSummaryService, summaries_enabled
+from .pagination import MAX_ID, decode_cursor, encode_cursor, keyset_filter
+
+
+def _annotate_from_summary(qs: models.QuerySet) -> models.QuerySet:
+    """Annotate inbox fields from ConversationSummary (one LEFT JOIN).
+
+    Uses the same annotation names as the Subquery path so callers are
+    unaffected. Conversations without a summary row get empty values.
+    """
+    return qs.annotate(
+        last_message_preview=F("inbox_summary__last_message_preview"),
+        last_message_at_annotated=F("inbox_summary__last_message_at"),
+        last_message_direction=F("inbox_summary__last_message_direction"),
+        last_message_sender_id=F("inbox_summary__last_message_sender_id"),
+        unread_count=Coalesce(F("inbox_summary__unread_inbound_count"), Value(0)),
+        needs_reply_annotated=Coalesce(F("inbox_summary__needs_reply"), Value(False)),
+    )
+
 
 class ConversationQueryService:
     """Optimized conversation list queries.
@@ -102,27 +124,30 @@ class ConversationQueryService:
             # Default: exclude closed
             qs = qs.exclude(status=ConversationStatus.CLOSED)
 
-        # Subquery for last message fields
-        latest_message = Message.objects.filter(
-            conversation=OuterRef("pk")
-        ).order_by("-created_at")
-
-        qs = qs.annotate(
-            last_message_preview=Subquery(latest_message.values("body_text")[:1]),
-            last_message_at_annotated=Subquery(latest_message.values("created_at")[:1]),
-            last_message_direction=Subquery(latest_message.values("direction")[:1]),
-        )
+        if summaries_enabled():
+            qs = _annotate_from_summary(qs)
+        else:
+            # Subquery for last message fields
+            latest_message = Message.objects.filter(
+                conversation=OuterRef("pk")
+            ).order_by("-created_at")
+
+            qs = qs.annotate(
+                last_message_preview=Subquery(latest_message.values("body_text")[:1]),
+                last_message_at_annotated=Subquery(latest_message.values("created_at")[:1]),
+                last_message_direction=Subquery(latest_message.values("direction")[:1]),
+            )
 
-        # Annotate needs_reply_annotated (last message was inbound)
-        # Use Case/When to create a proper boolean, and use different name
-        # to avoid conflict with Conversation.needs_reply property
-        qs = qs.annotate(
-            needs_reply_annotated=Case(
-                When(last_message_direction=MessageDirection.INBOUND, then=Value(True)),
-                default=Value(False),
-                output_field=BooleanField(),
+            # Annotate needs_reply_annotated (last message was inbound)
+            # Use Case/When to create a proper boolean, and use different name
+            # to avoid conflict with Conversation.needs_reply property
+            qs = qs.annotate(
+                needs_reply_annotated=Case(
+                    When(last_message_direction=MessageDirection.INBOUND, then=Value(True)),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                )
             )
-        )
 
         # Order by most recent activity
         qs = qs.order_by("-last_message_at_annotated", "-updated_at")
@@ -191,17 +216,25 @@ class ConversationQueryService:
     def list_for_mobile(
         user: "User",
         limit: int = 100,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
     ) -> models.QuerySet:
         """Get conversations for mobile app (staff).
 
-        Returns conversations with unread counts and needs-reply indicators.
+        Returns conversations with unread counts and needs-reply indicators,
+        newest activity first, keyset-paginated on (last message time, id).
 
         Args:
             user: Staff user
             limit: Maximum conversations to return
+            cursor: Only conversations after this cursor (see conversation_cursor)
+            since: Only conversations with activity after this timestamp
 
         Returns:
             QuerySet of Conversation with annotations
+
+        Raises:
+            InvalidCursor: If cursor is malformed
         """
         person_ct = ContentType.objects.get_for_model(Person)
 
@@ -211,59 +244,94 @@ class ConversationQueryService:
             deleted_at__isnull=True,
         ).exclude(status=ConversationStatus.CLOSED)
 
-        # Subquery for last message
-        latest_message = Message.objects.filter(
-            conversation=OuterRef("pk")
-        ).order_by("-created_at")
-
-        qs = qs.annotate(
-            last_message_preview=Subquery(latest_message.values("body_text")[:1]),
-            last_message_at_annotated=Subquery(latest_message.values("created_at")[:1]),
-            last_message_direction=Subquery(latest_message.values("direction")[:1]),
-            last_message_sender_id=Subquery(latest_message.values("sender_person_id")[:1]),
-        )
+        if summaries_enabled():
+            qs = _annotate_from_summary(qs)
+        else:
+            # Subquery for last message
+            latest_message = Message.objects.filter(
+                conversation=OuterRef("pk")
+            ).order_by("-created_at")
+
+            qs = qs.annotate(
+                last_message_preview=Subquery(latest_message.values("body_text")[:1]),
+                last_message_at_annotated=Subquery(latest_message.values("created_at")[:1]),
+                last_message_direction=Subquery(latest_message.values("direction")[:1]),
+                last_message_sender_id=Subquery(latest_message.values("sender_person_id")[:1]),
+            )
 
-        # Count unread inbound messages
-        unread_messages = Message.objects.filter(
-            conversation=OuterRef("pk"),
-            direction=MessageDirection.INBOUND,
-            status__in=[
-                MessageStatus.QUEUED,
-                MessageStatus.SENDING,
-                MessageStatus.SENT,
-                MessageStatus.DELIVERED,
-            ],
-        )
+            # Count unread inbound messages
+            unread_messages = Message.objects.filter(
+                conversation=OuterRef("pk"),
+                direction=MessageDirection.INBOUND,
+                status__in=[
+                    MessageStatus.QUEUED,
+                    MessageStatus.SENDING,
+                    MessageStatus.SENT,
+                    MessageStatus.DELIVERED,
+                ],
+            )
 
-        qs = qs.annotate(
-            unread_count=Coalesce(
-                Subquery(
-                    unread_messages.values("conversation").annotate(
-                        cnt=Count("id")
-                    ).values("cnt")[:1]
-                ),
-                Value(0),
+            qs = qs.annotate(
+                unread_count=Coalesce(
+                    Subquery(
+                        unread_messages.values("conversation").annotate(
+                            cnt=Count("id")
+                        ).values("cnt")[:1]
+                    ),
+                    Value(0),
+                )
             )
-        )
 
-        # Needs reply: last message was inbound
-        # Use Case/When and different name to avoid conflict with property
-        qs = qs.annotate(
-            needs_reply_annotated=Case(
-                When(last_message_direction=MessageDirection.INBOUND, then=Value(True)),
-                default=Value(False),
-                output_field=BooleanField(),
+            # Needs reply: last message was inbound
+            # Use Case/When and different name to avoid conflict with property
+            qs = qs.annotate(
+                needs_reply_annotated=Case(
+                    When(last_message_direction=MessageDirection.INBOUND, then=Value(True)),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                )
             )
-        )
 
-        # Order by most recent
-        qs = qs.order_by("-last_message_at_annotated", "-updated_at")
+        if since:
+            changed = Q(last_message_at_annotated__gt=since) | Q(updated_at__gt=since)
+            if summaries_enabled():
+                # Read marks touch only the summary row
+                changed |= Q(inbox_summary__updated_at__gt=since)
+            qs = qs.filter(changed)
+
+        if cursor:
+            last_message_at, pk = decode_cursor(cursor)
+            qs = qs.filter(keyset_filter("last_message_at_annotated", last_message_at, pk, descending=True))
+
+        # Order by most recent, id as tie-breaker so cursors are stable
+        qs = qs.order_by(F("last_message_at_annotated").desc(nulls_last=True), "-pk")
 
         if limit:
             qs = qs[:limit]
 
         return qs
 
+    @staticmethod
+    def conversation_cursor(conversation: Conversation) -> str:
+        """Cursor for continuing list_for_mobile after this conversation."""
+        return encode_cursor(conversation.last_message_at_annotated, conversation.pk)
+
+
+class MessagePage(NamedTuple):
+    """One page of messages from MessageQueryService.get_message_page.
+
+    Attributes:
+        messages: Messages in chronological order
+        has_more: More messages exist beyond this page in the paging direction
+        before_cursor: Pass as `before` to load older messages
+        after_cursor: Pass as `after` to poll for newer messages
+    """
+
+    messages: list
+    has_more: bool
+    before_cursor: Optional[str]
+    after_cursor: Optional[str]
+
 
 class MessageQueryService:
     """Optimized message retrieval queries.
@@ -278,6 +346,11 @@ class MessageQueryService:
             before=cursor_timestamp,
         )
 
+        # Keyset pages: newest first page, then older / newer via cursors
+        page = MessageQueryService.get_message_page(conversation=conv, limit=50)
+        older = MessageQueryService.get_message_page(conversation=conv, before=page.before_cursor)
+        newer = MessageQueryService.get_message_page(conversation=conv, after=page.after_cursor)
+
         # Get messages for a lead (by person_id)
         messages = MessageQueryService.get_messages_for_lead(
             person_id=person_id,
@@ -344,6 +417,72 @@ class MessageQueryService:
 
         return qs
 
+    @staticmethod
+    def get_message_page(
+        conversation: Conversation,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> MessagePage:
+        """Get one page of messages using keyset pagination on (created_at, id).
+
+        Without `after` or `since` this pages backwards: the newest `limit`
+        messages, or those older than `before`. With `after` (a cursor) or
+        `since` (a timestamp) it pages forwards from that point, which is
+        how clients poll for new messages without re-downloading the thread.
+
+        Args:
+            conversation: Conversation to get messages from
+            limit: Maximum messages to return
+            before: Cursor; only messages older than it
+            after: Cursor; only messages newer than it
+            since: Only messages created after this timestamp
+
+        Returns:
+            MessagePage with messages in chronological order
+
+        Raises:
+            InvalidCursor: If a cursor is malformed
+        """
+        qs = Message.objects.filter(
+            conversation=conversation
+        ).select_related("sender_person", "template")
+
+        forward = bool(after or since)
+        if before:
+            qs = qs.filter(keyset_filter("created_at", *decode_cursor(before), descending=True))
+        if after:
+            qs = qs.filter(keyset_filter("created_at", *decode_cursor(after), descending=False))
+        if since:
+            qs = qs.filter(created_at__gt=since)
+
+        if forward:
+            rows = list(qs.order_by("created_at", "pk")[: limit + 1])
+            has_more = len(rows) > limit
+            messages = rows[:limit]
+        else:
+            rows = list(qs.order_by("-created_at", "-pk")[: limit + 1])
+            has_more = len(rows) > limit
+            messages = rows[:limit][::-1]
+
+        if messages:
+            before_cursor = encode_cursor(messages[0].created_at, messages[0].pk)
+            after_cursor = encode_cursor(messages[-1].created_at, messages[-1].pk)
+        else:
+            # Nothing new: keep the client's position
+            before_cursor = before
+            after_cursor = after
+            if after_cursor is None and since is not None:
+                after_cursor = encode_cursor(since, MAX_ID)
+
+        return MessagePage(
+            messages=messages,
+            has_more=has_more,
+            before_cursor=before_cursor,
+            after_cursor=after_cursor,
+        )
+
     @staticmethod
     def get_messages_for_lead(
         person_id: str,
@@ -391,16 +530,16 @@ class MessageQueryService:
         Returns:
             Number of messages updated
         """
-        return Message.objects.filter(
-            conversation=conversation,
-            direction=MessageDirection.INBOUND,
-            status__in=[
-                MessageStatus.QUEUED,
-                MessageStatus.SENDING,
-                MessageStatus.SENT,
-                MessageStatus.DELIVERED,
-            ],
-        ).update(
-            status=MessageStatus.READ,
-            read_at=timezone.now(),
-        )
+        with transaction.atomic():
+            updated = Message.objects.filter(
+                conversation=conversation,
+                direction=MessageDirection.INBOUND,
+                status__in=UNREAD_STATUSES,
+            ).update(
+                status=MessageStatus.READ,
+                read_at=timezone.now(),
+            )
+            # Bulk update bypasses Message signals; keep the inbox summary in step
+            if updated and summaries_enabled():
+                transaction.on_commit(lambda: ConversationSummaryService.refresh([conversation.pk]))
+        return updated
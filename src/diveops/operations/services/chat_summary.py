@@ -0,0 +1,155 @@
+"""Conversation inbox summary maintenance.
+
+Keeps ConversationSummary rows (last message, unread inbound count,
+needs_reply) in step with Message. While CHAT_SUMMARY_ENABLED is set,
+summaries are refreshed once the change that affects them commits, so
+each refresh reads every committed message, including those of
+concurrent transactions:
+
+- Message saves and deletes (signals in operations.signals)
+- Bulk read marks (MessageQueryService.mark_inbound_read)
+
+Inbox queries read the summary table instead of correlated subqueries
+when CHAT_SUMMARY_ENABLED is set (see ConversationQueryService). With it
+off nothing is maintained; run backfill_conversation_summaries before
+turning it on.
+
+Usage:
+    from diveops.operations.services.chat_summary import ConversationSummaryService
+
+    ConversationSummaryService.refresh([conversation.pk])
+    ConversationSummaryService.backfill(batch_size=500)
+"""
+
+import logging
+
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from django_communication.models import Conversation, Message, MessageDirection, MessageStatus
+
+from ..models import ConversationSummary
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_LENGTH = 200
+
+# Inbound messages in these states count as unread
+UNREAD_STATUSES = [
+    MessageStatus.QUEUED,
+    MessageStatus.SENDING,
+    MessageStatus.SENT,
+    MessageStatus.DELIVERED,
+]
+
+SUMMARY_FIELDS = [
+    "last_message_id",
+    "last_message_preview",
+    "last_message_at",
+    "last_message_direction",
+    "last_message_sender_id",
+    "unread_inbound_count",
+    "needs_reply",
+]
+
+
+def summaries_enabled() -> bool:
+    """Whether inbox queries read from ConversationSummary."""
+    return getattr(settings, "CHAT_SUMMARY_ENABLED", False)
+
+
+class ConversationSummaryService:
+    """Build and maintain ConversationSummary rows."""
+
+    @staticmethod
+    def refresh(conversation_ids) -> int:
+        """Recompute summaries for the given conversations.
+
+        One query reads the last message and unread count of every listed
+        conversation, one upsert writes them.
+
+        Args:
+            conversation_ids: Conversation primary keys
+
+        Returns:
+            Number of summaries written
+        """
+        conversation_ids = [pk for pk in set(conversation_ids) if pk is not None]
+        if not conversation_ids:
+            return 0
+
+        latest_message = Message.objects.filter(conversation=OuterRef("pk")).order_by("-created_at")
+        unread_messages = Message.objects.filter(
+            conversation=OuterRef("pk"),
+            direction=MessageDirection.INBOUND,
+            status__in=UNREAD_STATUSES,
+        )
+
+        rows = (
+            Conversation.objects.filter(pk__in=conversation_ids)
+            .annotate(
+                summary_last_id=Subquery(latest_message.values("pk")[:1]),
+                summary_last_body=Subquery(latest_message.values("body_text")[:1]),
+                summary_last_at=Subquery(latest_message.values("created_at")[:1]),
+                summary_last_direction=Subquery(latest_message.values("direction")[:1]),
+                summary_last_sender=Subquery(latest_message.values("sender_person_id")[:1]),
+                summary_unread=Coalesce(
+                    Subquery(
+                        unread_messages.values("conversation").annotate(cnt=Count("id")).values("cnt")[:1]
+                    ),
+                    Value(0),
+                ),
+            )
+            .values(
+                "pk",
+                "summary_last_id",
+                "summary_last_body",
+                "summary_last_at",
+                "summary_last_direction",
+                "summary_last_sender",
+                "summary_unread",
+            )
+        )
+
+        summaries = [
+            ConversationSummary(
+                conversation_id=row["pk"],
+                last_message_id=row["summary_last_id"],
+                last_message_preview=(row["summary_last_body"] or "")[:PREVIEW_LENGTH],
+                last_message_at=row["summary_last_at"],
+                last_message_direction=row["summary_last_direction"] or "",
+                last_message_sender_id=row["summary_last_sender"],
+                unread_inbound_count=row["summary_unread"],
+                needs_reply=row["summary_last_direction"] == MessageDirection.INBOUND,
+            )
+            for row in rows
+        ]
+
+        ConversationSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["conversation"],
+            update_fields=[*SUMMARY_FIELDS, "updated_at"],
+        )
+        return len(summaries)
+
+    @staticmethod
+    def backfill(batch_size: int = 500) -> int:
+        """Rebuild summaries for every conversation, in batches.
+
+        Returns:
+            Number of summaries written
+        """
+        total = 0
+        last_pk = None
+        while True:
+            qs = Conversation.objects.order_by("pk")
+            if last_pk is not None:
+                qs = qs.filter(pk__gt=last_pk)
+            batch = list(qs.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            total += ConversationSummaryService.refresh(batch)
+            last_pk = batch[-1]
+        return total
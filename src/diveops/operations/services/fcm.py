@@ -1,12 +1,27 @@
-"""Firebase Cloud Messaging (FCM) service for push notifications."""
+"""Firebase Cloud Messaging (FCM) service for push notifications.
+
+Pushes to many devices are sent as FCM multicasts (up to 500 tokens per
+call) and device state is written back in bulk. Staff chat notifications
+are queued and sent by a background worker thread, off the request.
+
+The sender is pluggable (FCM_PUSH_SENDER); StubSender stands in for
+Firebase in tests and local development.
+"""
 
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .background_queue import BackgroundQueue
 
 logger = logging.getLogger(__name__)
 
+# FCM multicast limit
+MULTICAST_BATCH_SIZE = 500
+
 # Firebase Admin SDK (lazy loaded)
 _firebase_app = None
 
@@ -80,35 +95,8 @@ def send_push_notification(
     try:
         from firebase_admin import messaging
 
-        # Build Android-specific config
-        android_config = messaging.AndroidConfig(
-            priority="high",
-            notification=messaging.AndroidNotification(
-                title=title,
-                body=body,
-                sound=sound,
-                click_action=click_action,
-                # Make notification appear even when app is in foreground
-                default_sound=True,
-                default_vibrate_timings=True,
-                notification_priority="PRIORITY_HIGH",
-            ),
-        )
-
-        # Build iOS-specific config (APNS)
-        apns_config = messaging.APNSConfig(
-            payload=messaging.APNSPayload(
-                aps=messaging.Aps(
-                    alert=messaging.ApsAlert(
-                        title=title,
-                        body=body,
-                    ),
-                    sound=sound,
-                    badge=badge,
-                    content_available=True,
-                ),
-            ),
-        )
+        android_config = _android_config(messaging, title, body, sound, click_action)
+        apns_config = _apns_config(messaging, title, body, sound, badge)
 
         # Build the message
         message = messaging.Message(
@@ -138,17 +126,144 @@ def send_push_notification(
         return False
 
 
-def send_push_to_user(
-    user,
+def _android_config(messaging, title, body, sound, click_action=None):
+    """Android-specific notification config."""
+    return messaging.AndroidConfig(
+        priority="high",
+        notification=messaging.AndroidNotification(
+            title=title,
+            body=body,
+            sound=sound,
+            click_action=click_action,
+            # Make notification appear even when app is in foreground
+            default_sound=True,
+            default_vibrate_timings=True,
+            notification_priority="PRIORITY_HIGH",
+        ),
+    )
+
+
+def _apns_config(messaging, title, body, sound, badge=None):
+    """iOS-specific notification config (APNS)."""
+    return messaging.APNSConfig(
+        payload=messaging.APNSPayload(
+            aps=messaging.Aps(
+                alert=messaging.ApsAlert(
+                    title=title,
+                    body=body,
+                ),
+                sound=sound,
+                badge=badge,
+                content_available=True,
+            ),
+        ),
+    )
+
+
+class PushResult(NamedTuple):
+    """Outcome of one device in a multicast send."""
+
+    success: bool
+    # Token is invalid or unregistered; the device should be deactivated
+    permanent: bool = False
+
+
+class FirebaseSender:
+    """Send multicast pushes through the Firebase Admin SDK."""
+
+    def send_multicast(
+        self,
+        tokens: list[str],
+        title: str,
+        body: str,
+        data: Optional[dict] = None,
+        sound: str = "default",
+    ) -> list[PushResult]:
+        """Send one notification to up to MULTICAST_BATCH_SIZE tokens.
+
+        Returns:
+            One PushResult per token, in order
+        """
+        app = _get_firebase_app()
+        if not app:
+            logger.warning("Firebase not initialized, skipping push notification")
+            return [PushResult(False) for _ in tokens]
+
+        from firebase_admin import messaging
+
+        message = messaging.MulticastMessage(
+            tokens=tokens,
+            notification=messaging.Notification(title=title, body=body),
+            data=data or {},
+            android=_android_config(messaging, title, body, sound),
+            apns=_apns_config(messaging, title, body, sound),
+        )
+        response = messaging.send_each_for_multicast(message, app=app)
+
+        results = []
+        for send_response in response.responses:
+            if send_response.success:
+                results.append(PushResult(True))
+            else:
+                results.append(PushResult(False, _is_permanent_failure(send_response.exception)))
+        return results
+
+
+class StubSender:
+    """Local stand-in for Firebase (tests, development).
+
+    Records every multicast in `sent`; tokens in `fail_tokens` fail
+    permanently.
+    """
+
+    sent: list[dict] = []
+    fail_tokens: set[str] = set()
+
+    def send_multicast(self, tokens, title, body, data=None, sound="default") -> list[PushResult]:
+        StubSender.sent.append({"tokens": list(tokens), "title": title, "body": body, "data": data or {}})
+        return [PushResult(token not in StubSender.fail_tokens, token in StubSender.fail_tokens) for token in tokens]
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.sent = []
+        cls.fail_tokens = set()
+
+
+def get_push_sender():
+    """Return the configured sender (FCM_PUSH_SENDER, default FirebaseSender)."""
+    path = getattr(settings, "FCM_PUSH_SENDER", "diveops.operations.services.fcm.FirebaseSender")
+    return import_string(path)()
+
+
+def _is_permanent_failure(exception) -> bool:
+    """Whether an FCM error means the token will never work again."""
+    error_str = str(exception)
+    code = getattr(exception, "code", "")
+    return (
+        type(exception).__name__ in ("UnregisteredError", "SenderIdMismatchError")
+        or code in ("NOT_FOUND", "UNREGISTERED")
+        or "Requested entity was not found" in error_str
+        or "not a valid FCM registration token" in error_str
+    )
+
+
+def send_push_to_devices(
+    devices,
     title: str,
     body: str,
     data: Optional[dict] = None,
     sound: str = "default",
 ) -> int:
-    """Send push notification to all of a user's active devices.
+    """Send one notification to many devices using multicast batches.
+
+    Devices are sent to in batches of MULTICAST_BATCH_SIZE tokens, and
+    their success/failure state is written back with one bulk_update:
+    successes reset failure_count; failures increment it and deactivate
+    the device on a permanent error or after FCM_MAX_FAILURES.
 
     Args:
-        user: Django User instance
+        devices: FCMDevice instances (only pk, registration_id,
+            failure_count and is_active are needed)
         title: Notification title
         body: Notification body text
         data: Optional data payload
@@ -159,29 +274,75 @@ def send_push_to_user(
     """
     from django_communication.models import FCMDevice
 
-    devices = FCMDevice.objects.filter(
-        user=user,
-        is_active=True,
-        deleted_at__isnull=True,
-    )
+    devices = list(devices)
+    if not devices:
+        return 0
+
+    sender = get_push_sender()
+    max_failures = getattr(settings, "FCM_MAX_FAILURES", 5)
 
     success_count = 0
-    for device in devices:
-        if send_push_notification(
-            registration_id=device.registration_id,
-            title=title,
-            body=body,
-            data=data,
-            sound=sound,
-        ):
-            device.mark_success()
-            success_count += 1
-        else:
-            device.mark_failure()
+    changed = []
+    for i in range(0, len(devices), MULTICAST_BATCH_SIZE):
+        batch = devices[i : i + MULTICAST_BATCH_SIZE]
+        try:
+            results = sender.send_multicast([d.registration_id for d in batch], title, body, data, sound)
+        except Exception as e:
+            logger.exception(f"FCM multicast failed: {e}")
+            results = [PushResult(False) for _ in batch]
+
+        for device, result in zip(batch, results, strict=True):
+            if result.success:
+                success_count += 1
+                if device.failure_count:
+                    device.failure_count = 0
+                    changed.append(device)
+            else:
+                device.failure_count = (device.failure_count or 0) + 1
+                if result.permanent or device.failure_count >= max_failures:
+                    logger.warning(f"Deactivating FCM device: {device.registration_id[:20]}...")
+                    device.is_active = False
+                changed.append(device)
+
+    if changed:
+        FCMDevice.objects.bulk_update(changed, ["failure_count", "is_active"], batch_size=MULTICAST_BATCH_SIZE)
 
     return success_count
 
 
+def _active_devices(**user_filter):
+    """Active devices of matching users, in one query."""
+    from django_communication.models import FCMDevice
+
+    return FCMDevice.objects.filter(
+        is_active=True,
+        deleted_at__isnull=True,
+        **user_filter,
+    ).only("pk", "registration_id", "failure_count", "is_active")
+
+
+def send_push_to_user(
+    user,
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+    sound: str = "default",
+) -> int:
+    """Send push notification to all of a user's active devices.
+
+    Args:
+        user: Django User instance
+        title: Notification title
+        body: Notification body text
+        data: Optional data payload
+        sound: Notification sound
+
+    Returns:
+        Number of successful deliveries
+    """
+    return send_push_to_devices(_active_devices(user=user), title, body, data, sound)
+
+
 def send_chat_notification(
     user,
     sender_name: str,
@@ -201,21 +362,25 @@ def send_chat_notification(
     Returns:
         Number of devices notified
     """
+    title, body, data = _chat_notification(sender_name, message_preview, conversation_id, person_id)
+    return send_push_to_user(user=user, title=title, body=body, data=data, sound="default")
+
+
+def _chat_notification(sender_name: str, message_preview: str, conversation_id: str, person_id: str):
+    """Build (title, body, data) for a new chat message push."""
     # Truncate message preview
     if len(message_preview) > 100:
         message_preview = message_preview[:97] + "..."
 
-    return send_push_to_user(
-        user=user,
-        title=f"New message from {sender_name}",
-        body=message_preview,
-        data={
+    return (
+        f"New message from {sender_name}",
+        message_preview,
+        {
             "type": "chat_message",
             "conversation_id": conversation_id,
             "person_id": person_id,
             "click_action": "OPEN_CHAT",
         },
-        sound="default",
     )
 
 
@@ -226,36 +391,64 @@ def notify_staff_of_new_message(
 ):
     """Notify all staff users when a visitor sends a message.
 
+    The push is queued after the current transaction commits and sent by
+    the push worker thread, so the request posting the message does not
+    wait on FCM.
+
     Args:
         person: Person (lead/visitor) who sent the message
         message_text: The message content
         conversation_id: Conversation UUID
     """
-    from django.contrib.auth import get_user_model
-    from django_communication.models import FCMDevice
+    sender_name = f"{person.first_name} {person.last_name}".strip() or person.email or "Visitor"
+    title, body, data = _chat_notification(sender_name, message_text, conversation_id, str(person.pk))
 
-    User = get_user_model()
+    transaction.on_commit(lambda: enqueue_push(title, body, data, staff=True))
 
-    # Get all staff users with active FCM devices
-    staff_with_devices = User.objects.filter(
-        is_staff=True,
-        is_active=True,
-        fcm_devices__is_active=True,
-        fcm_devices__deleted_at__isnull=True,
-    ).distinct()
 
-    sender_name = f"{person.first_name} {person.last_name}".strip() or person.email or "Visitor"
+def _deliver_staff_push(title: str, body: str, data: dict) -> int:
+    """Send one notification to every active staff device."""
+    total_sent = send_push_to_devices(
+        _active_devices(user__is_staff=True, user__is_active=True),
+        title,
+        body,
+        data,
+    )
+    logger.info(f"Sent {total_sent} FCM notifications: {title}")
+    return total_sent
 
-    total_sent = 0
-    for staff_user in staff_with_devices:
-        count = send_chat_notification(
-            user=staff_user,
-            sender_name=sender_name,
-            message_preview=message_text,
-            conversation_id=conversation_id,
-            person_id=str(person.pk),
-        )
-        total_sent += count
 
-    logger.info(f"Sent {total_sent} FCM notifications for new message from {sender_name}")
-    return total_sent
+# =============================================================================
+# Push queue (keeps FCM off the request thread)
+# =============================================================================
+
+
+def enqueue_push(title: str, body: str, data: Optional[dict] = None, *, staff: bool = False, user_ids=None) -> None:
+    """Queue a push for the background worker.
+
+    Args:
+        title: Notification title
+        body: Notification body text
+        data: Optional data payload
+        staff: Send to every active staff user
+        user_ids: Send to these users (ignored if staff is True)
+
+    With FCM_PUSH_ASYNC = False the push is sent immediately instead.
+    Queued pushes are lost if the process restarts before they are sent.
+    """
+    job = (title, body, data or {}, staff, list(user_ids or []))
+    if not getattr(settings, "FCM_PUSH_ASYNC", True):
+        _run_job(job)
+        return
+
+    _queue.put(job)
+
+
+def _run_job(job) -> int:
+    title, body, data, staff, user_ids = job
+    if staff:
+        return _deliver_staff_push(title, body, data)
+    return send_push_to_devices(_active_devices(user_id__in=user_ids), title, body, data)
+
+
+_queue = BackgroundQueue("fcm-push", _run_job)
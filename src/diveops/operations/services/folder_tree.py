@@ -0,0 +1,264 @@
+"""DocumentFolder tree lookups with recursive CTEs.
+
+Walking folder.children or folder.parent costs a query per folder or per
+level. These lookups resolve a whole tree in one query instead:
+
+- FolderTreeService.subtree: live folders under some roots (or the whole
+  tree), each with its tree_path of names, optionally skipping Trash
+- FolderTreeService.chains / ancestors / paths: root-to-folder chains for
+  breadcrumbs, backup paths and trash checks
+
+Chains are cached in the shared Django cache under a folder-tree version.
+Saving or deleting a DocumentFolder bumps the version (signals in
+operations.signals), so a move, rename or delete is seen by every process
+on its next lookup. QuerySet.update() bypasses signals; call
+bump_folder_tree_version() after bulk edits to folders.
+
+Usage:
+    from diveops.operations.services.folder_tree import FolderTreeService
+
+    breadcrumbs = FolderTreeService.ancestors(folder)
+    for folder in FolderTreeService.subtree([root.pk], include_trash=False):
+        print("/".join(folder.tree_path))
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from django_documents.models import DocumentFolder
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "diveops:folder_tree:version"
+CHAIN_CACHE_PREFIX = "diveops:folder_tree:chain"
+
+TRASH_SLUG = "trash"
+
+# Guards the recursion against parent cycles
+MAX_DEPTH = 100
+
+# Folder columns carried by chains (cached) and subtrees
+CHAIN_FIELDS = ("parent", "name", "slug")
+SUBTREE_FIELDS = ("parent", "name", "slug", "description")
+
+
+def folder_tree_version() -> int | None:
+    """Return the shared folder-tree version, or None if the cache is unavailable."""
+    try:
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            # Start from the clock so an evicted counter never reuses old keys
+            cache.add(VERSION_CACHE_KEY, int(time.time()), timeout=None)
+            version = cache.get(VERSION_CACHE_KEY)
+        return version
+    except Exception as e:
+        logger.warning(f"Folder tree version unavailable: {e}")
+        return None
+
+
+def bump_folder_tree_version() -> None:
+    """Invalidate every cached folder chain."""
+    try:
+        if not cache.add(VERSION_CACHE_KEY, int(time.time()), timeout=None):
+            cache.incr(VERSION_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Folder tree version bump failed: {e}")
+
+
+def _columns(fields) -> list:
+    """(attname, quoted column) for the pk and the given DocumentFolder fields."""
+    meta = DocumentFolder._meta
+    fields = [meta.pk] + [meta.get_field(name) for name in fields]
+    return [(field.attname, connection.ops.quote_name(field.column)) for field in fields]
+
+
+def _db_ids(ids) -> list:
+    pk = DocumentFolder._meta.pk
+    return [pk.get_db_prep_value(pk.to_python(value), connection) for value in ids]
+
+
+def _instance(row: dict) -> DocumentFolder:
+    """A DocumentFolder from a partial row; other fields load on access."""
+    meta = DocumentFolder._meta
+    # Raw rows hold backend values (e.g. hex strings for UUIDs on SQLite)
+    for attname in (meta.pk.attname, "parent_id"):
+        if row.get(attname) is not None:
+            row[attname] = meta.pk.to_python(row[attname])
+    names = [field.attname for field in meta.concrete_fields if field.attname in row]
+    return DocumentFolder.from_db(connection.alias, names, [row[name] for name in names])
+
+
+class FolderTreeService:
+    """Resolve DocumentFolder subtrees and ancestor chains in one query."""
+
+    @staticmethod
+    def subtree(root_ids=None, include_trash: bool = True) -> list[DocumentFolder]:
+        """Live folders under the given roots, roots included.
+
+        Args:
+            root_ids: Folder primary keys; None for the whole tree
+            include_trash: If False, folders with the Trash slug are
+                skipped along with everything under them
+
+        Returns:
+            Folders sorted by tree_path, the tuple of folder names from
+            the top of the tree down to the folder
+        """
+        if root_ids is not None:
+            root_ids = _db_ids(set(root_ids))
+            if not root_ids:
+                return []
+
+        columns = _columns(SUBTREE_FIELDS)
+        names = [column for _, column in columns]
+        pk_col, parent_col = names[0], names[1]
+        table = connection.ops.quote_name(DocumentFolder._meta.db_table)
+        deleted_col = connection.ops.quote_name(DocumentFolder._meta.get_field("deleted_at").column)
+        slug_col = connection.ops.quote_name(DocumentFolder._meta.get_field("slug").column)
+
+        params = []
+        if root_ids is None:
+            anchor = f"f.{parent_col} IS NULL"
+        else:
+            anchor = f"f.{pk_col} IN ({', '.join(['%s'] * len(root_ids))})"
+            params.extend(root_ids)
+        skip_trash = ""
+        if not include_trash:
+            skip_trash = f" AND (f.{slug_col} IS NULL OR f.{slug_col} <> %s)"
+            params.append(TRASH_SLUG)
+        select = ", ".join(f"f.{column}" for column in names)
+        sql = f"""
+            WITH RECURSIVE tree ({", ".join(names)}, depth) AS (
+                SELECT {select}, 0 FROM {table} f
+                WHERE {anchor} AND f.{deleted_col} IS NULL{skip_trash}
+                UNION ALL
+                SELECT {select}, tree.depth + 1 FROM {table} f
+                JOIN tree ON f.{parent_col} = tree.{pk_col}
+                WHERE f.{deleted_col} IS NULL{skip_trash} AND tree.depth < %s
+            )
+            SELECT {", ".join(names)} FROM tree
+        """
+        if not include_trash:
+            params.append(TRASH_SLUG)
+        params.append(MAX_DEPTH)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        attnames = [attname for attname, _ in columns]
+        folders = {}
+        for row in rows:
+            folder = _instance(dict(zip(attnames, row)))
+            folders.setdefault(folder.pk, folder)
+
+        # Roots whose parent is outside the subtree start from its chain
+        outside = {f.parent_id for f in folders.values() if f.parent_id is not None and f.parent_id not in folders}
+        bases = FolderTreeService.paths(outside) if outside else {}
+
+        def tree_path(folder):
+            if not hasattr(folder, "tree_path"):
+                parent = folders.get(folder.parent_id)
+                base = tree_path(parent) if parent is not None else bases.get(folder.parent_id, ())
+                folder.tree_path = base + (folder.name,)
+            return folder.tree_path
+
+        for folder in folders.values():
+            tree_path(folder)
+        return sorted(folders.values(), key=lambda f: f.tree_path)
+
+    @staticmethod
+    def chains(folder_ids) -> dict:
+        """Root-to-folder chains, from the cache or one recursive query.
+
+        Deleted folders are part of chains, as they are of folder.parent.
+
+        Args:
+            folder_ids: Folder primary keys
+
+        Returns:
+            {folder_id: [root, ..., folder]}; unknown folders are absent
+        """
+        ids = {DocumentFolder._meta.pk.to_python(pk) for pk in folder_ids if pk is not None}
+        if not ids:
+            return {}
+
+        version = folder_tree_version()
+        keys = {pk: f"{CHAIN_CACHE_PREFIX}:{version}:{pk}" for pk in ids}
+        rows_by_id = {}
+        if version is not None:
+            try:
+                cached = cache.get_many(keys.values())
+            except Exception as e:
+                logger.warning(f"Folder tree cache read failed: {e}")
+                cached = {}
+            rows_by_id = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = ids - rows_by_id.keys()
+        if missing:
+            loaded = FolderTreeService._load_chains(missing)
+            rows_by_id.update(loaded)
+            if version is not None and loaded:
+                timeout = getattr(settings, "FOLDER_TREE_CACHE_TIMEOUT", 86400)
+                try:
+                    cache.set_many({keys[pk]: rows for pk, rows in loaded.items()}, timeout)
+                except Exception as e:
+                    logger.warning(f"Folder tree cache write failed: {e}")
+
+        return {pk: [_instance(row) for row in rows] for pk, rows in rows_by_id.items()}
+
+    @staticmethod
+    def _load_chains(ids) -> dict:
+        """{folder_id: [row dict, root first]} for ids, in one query."""
+        columns = _columns(CHAIN_FIELDS)
+        names = [column for _, column in columns]
+        pk_col, parent_col = names[0], names[1]
+        table = connection.ops.quote_name(DocumentFolder._meta.db_table)
+        select = ", ".join(f"f.{column}" for column in names)
+        db_ids = _db_ids(ids)
+        sql = f"""
+            WITH RECURSIVE chain (start_id, level, {", ".join(names)}) AS (
+                SELECT f.{pk_col}, 0, {select} FROM {table} f
+                WHERE f.{pk_col} IN ({", ".join(["%s"] * len(db_ids))})
+                UNION ALL
+                SELECT chain.start_id, chain.level + 1, {select} FROM {table} f
+                JOIN chain ON f.{pk_col} = chain.{parent_col}
+                WHERE chain.level < %s
+            )
+            SELECT start_id, level, {", ".join(names)} FROM chain
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, db_ids + [MAX_DEPTH])
+            rows = cursor.fetchall()
+
+        to_python = DocumentFolder._meta.pk.to_python
+        attnames = [attname for attname, _ in columns]
+        levels = {}
+        for start_id, level, *values in rows:
+            levels.setdefault(to_python(start_id), []).append((level, dict(zip(attnames, values))))
+        return {
+            pk: [row for _, row in sorted(entries, key=lambda entry: entry[0], reverse=True)]
+            for pk, entries in levels.items()
+        }
+
+    @staticmethod
+    def ancestors(folder: DocumentFolder) -> list[DocumentFolder]:
+        """Breadcrumb trail: the root down to folder itself."""
+        return FolderTreeService.chains([folder.pk]).get(folder.pk, [folder])
+
+    @staticmethod
+    def paths(folder_ids) -> dict:
+        """{folder_id: (root name, ..., folder name)}."""
+        return {
+            pk: tuple(folder.name for folder in chain)
+            for pk, chain in FolderTreeService.chains(folder_ids).items()
+        }
+
+    @staticmethod
+    def is_in_trash(folder: DocumentFolder) -> bool:
+        """Whether folder is the top-level Trash folder or inside it."""
+        root = FolderTreeService.ancestors(folder)[0]
+        return root.slug == TRASH_SLUG and root.parent_id is None
@@ -0,0 +1,229 @@
+"""Monthly range partitioning of LocationUpdate (PostgreSQL).
+
+Partitioning on recorded_at keeps each month's fixes and indexes in their
+own table: recent-position and trip-track queries only touch the months
+they ask for, and history past every retention policy is dropped a whole
+month at a time instead of row by row.
+
+The table starts out unpartitioned. convert_to_partitioned() switches it
+over once (it copies every row under an exclusive lock, so run it in a
+maintenance window); ensure_partitions() then creates upcoming months and
+should run regularly. Both are exposed by the partition_location_updates
+command. On other databases, or before conversion, these are no-ops.
+
+The primary key becomes (id, recorded_at), as PostgreSQL requires the
+partition key in unique constraints; Django still addresses rows by id.
+"""
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from ..models import LocationUpdate
+
+logger = logging.getLogger(__name__)
+
+PARTITION_KEY = "recorded_at"
+
+
+def _table() -> str:
+    return LocationUpdate._meta.db_table
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def _month_start(value) -> datetime:
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def _add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    """Table name of the partition holding this month (UTC)."""
+    return f"{_table()}_p{month:%Y%m}"
+
+
+def is_partitioned() -> bool:
+    """Whether the LocationUpdate table is range partitioned."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [_table()],
+        )
+        return cursor.fetchone()[0]
+
+
+def monthly_partitions() -> list[datetime]:
+    """Months (UTC) that currently have a partition, oldest first."""
+    prefix = f"{_table()}_p"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [_table()],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        suffix = name[len(prefix):] if name.startswith(prefix) else ""
+        if len(suffix) == 6 and suffix.isdigit():
+            months.append(datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=dt_timezone.utc))
+    return sorted(months)
+
+
+def _create_month(cursor, month: datetime) -> None:
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(partition_name(month))} PARTITION OF {_quote(_table())} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [month, _add_months(month, 1)],
+    )
+
+
+def ensure_partitions(months_ahead: int = None, now=None) -> list[str]:
+    """Create partitions from the current month through months_ahead.
+
+    A month whose rows already sit in the default partition (fixes with
+    far-future device clocks) cannot be split out; it is logged and skipped.
+
+    Args:
+        months_ahead: Months after the current one (default:
+            LOCATION_PARTITION_MONTHS_AHEAD)
+        now: Reference time (default: timezone.now())
+
+    Returns:
+        Names of the partitions created
+    """
+    if not is_partitioned():
+        return []
+    if months_ahead is None:
+        months_ahead = getattr(settings, "LOCATION_PARTITION_MONTHS_AHEAD", 3)
+
+    existing = set(monthly_partitions())
+    current = _month_start(now or timezone.now())
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = _add_months(current, offset)
+            if month in existing:
+                continue
+            try:
+                with transaction.atomic():
+                    _create_month(cursor, month)
+            except DatabaseError as e:
+                logger.warning("Could not create partition %s: %s", partition_name(month), e)
+                continue
+            created.append(partition_name(month))
+    return created
+
+
+def drop_expired_partitions(cutoff) -> int:
+    """Drop monthly partitions that end before cutoff.
+
+    Args:
+        cutoff: Every row recorded before this time has expired
+
+    Returns:
+        Number of partitions dropped
+    """
+    if not is_partitioned():
+        return 0
+    dropped = 0
+    with connection.cursor() as cursor:
+        for month in monthly_partitions():
+            if _add_months(month, 1) > cutoff:
+                break
+            cursor.execute(f"DROP TABLE {_quote(partition_name(month))}")
+            logger.info("Dropped expired location partition %s", partition_name(month))
+            dropped += 1
+    return dropped
+
+
+def convert_to_partitioned(months_ahead: int = None) -> int:
+    """Rebuild LocationUpdate as a table partitioned by month of recorded_at.
+
+    Runs in one transaction: the table is renamed, a partitioned copy with
+    the same columns is created with a partition per month of existing
+    data plus a default partition, rows are copied, the old table is
+    dropped and its constraints and indexes are recreated under their
+    original names.
+
+    Args:
+        months_ahead: Future months to create (default:
+            LOCATION_PARTITION_MONTHS_AHEAD)
+
+    Returns:
+        Number of monthly partitions created
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL or the table is
+            already partitioned
+    """
+    if connection.vendor != "postgresql":
+        raise RuntimeError("Partitioning requires PostgreSQL")
+    if is_partitioned():
+        raise RuntimeError(f"{_table()} is already partitioned")
+    if months_ahead is None:
+        months_ahead = getattr(settings, "LOCATION_PARTITION_MONTHS_AHEAD", 3)
+
+    table = _table()
+    old_table = f"{table}_unpartitioned"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Deferred FK checks pending on the old table would block dropping it
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(f"LOCK TABLE {_quote(table)} IN ACCESS EXCLUSIVE MODE")
+
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) ORDER BY contype",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(ix.indexrelid) FROM pg_index ix WHERE ix.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = ix.indexrelid)",
+            [table],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT min({_quote(PARTITION_KEY)}) FROM {_quote(table)}")
+        oldest = cursor.fetchone()[0]
+
+        cursor.execute(f"ALTER TABLE {_quote(table)} RENAME TO {_quote(old_table)}")
+        cursor.execute(
+            f"CREATE TABLE {_quote(table)} (LIKE {_quote(old_table)} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({_quote(PARTITION_KEY)})"
+        )
+
+        first = _month_start(oldest) if oldest else _month_start(timezone.now())
+        last = _add_months(_month_start(timezone.now()), months_ahead)
+        month = first
+        created = 0
+        while month <= last:
+            _create_month(cursor, month)
+            month = _add_months(month, 1)
+            created += 1
+        cursor.execute(f"CREATE TABLE {_quote(table + '_default')} PARTITION OF {_quote(table)} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {_quote(table)} SELECT * FROM {_quote(old_table)}")
+        cursor.execute(f"DROP TABLE {_quote(old_table)}")
+
+        for name, kind, definition in constraints:
+            if kind == "p":
+                definition = f"PRIMARY KEY ({_quote('id')}, {_quote(PARTITION_KEY)})"
+            cursor.execute(f"ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}")
+        for definition in index_definitions:
+            cursor.execute(definition)
+
+    logger.info("Partitioned %s into %d monthly partitions", table, created)
+    return created
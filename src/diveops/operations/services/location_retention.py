@@ -0,0 +1,283 @@
+"""Location history retention.
+
+Raw GPS fixes are kept at full resolution only for a while. After that,
+each track (one person, one excursion, one day) is simplified with
+Douglas-Peucker: points that lie within a tolerance of the line through
+their neighbours are removed, so the track keeps its shape at a fraction
+of the rows. Much later, points are deleted altogether.
+
+Policies come from LOCATION_RETENTION_POLICIES, per sharing visibility.
+Compaction works in bounded batches so it can run daily against a large
+table (see the compact_location_history command).
+
+Usage:
+    from diveops.operations.services.location_retention import LocationRetentionService
+
+    result = LocationRetentionService.compact(batch_size=500, max_batches=100)
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import LocationSharingPreference, LocationUpdate
+from .location_partitions import drop_expired_partitions
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_METERS = 6_371_000
+
+DEFAULT_POLICY = {"downsample_after_days": 30, "tolerance_meters": 10, "delete_after_days": None}
+
+
+class RetentionPolicy(NamedTuple):
+    """How long raw and downsampled points are kept.
+
+    Attributes:
+        downsample_after_days: Age at which tracks are simplified (None: never)
+        tolerance_meters: Douglas-Peucker tolerance
+        delete_after_days: Age at which points are deleted (None: never)
+    """
+
+    downsample_after_days: Optional[int]
+    tolerance_meters: float
+    delete_after_days: Optional[int]
+
+
+def retention_policies() -> dict:
+    """Policies keyed by visibility; None is people without a preference.
+
+    Each visibility's settings entry is merged over the "default" entry.
+    """
+    configured = getattr(settings, "LOCATION_RETENTION_POLICIES", {})
+    default = {**DEFAULT_POLICY, **configured.get("default", {})}
+    policies = {None: RetentionPolicy(**default)}
+    for visibility in LocationSharingPreference.Visibility.values:
+        policies[visibility] = RetentionPolicy(**{**default, **configured.get(visibility, {})})
+    return policies
+
+
+def douglas_peucker(points, tolerance_meters: float) -> list[int]:
+    """Simplify a track, returning the indices of the points to keep.
+
+    Args:
+        points: Sequence of (latitude, longitude) in track order
+        tolerance_meters: Maximum distance a removed point may lie from
+            the simplified track
+
+    Returns:
+        Sorted indices into points; always includes the first and last
+    """
+    count = len(points)
+    if count <= 2:
+        return list(range(count))
+
+    # Local equirectangular projection in meters; accurate at track scale
+    lat0 = math.radians(float(points[0][0]))
+    lon0 = math.radians(float(points[0][1]))
+    cos_lat0 = math.cos(lat0)
+    xy = [
+        (
+            EARTH_RADIUS_METERS * (math.radians(float(lon)) - lon0) * cos_lat0,
+            EARTH_RADIUS_METERS * (math.radians(float(lat)) - lat0),
+        )
+        for lat, lon in points
+    ]
+
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        ax, ay = xy[start]
+        bx, by = xy[end]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+
+        max_distance = -1.0
+        farthest = start
+        for i in range(start + 1, end):
+            px, py = xy[i]
+            if length_sq == 0:
+                distance = math.hypot(px - ax, py - ay)
+            else:
+                # Distance to the segment, not the infinite line
+                t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+                distance = math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+            if distance > max_distance:
+                max_distance = distance
+                farthest = i
+
+        if max_distance > tolerance_meters:
+            keep[farthest] = True
+            stack.append((start, farthest))
+            stack.append((farthest, end))
+
+    return [i for i, kept in enumerate(keep) if kept]
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of LocationRetentionService.compact.
+
+    Attributes:
+        tracks: Tracks downsampled
+        points_kept: Points kept (and marked downsampled)
+        points_removed: Points removed by downsampling
+        points_expired: Points deleted for age
+        partitions_dropped: Whole monthly partitions dropped for age
+        batches: Batches processed
+        complete: False if max_batches stopped the run early
+    """
+
+    tracks: int = 0
+    points_kept: int = 0
+    points_removed: int = 0
+    points_expired: int = 0
+    partitions_dropped: int = 0
+    batches: int = 0
+    complete: bool = True
+
+
+# Primary keys per DELETE/UPDATE statement
+WRITE_CHUNK_SIZE = 5000
+
+
+def _chunks(pks):
+    for i in range(0, len(pks), WRITE_CHUNK_SIZE):
+        yield pks[i:i + WRITE_CHUNK_SIZE]
+
+
+def _hard_delete(pks) -> int:
+    """Delete LocationUpdate rows for good (retention, not soft delete)."""
+    deleted = 0
+    for chunk in _chunks(pks):
+        count, _ = models.QuerySet.delete(LocationUpdate.all_objects.filter(pk__in=chunk))
+        deleted += count
+    return deleted
+
+
+def _scope(visibility) -> Q:
+    """People governed by the policy for this visibility."""
+    if visibility is None:
+        return Q(person__location_sharing_preference__isnull=True)
+    return Q(person__location_sharing_preference__visibility=visibility)
+
+
+class LocationRetentionService:
+    """Apply retention policies to LocationUpdate history."""
+
+    @staticmethod
+    def compact(
+        *,
+        now=None,
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> CompactionResult:
+        """Expire and downsample location history per retention policy.
+
+        Each batch is one transaction: up to batch_size expired points, or
+        up to batch_size tracks to downsample. A track is one person's raw
+        points for one excursion (or none) on one day.
+
+        Args:
+            now: Reference time (default: timezone.now())
+            batch_size: Rows (expiry) or tracks (downsampling) per batch
+            max_batches: Stop after this many batches (None: run to the end)
+            dry_run: Count one batch per policy without writing anything
+
+        Returns:
+            CompactionResult with counts
+        """
+        now = now or timezone.now()
+        result = CompactionResult()
+        policies = retention_policies()
+
+        def budget_left():
+            if max_batches is not None and result.batches >= max_batches:
+                result.complete = False
+                return False
+            return True
+
+        if not dry_run:
+            delete_ages = [p.delete_after_days for p in policies.values()]
+            if all(age is not None for age in delete_ages):
+                result.partitions_dropped = drop_expired_partitions(now - timedelta(days=max(delete_ages)))
+
+        for visibility, policy in policies.items():
+            scope = LocationUpdate.all_objects.filter(_scope(visibility))
+
+            if policy.delete_after_days is not None:
+                expired = scope.filter(recorded_at__lt=now - timedelta(days=policy.delete_after_days))
+                while budget_left():
+                    pks = list(expired.order_by().values_list("pk", flat=True)[:batch_size])
+                    if not pks:
+                        break
+                    result.batches += 1
+                    if dry_run:
+                        result.points_expired += len(pks)
+                        break
+                    with transaction.atomic():
+                        result.points_expired += _hard_delete(pks)
+
+            if policy.downsample_after_days is not None:
+                raw = scope.filter(
+                    is_downsampled=False,
+                    recorded_at__lt=now - timedelta(days=policy.downsample_after_days),
+                )
+                tracks = raw.order_by().values("person_id", "excursion_id", day=TruncDate("recorded_at")).distinct()
+                while budget_left():
+                    batch = list(tracks[:batch_size])
+                    if not batch:
+                        break
+                    result.batches += 1
+                    with transaction.atomic():
+                        for track in batch:
+                            LocationRetentionService._downsample_track(
+                                raw, track, policy.tolerance_meters, result, dry_run
+                            )
+                    if dry_run:
+                        break
+
+        logger.info("Location compaction: %s", result)
+        return result
+
+    @staticmethod
+    def _downsample_track(raw, track, tolerance_meters, result, dry_run):
+        points = list(
+            raw.filter(
+                person_id=track["person_id"],
+                excursion_id=track["excursion_id"],
+                recorded_at__date=track["day"],
+            )
+            .order_by("recorded_at")
+            .values_list("pk", "latitude", "longitude")
+        )
+        if not points:
+            return
+
+        kept = douglas_peucker([(lat, lon) for _, lat, lon in points], tolerance_meters)
+        kept_pks = [points[i][0] for i in kept]
+        kept_set = set(kept)
+        removed_pks = [pk for i, (pk, _, _) in enumerate(points) if i not in kept_set]
+
+        result.tracks += 1
+        result.points_kept += len(kept_pks)
+        result.points_removed += len(removed_pks)
+        if dry_run:
+            return
+
+        _hard_delete(removed_pks)
+        for chunk in _chunks(kept_pks):
+            LocationUpdate.all_objects.filter(pk__in=chunk).update(is_downsampled=True)
@@ -0,0 +1,283 @@
+"""Excursion track reconstruction.
+
+Replays the path each diver (or the boat's crew device) took during an
+excursion from LocationUpdate rows linked to it. Points are streamed from
+a server-side cursor one person at a time, simplified for the requested
+map zoom, and written out as GeoJSON or encoded polylines without ever
+holding the whole excursion in memory.
+
+Tracks of completed excursions are cached: they only change when a late
+upload or retention compaction touches the points, which changes the
+version in the cache key.
+
+Usage:
+    from diveops.operations.services.location_tracks import ExcursionTrackService
+
+    for chunk in ExcursionTrackService.stream(excursion, fmt="polyline", zoom=14):
+        ...
+"""
+
+import hashlib
+import json
+import logging
+import math
+from typing import Iterator, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from django_parties.models import Person
+
+from ..models import LocationUpdate
+from .location_retention import douglas_peucker
+from .locations import MAX_ZOOM, STAFF_VISIBILITIES
+
+logger = logging.getLogger(__name__)
+
+GEOJSON = "geojson"
+POLYLINE = "polyline"
+FORMATS = (GEOJSON, POLYLINE)
+
+CONTENT_TYPES = {GEOJSON: "application/geo+json", POLYLINE: "application/json"}
+
+# Rows fetched per round trip from the server-side cursor
+TRACK_FETCH_SIZE = 2000
+
+TRACK_CACHE_PREFIX = "excursion_track"
+
+# Meters per pixel at zoom 0 on the equator (256px tiles)
+EQUATOR_METERS_PER_PIXEL = 156543.03392
+
+
+class TrackPoint(NamedTuple):
+    latitude: float
+    longitude: float
+    recorded_at: object
+
+
+class Track(NamedTuple):
+    """One person's time-ordered, simplified path."""
+
+    person_id: object
+    points: list
+
+
+def tolerance_for_zoom(zoom: Optional[int], latitude: float) -> float:
+    """Simplification tolerance in meters: one screen pixel at this zoom.
+
+    Args:
+        zoom: Map zoom level (None: full resolution)
+        latitude: Latitude the track is drawn at
+
+    Returns:
+        Douglas-Peucker tolerance; 0 keeps every point
+    """
+    if zoom is None:
+        return 0.0
+    return EQUATOR_METERS_PER_PIXEL * math.cos(math.radians(latitude)) / 2 ** zoom
+
+
+def parse_zoom(value) -> Optional[int]:
+    """Parse an optional zoom query parameter.
+
+    Raises:
+        ValueError: If the value is not a zoom level
+    """
+    if value in (None, ""):
+        return None
+    if not str(value).isdigit() or int(value) > MAX_ZOOM:
+        raise ValueError(f"zoom must be an integer between 0 and {MAX_ZOOM}")
+    return int(value)
+
+
+def encode_polyline(points, precision: int = 5) -> str:
+    """Encode (latitude, longitude) pairs with the Google polyline algorithm.
+
+    Args:
+        points: Sequence of (latitude, longitude)
+        precision: Decimal places kept (5 is what map libraries expect)
+
+    Returns:
+        Encoded polyline string
+    """
+    factor = 10 ** precision
+    output = []
+    previous_lat = previous_lon = 0
+    for lat, lon in points:
+        lat = round(float(lat) * factor)
+        lon = round(float(lon) * factor)
+        for delta in (lat - previous_lat, lon - previous_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                output.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            output.append(chr(value + 63))
+        previous_lat, previous_lon = lat, lon
+    return "".join(output)
+
+
+def _simplify(points: list, zoom: Optional[int]) -> list:
+    if zoom is None or len(points) <= 2:
+        return points
+    tolerance = tolerance_for_zoom(zoom, points[0].latitude)
+    kept = douglas_peucker([(p.latitude, p.longitude) for p in points], tolerance)
+    return [points[i] for i in kept]
+
+
+class ExcursionTrackService:
+    """Reconstruct and serialize excursion tracks."""
+
+    @staticmethod
+    def points(excursion, person_id=None):
+        """Location updates of the excursion visible to staff, in track order."""
+        qs = LocationUpdate.objects.filter(
+            excursion=excursion,
+            person__location_sharing_preference__visibility__in=STAFF_VISIBILITIES,
+            person__location_sharing_preference__deleted_at__isnull=True,
+        )
+        if person_id is not None:
+            qs = qs.filter(person_id=person_id)
+        return qs.order_by("person_id", "recorded_at")
+
+    @staticmethod
+    def iter_tracks(excursion, *, zoom: Optional[int] = None, person_id=None) -> Iterator[Track]:
+        """Yield one simplified Track per person.
+
+        Rows come from a server-side cursor; only the current person's
+        points are held in memory.
+
+        Args:
+            excursion: Excursion to replay
+            zoom: Map zoom the tracks are simplified for (None: every point)
+            person_id: Only this person's track
+        """
+        rows = (
+            ExcursionTrackService.points(excursion, person_id)
+            .values_list("person_id", "latitude", "longitude", "recorded_at")
+            .iterator(chunk_size=TRACK_FETCH_SIZE)
+        )
+        current = None
+        points = []
+        for row_person_id, lat, lon, recorded_at in rows:
+            if row_person_id != current:
+                if points:
+                    yield Track(current, _simplify(points, zoom))
+                current, points = row_person_id, []
+            points.append(TrackPoint(float(lat), float(lon), recorded_at))
+        if points:
+            yield Track(current, _simplify(points, zoom))
+
+    @staticmethod
+    def version(excursion, person_id=None) -> str:
+        """Changes whenever a point of the excursion is added or changed."""
+        stats = ExcursionTrackService.points(excursion, person_id).order_by().aggregate(
+            count=Count("pk"),
+            updated=Max("updated_at"),
+            preference_updated=Max("person__location_sharing_preference__updated_at"),
+        )
+        raw = f"{excursion.pk}|{stats['count']}|{stats['updated']}|{stats['preference_updated']}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def stream(
+        excursion,
+        *,
+        fmt: str = GEOJSON,
+        zoom: Optional[int] = None,
+        person_id=None,
+        version: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Serialize the excursion's tracks as JSON text chunks.
+
+        GeoJSON is a FeatureCollection with one LineString (or Point) per
+        person and coordTimes alongside the coordinates. The polyline
+        format gives each person an encoded polyline plus times in epoch
+        seconds, which is several times smaller.
+
+        Completed excursions are served from the cache when possible and
+        stored there once fully streamed.
+
+        Args:
+            excursion: Excursion to replay
+            fmt: GEOJSON or POLYLINE
+            zoom: Map zoom the tracks are simplified for (None: every point)
+            person_id: Only this person's track
+            version: Result of version(), if the caller already has it
+
+        Raises:
+            ValueError: If fmt is not a known format
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+
+        cache_key = None
+        if excursion.status == "completed":
+            version = version or ExcursionTrackService.version(excursion, person_id)
+            cache_key = f"{TRACK_CACHE_PREFIX}:{excursion.pk}:{fmt}:{zoom}:{person_id}:{version}"
+            try:
+                cached = cache.get(cache_key)
+            except Exception as e:
+                logger.warning(f"Track cache unavailable: {e}")
+                cached = None
+            if cached is not None:
+                return iter([cached])
+
+        return ExcursionTrackService._generate(excursion, fmt, zoom, person_id, cache_key)
+
+    @staticmethod
+    def _generate(excursion, fmt, zoom, person_id, cache_key):
+        names = {
+            p.pk: f"{p.first_name} {p.last_name}"
+            for p in Person.objects.filter(
+                pk__in=ExcursionTrackService.points(excursion, person_id).order_by().values("person_id")
+            )
+        }
+        chunks = [] if cache_key else None
+
+        def emit(text):
+            if chunks is not None:
+                chunks.append(text)
+            return text
+
+        if fmt == GEOJSON:
+            yield emit('{"type": "FeatureCollection", "features": [')
+        else:
+            yield emit(f'{{"excursion_id": "{excursion.pk}", "zoom": {json.dumps(zoom)}, "tracks": [')
+
+        for i, track in enumerate(ExcursionTrackService.iter_tracks(excursion, zoom=zoom, person_id=person_id)):
+            if fmt == GEOJSON:
+                coordinates = [[round(p.longitude, 6), round(p.latitude, 6)] for p in track.points]
+                item = {
+                    "type": "Feature",
+                    "geometry": (
+                        {"type": "LineString", "coordinates": coordinates}
+                        if len(coordinates) > 1
+                        else {"type": "Point", "coordinates": coordinates[0]}
+                    ),
+                    "properties": {
+                        "person_id": str(track.person_id),
+                        "person_name": names.get(track.person_id, ""),
+                        "coordTimes": [p.recorded_at.isoformat() for p in track.points],
+                    },
+                }
+            else:
+                item = {
+                    "person_id": str(track.person_id),
+                    "person_name": names.get(track.person_id, ""),
+                    "polyline": encode_polyline((p.latitude, p.longitude) for p in track.points),
+                    "times": [int(p.recorded_at.timestamp()) for p in track.points],
+                }
+            yield emit((", " if i else "") + json.dumps(item))
+
+        yield emit("]}")
+
+        if chunks is not None:
+            try:
+                cache.set(
+                    cache_key,
+                    "".join(chunks),
+                    timeout=getattr(settings, "LOCATION_TRACK_CACHE_TIMEOUT", 7 * 24 * 3600),
+                )
+            except Exception as e:
+                logger.warning(f"Track cache unavailable: {e}")
@@ -0,0 +1,405 @@
+"""Location update ingestion and last-known positions.
+
+Mobile clients buffer GPS fixes while offline and flush them in batches.
+LocationIngestService validates a batch item by item, drops fixes already
+stored for the same (person, recorded_at), and writes the rest with a
+single bulk_create instead of one INSERT per fix.
+
+LatestLocationService keeps one LatestLocation row per person at ingest
+time and answers the staff map: positions inside a bounding box or map
+tile, grid-clustered by zoom level.
+
+Usage:
+    from diveops.operations.services.locations import LatestLocationService, LocationIngestService
+
+    result = LocationIngestService.ingest_batch(person, updates)
+    result.accepted, result.rejected, result.results
+
+    qs = LatestLocationService.visible_to_staff()
+    qs = LatestLocationService.filter_bbox(qs, parse_bbox("-87.5,20.3,-86.7,21.3"))
+    points, clusters = cluster_locations(qs, zoom=12)
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import LatestLocation, LocationSharingPreference, LocationUpdate
+
+# Rows per INSERT statement
+INSERT_BATCH_SIZE = 1000
+
+VALID_SOURCES = {choice.value for choice in LocationUpdate.Source}
+
+# Per-item result statuses
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+DUPLICATE = "duplicate"
+
+
+def max_batch_updates() -> int:
+    """Maximum number of updates accepted in one batch request."""
+    return getattr(settings, "LOCATION_BATCH_MAX_UPDATES", 1000)
+
+
+def _optional_decimal(value):
+    if not value:
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+def parse_location(data) -> dict:
+    """Validate one location update payload.
+
+    Optional fields that fail to parse are dropped; a missing or invalid
+    recorded_at falls back to the current time.
+
+    Args:
+        data: Payload dict with latitude, longitude and optional
+            accuracy_meters, altitude_meters, source, recorded_at
+
+    Returns:
+        Dict of LocationUpdate field values
+
+    Raises:
+        ValueError: If the payload is not an object or the coordinates are
+            missing or out of range (message is safe to show to clients)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Update must be an object")
+
+    try:
+        latitude = Decimal(str(data.get("latitude", "")))
+        longitude = Decimal(str(data.get("longitude", "")))
+    except (InvalidOperation, TypeError):
+        raise ValueError("Invalid coordinates")
+    if not latitude.is_finite() or not longitude.is_finite():
+        raise ValueError("Invalid coordinates")
+
+    if not (-90 <= latitude <= 90):
+        raise ValueError("Latitude must be between -90 and 90")
+    if not (-180 <= longitude <= 180):
+        raise ValueError("Longitude must be between -180 and 180")
+
+    source = data.get("source", LocationUpdate.Source.FUSED)
+    if source not in VALID_SOURCES:
+        source = LocationUpdate.Source.FUSED
+
+    recorded_at = None
+    recorded_at_str = data.get("recorded_at")
+    if isinstance(recorded_at_str, str) and recorded_at_str:
+        try:
+            recorded_at = parse_datetime(recorded_at_str)
+        except ValueError:
+            recorded_at = None
+    if recorded_at is None:
+        recorded_at = timezone.now()
+    elif timezone.is_naive(recorded_at):
+        recorded_at = timezone.make_aware(recorded_at)
+
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "accuracy_meters": _optional_decimal(data.get("accuracy_meters")),
+        "altitude_meters": _optional_decimal(data.get("altitude_meters")),
+        "source": source,
+        "recorded_at": recorded_at,
+    }
+
+
+@dataclass
+class BatchResult:
+    """Outcome of LocationIngestService.ingest_batch.
+
+    Attributes:
+        accepted: Updates written
+        rejected: Updates refused as invalid
+        duplicates: Updates skipped because (person, recorded_at) exists
+        results: Per-item {"index", "status", "error"} in request order
+    """
+
+    accepted: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    results: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates,
+            "results": self.results,
+        }
+
+
+class LocationIngestService:
+    """Write batches of location updates."""
+
+    @staticmethod
+    def ingest_batch(person, updates: list) -> BatchResult:
+        """Validate, deduplicate and bulk insert location updates.
+
+        Duplicates are detected by (person, recorded_at), both within the
+        batch and against stored updates (one query). The unique constraint
+        on those columns catches a concurrent retry of the same batch.
+
+        Args:
+            person: Person the updates belong to
+            updates: List of payload dicts (see parse_location)
+
+        Returns:
+            BatchResult with counts and per-item statuses
+        """
+        result = BatchResult()
+
+        parsed = {}
+        for index, data in enumerate(updates):
+            try:
+                parsed[index] = parse_location(data)
+            except ValueError as e:
+                result.results.append({"index": index, "status": REJECTED, "error": str(e)})
+
+        existing = set(
+            LocationUpdate.all_objects.filter(
+                person=person,
+                recorded_at__in={values["recorded_at"] for values in parsed.values()},
+            ).values_list("recorded_at", flat=True)
+        ) if parsed else set()
+
+        to_create = []
+        for index, values in parsed.items():
+            if values["recorded_at"] in existing:
+                result.results.append({"index": index, "status": DUPLICATE, "error": None})
+                continue
+            existing.add(values["recorded_at"])
+            to_create.append(LocationUpdate(person=person, **values))
+            result.results.append({"index": index, "status": ACCEPTED, "error": None})
+
+        LocationUpdate.objects.bulk_create(to_create, batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True)
+        LatestLocationService.record(to_create)
+
+        result.results.sort(key=lambda item: item["index"])
+        result.accepted = len(to_create)
+        result.duplicates = sum(1 for item in result.results if item["status"] == DUPLICATE)
+        result.rejected = len(updates) - result.accepted - result.duplicates
+        return result
+
+
+# Sharing levels that make a position visible on the staff map
+STAFF_VISIBILITIES = [
+    LocationSharingPreference.Visibility.STAFF,
+    LocationSharingPreference.Visibility.TRIP,
+    LocationSharingPreference.Visibility.BUDDIES,
+    LocationSharingPreference.Visibility.PUBLIC,
+]
+
+# Clustering grid cells per 256px map tile side (4 -> 64px cells)
+CLUSTER_CELLS_PER_TILE = 4
+
+# At this zoom and closer every position is returned unclustered
+CLUSTER_MAX_ZOOM = 17
+
+MAX_ZOOM = 22
+
+
+class BoundingBox(NamedTuple):
+    """Map viewport in degrees. west > east means it crosses the antimeridian."""
+
+    west: float
+    south: float
+    east: float
+    north: float
+
+
+def parse_bbox(value: str) -> BoundingBox:
+    """Parse a "west,south,east,north" bounding box.
+
+    Raises:
+        ValueError: If the value is malformed or out of range
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be west,south,east,north")
+    if not all(math.isfinite(v) for v in (west, south, east, north)):
+        raise ValueError("bbox must be west,south,east,north")
+    if not (-90 <= south <= north <= 90):
+        raise ValueError("bbox latitudes must satisfy -90 <= south <= north <= 90")
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("bbox longitudes must be between -180 and 180")
+    return BoundingBox(west, south, east, north)
+
+
+def parse_tile(value: str) -> tuple[int, BoundingBox]:
+    """Parse a "z/x/y" slippy map tile into its zoom and bounding box.
+
+    Raises:
+        ValueError: If the value is malformed or the tile does not exist
+    """
+    try:
+        zoom, x, y = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError("tile must be z/x/y")
+    n = 2 ** zoom if 0 <= zoom <= MAX_ZOOM else 0
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError("tile out of range")
+
+    def tile_latitude(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return zoom, BoundingBox(
+        west=x / n * 360 - 180,
+        south=tile_latitude(y + 1),
+        east=(x + 1) / n * 360 - 180,
+        north=tile_latitude(y),
+    )
+
+
+def _mercator(latitude: float, longitude: float) -> tuple[float, float]:
+    """Project to Web Mercator, normalized to [0, 1] on both axes."""
+    latitude = max(min(latitude, 85.0511), -85.0511)
+    x = (longitude + 180) / 360
+    y = (1 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2
+    return x, y
+
+
+def cluster_locations(locations, zoom: int) -> tuple[list, list]:
+    """Group positions that share a screen-space grid cell at this zoom.
+
+    Args:
+        locations: LatestLocation rows
+        zoom: Map zoom level
+
+    Returns:
+        Tuple of (unclustered LatestLocation rows, clusters as dicts with
+        latitude, longitude (cell centroid) and count)
+    """
+    if zoom >= CLUSTER_MAX_ZOOM:
+        return list(locations), []
+
+    cells_per_side = 2 ** zoom * CLUSTER_CELLS_PER_TILE
+    cells = {}
+    for loc in locations:
+        x, y = _mercator(float(loc.latitude), float(loc.longitude))
+        key = (min(int(x * cells_per_side), cells_per_side - 1), min(int(y * cells_per_side), cells_per_side - 1))
+        cells.setdefault(key, []).append(loc)
+
+    points = []
+    clusters = []
+    for members in cells.values():
+        if len(members) == 1:
+            points.append(members[0])
+            continue
+        clusters.append({
+            "latitude": sum(float(m.latitude) for m in members) / len(members),
+            "longitude": sum(float(m.longitude) for m in members) / len(members),
+            "count": len(members),
+        })
+    return points, clusters
+
+
+class LatestLocationService:
+    """Maintain and query last-known positions."""
+
+    @staticmethod
+    def record(locations) -> int:
+        """Advance LatestLocation rows to the newest of the given updates.
+
+        One conditional upsert, so concurrent batches for the same person
+        cannot move a position backwards: updates older than the stored
+        position (late uploads from an offline device) leave it unchanged.
+        Rows are read back from LocationUpdate, so updates dropped by
+        bulk_create(ignore_conflicts=True) are never referenced.
+
+        Args:
+            locations: LocationUpdate instances (saved)
+
+        Returns:
+            Number of positions written
+        """
+        locations = [loc for loc in locations if loc.pk is not None]
+        if not locations:
+            return 0
+
+        latest = LatestLocation._meta
+        update = LocationUpdate._meta
+        qn = connection.ops.quote_name
+        table = qn(latest.db_table)
+
+        def col(meta, name):
+            return qn(meta.get_field(name).column)
+
+        copied = ["latitude", "longitude", "accuracy_meters", "source", "recorded_at"]
+        columns = [col(latest, "person"), col(latest, "location_id")] + [col(latest, name) for name in copied]
+        select = [f"u.{col(update, 'person')}", f"u.{col(update, 'id')}"] + [f"u.{col(update, name)}" for name in copied]
+        updated_at = col(latest, "updated_at")
+        recorded_at = col(latest, "recorded_at")
+        sql = f"""
+            INSERT INTO {table} ({", ".join(columns)}, {updated_at})
+            SELECT DISTINCT ON (u.{col(update, "person")}) {", ".join(select)}, %s
+            FROM {qn(update.db_table)} u
+            WHERE u.{col(update, "id")} = ANY(%s) AND u.{col(update, "recorded_at")} = ANY(%s)
+            ORDER BY u.{col(update, "person")}, u.{col(update, "recorded_at")} DESC
+            ON CONFLICT ({col(latest, "person")}) DO UPDATE SET
+                {", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])},
+                {updated_at} = EXCLUDED.{updated_at}
+            WHERE EXCLUDED.{recorded_at} >= {table}.{recorded_at}
+        """
+        params = [
+            timezone.now(),
+            [loc.pk for loc in locations],
+            list({loc.recorded_at for loc in locations}),
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    @staticmethod
+    def visible_to_staff():
+        """Positions of people sharing their location with staff."""
+        return LatestLocation.objects.filter(
+            person__location_sharing_preference__is_tracking_enabled=True,
+            person__location_sharing_preference__visibility__in=STAFF_VISIBILITIES,
+            person__location_sharing_preference__deleted_at__isnull=True,
+        ).select_related("person")
+
+    @staticmethod
+    def filter_bbox(qs, bbox: BoundingBox):
+        """Restrict positions to a bounding box."""
+        qs = qs.filter(latitude__gte=bbox.south, latitude__lte=bbox.north)
+        if bbox.west <= bbox.east:
+            return qs.filter(longitude__gte=bbox.west, longitude__lte=bbox.east)
+        return qs.filter(Q(longitude__gte=bbox.west) | Q(longitude__lte=bbox.east))
+
+    @staticmethod
+    def version(qs, key: str = "") -> str:
+        """ETag for a position query: changes when any row in it changes.
+
+        One aggregate query: row count plus the latest position and
+        sharing preference change.
+
+        Args:
+            qs: Filtered LatestLocation queryset
+            key: Request parameters that shaped the response
+
+        Returns:
+            Opaque version string
+        """
+        stats = qs.order_by().aggregate(
+            count=Count("pk"),
+            updated=Max("updated_at"),
+            preference_updated=Max("person__location_sharing_preference__updated_at"),
+        )
+        raw = f"{key}|{stats['count']}|{stats['updated']}|{stats['preference_updated']}"
+        return hashlib.sha1(raw.encode()).hexdigest()
@@ -0,0 +1,136 @@
+"""Media renditions (resized image variants) off the request path.
+
+Uploads create the MediaAsset inline, so the image shows up in the Media
+Library at once, and queue rendition generation for a background worker
+thread. django-documents' generate_renditions produces every size for an
+asset in one call; thumbnails.generate_variants then adds WebP (and
+optionally AVIF) copies of each size.
+
+Pages that show many images resolve all their rendition URLs with one
+query (prefetch_thumbnail_urls, or the prefetch_thumbnails template tag)
+instead of one or two queries per image and size.
+
+Usage:
+    from diveops.operations.services.media_renditions import enqueue_renditions, prefetch_thumbnail_urls
+
+    asset = process_image_upload(doc)
+    enqueue_renditions(asset)
+
+    prefetch_thumbnail_urls(page_of_documents)
+"""
+
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from .background_queue import BackgroundQueue
+
+logger = logging.getLogger(__name__)
+
+# Attribute holding a document's prefetched {role: url}
+THUMBNAIL_URLS_ATTR = "_thumbnail_urls"
+
+
+def rendition_index(document_ids) -> dict:
+    """Rendition URLs by original document ID, in one query.
+
+    Args:
+        document_ids: Original (uploaded) Document primary keys
+
+    Returns:
+        {document_id: {role: url}}; documents without renditions are absent
+    """
+    from django_documents.models import MediaAsset
+
+    document_ids = list(document_ids)
+    if not document_ids:
+        return {}
+
+    file_field = MediaAsset._meta.get_field("renditions").related_model._meta.get_field("file")
+    rows = MediaAsset.objects.filter(document_id__in=document_ids).values_list(
+        "document_id", "renditions__role", "renditions__file"
+    )
+
+    index = {}
+    for document_id, role, name in rows:
+        if name:
+            index.setdefault(document_id, {})[role] = file_field.storage.url(name)
+    return index
+
+
+def prefetch_thumbnail_urls(objects, attr: Optional[str] = None) -> dict:
+    """Attach rendition URLs to many documents with a single query.
+
+    Each document gets a THUMBNAIL_URLS_ATTR dict that the thumbnail_url
+    template tag reads instead of querying. Documents that already have
+    one are skipped.
+
+    Args:
+        objects: Documents, or objects holding a document in attr
+        attr: Attribute of each object that holds its Document
+
+    Returns:
+        {document_id: {role: url}} for the documents looked up
+    """
+    documents = [getattr(obj, attr, None) if attr else obj for obj in objects]
+    documents = [doc for doc in documents if doc is not None and not hasattr(doc, THUMBNAIL_URLS_ATTR)]
+    if not documents:
+        return {}
+
+    index = rendition_index({doc.pk for doc in documents})
+    for doc in documents:
+        setattr(doc, THUMBNAIL_URLS_ATTR, index.get(doc.pk, {}))
+    return index
+
+
+# =============================================================================
+# Rendition queue (keeps image resizing off the request thread)
+# =============================================================================
+
+
+def enqueue_renditions(asset) -> None:
+    """Generate renditions for a MediaAsset once the transaction commits.
+
+    With MEDIA_RENDITIONS_ASYNC = False they are generated immediately
+    instead. A queued asset is lost if the process restarts before the
+    worker reaches it; the original stays usable without renditions.
+
+    Args:
+        asset: MediaAsset (saved)
+    """
+    if not getattr(settings, "MEDIA_RENDITIONS_ASYNC", True):
+        generate_asset_renditions(asset.pk)
+        return
+
+    asset_pk = asset.pk
+    transaction.on_commit(lambda: _queue.put(asset_pk))
+
+
+def generate_asset_renditions(asset_pk) -> bool:
+    """Generate every rendition of one MediaAsset, plus WebP/AVIF variants.
+
+    Returns:
+        True on success; failures are logged, the original stays usable
+    """
+    from django_documents.media_service import generate_renditions
+    from django_documents.models import MediaAsset
+
+    from ..thumbnails import generate_variants
+
+    try:
+        asset = MediaAsset.objects.select_related("document").get(pk=asset_pk)
+        generate_renditions(asset)
+    except Exception as e:
+        logger.warning(f"Rendition generation failed for media asset {asset_pk}: {e}")
+        return False
+
+    try:
+        generate_variants(asset.document)
+    except Exception as e:
+        logger.warning(f"Thumbnail variants failed for media asset {asset_pk}: {e}")
+    return True
+
+
+_queue = BackgroundQueue("media-renditions", generate_asset_renditions)
@@ -0,0 +1,136 @@
+"""Keyset (cursor) pagination helpers.
+
+Lists ordered by a timestamp are paged on the (timestamp, id) pair rather
+than OFFSET, so each page is an index range scan that stays fast however
+deep the client scrolls, and rows inserted meanwhile never shift a page.
+
+Cursors are opaque URL-safe tokens; clients pass back what the API
+returned and must not build them.
+
+Usage:
+    from diveops.operations.services.pagination import decode_cursor, encode_cursor, keyset_filter
+
+    token = encode_cursor(msg.created_at, msg.pk)
+    created_at, pk = decode_cursor(token)
+    qs = qs.filter(keyset_filter("created_at", created_at, pk, descending=True))
+"""
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from ..exceptions import InvalidCursor
+
+CURSOR_SEPARATOR = "|"
+
+# Sorts after every real id: a cursor at (timestamp, MAX_ID) means "after timestamp"
+MAX_ID = uuid.UUID(int=(1 << 128) - 1)
+
+
+def encode_cursor(timestamp: Optional[datetime], pk) -> str:
+    """Build an opaque cursor for the row at (timestamp, pk).
+
+    Args:
+        timestamp: Ordering timestamp of the row (may be None)
+        pk: Primary key of the row (UUID)
+
+    Returns:
+        URL-safe cursor token
+    """
+    raw = f"{timestamp.isoformat() if timestamp else ''}{CURSOR_SEPARATOR}{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[Optional[datetime], uuid.UUID]:
+    """Parse a cursor built by encode_cursor.
+
+    Args:
+        token: Cursor token from a previous response
+
+    Returns:
+        Tuple of (timestamp or None, primary key)
+
+    Raises:
+        InvalidCursor: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        timestamp_str, pk_str = raw.split(CURSOR_SEPARATOR)
+        timestamp = parse_datetime(timestamp_str) if timestamp_str else None
+        if timestamp_str and timestamp is None:
+            raise ValueError("bad timestamp")
+        return timestamp, uuid.UUID(pk_str)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+
+
+def keyset_filter(field: str, timestamp: Optional[datetime], pk, *, descending: bool) -> Q:
+    """Q for rows strictly after (timestamp, pk) in the list order.
+
+    The list must be ordered by (field, pk), both descending or both
+    ascending. In descending lists NULL timestamps sort last.
+
+    Args:
+        field: Name of the timestamp field or annotation
+        timestamp: Timestamp from the cursor
+        pk: Primary key from the cursor
+        descending: True for newest-first lists
+
+    Returns:
+        Q object to filter the ordered queryset with
+    """
+    if descending:
+        if timestamp is None:
+            return Q(**{f"{field}__isnull": True, "pk__lt": pk})
+        return (
+            Q(**{f"{field}__lt": timestamp})
+            | Q(**{field: timestamp, "pk__lt": pk})
+            | Q(**{f"{field}__isnull": True})
+        )
+    return Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "pk__gt": pk})
+
+
+def page_params(query, *, max_limit: int) -> dict:
+    """Read keyset paging parameters from a request's query string.
+
+    Accepts `limit` (capped at max_limit), `before` and `after` cursors, and
+    `since` (ISO 8601 timestamp). Cursors are validated later, when decoded.
+
+    Args:
+        query: request.GET
+        max_limit: Default and maximum page size
+
+    Returns:
+        Dict with limit, before, after and since, as taken by
+        MessageQueryService.get_message_page
+
+    Raises:
+        InvalidCursor: If limit or since is malformed
+    """
+    try:
+        limit = min(int(query.get("limit") or max_limit), max_limit)
+    except ValueError as e:
+        raise InvalidCursor("limit must be an integer") from e
+    if limit < 1:
+        raise InvalidCursor("limit must be positive")
+
+    since = None
+    if query.get("since"):
+        try:
+            since = parse_datetime(query["since"])
+        except ValueError:
+            since = None
+        if since is None:
+            raise InvalidCursor("since must be an ISO 8601 timestamp")
+
+    return {
+        "limit": limit,
+        "before": query.get("before") or None,
+        "after": query.get("after") or None,
+        "since": since,
+    }
@@ -0,0 +1,214 @@
+"""Chat presence and typing-indicator coalescing.
+
+Presence records which sockets are viewing which chat room, so staff views
+can show who is online without a database query. Each room is one Redis
+sorted set (member = "<role>:<id>:<channel>", score = expiry timestamp)
+with a key TTL, so abandoned sockets age out on their own:
+
+    ZADD   diveops:presence:<room> <expires_at> staff:12:specific.abc
+    ZRANGEBYSCORE diveops:presence:<room> <now> +inf
+
+When the default cache is not Redis (tests, local dev) the same data is
+kept as a dict per room in the Django cache.
+
+TypingCoalescer debounces a socket's typing events so a burst of
+keystrokes costs at most one channel layer fan-out per interval.
+
+Usage:
+    from diveops.operations.services.presence import PresenceService
+
+    PresenceService.join("chat_conversation_<id>", "staff:12:<channel>")
+    PresenceService.get_rooms(["chat_conversation_<id>", "chat_lead_<id>"])
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "diveops:presence"
+
+
+def presence_ttl() -> int:
+    """Seconds a presence entry lives without a heartbeat."""
+    return getattr(settings, "CHAT_PRESENCE_TTL", 60)
+
+
+def typing_interval() -> float:
+    """Minimum seconds between typing fan-outs per socket."""
+    return getattr(settings, "CHAT_TYPING_INTERVAL", 0.5)
+
+
+@dataclass
+class RoomPresence:
+    """Who is currently viewing a chat room."""
+
+    staff_ids: set[str] = field(default_factory=set)
+    user_ids: set[str] = field(default_factory=set)
+    visitors: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "staff_ids": sorted(self.staff_ids),
+            "user_ids": sorted(self.user_ids),
+            "visitors": self.visitors,
+        }
+
+
+def _redis_client():
+    """Return the raw Redis client behind the default cache, if any."""
+    backend = getattr(cache, "_cache", None)
+    if backend is None or not hasattr(backend, "get_client"):
+        return None
+    try:
+        return backend.get_client(write=True)
+    except Exception:
+        return None
+
+
+def _room_key(room: str) -> str:
+    return cache.make_key(f"{KEY_PREFIX}:{room}")
+
+
+class PresenceService:
+    """Per-room presence backed by Redis sorted sets (or the Django cache)."""
+
+    @staticmethod
+    def join(room: str, member: str) -> None:
+        """Mark member as viewing room (also used as the heartbeat)."""
+        ttl = presence_ttl()
+        now = time.time()
+        try:
+            client = _redis_client()
+            if client is not None:
+                key = _room_key(room)
+                pipe = client.pipeline(transaction=False)
+                pipe.zadd(key, {member: now + ttl})
+                pipe.zremrangebyscore(key, "-inf", now)
+                pipe.expire(key, ttl)
+                pipe.execute()
+            else:
+                key = f"{KEY_PREFIX}:{room}"
+                members = {m: exp for m, exp in (cache.get(key) or {}).items() if exp > now}
+                members[member] = now + ttl
+                cache.set(key, members, ttl)
+        except Exception as e:
+            logger.warning(f"Presence update failed for {room}: {e}")
+
+    @staticmethod
+    def leave(room: str, member: str) -> None:
+        """Remove member from room."""
+        try:
+            client = _redis_client()
+            if client is not None:
+                client.zrem(_room_key(room), member)
+            else:
+                key = f"{KEY_PREFIX}:{room}"
+                members = cache.get(key) or {}
+                if members.pop(member, None) is not None:
+                    cache.set(key, members, presence_ttl())
+        except Exception as e:
+            logger.warning(f"Presence removal failed for {room}: {e}")
+
+    @staticmethod
+    def get_rooms(rooms: list[str]) -> dict[str, RoomPresence]:
+        """Return presence for each room in one cache round trip.
+
+        Rooms nobody is viewing map to an empty RoomPresence.
+        """
+        now = time.time()
+        members_by_room: dict[str, list[str]] = {}
+        try:
+            client = _redis_client()
+            if client is not None:
+                pipe = client.pipeline(transaction=False)
+                for room in rooms:
+                    pipe.zrangebyscore(_room_key(room), now, "+inf")
+                for room, members in zip(rooms, pipe.execute(), strict=True):
+                    members_by_room[room] = [m.decode() if isinstance(m, bytes) else m for m in members]
+            else:
+                stored = cache.get_many([f"{KEY_PREFIX}:{room}" for room in rooms])
+                for room in rooms:
+                    members = stored.get(f"{KEY_PREFIX}:{room}") or {}
+                    members_by_room[room] = [m for m, exp in members.items() if exp > now]
+        except Exception as e:
+            logger.warning(f"Presence lookup failed: {e}")
+
+        return {room: _summarize(members_by_room.get(room, [])) for room in rooms}
+
+
+def member_id(role: str, identity: str, channel_name: str) -> str:
+    """Build a presence member ("staff:12:<channel>")."""
+    return f"{role}:{identity}:{channel_name}"
+
+
+def _summarize(members: list[str]) -> RoomPresence:
+    presence = RoomPresence()
+    for member in members:
+        role, _, rest = member.partition(":")
+        identity = rest.partition(":")[0]
+        if role == "staff":
+            presence.staff_ids.add(identity)
+        elif role == "user":
+            presence.user_ids.add(identity)
+        else:
+            presence.visitors += 1
+    return presence
+
+
+class TypingCoalescer:
+    """Debounce one socket's typing events into at most one send per interval.
+
+    The first event after a quiet interval is sent immediately; events
+    inside the interval only update the pending state, which is sent when
+    the interval ends if it differs from what was last sent.
+    """
+
+    def __init__(self, send, interval: float | None = None):
+        """
+        Args:
+            send: Coroutine function called with the is_typing flag to fan out
+            interval: Minimum seconds between sends (default CHAT_TYPING_INTERVAL)
+        """
+        self.send = send
+        self.interval = typing_interval() if interval is None else interval
+        self.last_sent_at = float("-inf")
+        self.last_sent: bool | None = None
+        self.pending: bool | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    async def update(self, is_typing: bool) -> None:
+        """Record a typing event from the client."""
+        loop = asyncio.get_running_loop()
+        wait = self.last_sent_at + self.interval - loop.time()
+        if wait <= 0 and self._flush_task is None:
+            await self._send(is_typing)
+            return
+
+        self.pending = is_typing
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_after(max(wait, 0)))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        pending, self.pending = self.pending, None
+        if pending is not None and pending != self.last_sent:
+            await self._send(pending)
+
+    async def _send(self, is_typing: bool) -> None:
+        self.last_sent_at = asyncio.get_running_loop().time()
+        self.last_sent = is_typing
+        await self.send(is_typing)
+
+    def cancel(self) -> None:
+        """Drop any pending send (socket closed)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self.pending = None
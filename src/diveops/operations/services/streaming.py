@@ -0,0 +1,62 @@
+"""Streaming responses that stay streamed under both WSGI and ASGI.
+
+StreamingHttpResponse sends a sync iterator chunk by chunk under WSGI
+(gunicorn), but under ASGI (daphne) Django can only serve async iterators
+incrementally: a sync iterator is consumed in full first, so the whole
+body sits in memory before the first byte goes out.
+
+streaming_response() gives ASGI requests an async iterator that pulls
+each chunk from the sync one with sync_to_async(thread_sensitive=True).
+Chunks run in the same thread as the rest of the request's sync code, so
+database connections and server-side cursors behave as under WSGI.
+
+Usage:
+    from diveops.operations.services.streaming import streaming_response
+
+    return streaming_response(request, generate_chunks(), content_type="application/json")
+"""
+
+from typing import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+def _next_chunk(iterator):
+    return next(iterator, _DONE)
+
+
+async def aiterate(iterable: Iterable) -> AsyncIterator:
+    """Async iterator over a sync iterable, one sync_to_async hop per chunk.
+
+    The sync iterator is closed (running its finally blocks) when the
+    async one is, e.g. when the client disconnects mid-stream.
+    """
+    iterator = iter(iterable)
+    pull = sync_to_async(_next_chunk, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await pull(iterator)
+            if chunk is _DONE:
+                break
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_response(request, iterable: Iterable, **kwargs) -> StreamingHttpResponse:
+    """StreamingHttpResponse over a sync iterable, async under ASGI.
+
+    Args:
+        request: The request being answered
+        iterable: Sync iterable of str or bytes chunks
+        **kwargs: Passed to StreamingHttpResponse (content_type, status, ...)
+    """
+    if isinstance(request, ASGIRequest):
+        iterable = aiterate(iterable)
+    return StreamingHttpResponse(iterable, **kwargs)
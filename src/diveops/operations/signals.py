@@ -0,0 +1,37 @@
+"""Signal handlers for dive operations."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_communication.models import Message
+from django_documents.models import DocumentFolder
+
+from .models import LocationUpdate
+from .services.chat_summary import ConversationSummaryService, summaries_enabled
+from .services.folder_tree import bump_folder_tree_version
+from .services.locations import LatestLocationService
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def refresh_conversation_summary(sender, instance, **kwargs):
+    """Refresh the conversation's inbox summary once the change commits."""
+    if instance.conversation_id and summaries_enabled():
+        conversation_id = instance.conversation_id
+        transaction.on_commit(lambda: ConversationSummaryService.refresh([conversation_id]))
+
+
+@receiver(post_save, sender=LocationUpdate)
+def record_latest_location(sender, instance, created, **kwargs):
+    """Advance the person's last known position (bulk ingest calls this directly)."""
+    if created:
+        LatestLocationService.record([instance])
+
+
+@receiver(post_save, sender=DocumentFolder)
+@receiver(post_delete, sender=DocumentFolder)
+def invalidate_folder_tree(sender, instance, created=False, **kwargs):
+    """Cached folder paths are stale once a folder is moved, renamed or deleted."""
+    if not created:
+        transaction.on_commit(bump_folder_tree_version)
@@ -98,6 +98,7 @@ urlpatterns = [
     path("bookings/<uuid:pk>/check-in/", staff_views.CheckInView.as_view(), name="check-in"),
     path("excursions/<uuid:pk>/start/", staff_views.StartExcursionView.as_view(), name="start-excursion"),
     path("excursions/<uuid:pk>/complete/", staff_views.CompleteExcursionView.as_view(), name="complete-excursion"),
+    path("excursions/<uuid:pk>/track/", staff_views.ExcursionTrackAPIView.as_view(), name="excursion-track"),
     # Dive Site management
     path("sites/", staff_views.DiveSiteListView.as_view(), name="staff-site-list"),
     path("sites/add/", staff_views.DiveSiteCreateView.as_view(), name="staff-site-create"),
@@ -188,6 +189,7 @@ urlpatterns = [
     # API endpoints
     path("api/compatible-sites/", staff_views.CompatibleSitesAPIView.as_view(), name="api-compatible-sites"),
     path("api/excursion-types/<uuid:pk>/tissue-profile/", staff_views.ExcursionTypeTissueCalculationView.as_view(), name="api-excursion-type-tissue-profile"),
+    path("api/excursion-types/<uuid:pk>/tissue-grid/", staff_views.ExcursionTypeTissueGridView.as_view(), name="api-excursion-type-tissue-grid"),
     # SignableAgreement management (waiver signing workflow)
     path("signable-agreements/", staff_views.SignableAgreementListView.as_view(), name="signable-agreement-list"),
     path("signable-agreements/create/", staff_views.SignableAgreementCreateView.as_view(), name="signable-agreement-create"),
@@ -437,6 +437,53 @@ class CompleteExcursionView(StaffPortalMixin, View):
         )
 
 
+class ExcursionTrackAPIView(StaffPortalMixin, View):
+    """Stream the recorded tracks of an excursion for replay on a map.
+
+    Query params (all optional):
+        format: "geojson" (default) or "polyline"
+        zoom: Map zoom; tracks are simplified to about one pixel
+        person: Only this person's track (UUID)
+
+    Responses carry an ETag; a matching If-None-Match gets a 304. The body
+    is streamed under both gunicorn (WSGI) and daphne (ASGI).
+    """
+
+    def get(self, request, pk):
+        import uuid
+
+        from django.utils.cache import get_conditional_response, patch_cache_control
+        from django.utils.http import quote_etag
+
+        from .services.location_tracks import CONTENT_TYPES, FORMATS, GEOJSON, ExcursionTrackService, parse_zoom
+        from .services.streaming import streaming_response
+
+        excursion = get_object_or_404(Excursion, pk=pk)
+        fmt = request.GET.get("format") or GEOJSON
+        try:
+            if fmt not in FORMATS:
+                raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+            zoom = parse_zoom(request.GET.get("zoom"))
+            person_id = uuid.UUID(request.GET["person"]) if request.GET.get("person") else None
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        version = ExcursionTrackService.version(excursion, person_id)
+        etag = quote_etag(f"{version}-{fmt}-{zoom}")
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = streaming_response(
+            request,
+            ExcursionTrackService.stream(excursion, fmt=fmt, zoom=zoom, person_id=person_id, version=version),
+            content_type=CONTENT_TYPES[fmt],
+        )
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class DiverDetailView(StaffPortalMixin, DetailView):
     """View diver details with all certifications."""
 
@@ -1037,9 +1084,10 @@ class DiveSitePhotoUploadView(StaffPortalMixin, View):
 
                 # Create MediaAsset so it shows up in Media Library
                 try:
-                    from django_documents.media_service import process_image_upload, generate_renditions
+                    from django_documents.media_service import process_image_upload
+                    from .services.media_renditions import enqueue_renditions
                     asset = process_image_upload(doc)
-                    generate_renditions(asset)
+                    enqueue_renditions(asset)
                 except Exception:
                     pass  # Best effort - thumbnails may already exist
 
@@ -4201,6 +4249,80 @@ class ExcursionTypeTissueCalculationView(StaffPortalMixin, View):
         return JsonResponse(result)
 
 
+class ExcursionTypeTissueGridView(StaffPortalMixin, View):
+    """Return a gradient-factor / gas / depth what-if grid as JSON.
+
+    Query params are comma-separated lists:
+    - gf_low, gf_high: gradient factors (clamped to 30-100)
+    - o2: gas O2 fractions (omit to use each dive's own gas)
+    - depth_offset: meters added to every planned depth
+
+    WARNING: This returns EPHEMERAL planning data. Results are NOT stored.
+    """
+
+    MAX_GRID_POINTS = 1000
+
+    @staticmethod
+    def _parse_list(raw, cast, default, clamp=None):
+        if not raw:
+            return default
+        values = []
+        for part in raw.split(","):
+            try:
+                value = cast(part.strip())
+            except (ValueError, TypeError):
+                continue
+            if clamp:
+                value = max(clamp[0], min(clamp[1], value))
+            if value not in values:
+                values.append(value)
+        return values or default
+
+    def get(self, request, pk):
+        """Calculate and return the tissue grid."""
+        from .services import (
+            DEFAULT_GF_HIGH,
+            DEFAULT_GF_LOW,
+            build_tissue_grid,
+            calculate_excursion_tissue_grid,
+        )
+
+        excursion_type = get_object_or_404(ExcursionType, pk=pk)
+
+        gf_lows = self._parse_list(request.GET.get("gf_low"), int, [DEFAULT_GF_LOW], clamp=(30, 100))
+        gf_highs = self._parse_list(request.GET.get("gf_high"), int, [DEFAULT_GF_HIGH], clamp=(30, 100))
+        gas_o2_fractions = self._parse_list(request.GET.get("o2"), float, [None], clamp=(0.21, 0.40))
+        depth_offsets = self._parse_list(request.GET.get("depth_offset"), float, [0.0], clamp=(-30.0, 30.0))
+
+        grid = build_tissue_grid(gf_lows, gf_highs, gas_o2_fractions, depth_offsets)
+        if len(grid) > self.MAX_GRID_POINTS:
+            return JsonResponse(
+                {"error": f"Grid too large ({len(grid)} points, max {self.MAX_GRID_POINTS})"},
+                status=400,
+            )
+
+        points = calculate_excursion_tissue_grid(excursion_type, grid)
+
+        return JsonResponse({
+            "excursion_type_id": str(excursion_type.pk),
+            "excursion_type_name": excursion_type.name,
+            "points": [
+                {
+                    "gf_low": p.gf_low,
+                    "gf_high": p.gf_high,
+                    "gas_o2_fraction": p.gas_o2_fraction,
+                    "depth_offset_m": p.depth_offset_m,
+                    "dive_ndls": p.dive_ndls,
+                    "dive_loading_after": [round(v, 1) for v in p.dive_loading_after],
+                    "min_ndl": p.min_ndl,
+                    "max_loading_percent": round(p.max_loading_percent, 1),
+                    "final_loading_percent": round(p.final_loading_percent, 1),
+                }
+                for p in points
+            ],
+        })
+
+
 # =============================================================================
 # Protected Area Views
 # =============================================================================
@@ -7173,7 +7295,8 @@ class MediaUploadView(StaffPortalMixin, View):
 
     def post(self, request):
         from django_documents.models import Document, MediaAsset
-        from django_documents.media_service import process_image_upload, generate_renditions
+        from django_documents.media_service import process_image_upload
+        from .services.media_renditions import enqueue_renditions
 
         file = request.FILES.get("file")
         if not file:
@@ -7192,8 +7315,8 @@ class MediaUploadView(StaffPortalMixin, View):
         # Process as image if it's an image
         if file.content_type.startswith("image/"):
             asset = process_image_upload(doc)
-            # Generate renditions
-            generate_renditions(asset)
+            # Renditions are generated in the background
+            enqueue_renditions(asset)
 
         messages.success(request, f"Uploaded {file.name}")
         return redirect("diveops:media-library")
@@ -7309,9 +7432,10 @@ class DiverUploadDocumentView(StaffPortalMixin, View):
 
             # Create MediaAsset so it shows up in Media Library
             try:
-                from django_documents.media_service import process_image_upload, generate_renditions
+                from django_documents.media_service import process_image_upload
+                from .services.media_renditions import enqueue_renditions
                 asset = process_image_upload(doc)
-                generate_renditions(asset)
+                enqueue_renditions(asset)
             except Exception:
                 pass  # Best effort
 
@@ -11475,39 +11599,63 @@ class SharedLocationsListView(StaffPortalMixin, TemplateView):
 
 
 class SharedLocationsAPIView(StaffPortalMixin, View):
-    """API endpoint returning location data as JSON for map markers."""
+    """API endpoint returning location data as JSON for map markers.
+
+    Reads last-known positions (LatestLocation), not the location history.
+
+    Query params (all optional):
+        bbox: west,south,east,north; only positions inside the box
+        tile: z/x/y map tile; instead of bbox, also sets zoom
+        zoom: Map zoom; nearby positions are returned as clusters
+        since: ISO 8601 timestamp; only positions changed after it, plus
+            active_ids (every visible person) so stale markers can be dropped
+
+    Responses carry an ETag; a matching If-None-Match gets a 304.
+    """
 
     def get(self, request):
-        from django.db.models import OuterRef, Subquery
-
-        from .models import LocationSharingPreference, LocationUpdate
-
-        # Get persons who are sharing location with staff visibility or above
-        sharing_person_ids = list(
-            LocationSharingPreference.objects.filter(
-                is_tracking_enabled=True,
-                visibility__in=[
-                    LocationSharingPreference.Visibility.STAFF,
-                    LocationSharingPreference.Visibility.TRIP,
-                    LocationSharingPreference.Visibility.BUDDIES,
-                    LocationSharingPreference.Visibility.PUBLIC,
-                ],
-            ).values_list("person_id", flat=True)
-        )
+        from django.utils.cache import get_conditional_response, patch_cache_control
+        from django.utils.dateparse import parse_datetime
+        from django.utils.http import quote_etag
 
-        # Get the most recent location for each sharing person
-        # Use distinct on person_id ordered by -recorded_at
-        locations = (
-            LocationUpdate.objects.filter(person_id__in=sharing_person_ids)
-            .order_by("person_id", "-recorded_at")
-            .distinct("person_id")
-            .select_related("person")
-        )
+        from .services.locations import LatestLocationService, cluster_locations, parse_bbox, parse_tile
+
+        qs = LatestLocationService.visible_to_staff()
+        zoom = None
+        try:
+            if request.GET.get("tile"):
+                zoom, bbox = parse_tile(request.GET["tile"])
+                qs = LatestLocationService.filter_bbox(qs, bbox)
+            elif request.GET.get("bbox"):
+                qs = LatestLocationService.filter_bbox(qs, parse_bbox(request.GET["bbox"]))
+            if request.GET.get("zoom"):
+                if not request.GET["zoom"].isdigit():
+                    raise ValueError("zoom must be a non-negative integer")
+                zoom = int(request.GET["zoom"])
+            since = None
+            if request.GET.get("since"):
+                since = parse_datetime(request.GET["since"])
+                if since is None:
+                    raise ValueError("since must be an ISO 8601 timestamp")
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        etag = quote_etag(LatestLocationService.version(qs, key=request.GET.urlencode()))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        server_time = timezone.now()
+        locations = list(qs.filter(updated_at__gt=since) if since else qs)
+        clusters = []
+        if zoom is not None and since is None:
+            locations, clusters = cluster_locations(locations, zoom)
 
         data = []
         for loc in locations:
             data.append({
-                "id": str(loc.pk),
+                "id": str(loc.location_id or loc.person_id),
+                "person_id": str(loc.person_id),
                 "latitude": float(loc.latitude),
                 "longitude": float(loc.longitude),
                 "person_name": f"{loc.person.first_name} {loc.person.last_name}",
@@ -11516,4 +11664,12 @@ class SharedLocationsAPIView(StaffPortalMixin, View):
                 "source": loc.source,
             })
 
-        return JsonResponse({"locations": data})
+        payload = {"locations": data, "clusters": clusters, "server_time": server_time.isoformat()}
+        if since:
+            payload["active_ids"] = [str(pk) for pk in qs.values_list("person_id", flat=True)]
+
+        response = JsonResponse(payload)
+        response["ETag"] = etag
+        # Browsers revalidate with If-None-Match on every poll
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
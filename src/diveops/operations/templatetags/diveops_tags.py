@@ -2,6 +2,9 @@
 
 from django import template
 
+from ..services.media_renditions import THUMBNAIL_URLS_ATTR, prefetch_thumbnail_urls
+from ..thumbnails import variant_url
+
 register = template.Library()
 
 # Map size names to MediaRendition roles
@@ -14,12 +17,14 @@ SIZE_TO_ROLE = {
 }
 
 
-@register.simple_tag
-def thumbnail_url(document, size="medium"):
+@register.simple_tag(takes_context=True)
+def thumbnail_url(context, document, size="medium"):
     """Get the thumbnail URL for a document.
 
-    Uses MediaRendition from django-documents if available,
-    falls back to original file URL.
+    Prefers a WebP/AVIF variant the browser accepts (per the request's
+    Accept header), then MediaRendition from django-documents,
+    then the original file URL. URLs prefetched with
+    prefetch_thumbnails are used without a query.
 
     Usage:
         {% load diveops_tags %}
@@ -34,16 +39,24 @@ def thumbnail_url(document, size="medium"):
     if not document:
         return ""
 
-    # Try to get rendition from MediaAsset
     role = SIZE_TO_ROLE.get(size, "medium")
 
+    request = context.get("request")
+    accept = request.META.get("HTTP_ACCEPT", "") if request is not None else ""
     try:
-        # Check if document has a MediaAsset with renditions
-        if hasattr(document, "media_asset"):
-            asset = document.media_asset
-            rendition = asset.renditions.filter(role=role).first()
-            if rendition and rendition.file:
-                return rendition.file.url
+        url = variant_url(document, role, accept)
+        if url:
+            return url
+    except Exception:
+        pass
+
+    try:
+        # One lookup per document covers every size
+        if not hasattr(document, THUMBNAIL_URLS_ATTR):
+            prefetch_thumbnail_urls([document])
+        url = getattr(document, THUMBNAIL_URLS_ATTR, {}).get(role)
+        if url:
+            return url
     except Exception:
         pass
 
@@ -55,6 +68,23 @@ def thumbnail_url(document, size="medium"):
     return ""
 
 
+@register.simple_tag
+def prefetch_thumbnails(objects, attr=""):
+    """Look up thumbnail URLs for a whole list of documents in one query.
+
+    Place before the loop; thumbnail_url then needs no queries.
+
+    Usage:
+        {% prefetch_thumbnails documents %}
+        {% prefetch_thumbnails media_assets "document" %}
+    """
+    try:
+        prefetch_thumbnail_urls(objects or [], attr or None)
+    except Exception:
+        pass
+    return ""
+
+
 @register.filter
 def has_thumbnail(document):
     """Check if a document can have a thumbnail.
@@ -0,0 +1,54 @@
+"""Tests for the in-process background job queue.
+
+Tests cover:
+- Jobs handled in order on one worker thread
+- A failing job does not stop the worker
+- Forked children start a fresh queue
+"""
+
+import threading
+
+from diveops.operations.services.background_queue import BackgroundQueue
+
+
+class TestBackgroundQueue:
+    """Tests for BackgroundQueue."""
+
+    def test_jobs_handled_in_order_off_the_caller_thread(self):
+        handled = []
+        jobs = BackgroundQueue("test-queue", lambda job: handled.append((job, threading.current_thread().name)))
+
+        for job in range(3):
+            jobs.put(job)
+        jobs.join()
+
+        assert handled == [(0, "test-queue"), (1, "test-queue"), (2, "test-queue")]
+
+    def test_failing_job_does_not_stop_worker(self, caplog):
+        handled = []
+
+        def handler(job):
+            if job == "bad":
+                raise ValueError("boom")
+            handled.append(job)
+
+        jobs = BackgroundQueue("test-failing", handler)
+        jobs.put("bad")
+        jobs.put("good")
+        jobs.join()
+
+        assert handled == ["good"]
+        assert "Background job failed on test-failing: boom" in caplog.text
+
+    def test_reset_after_fork_drops_queue(self):
+        jobs = BackgroundQueue("test-fork", lambda job: None)
+        jobs.put(1)
+        jobs.join()
+        inherited = jobs._queue
+
+        jobs._reset_after_fork()
+
+        assert jobs._queue is None
+        jobs.put(2)
+        jobs.join()
+        assert jobs._queue is not inherited
@@ -0,0 +1,130 @@
+"""Tests for batched WebSocket broadcasts.
+
+These tests verify:
+1. All rooms of a broadcast are sent in one async task
+2. broadcast_messages reads message data in a single query
+3. Per-room message order is preserved
+"""
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_parties.models import Person
+from django_communication.models import (
+    Conversation,
+    ConversationStatus,
+    Message,
+    MessageDirection,
+    MessageStatus,
+)
+
+from diveops.operations.services.broadcast import BroadcastService
+
+
+@pytest.fixture
+def person(db):
+    """Create a test person."""
+    return Person.objects.create(
+        first_name="Test",
+        last_name="Lead",
+        email="test@example.com",
+        lead_status="new",
+    )
+
+
+@pytest.fixture
+def conversation(db, person):
+    """Create a test conversation linked to person."""
+    return Conversation.objects.create(
+        subject="Test Conversation",
+        related_content_type=ContentType.objects.get_for_model(Person),
+        related_object_id=str(person.pk),
+        status=ConversationStatus.ACTIVE,
+    )
+
+
+@pytest.fixture
+def messages(db, conversation, person):
+    """Create test messages in conversation."""
+    return [
+        Message.objects.create(
+            conversation=conversation,
+            sender_person=person,
+            direction=MessageDirection.INBOUND,
+            body_text=f"Test message {i}",
+            status=MessageStatus.SENT,
+        )
+        for i in range(5)
+    ]
+
+
+def join(*rooms):
+    """Add a fresh channel to each room and return (layer, channel)."""
+    layer = get_channel_layer()
+    channel = async_to_sync(layer.new_channel)()
+    for room in rooms:
+        async_to_sync(layer.group_add)(room, channel)
+    return layer, channel
+
+
+def drain(layer, channel, count):
+    async def receive_all():
+        return [await layer.receive(channel) for _ in range(count)]
+
+    return async_to_sync(receive_all)()
+
+
+class TestBroadcastMessage:
+    """Tests for BroadcastService.broadcast_message."""
+
+    def test_sends_to_every_room(self):
+        """Explicit fields reach each requested room."""
+        layer, conversation_channel = join("chat_conversation_c1")
+        _, lead_channel = join("chat_lead_p1")
+
+        BroadcastService.broadcast_message(
+            rooms=["conversation", "lead"],
+            conversation_id="c1",
+            person_id="p1",
+            message_id="m1",
+            message_text="Hello",
+            direction="outbound",
+        )
+
+        for channel in (conversation_channel, lead_channel):
+            event = drain(layer, channel, 1)[0]
+            assert event["type"] == "new_message"
+            assert event["message_id"] == "m1"
+            assert event["body"] == "Hello"
+
+
+@pytest.mark.django_db
+class TestBroadcastMessages:
+    """Tests for BroadcastService.broadcast_messages."""
+
+    def test_single_query_and_order(self, messages, conversation, person):
+        """Many messages cost one query and arrive in created_at order."""
+        layer, channel = join(f"chat_conversation_{conversation.pk}")
+        _, lead_channel = join(f"chat_lead_{person.pk}")
+
+        with CaptureQueriesContext(connection) as ctx:
+            sent = BroadcastService.broadcast_messages(
+                [m.pk for m in reversed(messages)],
+                rooms=["conversation", "lead"],
+                person_id=str(person.pk),
+            )
+
+        assert len(ctx.captured_queries) == 1
+        assert sent == 10
+        events = drain(layer, channel, 5)
+        assert [e["message_id"] for e in events] == [str(m.pk) for m in messages]
+        assert events[0]["sender_name"] == "Test Lead"
+        assert len(drain(layer, lead_channel, 5)) == 5
+
+    def test_unknown_ids_send_nothing(self, db):
+        """Missing messages are skipped."""
+        assert BroadcastService.broadcast_messages(["00000000-0000-0000-0000-000000000000"]) == 0
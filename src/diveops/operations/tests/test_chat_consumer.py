@@ -0,0 +1,167 @@
+"""Tests for the async ChatConsumer.
+
+Scenarios run on the in-memory channel layer through async_to_sync, so
+no async pytest plugin is needed.
+
+Tests cover:
+- Visitor, staff and conversation routes join the right group
+- Unauthorized staff connections are rejected
+- Messages and typing indicators fan out to every socket in the room
+- new_message events from the HTTP API reach the socket
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+
+from diveops.operations.consumers import ChatConsumer
+
+VISITOR_ID = "3f1c2a9e-0000-4000-8000-000000000001"
+LEAD_ID = "3f1c2a9e-0000-4000-8000-000000000002"
+CONVERSATION_ID = "3f1c2a9e-0000-4000-8000-000000000003"
+
+
+class MockUser:
+    """Mock user for testing."""
+
+    def __init__(self, pk, is_authenticated=True, is_staff=False):
+        self.pk = pk
+        self.is_authenticated = is_authenticated
+        self.is_staff = is_staff
+
+
+def make_communicator(path, route_kwargs, user=None):
+    communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), path)
+    communicator.scope["url_route"] = {"kwargs": route_kwargs}
+    communicator.scope["user"] = user
+    return communicator
+
+
+def visitor_communicator():
+    return make_communicator(f"/ws/chat/visitor/{VISITOR_ID}/", {"visitor_id": VISITOR_ID})
+
+
+def conversation_communicator(user=None):
+    return make_communicator(
+        f"/ws/chat/conversation/{CONVERSATION_ID}/", {"conversation_id": CONVERSATION_ID}, user
+    )
+
+
+class TestChatConnection:
+    """Tests for connecting to chat rooms."""
+
+    def test_visitor_joins_visitor_room(self):
+        """Visitor route is public and joins chat_visitor_<id>."""
+
+        async def scenario():
+            communicator = visitor_communicator()
+            connected, _ = await communicator.connect()
+            response = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return connected, response
+
+        connected, response = async_to_sync(scenario)()
+
+        assert connected is True
+        assert response == {"type": "connection_established", "room": f"chat_visitor_{VISITOR_ID}"}
+
+    def test_lead_route_requires_staff(self):
+        """Non-staff users cannot open a lead chat."""
+
+        async def scenario():
+            communicator = make_communicator(
+                f"/ws/chat/lead/{LEAD_ID}/", {"lead_id": LEAD_ID}, MockUser(pk=1, is_staff=False)
+            )
+            connected, _ = await communicator.connect()
+            return connected
+
+        assert async_to_sync(scenario)() is False
+
+    def test_staff_joins_lead_room(self):
+        """Staff users join chat_lead_<id>."""
+
+        async def scenario():
+            communicator = make_communicator(
+                f"/ws/chat/lead/{LEAD_ID}/", {"lead_id": LEAD_ID}, MockUser(pk=1, is_staff=True)
+            )
+            connected, _ = await communicator.connect()
+            response = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return connected, response
+
+        connected, response = async_to_sync(scenario)()
+
+        assert connected is True
+        assert response["room"] == f"chat_lead_{LEAD_ID}"
+
+
+class TestChatFanOut:
+    """Tests for broadcasting within a room."""
+
+    def test_message_reaches_every_participant(self):
+        """A staff message is delivered to the visitor and echoed to staff."""
+
+        async def scenario():
+            staff = conversation_communicator(MockUser(pk=1, is_staff=True))
+            visitor = conversation_communicator()
+            await staff.connect()
+            await visitor.connect()
+            await staff.receive_json_from()
+            await visitor.receive_json_from()
+
+            await staff.send_json_to({"type": "message", "message": "  Hello!  "})
+            received = [await visitor.receive_json_from(), await staff.receive_json_from()]
+
+            await staff.disconnect()
+            await visitor.disconnect()
+            return received
+
+        for response in async_to_sync(scenario)():
+            assert response == {
+                "type": "message",
+                "message": "Hello!",
+                "direction": "outbound",
+                "sender": "staff",
+            }
+
+    def test_typing_indicator(self):
+        """Typing events are relayed with the sender role."""
+
+        async def scenario():
+            staff = conversation_communicator(MockUser(pk=1, is_staff=True))
+            visitor = conversation_communicator()
+            await staff.connect()
+            await visitor.connect()
+            await staff.receive_json_from()
+            await visitor.receive_json_from()
+
+            await visitor.send_json_to({"type": "typing", "is_typing": True})
+            response = await staff.receive_json_from()
+
+            await staff.disconnect()
+            await visitor.disconnect()
+            return response
+
+        assert async_to_sync(scenario)() == {"type": "typing", "is_typing": True, "sender": "visitor"}
+
+    def test_new_message_event_from_http_api(self):
+        """new_message group events are forwarded to the socket."""
+
+        async def scenario():
+            visitor = conversation_communicator()
+            await visitor.connect()
+            await visitor.receive_json_from()
+
+            await get_channel_layer().group_send(
+                f"chat_conversation_{CONVERSATION_ID}",
+                {"type": "new_message", "message_id": "m1", "message": "Hi", "direction": "outbound"},
+            )
+            response = await visitor.receive_json_from()
+            await visitor.disconnect()
+            return response
+
+        response = async_to_sync(scenario)()
+
+        assert response["type"] == "new_message"
+        assert response["message_id"] == "m1"
+        assert response["created_at"] is None
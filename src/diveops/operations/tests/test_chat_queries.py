@@ -4,6 +4,7 @@ These tests verify:
 1. Query count optimization (no N+1 queries)
 2. Correct annotations and filtering
 3. Cursor pagination behavior
+4. Keyset paging with opaque cursors
 """
 
 import pytest
@@ -20,6 +21,7 @@ from django_communication.models import (
     MessageStatus,
 )
 
+from diveops.operations.exceptions import InvalidCursor
 from diveops.operations.services.chat_queries import (
     ConversationQueryService,
     MessageQueryService,
@@ -209,6 +211,99 @@ class TestMessageQueryServiceGetMessages:
             assert msg.created_at < middle_msg.created_at
 
 
+# =============================================================================
+# MessageQueryService.get_message_page Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestMessageQueryServiceGetMessagePage:
+    """Tests for keyset pagination in MessageQueryService.get_message_page."""
+
+    def test_first_page_is_latest_in_chronological_order(self, conversation, messages):
+        """Without a cursor, returns the newest messages oldest-first."""
+        page = MessageQueryService.get_message_page(conversation, limit=4)
+
+        assert [m.pk for m in page.messages] == [m.pk for m in messages[-4:]]
+        assert page.has_more is True
+
+    def test_before_cursor_walks_whole_thread(self, conversation, messages):
+        """Following before_cursor returns every message exactly once."""
+        # Identical timestamps force the id tie-breaker
+        Message.objects.filter(conversation=conversation).update(created_at=messages[0].created_at)
+
+        page = MessageQueryService.get_message_page(conversation, limit=3)
+        seen = [m.pk for m in page.messages]
+        while page.has_more:
+            page = MessageQueryService.get_message_page(conversation, limit=3, before=page.before_cursor)
+            seen = [m.pk for m in page.messages] + seen
+
+        assert len(seen) == 10
+        assert set(seen) == {m.pk for m in messages}
+
+    def test_after_cursor_returns_only_new_messages(self, conversation, messages, person):
+        """Polling with after_cursor returns just the delta."""
+        page = MessageQueryService.get_message_page(conversation, limit=50)
+
+        empty = MessageQueryService.get_message_page(conversation, after=page.after_cursor)
+        assert empty.messages == []
+        assert empty.after_cursor == page.after_cursor
+
+        new = Message.objects.create(
+            conversation=conversation,
+            sender_person=person,
+            direction=MessageDirection.INBOUND,
+            body_text="New",
+            status=MessageStatus.SENT,
+        )
+        delta = MessageQueryService.get_message_page(conversation, after=page.after_cursor)
+        assert [m.pk for m in delta.messages] == [new.pk]
+
+    def test_since_timestamp(self, conversation, messages):
+        """since returns messages created after the timestamp."""
+        page = MessageQueryService.get_message_page(conversation, since=messages[0].created_at)
+
+        assert all(m.created_at > messages[0].created_at for m in page.messages)
+
+    def test_empty_since_page_keeps_position(self, conversation, messages, person):
+        """An empty since poll returns a cursor at that time, not None."""
+        latest = messages[-1].created_at
+
+        empty = MessageQueryService.get_message_page(conversation, since=latest)
+        assert empty.messages == []
+        assert empty.after_cursor is not None
+
+        new = Message.objects.create(
+            conversation=conversation,
+            sender_person=person,
+            direction=MessageDirection.INBOUND,
+            body_text="New",
+            status=MessageStatus.SENT,
+        )
+        delta = MessageQueryService.get_message_page(conversation, after=empty.after_cursor)
+        assert [m.pk for m in delta.messages] == [new.pk]
+
+    def test_invalid_cursor(self, conversation, messages):
+        """Malformed cursors raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            MessageQueryService.get_message_page(conversation, before="not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestConversationListForMobileCursor:
+    """Tests for keyset pagination in ConversationQueryService.list_for_mobile."""
+
+    def test_cursor_pages_cover_all_conversations(self, multiple_conversations):
+        """Pages follow on from each other without gaps or repeats."""
+        first = list(ConversationQueryService.list_for_mobile(user=None, limit=2))
+        cursor = ConversationQueryService.conversation_cursor(first[-1])
+        rest = list(ConversationQueryService.list_for_mobile(user=None, limit=10, cursor=cursor))
+
+        ids = [c.pk for c in first + rest]
+        assert len(ids) == 5
+        assert set(ids) == {c.pk for c in multiple_conversations}
+
+
 # =============================================================================
 # MessageQueryService.get_messages_for_lead Tests
 # =============================================================================
@@ -0,0 +1,187 @@
+"""Tests for the materialized conversation inbox summary.
+
+These tests verify:
+1. Summaries follow committed message changes and read marks, only while enabled
+2. Inbox queries on the summary table match the Subquery path
+3. Backfill rebuilds every summary
+"""
+
+import uuid
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_parties.models import Person
+from django_communication.models import (
+    Conversation,
+    ConversationStatus,
+    Message,
+    MessageDirection,
+    MessageStatus,
+)
+
+from diveops.operations.models import ConversationSummary
+from diveops.operations.services.chat_queries import ConversationQueryService, MessageQueryService
+from diveops.operations.services.chat_summary import ConversationSummaryService
+
+ANNOTATIONS = [
+    "last_message_preview",
+    "last_message_at_annotated",
+    "last_message_direction",
+    "last_message_sender_id",
+    "unread_count",
+    "needs_reply_annotated",
+]
+
+
+@pytest.fixture
+def person_ct(db):
+    """Get ContentType for Person."""
+    return ContentType.objects.get_for_model(Person)
+
+
+@pytest.fixture
+def conversations(db, person_ct, settings, django_capture_on_commit_callbacks):
+    """Create conversations with a mix of inbound and outbound last messages."""
+    settings.CHAT_SUMMARY_ENABLED = True
+    with django_capture_on_commit_callbacks(execute=True):
+        return _create_conversations(person_ct)
+
+
+def _create_conversations(person_ct):
+    result = []
+    for i in range(4):
+        person = Person.objects.create(
+            first_name=f"Person{i}",
+            last_name="Test",
+            email=f"person{i}@example.com",
+            lead_status="new",
+        )
+        conv = Conversation.objects.create(
+            subject=f"Conversation {i}",
+            related_content_type=person_ct,
+            related_object_id=str(person.pk),
+            status=ConversationStatus.ACTIVE,
+        )
+        for j in range(i + 1):
+            inbound = (i + j) % 2 == 0
+            Message.objects.create(
+                conversation=conv,
+                sender_person=person if inbound else None,
+                direction=MessageDirection.INBOUND if inbound else MessageDirection.OUTBOUND,
+                body_text=f"Message {j} in conv {i}",
+                status=MessageStatus.SENT,
+            )
+        result.append(conv)
+    return result
+
+
+def inbox_rows(qs):
+    """Inbox annotations per conversation, with sender ids as UUIDs.
+
+    A Subquery over a foreign key may return the raw column value
+    (e.g. hex text on SQLite), so ids are normalized before comparing.
+    """
+    rows = []
+    for conv in qs:
+        values = {name: getattr(conv, name) for name in ANNOTATIONS}
+        if values["last_message_sender_id"] is not None:
+            values["last_message_sender_id"] = uuid.UUID(str(values["last_message_sender_id"]))
+        rows.append((conv.pk, *values.values()))
+    return rows
+
+
+@pytest.mark.django_db
+class TestSummaryMaintenance:
+    """Tests for keeping summaries in step with messages."""
+
+    def test_created_with_messages(self, conversations):
+        """Each new message updates its conversation's summary."""
+        conv = conversations[2]
+        summary = ConversationSummary.objects.get(conversation=conv)
+        last = Message.objects.filter(conversation=conv).order_by("-created_at").first()
+
+        assert summary.last_message_id == last.pk
+        assert summary.last_message_preview == last.body_text
+        assert summary.needs_reply == (last.direction == MessageDirection.INBOUND)
+        assert summary.unread_inbound_count == Message.objects.filter(
+            conversation=conv, direction=MessageDirection.INBOUND
+        ).count()
+
+    def test_refreshed_after_commit(self, conversations, django_capture_on_commit_callbacks):
+        """A new message updates the summary only once its transaction commits."""
+        conv = conversations[0]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            message = Message.objects.create(
+                conversation=conv,
+                direction=MessageDirection.OUTBOUND,
+                body_text="Reply",
+                status=MessageStatus.SENT,
+            )
+            assert ConversationSummary.objects.get(conversation=conv).last_message_id != message.pk
+
+        assert ConversationSummary.objects.get(conversation=conv).last_message_id == message.pk
+
+    def test_not_maintained_while_disabled(self, conversations, settings, django_capture_on_commit_callbacks):
+        """With CHAT_SUMMARY_ENABLED off, message saves do no summary work."""
+        settings.CHAT_SUMMARY_ENABLED = False
+        conv = conversations[0]
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            Message.objects.create(
+                conversation=conv,
+                direction=MessageDirection.INBOUND,
+                body_text="Unsummarized",
+                status=MessageStatus.SENT,
+            )
+
+        assert callbacks == []
+        assert ConversationSummary.objects.get(conversation=conv).last_message_preview != "Unsummarized"
+
+    def test_mark_inbound_read_resets_unread(self, conversations, django_capture_on_commit_callbacks):
+        """Bulk read marks refresh the summary."""
+        conv = conversations[3]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            MessageQueryService.mark_inbound_read(conv)
+
+        assert ConversationSummary.objects.get(conversation=conv).unread_inbound_count == 0
+
+    def test_backfill_rebuilds(self, conversations):
+        """Backfill restores deleted or stale summaries."""
+        ConversationSummary.objects.all().delete()
+
+        written = ConversationSummaryService.backfill(batch_size=3)
+
+        assert written == 4
+        assert ConversationSummary.objects.count() == 4
+
+
+@pytest.mark.django_db
+class TestSummaryQueries:
+    """Tests for ConversationQueryService on the summary table."""
+
+    def test_mobile_matches_subquery_path(self, conversations, settings):
+        """Both paths return the same rows, order and annotations."""
+        settings.CHAT_SUMMARY_ENABLED = False
+        expected = inbox_rows(ConversationQueryService.list_for_mobile(user=None))
+
+        settings.CHAT_SUMMARY_ENABLED = True
+        actual = inbox_rows(ConversationQueryService.list_for_mobile(user=None))
+
+        assert actual == expected
+
+    def test_leads_single_query_without_subqueries(self, conversations, settings):
+        """The summary path is one query with a join, not per-row subqueries."""
+        settings.CHAT_SUMMARY_ENABLED = True
+        ContentType.objects.get_for_model(Person)  # Warm the ContentType cache
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = list(ConversationQueryService.list_for_leads(status="all"))
+
+        assert len(result) == 4
+        assert len(ctx.captured_queries) == 1
+        assert ctx.captured_queries[0]["sql"].upper().count("SELECT") == 1
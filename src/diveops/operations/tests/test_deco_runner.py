@@ -0,0 +1,134 @@
+"""Tests for the deco validator runner.
+
+Tests cover:
+- Batched validation: HTTP first, one-shot binary per input once HTTP is down
+- HTTP endpoint breaker accounting, health check and the pooled HTTP client
+"""
+
+import os
+import sys
+import textwrap
+from unittest.mock import patch
+
+import httpx
+import pytest
+from django.core.cache import cache
+
+from diveops.operations.planning import deco_runner
+
+# Same contract as diveops-deco-validate: one JSON document on stdin, one
+# result on stdout, then exit
+FAKE_ONESHOT = textwrap.dedent(
+    """
+    import json, os, sys
+
+    data = json.load(sys.stdin)
+    print(json.dumps({"tool": "oneshot", "pid": os.getpid(), "gf_low": data["gf_low"]}))
+    """
+)
+
+
+class TestRunDecoValidators:
+    """Tests for batched validation in deco_runner."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @patch.object(deco_runner, "_run_deco_binary", side_effect=lambda data: {"tool": "oneshot", **data})
+    @patch.object(deco_runner, "_run_deco_http", return_value=None)
+    def test_http_skipped_for_rest_of_batch(self, mock_http, mock_binary):
+        """Once HTTP is down, the remaining inputs go straight to the binary."""
+        results = deco_runner.run_deco_validators([{"gf_low": 0.3}, {"gf_low": 0.4}, {"gf_low": 0.5}])
+
+        assert [r["gf_low"] for r in results] == [0.3, 0.4, 0.5]
+        assert mock_http.call_count == 1
+        assert mock_binary.call_count == 3
+
+    @patch.object(deco_runner, "_run_deco_http", side_effect=lambda data: {"tool": "rust", **data})
+    def test_http_answers_whole_batch(self, mock_http):
+        """With HTTP up, every input is validated over the pooled client."""
+        with patch.object(deco_runner, "_run_deco_binary") as mock_binary:
+            results = deco_runner.run_deco_validators([{"gf_low": 0.3}, {"gf_low": 0.4}])
+
+        assert [r["tool"] for r in results] == ["rust", "rust"]
+        mock_binary.assert_not_called()
+
+    @patch.object(deco_runner, "_run_deco_http", return_value=None)
+    def test_oneshot_cli_runs_once_per_input(self, mock_http, settings, tmp_path):
+        """The binary fallback spawns the one-shot CLI for each input."""
+        script = tmp_path / "diveops-deco-validate"
+        script.write_text(f"#!{sys.executable}\n{FAKE_ONESHOT}")
+        os.chmod(script, 0o755)
+        settings.DECO_VALIDATOR_PATH = str(script)
+
+        results = deco_runner.run_deco_validators([{"gf_low": 0.3}, {"gf_low": 0.4}])
+
+        assert [r["gf_low"] for r in results] == [0.3, 0.4]
+        assert results[0]["pid"] != results[1]["pid"]
+
+
+class TestRunDecoHttp:
+    """Tests for the deco HTTP endpoint call."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        deco_runner.close_client()
+        yield
+        cache.clear()
+        deco_runner.close_client()
+
+    def _respond(self, status, body):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status, json=body))
+        return patch.object(deco_runner, "_get_client", return_value=httpx.Client(transport=transport))
+
+    def test_server_error_falls_back_and_counts_failure(self, settings):
+        """A 5xx response is a breaker failure and falls back to the binary."""
+        settings.RUST_CIRCUIT_FAILURE_THRESHOLD = 1
+
+        with self._respond(500, {"error": "database"}), \
+                patch("diveops.operations.pricing.circuit_breaker._ensure_health_probe"):
+            assert deco_runner._run_deco_http({"gf_low": 0.3}) is None
+
+        assert deco_runner.get_breaker("deco/validate").state == "open"
+
+    def test_validation_error_returned_as_is(self):
+        """A 4xx result from Rust is returned, without closing the circuit."""
+        with self._respond(400, {"error": "invalid_segments"}), \
+                patch.object(deco_runner.get_breaker("deco/validate"), "record_success") as success:
+            result = deco_runner._run_deco_http({"gf_low": 0.3})
+
+        assert result == {"error": "invalid_segments"}
+        success.assert_not_called()
+
+    def test_success_closes_circuit(self):
+        """Only a 2xx response records a success."""
+        with self._respond(200, {"tool": "rust"}), \
+                patch.object(deco_runner.get_breaker("deco/validate"), "record_success") as success:
+            assert deco_runner._run_deco_http({"gf_low": 0.3}) == {"tool": "rust"}
+
+        success.assert_called_once()
+
+    def test_health_checks_deco_endpoint(self):
+        """The deco health check asks the deco service, not pricing."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, json={"status": "ok", "service": "deco-validator"})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch.object(deco_runner, "_get_client", return_value=client):
+            assert deco_runner.check_health() is True
+
+        assert seen == ["/api/deco/health"]
+
+    def test_client_is_shared(self):
+        """Calls reuse one pooled client until it is closed."""
+        client = deco_runner._get_client()
+
+        assert deco_runner._get_client() is client
+        deco_runner.close_client()
+        assert client.is_closed
+        assert deco_runner._get_client() is not client
@@ -0,0 +1,297 @@
+"""Tests for the streaming document backup.
+
+These tests verify:
+1. Folder paths come from one preloaded folder map
+2. Files are streamed into the archive in chunks, compressed media stored as-is
+3. Trash, unfiled and individually selected documents land where they did before
+4. Unreadable files are listed in the manifest and skipped
+5. The download view streams the archive, under WSGI and ASGI
+6. S3 sync skips recorded documents without requests and batches deletes
+"""
+
+import io
+import json
+import os
+from unittest.mock import patch
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from django_documents.models import Document, DocumentFolder
+
+from diveops.operations.document_backup import (
+    STREAM_CHUNK_SIZE,
+    backup_documents,
+    plan_backup,
+    stream_backup,
+    sync_to_s3,
+)
+from diveops.operations.models import DocumentSyncRecord
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def make_folder(name, parent=None, slug=""):
+    return DocumentFolder.objects.create(name=name, parent=parent, slug=slug or name.lower())
+
+
+def make_document(folder, filename, data=b"dive log\n" * 100, content_type="text/plain"):
+    return Document.objects.create(
+        folder=folder,
+        file=ContentFile(data, name=filename),
+        filename=filename,
+        content_type=content_type,
+        document_type=content_type,
+        file_size=len(data),
+    )
+
+
+class LocalS3:
+    """In-memory stand-in for the S3 client calls sync_to_s3 makes."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def upload_fileobj(self, fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self.calls.append("upload")
+        self.objects[Key] = fileobj.read()
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, Bucket, Prefix):
+        self.calls.append("list")
+        yield {"Contents": [{"Key": key} for key in sorted(self.objects) if key.startswith(Prefix)]}
+
+    def delete_objects(self, Bucket, Delete):
+        self.calls.append("delete")
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+        return {}
+
+
+def read_archive(plan, **kwargs):
+    return ZipFile(io.BytesIO(b"".join(stream_backup(plan, **kwargs))))
+
+
+@pytest.mark.django_db
+class TestStreamBackup:
+    """Tests for plan_backup and stream_backup."""
+
+    def test_nested_paths_resolved_with_fixed_queries(self, django_assert_num_queries):
+        folder = make_folder("Sites")
+        for depth in range(4):
+            folder = make_folder(f"Level {depth}", parent=folder)
+            make_document(folder, f"notes_{depth}.txt")
+
+        # Folders, their documents, unfiled documents
+        with django_assert_num_queries(3):
+            plan = plan_backup()
+
+        names = read_archive(plan).namelist()
+        assert "documents/Sites/Level 0/Level 1/Level 2/Level 3/notes_3.txt" in names
+        assert "documents/manifest.json" in names
+
+    def test_compressed_media_stored_and_text_deflated(self):
+        folder = make_folder("Photos")
+        make_document(folder, "reef.jpg", os.urandom(1000), "image/jpeg")
+        make_document(folder, "log.txt")
+
+        archive = read_archive(plan_backup())
+
+        assert archive.getinfo("documents/Photos/reef.jpg").compress_type == ZIP_STORED
+        assert archive.getinfo("documents/Photos/log.txt").compress_type == ZIP_DEFLATED
+        assert archive.read("documents/Photos/log.txt") == b"dive log\n" * 100
+        assert archive.testzip() is None
+
+    def test_large_file_streamed_in_chunks(self):
+        data = os.urandom(STREAM_CHUNK_SIZE * 5)
+        make_document(make_folder("Video"), "wreck.mp4", data, "video/mp4")
+
+        chunks = list(stream_backup(plan_backup()))
+
+        assert len(chunks) > 5
+        assert ZipFile(io.BytesIO(b"".join(chunks))).read("documents/Video/wreck.mp4") == data
+
+    def test_trash_unfiled_and_duplicates(self):
+        folder = make_folder("Forms")
+        make_document(folder, "waiver.txt")
+        make_document(folder, "waiver.txt")
+        make_document(make_folder("Trash", slug="trash"), "old.txt")
+        make_document(None, "loose.txt")
+
+        archive = read_archive(plan_backup())
+        with_trash = read_archive(plan_backup(include_trash=True))
+
+        names = archive.namelist()
+        assert {"documents/Forms/waiver.txt", "documents/Forms/waiver_1.txt", "documents/_unfiled/loose.txt"} <= set(names)
+        assert "documents/Trash/old.txt" not in names
+        assert "documents/Trash/old.txt" in with_trash.namelist()
+
+    def test_selection_keeps_full_paths(self):
+        parent = make_folder("Customers")
+        selected = make_folder("Certifications", parent=parent)
+        make_document(selected, "card.pdf", b"%PDF-1.4", "application/pdf")
+        single = make_document(make_folder("Invoices"), "inv.txt")
+        loose = make_document(None, "note.txt")
+
+        plan = plan_backup(folder_ids=[str(selected.pk)], document_ids=[str(single.pk), str(loose.pk)])
+        archive = read_archive(plan)
+
+        assert set(archive.namelist()) == {
+            "documents/Customers/Certifications/card.pdf",
+            "documents/Invoices/inv.txt",
+            "documents/_selected/note.txt",
+            "documents/manifest.json",
+        }
+        assert json.loads(archive.read("documents/manifest.json"))["selection_mode"] == "custom"
+
+    def test_missing_file_counted(self):
+        doc = make_document(make_folder("Lost"), "gone.txt")
+        doc.file.storage.delete(doc.file.name)
+
+        manifest = json.loads(read_archive(plan_backup()).read("documents/manifest.json"))
+
+        assert manifest["statistics"]["documents_missing"] == 1
+        assert manifest["documents"] == []
+        assert manifest["errors"][0]["id"] == str(doc.pk)
+
+    def test_backend_error_recorded_and_archive_continues(self):
+        class ReadTimeoutError(Exception):
+            """Like botocore's, not an OSError."""
+
+        class FailingSource(io.BytesIO):
+            def read(self, size=-1):
+                raise ReadTimeoutError("Read timeout on endpoint URL")
+
+        folder = make_folder("Forms")
+        broken = make_document(folder, "broken.txt")
+        make_document(folder, "waiver.txt")
+        field_file = type(broken.file)
+        original_open = field_file.open
+
+        def open_file(self, mode="rb"):
+            if self.name == broken.file.name:
+                return FailingSource()
+            return original_open(self, mode)
+
+        with patch.object(field_file, "open", open_file):
+            archive = read_archive(plan_backup())
+
+        manifest = json.loads(archive.read("documents/manifest.json"))
+        assert [d["filename"] for d in manifest["documents"]] == ["waiver.txt"]
+        (error,) = manifest["errors"]
+        assert error["path"] == "Forms/broken.txt"
+        assert error["error"].startswith("ReadTimeoutError")
+        assert manifest["statistics"]["documents_missing"] == 1
+        assert archive.read("documents/Forms/waiver.txt") == b"dive log\n" * 100
+
+    def test_backup_documents_writes_file(self, tmp_path):
+        make_document(make_folder("Forms"), "waiver.txt")
+        output = str(tmp_path / "backup.zip")
+
+        assert backup_documents(output_path=output, include_metadata=False) == output
+        assert ZipFile(output).namelist() == ["documents/Forms/waiver.txt"]
+
+
+@pytest.mark.django_db
+class TestSyncToS3:
+    """Tests for the incremental S3 sync."""
+
+    @pytest.fixture
+    def s3(self):
+        return LocalS3()
+
+    def test_unchanged_documents_cost_no_requests(self, s3):
+        folder = make_folder("Forms", parent=make_folder("Shop"))
+        make_document(folder, "waiver.txt")
+        make_document(folder, "waiver.txt", b"second")
+
+        first = sync_to_s3("bucket", prefix="backup", client=s3)
+        s3.calls.clear()
+        second = sync_to_s3("bucket", prefix="backup", client=s3)
+
+        assert first["uploaded"] == 2
+        assert set(s3.objects) == {"backup/Shop/Forms/waiver.txt", "backup/Shop/Forms/waiver_1.txt"}
+        assert second["skipped"] == 2
+        assert s3.calls == []
+
+    def test_changed_document_uploaded_again(self, s3):
+        folder = make_folder("Forms")
+        changed = make_document(folder, "waiver.txt")
+        make_document(folder, "medical.txt")
+        sync_to_s3("bucket", client=s3)
+
+        changed.checksum = "new"
+        changed.save()
+        stats = sync_to_s3("bucket", client=s3)
+
+        assert (stats["uploaded"], stats["skipped"]) == (1, 1)
+        assert DocumentSyncRecord.objects.get(document=changed).checksum == "new"
+
+    def test_full_sync_ignores_records(self, s3):
+        make_document(make_folder("Forms"), "waiver.txt")
+        sync_to_s3("bucket", client=s3)
+
+        assert sync_to_s3("bucket", client=s3, full=True)["uploaded"] == 1
+
+    def test_delete_removed_batches_and_restores(self, s3):
+        kept = make_document(make_folder("Forms"), "waiver.txt")
+        sync_to_s3("bucket", client=s3)
+        s3.objects.clear()
+        s3.objects.update({f"document-backup/old/{i}.txt": b"" for i in range(3)})
+        s3.calls.clear()
+
+        stats = sync_to_s3("bucket", client=s3, delete_removed=True)
+
+        assert s3.calls.count("delete") == 1
+        assert stats["deleted"] == 3
+        # The recorded object was missing from the listing, so it was uploaded again
+        assert stats["uploaded"] == 1
+        assert set(s3.objects) == {"document-backup/Forms/waiver.txt"}
+        assert DocumentSyncRecord.objects.filter(document=kept).count() == 1
+
+
+@pytest.mark.django_db
+class TestDocumentBackupDownloadView:
+    """Tests for the backup download endpoint."""
+
+    def test_streams_zip(self):
+        make_document(make_folder("Forms"), "waiver.txt")
+        User.objects.create_user(username="backupstaff", password="testpass123", is_staff=True)
+        client = Client()
+        client.login(username="backupstaff", password="testpass123")
+
+        response = client.post(reverse("diveops:document-backup-download"), {"backup_all": "on"})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Disposition"].startswith('attachment; filename="document_backup_')
+        archive = ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        assert "documents/Forms/waiver.txt" in archive.namelist()
+
+    def test_streams_async_under_asgi(self):
+        make_document(make_folder("Forms"), "waiver.txt")
+        staff = User.objects.create_user(username="asyncbackup", password="testpass123", is_staff=True)
+
+        async def download():
+            client = AsyncClient()
+            await client.aforce_login(staff)
+            response = await client.post(reverse("diveops:document-backup-download"), {"backup_all": "on"})
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(download)()
+
+        assert response.is_async
+        assert "documents/Forms/waiver.txt" in ZipFile(io.BytesIO(body)).namelist()
@@ -0,0 +1,192 @@
+"""Tests for excursion track reconstruction.
+
+These tests verify:
+1. Polyline encoding and zoom-dependent simplification
+2. Tracks are grouped per person, time-ordered and limited to staff-visible people
+3. Completed excursions are served from the cache
+4. The staff API streams GeoJSON or polylines with an ETag, under WSGI and ASGI
+"""
+
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from django_parties.models import Person
+
+from diveops.operations.models import LocationSharingPreference, LocationUpdate
+from diveops.operations.services.location_tracks import (
+    ExcursionTrackService,
+    encode_polyline,
+    tolerance_for_zoom,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_diver(name, visibility=LocationSharingPreference.Visibility.STAFF):
+    person = Person.objects.create(first_name=name, last_name="Diver")
+    LocationSharingPreference.objects.create(person=person, visibility=visibility)
+    return person
+
+
+def record_track(person, excursion, count):
+    """Points heading due east in a straight line, recorded newest first."""
+    start = timezone.now() - timedelta(hours=1)
+    for i in reversed(range(count)):
+        LocationUpdate.objects.create(
+            person=person,
+            excursion=excursion,
+            latitude=Decimal("20.500000"),
+            longitude=Decimal("-87.300000") + Decimal(i) / 10000,
+            recorded_at=start + timedelta(seconds=i * 10),
+        )
+
+
+class TestEncoding:
+    """Tests for polyline encoding and simplification tolerance."""
+
+    def test_encode_polyline_reference_example(self):
+        points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+
+        assert encode_polyline(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+    def test_tolerance_halves_per_zoom_level(self):
+        assert tolerance_for_zoom(None, 20.5) == 0
+        assert tolerance_for_zoom(15, 20.5) == pytest.approx(tolerance_for_zoom(14, 20.5) / 2)
+        assert 4 < tolerance_for_zoom(15, 0) < 5
+
+
+@pytest.mark.django_db
+class TestExcursionTracks:
+    """Tests for ExcursionTrackService."""
+
+    def test_tracks_grouped_per_person_in_time_order(self, excursion):
+        first, second = make_diver("First"), make_diver("Second")
+        record_track(first, excursion, 5)
+        record_track(second, excursion, 3)
+
+        tracks = list(ExcursionTrackService.iter_tracks(excursion))
+
+        assert sorted(len(t.points) for t in tracks) == [3, 5]
+        for track in tracks:
+            times = [p.recorded_at for p in track.points]
+            assert times == sorted(times)
+
+    def test_zoom_simplifies_straight_track(self, excursion):
+        record_track(make_diver("Line"), excursion, 30)
+
+        (track,) = ExcursionTrackService.iter_tracks(excursion, zoom=14)
+
+        assert len(track.points) == 2
+
+    def test_private_people_excluded(self, excursion):
+        record_track(make_diver("Hidden", LocationSharingPreference.Visibility.PRIVATE), excursion, 5)
+
+        assert list(ExcursionTrackService.iter_tracks(excursion)) == []
+
+    def test_completed_excursion_served_from_cache(self, excursion, django_assert_max_num_queries):
+        record_track(make_diver("Cached"), excursion, 5)
+        excursion.status = "completed"
+        excursion.save()
+
+        first = "".join(ExcursionTrackService.stream(excursion, fmt="polyline"))
+        with django_assert_max_num_queries(1):
+            second = "".join(ExcursionTrackService.stream(excursion, fmt="polyline"))
+
+        assert first == second
+        assert len(json.loads(first)["tracks"]) == 1
+
+    def test_late_upload_changes_cached_track(self, excursion):
+        person = make_diver("Late")
+        record_track(person, excursion, 5)
+        excursion.status = "completed"
+        excursion.save()
+        "".join(ExcursionTrackService.stream(excursion, fmt="polyline"))
+
+        LocationUpdate.objects.create(
+            person=person,
+            excursion=excursion,
+            latitude=Decimal("20.600000"),
+            longitude=Decimal("-87.300000"),
+            recorded_at=timezone.now(),
+        )
+        body = json.loads("".join(ExcursionTrackService.stream(excursion, fmt="polyline")))
+
+        assert len(body["tracks"][0]["times"]) == 6
+
+
+@pytest.mark.django_db
+class TestExcursionTrackAPIView:
+    """Tests for the staff excursion track endpoint."""
+
+    @pytest.fixture
+    def staff_client(self):
+        User.objects.create_user(username="trackstaff", password="testpass123", is_staff=True)
+        client = Client()
+        client.login(username="trackstaff", password="testpass123")
+        return client
+
+    def test_geojson_feature_per_person(self, staff_client, excursion):
+        record_track(make_diver("Geo"), excursion, 4)
+
+        response = staff_client.get(reverse("diveops:excursion-track", kwargs={"pk": excursion.pk}))
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/geo+json"
+        data = json.loads(b"".join(response.streaming_content))
+        (feature,) = data["features"]
+        assert feature["geometry"]["type"] == "LineString"
+        assert len(feature["geometry"]["coordinates"]) == len(feature["properties"]["coordTimes"]) == 4
+        assert feature["properties"]["person_name"] == "Geo Diver"
+
+    def test_polyline_format_and_etag(self, staff_client, excursion):
+        record_track(make_diver("Poly"), excursion, 4)
+        url = reverse("diveops:excursion-track", kwargs={"pk": excursion.pk})
+
+        response = staff_client.get(url, {"format": "polyline", "zoom": "16"})
+        data = json.loads(b"".join(response.streaming_content))
+        repeat = staff_client.get(
+            url, {"format": "polyline", "zoom": "16"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert data["zoom"] == 16
+        assert data["tracks"][0]["polyline"]
+        assert repeat.status_code == 304
+
+    def test_streams_async_under_asgi(self, excursion):
+        staff = User.objects.create_user(username="asyncstaff", password="testpass123", is_staff=True)
+        record_track(make_diver("Async"), excursion, 4)
+        url = reverse("diveops:excursion-track", kwargs={"pk": excursion.pk})
+
+        async def fetch():
+            client = AsyncClient()
+            await client.aforce_login(staff)
+            response = await client.get(url)
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(fetch)()
+
+        assert response.is_async
+        assert len(json.loads(body)["features"]) == 1
+
+    def test_invalid_params_rejected(self, staff_client, excursion):
+        url = reverse("diveops:excursion-track", kwargs={"pk": excursion.pk})
+
+        assert staff_client.get(url, {"format": "kml"}).status_code == 400
+        assert staff_client.get(url, {"zoom": "99"}).status_code == 400
+        assert staff_client.get(url, {"person": "nope"}).status_code == 400
@@ -0,0 +1,104 @@
+"""Tests for the FCM multicast push pipeline.
+
+These tests verify:
+1. Devices are sent to in multicast batches of up to 500 tokens
+2. Device state is written back in bulk
+3. Staff chat notifications are queued until commit and reach staff only
+
+Firebase is replaced by StubSender (FCM_PUSH_SENDER in test settings).
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_communication.models import FCMDevice
+
+from diveops.operations.services import fcm
+from diveops.operations.services.fcm import StubSender
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def stub_sender(settings):
+    settings.FCM_PUSH_SENDER = "diveops.operations.services.fcm.StubSender"
+    settings.FCM_PUSH_ASYNC = False
+    StubSender.reset()
+    yield StubSender
+    StubSender.reset()
+
+
+@pytest.fixture
+def staff_user(db):
+    return User.objects.create_user(username="staff", password="x", is_staff=True)
+
+
+def make_devices(user, count, prefix="token"):
+    return FCMDevice.objects.bulk_create(
+        FCMDevice(user=user, registration_id=f"{prefix}-{i}", platform="android", is_active=True, failure_count=0)
+        for i in range(count)
+    )
+
+
+@pytest.mark.django_db
+class TestSendPushToDevices:
+    """Tests for send_push_to_devices."""
+
+    def test_multicast_batches(self, staff_user):
+        """1200 devices are sent in batches of 500, 500 and 200."""
+        make_devices(staff_user, 1200)
+
+        sent = fcm.send_push_to_user(staff_user, "Title", "Body")
+
+        assert sent == 1200
+        assert [len(call["tokens"]) for call in StubSender.sent] == [500, 500, 200]
+
+    def test_state_written_back_in_bulk(self, staff_user, settings):
+        """Failures and recoveries are saved with one bulk update."""
+        settings.FCM_MAX_FAILURES = 3
+        devices = make_devices(staff_user, 4)
+        FCMDevice.objects.filter(pk=devices[0].pk).update(failure_count=2)
+        FCMDevice.objects.filter(pk=devices[1].pk).update(failure_count=2)
+        StubSender.fail_tokens = {"token-2"}
+        StubSender.sent = []
+
+        with CaptureQueriesContext(connection) as ctx:
+            sent = fcm.send_push_to_devices(fcm._active_devices(user=staff_user), "Title", "Body")
+
+        assert sent == 3
+        # One SELECT for the devices, one UPDATE for all changed rows
+        assert len(ctx.captured_queries) == 2
+        state = {d.registration_id: (d.failure_count, d.is_active) for d in FCMDevice.objects.all()}
+        assert state["token-0"] == (0, True)
+        assert state["token-2"] == (1, False)
+        assert state["token-3"] == (0, True)
+
+
+@pytest.mark.django_db
+class TestNotifyStaff:
+    """Tests for notify_staff_of_new_message."""
+
+    def test_queued_until_commit_and_sent_to_staff(self, staff_user, django_capture_on_commit_callbacks):
+        """The push waits for commit and skips non-staff devices."""
+        customer = User.objects.create_user(username="customer", password="x")
+        make_devices(staff_user, 2, prefix="staff")
+        make_devices(customer, 1, prefix="customer")
+
+        class Sender:
+            pk = "6f1c2a9e-0000-4000-8000-000000000001"
+            first_name = "Ana"
+            last_name = "Diver"
+            email = "ana@example.com"
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            fcm.notify_staff_of_new_message(Sender(), "Hello there", "conv-1")
+            assert StubSender.sent == []
+
+        assert len(callbacks) == 1
+        assert len(StubSender.sent) == 1
+        call = StubSender.sent[0]
+        assert sorted(call["tokens"]) == ["staff-0", "staff-1"]
+        assert call["title"] == "New message from Ana Diver"
+        assert call["data"]["conversation_id"] == "conv-1"
@@ -0,0 +1,177 @@
+"""Tests for recursive folder tree resolution.
+
+These tests verify:
+1. A whole subtree loads in one query, with paths and Trash pruning
+2. Ancestor chains are cached and invalidated when a folder changes
+3. Backup folder trees and stats are built from the subtree
+4. Trash views treat documents in Trash subfolders as trashed
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from django_documents.models import Document, DocumentFolder
+
+from diveops.operations.services.folder_tree import FolderTreeService
+
+User = get_user_model()
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_folder(name, parent=None, slug=""):
+    return DocumentFolder.objects.create(name=name, parent=parent, slug=slug or name.lower())
+
+
+@pytest.fixture
+def tree():
+    """Shop/Forms/Waivers, Shop/Archive (deleted), Trash/Old."""
+    shop = make_folder("Shop")
+    forms = make_folder("Forms", parent=shop)
+    waivers = make_folder("Waivers", parent=forms)
+    archive = make_folder("Archive", parent=shop)
+    archive.deleted_at = timezone.now()
+    archive.save()
+    trash = make_folder("Trash", slug="trash")
+    old = make_folder("Old", parent=trash)
+    return {"shop": shop, "forms": forms, "waivers": waivers, "trash": trash, "old": old}
+
+
+@pytest.mark.django_db
+class TestSubtree:
+    """Tests for FolderTreeService.subtree."""
+
+    def test_whole_tree_in_one_query(self, tree, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            folders = FolderTreeService.subtree()
+
+        assert [f.tree_path for f in folders] == [
+            ("Shop",),
+            ("Shop", "Forms"),
+            ("Shop", "Forms", "Waivers"),
+            ("Trash",),
+            ("Trash", "Old"),
+        ]
+
+    def test_trash_pruned(self, tree):
+        folders = FolderTreeService.subtree(include_trash=False)
+
+        assert {f.name for f in folders} == {"Shop", "Forms", "Waivers"}
+
+    def test_nested_root_keeps_full_path(self, tree):
+        folders = FolderTreeService.subtree([tree["forms"].pk])
+
+        assert [f.tree_path for f in folders] == [("Shop", "Forms"), ("Shop", "Forms", "Waivers")]
+        assert folders[1].parent_id == tree["forms"].pk
+
+
+@pytest.mark.django_db
+class TestChains:
+    """Tests for cached ancestor chains."""
+
+    def test_ancestors_cached(self, tree, django_assert_num_queries):
+        FolderTreeService.ancestors(tree["waivers"])
+
+        with django_assert_num_queries(0):
+            crumbs = FolderTreeService.ancestors(tree["waivers"])
+
+        assert crumbs == [tree["shop"], tree["forms"], tree["waivers"]]
+        assert [c.name for c in crumbs] == ["Shop", "Forms", "Waivers"]
+
+    def test_rename_bumps_version(self, tree, django_capture_on_commit_callbacks):
+        assert FolderTreeService.paths([tree["waivers"].pk])[tree["waivers"].pk] == ("Shop", "Forms", "Waivers")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            tree["forms"].name = "Paperwork"
+            tree["forms"].save()
+
+        assert FolderTreeService.paths([tree["waivers"].pk])[tree["waivers"].pk] == ("Shop", "Paperwork", "Waivers")
+
+    def test_is_in_trash(self, tree):
+        assert FolderTreeService.is_in_trash(tree["old"])
+        assert not FolderTreeService.is_in_trash(tree["forms"])
+
+
+@pytest.mark.django_db
+class TestBackupTree:
+    """Tests for the backup page folder tree and stats."""
+
+    def test_backup_folder_tree(self, tree, django_assert_num_queries):
+        from diveops.operations.document_views import DocumentBackupView
+
+        Document.objects.create(folder=tree["forms"], filename="waiver.pdf")
+
+        with django_assert_num_queries(2):
+            roots = DocumentBackupView()._build_folder_tree()
+
+        shop = roots[0]
+        assert [r["name"] for r in roots] == ["Shop", "Trash"]
+        assert shop["children"][0]["name"] == "Forms"
+        assert shop["children"][0]["document_count"] == 1
+        assert shop["children"][0]["children"][0]["name"] == "Waivers"
+
+    def test_trash_subfolders_counted(self, tree):
+        from diveops.operations.document_backup import get_backup_stats
+
+        Document.objects.create(folder=tree["old"], filename="old.pdf")
+
+        assert get_backup_stats()["trash_documents"] == 1
+
+
+@pytest.mark.django_db
+class TestTrashViews:
+    """Tests for the trash document views on Trash subfolders."""
+
+    @pytest.fixture
+    def staff_client(self):
+        User.objects.create_user(username="trashstaff", password="testpass123", is_staff=True)
+        client = Client()
+        client.login(username="trashstaff", password="testpass123")
+        return client
+
+    def test_restore_from_trash_subfolder(self, tree, staff_client):
+        doc = Document.objects.create(
+            folder=tree["old"], filename="old.pdf", metadata={"original_folder_id": str(tree["forms"].pk)}
+        )
+
+        staff_client.post(reverse("diveops:document-restore", kwargs={"pk": doc.pk}))
+
+        doc.refresh_from_db()
+        assert doc.folder_id == tree["forms"].pk
+
+    def test_trashed_document_not_trashed_again(self, tree, staff_client):
+        doc = Document.objects.create(
+            folder=tree["old"], filename="old.pdf", metadata={"original_folder_id": str(tree["forms"].pk)}
+        )
+
+        staff_client.post(reverse("diveops:document-delete", kwargs={"pk": doc.pk}))
+
+        doc.refresh_from_db()
+        assert doc.folder_id == tree["old"].pk
+        assert doc.metadata["original_folder_id"] == str(tree["forms"].pk)
+
+    def test_permanent_delete_from_trash_subfolder(self, tree, staff_client):
+        trashed = Document.objects.create(folder=tree["old"], filename="old.pdf")
+        live = Document.objects.create(folder=tree["forms"], filename="waiver.pdf")
+
+        staff_client.post(reverse("diveops:document-permanent-delete", kwargs={"pk": trashed.pk}))
+        staff_client.post(reverse("diveops:document-permanent-delete", kwargs={"pk": live.pk}))
+
+        assert set(Document.objects.values_list("pk", flat=True)) == {live.pk}
+
+    def test_empty_trash_includes_subfolders(self, tree, staff_client):
+        Document.objects.create(folder=tree["trash"], filename="top.pdf")
+        Document.objects.create(folder=tree["old"], filename="old.pdf")
+        live = Document.objects.create(folder=tree["forms"], filename="waiver.pdf")
+
+        staff_client.post(reverse("diveops:empty-trash"))
+
+        assert set(Document.objects.values_list("pk", flat=True)) == {live.pk}
@@ -0,0 +1,156 @@
+"""Tests for location history retention.
+
+These tests verify:
+1. Douglas-Peucker keeps a track's shape within tolerance
+2. Compaction downsamples and expires per visibility policy, in batches
+3. Monthly partitioning (PostgreSQL only)
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from django_parties.models import Person
+
+from diveops.operations.models import LocationSharingPreference, LocationUpdate
+from diveops.operations.services import location_partitions
+from diveops.operations.services.location_retention import LocationRetentionService, douglas_peucker
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+POLICIES = {
+    "default": {"downsample_after_days": 30, "tolerance_meters": 10, "delete_after_days": 365},
+    "private": {"downsample_after_days": 7, "tolerance_meters": 10, "delete_after_days": 90},
+}
+
+
+@pytest.fixture(autouse=True)
+def policies(settings):
+    settings.LOCATION_RETENTION_POLICIES = POLICIES
+
+
+def make_person(visibility=None):
+    person = Person.objects.create(first_name="Track", last_name="Diver")
+    if visibility:
+        LocationSharingPreference.objects.create(person=person, visibility=visibility)
+    return person
+
+
+def make_track(person, start, count, step_seconds=10):
+    """Points heading due east in a straight line, ~11m apart."""
+    return [
+        LocationUpdate.objects.create(
+            person=person,
+            latitude=Decimal("20.500000"),
+            longitude=Decimal("-87.300000") + Decimal(i) / 10000,
+            recorded_at=start + timedelta(seconds=i * step_seconds),
+        )
+        for i in range(count)
+    ]
+
+
+class TestDouglasPeucker:
+    """Tests for douglas_peucker."""
+
+    def test_straight_line_keeps_endpoints(self):
+        points = [(20.5, -87.3 + i * 0.0001) for i in range(50)]
+
+        assert douglas_peucker(points, tolerance_meters=1) == [0, 49]
+
+    def test_corner_is_kept(self):
+        """A right-angle turn survives; points along each leg do not."""
+        east = [(20.5, -87.3 + i * 0.0001) for i in range(10)]
+        north = [(20.5 + i * 0.0001, -87.3 + 9 * 0.0001) for i in range(1, 10)]
+
+        assert douglas_peucker(east + north, tolerance_meters=5) == [0, 9, 18]
+
+    def test_small_wiggles_within_tolerance_removed(self):
+        """Offsets of ~1m are dropped at a 10m tolerance but kept at 0.5m."""
+        points = [(20.5 + (0.00001 if i % 2 else 0), -87.3 + i * 0.0001) for i in range(20)]
+
+        assert douglas_peucker(points, tolerance_meters=10) == [0, 19]
+        assert len(douglas_peucker(points, tolerance_meters=0.5)) == 20
+
+
+@pytest.mark.django_db
+class TestCompaction:
+    """Tests for LocationRetentionService.compact."""
+
+    def test_downsamples_by_visibility_policy(self):
+        """Private tracks are thinned after 7 days, others only after 30."""
+        private = make_person(LocationSharingPreference.Visibility.PRIVATE)
+        other = make_person()
+        make_track(private, NOW - timedelta(days=10), 30)
+        make_track(other, NOW - timedelta(days=10), 30)
+
+        result = LocationRetentionService.compact(now=NOW)
+
+        assert result.tracks == 1
+        kept = LocationUpdate.objects.filter(person=private)
+        assert kept.count() == 2
+        assert all(loc.is_downsampled for loc in kept)
+        assert LocationUpdate.objects.filter(person=other).count() == 30
+
+    def test_recent_points_untouched_and_old_points_expired(self):
+        person = make_person(LocationSharingPreference.Visibility.PRIVATE)
+        make_track(person, NOW - timedelta(days=1), 10)
+        make_track(person, NOW - timedelta(days=100), 10)
+
+        result = LocationRetentionService.compact(now=NOW)
+
+        assert result.points_expired == 10
+        assert LocationUpdate.objects.filter(person=person).count() == 10
+
+    def test_rerun_is_noop(self):
+        person = make_person(LocationSharingPreference.Visibility.PRIVATE)
+        make_track(person, NOW - timedelta(days=10), 30)
+        LocationRetentionService.compact(now=NOW)
+
+        result = LocationRetentionService.compact(now=NOW)
+
+        assert (result.tracks, result.points_removed, result.points_expired) == (0, 0, 0)
+
+    def test_max_batches_stops_early(self):
+        """Each track is its own batch at batch_size=1; the run resumes later."""
+        person = make_person(LocationSharingPreference.Visibility.PRIVATE)
+        for day in (10, 11, 12):
+            make_track(person, NOW - timedelta(days=day), 5)
+
+        first = LocationRetentionService.compact(now=NOW, batch_size=1, max_batches=2)
+        second = LocationRetentionService.compact(now=NOW, batch_size=1)
+
+        assert (first.tracks, first.complete) == (2, False)
+        assert (second.tracks, second.complete) == (1, True)
+
+    def test_dry_run_changes_nothing(self):
+        person = make_person(LocationSharingPreference.Visibility.PRIVATE)
+        make_track(person, NOW - timedelta(days=10), 30)
+
+        result = LocationRetentionService.compact(now=NOW, dry_run=True)
+
+        assert result.points_removed == 28
+        assert LocationUpdate.objects.filter(person=person).count() == 30
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Partitioning requires PostgreSQL")
+class TestPartitions:
+    """Tests for monthly partitioning of LocationUpdate."""
+
+    def test_convert_keeps_rows_and_drops_expired_months(self):
+        person = make_person()
+        make_track(person, datetime(2024, 1, 10, tzinfo=dt_timezone.utc), 3)
+        recent = make_track(person, datetime.now(dt_timezone.utc) - timedelta(minutes=5), 3)
+
+        location_partitions.convert_to_partitioned(months_ahead=1)
+
+        assert location_partitions.is_partitioned()
+        assert LocationUpdate.objects.filter(person=person).count() == 6
+        assert LocationUpdate.objects.get(pk=recent[0].pk).person_id == person.pk
+
+        dropped = location_partitions.drop_expired_partitions(datetime(2024, 2, 1, tzinfo=dt_timezone.utc))
+
+        assert dropped == 1
+        assert LocationUpdate.objects.filter(person=person).count() == 3
@@ -0,0 +1,99 @@
+"""Tests for media rendition prefetching and the rendition queue.
+
+These tests verify:
+1. A list of documents resolves its thumbnail URLs with one lookup
+2. thumbnail_url reads prefetched URLs and falls back to the original
+3. Uploads queue rendition generation after commit
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from diveops.operations.services import media_renditions
+from diveops.operations.services.media_renditions import enqueue_renditions, prefetch_thumbnail_urls
+from diveops.operations.templatetags.diveops_tags import prefetch_thumbnails, thumbnail_url
+
+
+def make_document(pk):
+    return SimpleNamespace(
+        pk=pk,
+        metadata={},
+        file=SimpleNamespace(name=f"documents/original_{pk}.jpg", url=f"/media/original_{pk}.jpg"),
+    )
+
+
+INDEX = {
+    1: {"small": "/media/small_1.jpg", "medium": "/media/medium_1.jpg"},
+    2: {"medium": "/media/medium_2.jpg"},
+}
+
+
+class TestPrefetch:
+    """Tests for prefetch_thumbnail_urls and the template tags."""
+
+    def test_one_lookup_for_many_documents(self):
+        documents = [make_document(pk) for pk in (1, 2, 3)]
+
+        with patch.object(media_renditions, "rendition_index", return_value=INDEX) as index:
+            prefetch_thumbnail_urls(documents)
+
+        index.assert_called_once()
+        assert set(index.call_args.args[0]) == {1, 2, 3}
+        assert documents[2]._thumbnail_urls == {}
+
+    def test_prefetch_through_attribute_and_skips_prefetched(self):
+        photos = [SimpleNamespace(document=make_document(pk)) for pk in (1, 2)]
+
+        with patch.object(media_renditions, "rendition_index", return_value=INDEX) as index:
+            prefetch_thumbnails(photos, "document")
+            prefetch_thumbnails(photos, "document")
+
+        index.assert_called_once()
+        assert photos[0].document._thumbnail_urls["small"] == "/media/small_1.jpg"
+
+    def test_thumbnail_url_uses_prefetched_urls(self):
+        document = make_document(1)
+        document._thumbnail_urls = INDEX[1]
+
+        with patch.object(media_renditions, "rendition_index") as index:
+            assert thumbnail_url({}, document, "small") == "/media/small_1.jpg"
+            assert thumbnail_url({}, document, "large") == "/media/original_1.jpg"
+
+        index.assert_not_called()
+
+    def test_thumbnail_url_looks_up_each_document_once(self):
+        document = make_document(2)
+
+        with patch.object(media_renditions, "rendition_index", return_value=INDEX) as index:
+            assert thumbnail_url({}, document, "medium") == "/media/medium_2.jpg"
+            assert thumbnail_url({}, document, "small") == "/media/original_2.jpg"
+
+        index.assert_called_once()
+
+
+@pytest.mark.django_db
+class TestRenditionQueue:
+    """Tests for enqueue_renditions."""
+
+    def test_inline_when_not_async(self, settings):
+        settings.MEDIA_RENDITIONS_ASYNC = False
+
+        with patch.object(media_renditions, "generate_asset_renditions") as generate:
+            enqueue_renditions(SimpleNamespace(pk=7))
+
+        generate.assert_called_once_with(7)
+
+    def test_queued_after_commit(self, settings, django_capture_on_commit_callbacks):
+        settings.MEDIA_RENDITIONS_ASYNC = True
+
+        with patch.object(media_renditions, "_queue") as jobs:
+            with django_capture_on_commit_callbacks(execute=False) as callbacks:
+                enqueue_renditions(SimpleNamespace(pk=7))
+            jobs.put.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+
+        jobs.put.assert_called_once_with(7)
@@ -14,7 +14,9 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 
@@ -474,6 +476,71 @@ class TestLocationUpdateView:
         data = response.json()
         assert data["created"] == 3
 
+    def test_location_update_batch_per_item_results(self, api_client, customer_token, customer_person):
+        """Invalid and duplicate updates are reported per item."""
+        now = timezone.now()
+        LocationUpdate.objects.create(
+            person=customer_person,
+            latitude=Decimal("20.5"),
+            longitude=Decimal("-87.3"),
+            recorded_at=now,
+        )
+        updates = [
+            {"latitude": 20.5, "longitude": -87.3, "recorded_at": now.isoformat()},
+            {"latitude": 95.0, "longitude": -87.3, "recorded_at": (now - timedelta(minutes=2)).isoformat()},
+            {"latitude": 20.6, "longitude": -87.4, "recorded_at": (now - timedelta(minutes=1)).isoformat()},
+            {"latitude": 20.6, "longitude": -87.4, "recorded_at": (now - timedelta(minutes=1)).isoformat()},
+        ]
+
+        response = api_client.post(
+            "/api/mobile/location/batch/",
+            data=json.dumps({"updates": updates}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {customer_token}",
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert (data["accepted"], data["rejected"], data["duplicates"]) == (1, 1, 2)
+        assert [item["status"] for item in data["results"]] == ["duplicate", "rejected", "accepted", "duplicate"]
+        assert data["results"][1]["error"] == "Latitude must be between -90 and 90"
+        assert LocationUpdate.objects.filter(person=customer_person).count() == 2
+
+    def test_location_update_batch_single_insert(self, api_client, customer_token, customer_person):
+        """A batch is written with one INSERT, not one per update."""
+        now = timezone.now()
+        updates = [
+            {"latitude": 20.5, "longitude": -87.3, "recorded_at": (now - timedelta(seconds=i)).isoformat()}
+            for i in range(200)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(
+                "/api/mobile/location/batch/",
+                data=json.dumps({"updates": updates}),
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"Bearer {customer_token}",
+            )
+
+        assert response.json()["accepted"] == 200
+        inserts = [q for q in ctx.captured_queries if "diveops_locationupdate" in q["sql"] and "INSERT" in q["sql"]]
+        assert len(inserts) == 1
+
+    def test_location_update_batch_limit(self, api_client, customer_token, customer_person, settings):
+        """Batches over LOCATION_BATCH_MAX_UPDATES are refused."""
+        settings.LOCATION_BATCH_MAX_UPDATES = 2
+        updates = [{"latitude": 20.5, "longitude": -87.3}] * 3
+
+        response = api_client.post(
+            "/api/mobile/location/batch/",
+            data=json.dumps({"updates": updates}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {customer_token}",
+        )
+
+        assert response.status_code == 413
+        assert LocationUpdate.objects.count() == 0
+
 
 # =============================================================================
 # Location Settings Tests
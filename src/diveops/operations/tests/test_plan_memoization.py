@@ -0,0 +1,205 @@
+"""Tests for memoized segment conversion and cached deco validation.
+
+Tests cover:
+- segments_to_steps / build_validator_input memoization by content hash
+- run_deco_validator result reuse for unchanged input
+- Validation carried over when re-locking an unchanged plan
+- Excursion locks validate only after commit, when enabled
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+
+from diveops.operations import _services as services
+from diveops.operations.planning import deco_runner, segment_converter
+
+ROUTE = [
+    {"phase": "descent", "from_depth_m": 0, "to_depth_m": 18, "duration_min": 3},
+    {"phase": "level", "depth_m": 18, "duration_min": 30},
+    {"phase": "ascent", "from_depth_m": 18, "to_depth_m": 5, "duration_min": 4},
+    {"phase": "safety_stop", "depth_m": 5, "duration_min": 3},
+    {"phase": "ascent", "from_depth_m": 5, "to_depth_m": 0, "duration_min": 1},
+]
+
+VALID_RESULT = {"tool": "diveops-deco-validate", "ndl_min": 20, "input_hash": "sha256:abc"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    cache.clear()
+    segment_converter.clear_memo()
+    yield
+    segment_converter.clear_memo()
+
+
+class TestSegmentMemoization:
+    """Tests for content-hash memoization in segment_converter."""
+
+    def test_steps_converted_once(self):
+        """Identical route_segments reuse the converted steps."""
+        with patch.object(
+            segment_converter, "_convert_segments", wraps=segment_converter._convert_segments
+        ) as convert:
+            first = segment_converter.segments_to_steps(ROUTE)
+            second = segment_converter.segments_to_steps([dict(seg) for seg in ROUTE])
+
+        assert first == second
+        assert convert.call_count == 1
+
+    def test_returned_steps_are_independent(self):
+        """Mutating returned steps does not poison the memo."""
+        steps = segment_converter.segments_to_steps(ROUTE)
+        steps[0]["depth_m"] = 999
+
+        assert segment_converter.segments_to_steps(ROUTE)[0]["depth_m"] != 999
+
+    def test_validator_input_keyed_on_gas_and_gf(self):
+        """Different gas or GF parameters build different payloads."""
+        air = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.21)
+        nitrox = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.32)
+        air_again = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.21)
+
+        assert air["gas"]["o2"] == 0.21
+        assert nitrox["gas"]["o2"] == 0.32
+        assert air == air_again
+        assert segment_converter.content_hash(air) == segment_converter.content_hash(air_again)
+
+
+class TestDecoResultCache:
+    """Tests for run_deco_validator result reuse."""
+
+    @patch.object(deco_runner, "_run_deco_http")
+    def test_unchanged_input_skips_sidecar(self, mock_http):
+        """The second validation of the same input makes no sidecar call."""
+        mock_http.return_value = dict(VALID_RESULT)
+        input_data = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.21)
+
+        first = deco_runner.run_deco_validator(input_data)
+        second = deco_runner.run_deco_validator(dict(input_data))
+
+        assert mock_http.call_count == 1
+        assert first == second
+        assert first["input_key"] == segment_converter.content_hash(input_data)
+
+    @patch.object(deco_runner, "_run_deco_binary")
+    @patch.object(deco_runner, "_run_deco_http", return_value=None)
+    def test_errors_are_not_cached(self, mock_http, mock_binary):
+        """Failed validations are retried next time."""
+        mock_binary.return_value = {"error": "timeout"}
+        input_data = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.21)
+
+        deco_runner.run_deco_validator(input_data)
+        deco_runner.run_deco_validator(input_data)
+
+        assert mock_binary.call_count == 2
+
+    @patch.object(deco_runner, "_run_deco_http")
+    def test_cache_version_change_revalidates(self, mock_http, settings):
+        """Bumping DECO_RESULT_CACHE_VERSION ignores results cached before."""
+        mock_http.return_value = dict(VALID_RESULT)
+        input_data = segment_converter.build_validator_input(route_segments=ROUTE, gas_o2=0.21)
+
+        first = deco_runner.run_deco_validator(input_data)
+        settings.DECO_RESULT_CACHE_VERSION = "2"
+        second = deco_runner.run_deco_validator(input_data)
+
+        assert mock_http.call_count == 2
+        assert first["cache_version"] == "1"
+        assert second["cache_version"] == "2"
+
+
+class TestValidationCarryOver:
+    """Tests for keeping validation across re-locks of an unchanged plan."""
+
+    def snapshot(self, route=ROUTE, gas_o2=0.21):
+        return {"briefing": {"route_segments": route, "gas_o2": gas_o2, "gas_he": 0.0}}
+
+    def test_unchanged_plan_keeps_validation(self):
+        """Same route and gas keep the previous validation."""
+        old = self.snapshot()
+        input_key = segment_converter.content_hash(services._plan_validator_input(old))
+        old["validation"] = {**VALID_RESULT, "input_key": input_key, "cache_version": "1"}
+        new = self.snapshot()
+
+        services._carry_over_validation(old, new)
+
+        assert new["validation"]["input_key"] == input_key
+
+    def test_older_validator_version_drops_validation(self, settings):
+        """A validation made under an older cache version is not carried."""
+        settings.DECO_RESULT_CACHE_VERSION = "2"
+        old = self.snapshot()
+        old["validation"] = {
+            **VALID_RESULT,
+            "input_key": segment_converter.content_hash(services._plan_validator_input(old)),
+            "cache_version": "1",
+        }
+        new = self.snapshot()
+
+        services._carry_over_validation(old, new)
+
+        assert "validation" not in new
+
+    def test_changed_plan_drops_validation(self):
+        """A different gas invalidates the previous validation."""
+        old = self.snapshot()
+        old["validation"] = {
+            **VALID_RESULT,
+            "input_key": segment_converter.content_hash(services._plan_validator_input(old)),
+            "cache_version": "1",
+        }
+        new = self.snapshot(gas_o2=0.32)
+
+        services._carry_over_validation(old, new)
+
+        assert "validation" not in new
+
+    def test_failed_validation_not_carried(self):
+        """Errors are never carried over."""
+        old = self.snapshot()
+        old["validation"] = {"error": "timeout", "input_key": "sha256:x"}
+        new = self.snapshot()
+
+        services._carry_over_validation(old, new)
+
+        assert "validation" not in new
+
+
+@pytest.mark.django_db
+class TestLockExcursionPlans:
+    """Tests for validation triggered by lock_excursion_plans."""
+
+    @pytest.fixture
+    def lock(self):
+        dives = [SimpleNamespace(pk=1, id=1), SimpleNamespace(pk=2, id=2)]
+        excursion = MagicMock()
+        excursion.dives.filter.return_value = dives
+        with patch.object(services, "lock_dive_plan", side_effect=lambda actor, dive: dive), \
+                patch.object(services, "log_excursion_event"), \
+                patch.object(services, "_validate_locked_plans") as validate:
+            yield lambda: services.lock_excursion_plans(actor=None, excursion=excursion), validate
+
+    def test_validated_after_commit(self, lock, settings, django_capture_on_commit_callbacks):
+        """No validator call runs inside the lock transaction."""
+        settings.DECO_VALIDATE_ON_LOCK = True
+        run, validate = lock
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            run()
+            validate.assert_not_called()
+        for callback in callbacks:
+            callback()
+
+        validate.assert_called_once_with(actor=None, dive_ids=[1, 2])
+
+    def test_not_validated_by_default(self, lock, django_capture_on_commit_callbacks):
+        """Locking alone never calls the validator."""
+        run, validate = lock
+
+        with django_capture_on_commit_callbacks(execute=True):
+            run()
+
+        validate.assert_not_called()
@@ -0,0 +1,191 @@
+"""Tests for chat presence tracking and typing-indicator coalescing.
+
+Tests cover:
+- PresenceService join/leave/expiry and batched room lookup
+- TypingCoalescer leading send, trailing flush and drop of repeats
+- ChatConsumer sends one typing fan-out per burst and tracks presence
+- Staff conversation list merges conversation, lead and visitor room presence
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from django_communication.models import Conversation, ConversationStatus
+from django_parties.models import Person
+
+from diveops.operations.consumers import ChatConsumer
+from diveops.operations.services.presence import PresenceService, TypingCoalescer, member_id
+
+ROOM = "chat_conversation_3f1c2a9e-0000-4000-8000-000000000003"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestPresenceService:
+    """Tests for PresenceService on the Django cache."""
+
+    def test_join_and_lookup(self):
+        """Members are summarized per role."""
+        PresenceService.join(ROOM, member_id("staff", "12", "specific.a"))
+        PresenceService.join(ROOM, member_id("staff", "12", "specific.b"))
+        PresenceService.join(ROOM, member_id("visitor", "v1", "specific.c"))
+
+        presence = PresenceService.get_rooms([ROOM, "chat_lead_empty"])
+
+        assert presence[ROOM].staff_ids == {"12"}
+        assert presence[ROOM].visitors == 1
+        assert presence["chat_lead_empty"].to_dict() == {"staff_ids": [], "user_ids": [], "visitors": 0}
+
+    def test_leave(self):
+        """Leaving removes only that socket."""
+        PresenceService.join(ROOM, member_id("user", "7", "specific.a"))
+        PresenceService.join(ROOM, member_id("visitor", "v1", "specific.b"))
+
+        PresenceService.leave(ROOM, member_id("user", "7", "specific.a"))
+
+        presence = PresenceService.get_rooms([ROOM])[ROOM]
+        assert presence.user_ids == set()
+        assert presence.visitors == 1
+
+    def test_entries_expire_without_heartbeat(self, settings):
+        """Sockets that stop heartbeating age out."""
+        settings.CHAT_PRESENCE_TTL = 60
+        PresenceService.join(ROOM, member_id("staff", "12", "specific.a"))
+
+        with patch("diveops.operations.services.presence.time.time", return_value=10**12):
+            presence = PresenceService.get_rooms([ROOM])[ROOM]
+
+        assert presence.staff_ids == set()
+
+
+class TestTypingCoalescer:
+    """Tests for TypingCoalescer."""
+
+    def run_events(self, events, interval=0.05, settle=0.1):
+        sent = []
+
+        async def send(is_typing):
+            sent.append(is_typing)
+
+        async def scenario():
+            coalescer = TypingCoalescer(send, interval=interval)
+            for is_typing in events:
+                await coalescer.update(is_typing)
+            await asyncio.sleep(settle)
+
+        async_to_sync(scenario)()
+        return sent
+
+    def test_burst_sends_once(self):
+        """A burst of identical keystrokes costs one fan-out."""
+        assert self.run_events([True] * 20) == [True]
+
+    def test_trailing_state_change_is_sent(self):
+        """Stopping inside the interval is sent when the interval ends."""
+        assert self.run_events([True, True, False]) == [True, False]
+
+    def test_cancel_drops_pending(self):
+        """Cancelled coalescers send nothing more."""
+        sent = []
+
+        async def send(is_typing):
+            sent.append(is_typing)
+
+        async def scenario():
+            coalescer = TypingCoalescer(send, interval=0.05)
+            await coalescer.update(True)
+            await coalescer.update(False)
+            coalescer.cancel()
+            await asyncio.sleep(0.1)
+
+        async_to_sync(scenario)()
+
+        assert sent == [True]
+
+
+class TestChatConsumerTyping:
+    """Tests for typing and presence in ChatConsumer."""
+
+    def test_typing_burst_and_presence(self, settings):
+        """Keystroke bursts fan out once and the socket shows in presence."""
+        settings.CHAT_TYPING_INTERVAL = 0.2
+        conversation_id = ROOM.removeprefix("chat_conversation_")
+
+        def communicator():
+            comm = WebsocketCommunicator(ChatConsumer.as_asgi(), f"/ws/chat/conversation/{conversation_id}/")
+            comm.scope["url_route"] = {"kwargs": {"conversation_id": conversation_id}}
+            comm.scope["user"] = None
+            return comm
+
+        async def scenario():
+            typist, watcher = communicator(), communicator()
+            await typist.connect()
+            await watcher.connect()
+            await typist.receive_json_from()
+            await watcher.receive_json_from()
+
+            for _ in range(10):
+                await typist.send_json_to({"type": "typing", "is_typing": True})
+            first = await watcher.receive_json_from()
+            extra = await watcher.receive_nothing(timeout=0.4)
+
+            presence = PresenceService.get_rooms([ROOM])[ROOM]
+            await typist.disconnect()
+            await watcher.disconnect()
+            return first, extra, presence
+
+        first, extra, presence = async_to_sync(scenario)()
+
+        assert first == {"type": "typing", "is_typing": True, "sender": "visitor"}
+        assert extra is True
+        assert presence.visitors == 2
+        assert PresenceService.get_rooms([ROOM])[ROOM].visitors == 0
+
+
+@pytest.mark.django_db
+class TestStaffConversationPresence:
+    """Tests for presence in the staff chat conversation list."""
+
+    def test_visitor_room_counts_for_its_conversation(self):
+        """A visitor on the public widget shows on their lead's conversation."""
+        visitor_id = "6a0e3f52-0000-4000-8000-0000000000aa"
+        person = Person.objects.create(first_name="Web", last_name="Visitor", visitor_id=visitor_id)
+        conversation = Conversation.objects.create(
+            subject="Website chat",
+            related_content_type=ContentType.objects.get_for_model(Person),
+            related_object_id=str(person.pk),
+            status=ConversationStatus.ACTIVE,
+        )
+        staff = get_user_model().objects.create_superuser(username="presencestaff", password="testpass123")
+        client = Client()
+        client.force_login(staff)
+
+        async def scenario():
+            comm = WebsocketCommunicator(ChatConsumer.as_asgi(), f"/ws/chat/visitor/{visitor_id}/")
+            comm.scope["url_route"] = {"kwargs": {"visitor_id": visitor_id}}
+            comm.scope["user"] = None
+            await comm.connect()
+            await comm.receive_json_from()
+            await asyncio.sleep(0.1)  # Let the heartbeat join the room
+            response = await sync_to_async(client.get)(reverse("diveops:api-chat-conversations"))
+            await comm.disconnect()
+            return response
+
+        response = async_to_sync(scenario)()
+
+        row = next(c for c in response.json()["conversations"] if c["conversation_id"] == str(conversation.pk))
+        assert row["presence"] == {"staff_ids": [], "user_ids": [], "visitors": 1}
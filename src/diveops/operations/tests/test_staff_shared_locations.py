@@ -16,7 +16,8 @@ from django.utils import timezone
 
 from django_parties.models import Person
 
-from diveops.operations.models import LocationSharingPreference, LocationUpdate
+from diveops.operations.models import LatestLocation, LocationSharingPreference, LocationUpdate
+from diveops.operations.services.locations import LatestLocationService
 
 User = get_user_model()
 
@@ -285,3 +286,153 @@ class TestSharedLocationsAPIView:
         # Should only return the most recent location
         assert len(data["locations"]) == 1
         assert float(data["locations"][0]["latitude"]) == float(newer.latitude)
+
+    def test_older_upload_does_not_replace_latest(
+        self, client, staff_user, person_sharing_location
+    ):
+        """A late upload of an older fix leaves the latest position alone."""
+        now = timezone.now()
+        LocationUpdate.objects.create(
+            person=person_sharing_location,
+            latitude=Decimal("21.200000"),
+            longitude=Decimal("-86.900000"),
+            recorded_at=now,
+        )
+        LocationUpdate.objects.create(
+            person=person_sharing_location,
+            latitude=Decimal("21.100000"),
+            longitude=Decimal("-86.800000"),
+            recorded_at=now - timedelta(hours=1),
+        )
+
+        client.login(username="staff@happydiving.mx", password="testpass123")
+        data = client.get(reverse("diveops:shared-locations-api")).json()
+
+        assert data["locations"][0]["latitude"] == 21.2
+
+
+@pytest.mark.django_db
+class TestLatestLocationRecord:
+    """Tests for the LatestLocation upsert."""
+
+    def test_older_update_not_written(self, person_sharing_location):
+        now = timezone.now()
+        newer = LocationUpdate.objects.create(
+            person=person_sharing_location, latitude=Decimal("21.2"), longitude=Decimal("-86.9"), recorded_at=now
+        )
+        older = LocationUpdate.objects.create(
+            person=person_sharing_location,
+            latitude=Decimal("21.1"),
+            longitude=Decimal("-86.8"),
+            recorded_at=now - timedelta(hours=1),
+        )
+
+        assert LatestLocationService.record([older]) == 0
+        assert LatestLocation.objects.get(person=person_sharing_location).location_id == newer.pk
+
+    def test_update_dropped_by_conflict_not_referenced(self, person_sharing_location):
+        """A fix skipped by ignore_conflicts leaves location_id on the stored row."""
+        now = timezone.now()
+        stored = LocationUpdate.objects.create(
+            person=person_sharing_location, latitude=Decimal("21.2"), longitude=Decimal("-86.9"), recorded_at=now
+        )
+        retry = LocationUpdate(
+            person=person_sharing_location, latitude=Decimal("21.3"), longitude=Decimal("-86.7"), recorded_at=now
+        )
+        LocationUpdate.objects.bulk_create([retry], ignore_conflicts=True)
+
+        assert LatestLocationService.record([retry]) == 0
+        latest = LatestLocation.objects.get(person=person_sharing_location)
+        assert latest.location_id == stored.pk
+        assert latest.latitude == Decimal("21.2")
+
+
+# =============================================================================
+# Bounding Box, Clustering and Conditional Request Tests
+# =============================================================================
+
+
+def make_sharers(count, latitude, longitude):
+    """Create people sharing with staff, each with one fix near a point."""
+    now = timezone.now()
+    for i in range(count):
+        person = Person.objects.create(first_name=f"Diver{i}", last_name="Near", email=f"near{latitude}{i}@example.com")
+        LocationSharingPreference.objects.create(
+            person=person,
+            visibility=LocationSharingPreference.Visibility.STAFF,
+            is_tracking_enabled=True,
+        )
+        LocationUpdate.objects.create(
+            person=person,
+            latitude=Decimal(str(latitude)) + Decimal(i) / 10000,
+            longitude=Decimal(str(longitude)),
+            recorded_at=now,
+        )
+
+
+@pytest.mark.django_db
+class TestSharedLocationsViewport:
+    """Tests for bbox/tile filtering, clustering, ETag and since polling."""
+
+    @pytest.fixture(autouse=True)
+    def login(self, client, staff_user):
+        client.login(username="staff@happydiving.mx", password="testpass123")
+
+    def test_bbox_filters_positions(self, client):
+        """Only positions inside the bounding box are returned."""
+        make_sharers(2, 21.16, -86.85)  # Cancun
+        make_sharers(1, 20.42, -86.92)  # Cozumel
+
+        data = client.get(reverse("diveops:shared-locations-api"), {"bbox": "-87.0,21.0,-86.7,21.3"}).json()
+
+        assert len(data["locations"]) == 2
+
+    def test_zoom_clusters_nearby_positions(self, client):
+        """At a low zoom nearby positions come back as one cluster."""
+        make_sharers(3, 21.16, -86.85)
+        make_sharers(1, 20.42, -86.92)
+
+        data = client.get(reverse("diveops:shared-locations-api"), {"zoom": "9"}).json()
+
+        assert [c["count"] for c in data["clusters"]] == [3]
+        assert len(data["locations"]) == 1
+
+    def test_tile_parameter(self, client):
+        """A z/x/y tile selects its area."""
+        make_sharers(1, 21.16, -86.85)
+
+        # Tile 8/66/112 covers Cancun
+        inside = client.get(reverse("diveops:shared-locations-api"), {"tile": "8/66/112"}).json()
+        outside = client.get(reverse("diveops:shared-locations-api"), {"tile": "8/0/0"}).json()
+
+        assert len(inside["locations"]) == 1
+        assert outside["locations"] == []
+
+    def test_etag_not_modified(self, client):
+        """Polling with the last ETag gets 304 until a position changes."""
+        make_sharers(1, 21.16, -86.85)
+        url = reverse("diveops:shared-locations-api")
+
+        first = client.get(url)
+        assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+        make_sharers(1, 21.17, -86.85)
+        assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+
+    def test_since_returns_changes_and_active_ids(self, client):
+        """since returns changed positions only, plus every visible person id."""
+        make_sharers(2, 21.16, -86.85)
+        url = reverse("diveops:shared-locations-api")
+        server_time = client.get(url).json()["server_time"]
+
+        make_sharers(1, 20.42, -86.92)
+        data = client.get(url, {"since": server_time}).json()
+
+        assert len(data["locations"]) == 1
+        assert len(data["active_ids"]) == 3
+
+    def test_invalid_bbox(self, client):
+        """Malformed bounding boxes are rejected."""
+        response = client.get(reverse("diveops:shared-locations-api"), {"bbox": "1,2,3"})
+
+        assert response.status_code == 400
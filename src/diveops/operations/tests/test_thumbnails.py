@@ -0,0 +1,161 @@
+"""Tests for the thumbnail engine.
+
+These tests verify:
+1. JPEGs are decoded at reduced scale and oversized decodes are refused and logged
+2. Variant formats are negotiated from the Accept header
+3. Variants are written for every size and picked up by thumbnail_url
+"""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import RequestFactory
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from diveops.operations import thumbnails  # noqa: E402
+from diveops.operations.templatetags.diveops_tags import thumbnail_url  # noqa: E402
+
+CHROME_ACCEPT = "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8"
+SAFARI_ACCEPT = "image/png,image/svg+xml,image/*;q=0.8,video/*;q=0.8,*/*;q=0.5"
+
+
+class StoredFile:
+    """Stand-in for a Document's FieldFile in default_storage."""
+
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+    def open(self, mode="rb"):
+        return default_storage.open(self.name, mode)
+
+
+def image_bytes(size, fmt="JPEG", mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, "navy").save(buffer, format=fmt)
+    buffer.seek(0)
+    return buffer
+
+
+class TestDecode:
+    """Tests for decode_image."""
+
+    def test_large_jpeg_decoded_at_reduced_scale(self):
+        img, stats = thumbnails.decode_image(image_bytes((6000, 4000)), (1200, 2000))
+
+        assert stats.source_size == (6000, 4000)
+        assert stats.decoded_size == img.size == (3000, 2000)
+        assert img.mode == "RGB"
+
+    def test_small_jpeg_decoded_at_full_size(self):
+        img, stats = thumbnails.decode_image(image_bytes((800, 600)), (1200, 2000))
+
+        assert stats.decoded_size == (800, 600)
+
+    def test_transparent_png_flattened(self):
+        img, _ = thumbnails.decode_image(image_bytes((40, 40), "PNG", "RGBA"), (80, 2000))
+
+        assert img.mode == "RGB"
+
+    def test_over_budget_refused(self, settings):
+        """PNGs cannot be decoded at reduced scale, so the budget applies to the full image."""
+        settings.THUMBNAIL_DECODE_BUDGET_MB = 1
+
+        with pytest.raises(ValueError, match="budget"):
+            thumbnails.decode_image(image_bytes((1000, 1000), "PNG"), (1200, 2000))
+
+
+@pytest.mark.django_db
+class TestGenerate:
+    """Tests for generate_thumbnail and generate_all_thumbnails failures."""
+
+    @pytest.fixture
+    def oversized(self, settings, tmp_path):
+        settings.THUMBNAIL_DECODE_BUDGET_MB = 1
+        path = tmp_path / "chart.png"
+        path.write_bytes(image_bytes((1000, 1000), "PNG").read())
+        return SimpleNamespace(pk="3b9e", file=SimpleNamespace(path=str(path)))
+
+    def test_refused_decode_logged_as_warning(self, oversized, caplog):
+        with caplog.at_level("WARNING", logger=thumbnails.__name__):
+            assert thumbnails.generate_thumbnail(oversized) is None
+            assert not any(thumbnails.generate_all_thumbnails(oversized).values())
+
+        assert [r.levelname for r in caplog.records] == ["WARNING", "WARNING"]
+        assert "budget" in caplog.records[0].getMessage()
+
+    def test_unexpected_error_logged_with_traceback(self, oversized, caplog):
+        with patch.object(thumbnails, "decode_image", side_effect=OSError("truncated")):
+            with caplog.at_level("ERROR", logger=thumbnails.__name__):
+                assert thumbnails.generate_thumbnail(oversized) is None
+
+        (record,) = caplog.records
+        assert record.exc_info is not None
+
+
+class TestNegotiation:
+    """Tests for negotiate_format."""
+
+    def test_prefers_best_accepted_format(self):
+        assert thumbnails.negotiate_format(CHROME_ACCEPT, {"webp", "avif"}) == "avif"
+        assert thumbnails.negotiate_format(CHROME_ACCEPT, {"webp"}) == "webp"
+
+    def test_wildcards_do_not_count(self):
+        assert thumbnails.negotiate_format(SAFARI_ACCEPT, {"webp", "avif"}) is None
+
+    def test_zero_quality_excluded(self):
+        assert thumbnails.negotiate_format("image/webp;q=0, image/avif", {"webp"}) is None
+
+
+@pytest.mark.django_db
+class TestVariants:
+    """Tests for generate_variants and variant_url."""
+
+    @pytest.fixture
+    def document(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.THUMBNAIL_FORMATS = ["webp"]
+        name = default_storage.save("documents/reef.jpg", ContentFile(image_bytes((2400, 1600)).read()))
+        return SimpleNamespace(pk="7f0c", filename="reef.jpg", metadata={"camera": "TG-6"}, file=StoredFile(name))
+
+    def test_every_size_written_and_recorded(self, document):
+        with patch.object(thumbnails, "Document") as model:
+            model.objects.select_for_update.return_value.only.return_value.get.return_value = document
+            record = thumbnails.generate_variants(document)
+
+        assert set(record["files"]) == set(thumbnails.THUMBNAIL_SIZES)
+        with default_storage.open(record["files"]["medium"]["webp"]) as f:
+            assert Image.open(f).format == "WEBP"
+        assert record["stats"]["decoded_size"] == [2400, 1600]
+        saved = model.objects.filter.return_value.update.call_args.kwargs["metadata"]
+        assert saved["camera"] == "TG-6"
+        assert saved[thumbnails.VARIANTS_METADATA_KEY] == record
+
+    def test_thumbnail_url_negotiates_variant(self, document):
+        with patch.object(thumbnails, "Document") as model:
+            model.objects.select_for_update.return_value.only.return_value.get.return_value = document
+            thumbnails.generate_variants(document)
+        document._thumbnail_urls = {"medium": "/media/renditions/medium.jpg"}
+
+        chrome = {"request": RequestFactory().get("/", HTTP_ACCEPT=CHROME_ACCEPT)}
+        safari = {"request": RequestFactory().get("/", HTTP_ACCEPT=SAFARI_ACCEPT)}
+
+        assert thumbnail_url(chrome, document, "medium").endswith("/thumbnails/7f0c/medium.webp")
+        assert thumbnail_url(safari, document, "medium") == "/media/renditions/medium.jpg"
+
+    def test_replaced_file_ignores_old_variants(self, document):
+        with patch.object(thumbnails, "Document") as model:
+            model.objects.select_for_update.return_value.only.return_value.get.return_value = document
+            thumbnails.generate_variants(document)
+        document.file.name = "documents/reef_v2.jpg"
+
+        assert thumbnails.variant_url(document, "medium", CHROME_ACCEPT) is None
@@ -0,0 +1,113 @@
+"""Tests for the vectorized Bühlmann tissue engine.
+
+The NumPy engine must match the scalar functions in _services to within
+floating-point tolerance.
+"""
+
+import random
+
+import pytest
+
+from diveops.operations import _services as scalar
+from diveops.operations.planning import tissue_engine as engine
+
+TOLERANCE = 1e-9
+
+
+def multilevel_profile(segment_count: int, seed: int = 7) -> list[dict]:
+    """Build a long segmented route profile (descent, levels, ascent steps)."""
+    rng = random.Random(seed)
+    steps = []
+    for _ in range(segment_count):
+        steps.append(
+            {
+                "depth_m": round(rng.uniform(3.0, 40.0), 1),
+                "duration_min": round(rng.uniform(0.1, 4.0), 2),
+            }
+        )
+    return steps
+
+
+class TestDiveTissueLoading:
+    """Tests for calculate_dive_tissue_loading parity."""
+
+    @pytest.mark.parametrize("segment_count", [1, 5, 60, 500])
+    def test_matches_scalar(self, segment_count):
+        """Final pressures and metrics match the scalar implementation."""
+        steps = multilevel_profile(segment_count)
+
+        expected_state, expected_metrics = scalar.calculate_dive_tissue_loading(
+            route_segments=steps, gas_o2_fraction=0.32
+        )
+        state, metrics = engine.calculate_dive_tissue_loading(route_segments=steps, gas_o2_fraction=0.32)
+
+        assert state.n2_pressures == pytest.approx(expected_state.n2_pressures, abs=TOLERANCE)
+        assert metrics["max_depth_m"] == expected_metrics["max_depth_m"]
+        assert metrics["runtime_min"] == pytest.approx(expected_metrics["runtime_min"])
+        assert metrics["max_loading_percent"] == pytest.approx(expected_metrics["max_loading_percent"])
+
+    def test_initial_state_and_skipped_steps(self):
+        """Starting state is respected and zero-duration steps are ignored."""
+        initial = scalar.TissueState(n2_pressures=[1.2 + i * 0.05 for i in range(16)])
+        steps = [
+            {"depth_m": 30, "duration_min": 0},
+            {"depth_m": 18, "duration_min": 25},
+            {"depth_m": 5, "duration_min": 3},
+        ]
+
+        expected, _ = scalar.calculate_dive_tissue_loading(route_segments=steps, initial_tissue_state=initial)
+        state, metrics = engine.calculate_dive_tissue_loading(route_segments=steps, initial_tissue_state=initial)
+
+        assert state.n2_pressures == pytest.approx(expected.n2_pressures, abs=TOLERANCE)
+        assert metrics["max_depth_m"] == 18.0
+
+    def test_empty_profile(self):
+        """No steps leaves tissues unchanged."""
+        state, metrics = engine.calculate_dive_tissue_loading(route_segments=[])
+
+        assert state.n2_pressures == pytest.approx([scalar.SURFACE_N2_PP] * 16)
+        assert metrics["runtime_min"] == 0.0
+
+
+class TestSurfaceInterval:
+    """Tests for calculate_surface_interval_offgassing parity."""
+
+    @pytest.mark.parametrize("minutes", [0, 10, 60, 360])
+    def test_matches_scalar(self, minutes):
+        """Off-gassing matches the scalar implementation."""
+        loaded, _ = scalar.calculate_dive_tissue_loading(route_segments=[{"depth_m": 30, "duration_min": 20}])
+
+        expected = scalar.calculate_surface_interval_offgassing(tissue_state=loaded, duration_min=minutes)
+        result = engine.calculate_surface_interval_offgassing(tissue_state=loaded, duration_min=minutes)
+
+        assert result.n2_pressures == pytest.approx(expected.n2_pressures, abs=TOLERANCE)
+
+
+class TestNDL:
+    """Tests for calculate_ndl parity."""
+
+    @pytest.mark.parametrize("depth_m", [6, 12, 18, 24, 30, 40])
+    @pytest.mark.parametrize("gf_high", [70, 85, 100])
+    @pytest.mark.parametrize("prior_minutes", [0, 15])
+    def test_matches_scalar(self, depth_m, gf_high, prior_minutes):
+        """NDL matches the scalar implementation across depths and GF High."""
+        state, _ = scalar.calculate_dive_tissue_loading(
+            route_segments=[{"depth_m": 25, "duration_min": prior_minutes}]
+        )
+
+        expected = scalar.calculate_ndl(state, depth_m, gf_low=30, gf_high=gf_high)
+        result = engine.calculate_ndl(state, depth_m, gf_low=30, gf_high=gf_high)
+
+        assert result == expected
+
+    def test_over_m_value_is_zero(self):
+        """Tissues already past their M-value have no NDL."""
+        state = scalar.TissueState(n2_pressures=[5.0] * 16)
+
+        assert engine.calculate_ndl(state, 18) == 0
+
+    def test_shallow_is_unlimited(self):
+        """Shallow depths never reach the M-value."""
+        state = scalar.TissueState()
+
+        assert engine.calculate_ndl(state, 3) == engine.UNLIMITED_NDL
@@ -0,0 +1,97 @@
+"""Tests for the gradient-factor / gas / depth what-if grid."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from diveops.operations import _services as services
+
+
+def make_excursion_type(dives):
+    """Build an ExcursionType stand-in whose dive_templates return dives."""
+    excursion_type = MagicMock()
+    excursion_type.pk = "et-1"
+    excursion_type.dive_templates.order_by.return_value = dives
+    return excursion_type
+
+
+def make_dive(sequence, depth, minutes, surface_interval=None, gas_o2=None):
+    """Build an ExcursionTypeDive stand-in with a rectangular profile."""
+    return SimpleNamespace(
+        pk=f"dive-{sequence}",
+        sequence=sequence,
+        name=f"Dive {sequence}",
+        route_segments=None,
+        planned_depth_meters=depth,
+        planned_duration_minutes=minutes,
+        surface_interval_minutes=surface_interval,
+        gas_o2_fraction=gas_o2,
+    )
+
+
+@pytest.fixture
+def two_tank_trip():
+    return make_excursion_type(
+        [
+            make_dive(1, 24, 40),
+            make_dive(2, 15, 50, surface_interval=60),
+        ]
+    )
+
+
+class TestBuildTissueGrid:
+    """Tests for build_tissue_grid."""
+
+    def test_cartesian_product_skips_inverted_gf(self):
+        """gf_low above gf_high is not a valid combination."""
+        grid = services.build_tissue_grid([30, 50, 90], [70, 85], [0.21, 0.32], [0.0, 3.0])
+
+        assert (90, 70, 0.21, 0.0) not in grid
+        assert (30, 85, 0.32, 3.0) in grid
+        assert len(grid) == 2 * 2 * (2 + 2)
+
+    def test_defaults(self):
+        """Gas and depth offset default to the dive's own plan."""
+        assert services.build_tissue_grid([30], [85]) == [(30, 85, None, 0.0)]
+
+
+class TestCalculateExcursionTissueGrid:
+    """Tests for calculate_excursion_tissue_grid."""
+
+    def test_matches_single_profile(self, two_tank_trip):
+        """Each grid point matches calculate_excursion_tissue_loading for that GF."""
+        grid = services.build_tissue_grid([30, 50], [70, 85, 100])
+
+        points = services.calculate_excursion_tissue_grid(two_tank_trip, grid)
+
+        for point in points:
+            profile = services.calculate_excursion_tissue_loading(
+                two_tank_trip, gf_low=point.gf_low, gf_high=point.gf_high
+            )
+            assert point.dive_ndls == [d.ndl_at_start for d in profile.dive_results]
+            assert point.final_loading_percent == pytest.approx(profile.final_loading_percent)
+            assert point.dive_loading_after == pytest.approx(
+                [d.loading_after_percent for d in profile.dive_results]
+            )
+
+    def test_segments_converted_once(self, two_tank_trip):
+        """Dive templates are loaded and profiled once for the whole grid."""
+        grid = services.build_tissue_grid([30, 40, 50], [70, 85], [0.21, 0.32], [0.0, 3.0])
+
+        with patch.object(services, "_dive_template_profile", wraps=services._dive_template_profile) as profile:
+            services.calculate_excursion_tissue_grid(two_tank_trip, grid)
+
+        assert profile.call_count == 2
+        two_tank_trip.dive_templates.order_by.assert_called_once_with("sequence")
+
+    def test_depth_offset_and_gas_override(self, two_tank_trip):
+        """Deeper plans shorten NDL; richer nitrox lengthens it."""
+        grid = [(30, 85, 0.21, 0.0), (30, 85, 0.21, 6.0), (30, 85, 0.32, 0.0)]
+
+        base, deeper, nitrox = services.calculate_excursion_tissue_grid(two_tank_trip, grid)
+
+        assert deeper.dive_ndls[0] < base.dive_ndls[0]
+        assert nitrox.dive_ndls[0] > base.dive_ndls[0]
+        assert deeper.max_loading_percent > base.max_loading_percent
+        assert base.min_ndl == min(base.dive_ndls)
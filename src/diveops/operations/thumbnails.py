@@ -6,22 +6,38 @@ Thumbnails are stored as proper Document objects in a folder hierarchy:
     Photos/resized/large/
 
 Each thumbnail document is linked to its original via metadata.
+
+Decoding shrinks on load: JPEGs are decoded directly at 1/2, 1/4 or 1/8
+scale (draft mode) when that still leaves twice the largest thumbnail,
+and anything that would still exceed THUMBNAIL_DECODE_BUDGET_MB decoded
+is refused instead of loaded.
+
+Modern-format variants (WebP, optionally AVIF) of the media renditions
+are written by generate_variants() and recorded in the original's
+metadata; variant_url() picks one the browser accepts.
 """
 
 import io
+import logging
+import time
 from pathlib import Path
+from typing import NamedTuple, Optional
 
+from django.conf import settings
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.db import transaction
 
 from django_documents.models import Document, DocumentFolder
 
 try:
-    from PIL import Image
+    from PIL import Image, features
     HAS_PIL = True
 except ImportError:
     HAS_PIL = False
 
+logger = logging.getLogger(__name__)
+
 
 # Thumbnail sizes for responsive design (max width, height scales proportionally)
 THUMBNAIL_SIZES = {
@@ -53,6 +69,26 @@ SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
 RESIZED_ROOT = "Photos"
 RESIZED_SUBFOLDER = "resized"
 
+# Output formats, best first (JPEG is what the renditions already provide)
+FORMAT_CONTENT_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+FORMAT_EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+ENCODE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 85, "optimize": True},
+}
+
+# Storage directory and Document.metadata key for format variants
+VARIANTS_ROOT = "thumbnails"
+VARIANTS_METADATA_KEY = "thumbnail_variants"
+
+# Decode at least this many times the thumbnail size, for LANCZOS quality
+DRAFT_OVERSAMPLE = 2
+
 
 def get_or_create_thumbnail_folder(size=DEFAULT_SIZE):
     """Get or create the folder for thumbnails of a given size.
@@ -163,93 +199,332 @@ def get_thumbnail_url(document, size=DEFAULT_SIZE):
     return None
 
 
+class DecodeStats(NamedTuple):
+    """How an original was decoded.
+
+    Attributes:
+        source_size: Stored (width, height)
+        decoded_size: (width, height) actually decoded
+        decode_seconds: Time to decode and flatten to RGB
+        decoded_bytes: Memory held by the decoded image, the bulk of the
+            peak for one thumbnail run
+    """
+
+    source_size: tuple
+    decoded_size: tuple
+    decode_seconds: float
+    decoded_bytes: int
+
+    def as_dict(self) -> dict:
+        return {
+            "source_size": list(self.source_size),
+            "decoded_size": list(self.decoded_size),
+            "decode_ms": round(self.decode_seconds * 1000, 1),
+            "decoded_bytes": self.decoded_bytes,
+        }
+
+
+def decode_budget_bytes() -> int:
+    return int(getattr(settings, "THUMBNAIL_DECODE_BUDGET_MB", 256) * 1024 * 1024)
+
+
+def _fit(size, box):
+    """Size of an image of this size after thumbnail(box)."""
+    width, height = size
+    scale = min(box[0] / width, box[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _pixel_bytes(mode):
+    # Pillow stores single-band 8-bit images in 1 byte, everything else in 4
+    return 1 if mode in ("1", "L", "P") else 4
+
+
+def decode_image(source, box):
+    """Decode an image just large enough for thumbnails fitting box.
+
+    Args:
+        source: Path or binary file object
+        box: Largest (width, height) that will be produced
+
+    Returns:
+        Tuple of (RGB image, transparency flattened on white; DecodeStats)
+
+    Raises:
+        ValueError: If the decoded image would exceed the memory budget
+    """
+    started = time.perf_counter()
+    with Image.open(source) as img:
+        source_size = img.size
+        target = _fit(img.size, box)
+        # JPEG only: DCT scaling skips most of the decode work and memory
+        img.draft("RGB", (target[0] * DRAFT_OVERSAMPLE, target[1] * DRAFT_OVERSAMPLE))
+
+        decoded_bytes = img.size[0] * img.size[1] * _pixel_bytes(img.mode)
+        if decoded_bytes > decode_budget_bytes():
+            raise ValueError(
+                f"{img.size[0]}x{img.size[1]} {img.format} image needs {decoded_bytes // 2**20} MB "
+                f"to decode (budget {decode_budget_bytes() // 2**20} MB)"
+            )
+
+        if img.mode in ("RGBA", "LA", "P"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            if img.mode == "P":
+                img = img.convert("RGBA")
+            if img.mode in ("RGBA", "LA"):
+                background.paste(img, mask=img.split()[-1])
+            else:
+                background.paste(img)
+            rgb = background
+        else:
+            rgb = img.convert("RGB")
+
+    stats = DecodeStats(source_size, rgb.size, time.perf_counter() - started, decoded_bytes)
+    return rgb, stats
+
+
+def _largest_box(sizes):
+    return max((THUMBNAIL_SIZES[size] for size in sizes), key=lambda box: box[0])
+
+
+def _by_width_descending(sizes):
+    return sorted(sizes, key=lambda name: THUMBNAIL_SIZES[name][0], reverse=True)
+
+
+def _resize(img, size):
+    """Return a copy of img fitted within the given thumbnail size."""
+    resized = img.copy()
+    # Create thumbnail maintaining aspect ratio
+    resized.thumbnail(THUMBNAIL_SIZES[size], Image.Resampling.LANCZOS)
+    return resized
+
+
+def encode(img, fmt):
+    """Encode an RGB image in one of FORMAT_CONTENT_TYPES."""
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt.upper(), **ENCODE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def _save_thumbnail(document, size, img):
+    """Store a resized image as the thumbnail Document for this size."""
+    # Save to bytes
+    buffer = io.BytesIO(encode(img, "jpeg"))
+
+    # Get or create thumbnail folder
+    folder = get_or_create_thumbnail_folder(size)
+
+    # Create unique filename
+    thumb_filename = f"thumb_{size}_{document.pk}.jpg"
+
+    # Delete existing thumbnail if any
+    Document.objects.filter(folder=folder, filename=thumb_filename).delete()
+
+    # Create new thumbnail document
+    thumb_doc = Document.objects.create(
+        filename=thumb_filename,
+        document_type="image/jpeg",
+        category="image",
+        folder=folder,
+        file_size=buffer.getbuffer().nbytes,
+        metadata={
+            "original_document_id": str(document.pk),
+            "original_filename": document.filename,
+            "thumbnail_size": size,
+            "dimensions": list(THUMBNAIL_SIZES[size]),
+            "is_thumbnail": True,
+        }
+    )
+
+    # Save the file
+    thumb_doc.file.save(thumb_filename, ContentFile(buffer.getvalue()), save=True)
+
+    return thumb_doc
+
+
+def _original_path(document):
+    if not HAS_PIL or not document.file:
+        return None
+    orig_path = Path(document.file.path)
+    return orig_path if orig_path.exists() else None
+
+
 @transaction.atomic
 def generate_thumbnail(document, size=DEFAULT_SIZE):
     """Generate a thumbnail document for an image document.
 
     Returns the thumbnail Document object, or None on failure.
     """
-    if not HAS_PIL:
-        return None
-
-    if not document.file:
-        return None
-
     if size not in THUMBNAIL_SIZES:
         size = DEFAULT_SIZE
 
     try:
-        orig_path = Path(document.file.path)
-        if not orig_path.exists():
+        orig_path = _original_path(document)
+        if orig_path is None:
             return None
 
-        dimensions = THUMBNAIL_SIZES[size]
-
-        # Generate thumbnail image
-        with Image.open(orig_path) as img:
-            # Handle different image modes
-            if img.mode in ("RGBA", "LA", "P"):
-                background = Image.new("RGB", img.size, (255, 255, 255))
-                if img.mode == "P":
-                    img = img.convert("RGBA")
-                if img.mode in ("RGBA", "LA"):
-                    background.paste(img, mask=img.split()[-1])
-                else:
-                    background.paste(img)
-                img = background
-            elif img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Create thumbnail maintaining aspect ratio
-            img.thumbnail(dimensions, Image.Resampling.LANCZOS)
-
-            # Save to bytes
-            buffer = io.BytesIO()
-            img.save(buffer, format="JPEG", quality=85, optimize=True)
-            buffer.seek(0)
-
-        # Get or create thumbnail folder
-        folder = get_or_create_thumbnail_folder(size)
+        img, _ = decode_image(orig_path, THUMBNAIL_SIZES[size])
+        return _save_thumbnail(document, size, _resize(img, size))
 
-        # Create unique filename
-        thumb_filename = f"thumb_{size}_{document.pk}.jpg"
+    except ValueError as e:
+        logger.warning(f"Thumbnail skipped for {document.pk}: {e}")
+        return None
+    except Exception as e:
+        logger.exception(f"Thumbnail generation error for {document.pk}: {e}")
+        return None
 
-        # Delete existing thumbnail if any
-        Document.objects.filter(folder=folder, filename=thumb_filename).delete()
 
-        # Create new thumbnail document
-        thumb_doc = Document.objects.create(
-            filename=thumb_filename,
-            document_type="image/jpeg",
-            category="image",
-            folder=folder,
-            file_size=buffer.getbuffer().nbytes,
-            metadata={
-                "original_document_id": str(document.pk),
-                "original_filename": document.filename,
-                "thumbnail_size": size,
-                "dimensions": list(dimensions),
-                "is_thumbnail": True,
-            }
-        )
+@transaction.atomic
+def generate_all_thumbnails(document):
+    """Generate thumbnails in all sizes for a document.
 
-        # Save the file
-        thumb_doc.file.save(thumb_filename, ContentFile(buffer.getvalue()), save=True)
+    The original is decoded once; each size is resized from the next
+    larger one rather than from the full image.
+    """
+    results = {size: False for size in THUMBNAIL_SIZES}
+    try:
+        orig_path = _original_path(document)
+        if orig_path is None:
+            return results
 
-        return thumb_doc
+        source, _ = decode_image(orig_path, _largest_box(THUMBNAIL_SIZES))
+        for size in _by_width_descending(THUMBNAIL_SIZES):
+            source = _resize(source, size)
+            results[size] = _save_thumbnail(document, size, source) is not None
 
+    except ValueError as e:
+        logger.warning(f"Thumbnails skipped for {document.pk}: {e}")
     except Exception as e:
-        print(f"Thumbnail generation error for {document.pk}: {e}")
-        return None
+        logger.exception(f"Thumbnail generation error for {document.pk}: {e}")
+    return results
 
 
-def generate_all_thumbnails(document):
-    """Generate thumbnails in all sizes for a document."""
-    results = {}
-    for size in THUMBNAIL_SIZES:
-        thumb_doc = generate_thumbnail(document, size)
-        results[size] = thumb_doc is not None
-    return results
+def supported_formats():
+    """THUMBNAIL_FORMATS that this Pillow build can encode, best first."""
+    if not HAS_PIL:
+        return []
+    configured = getattr(settings, "THUMBNAIL_FORMATS", ["webp"])
+    formats = []
+    for fmt in FORMAT_CONTENT_TYPES:
+        if fmt not in configured:
+            continue
+        try:
+            # AVIF needs Pillow 11.3+ built with libavif
+            if fmt == "jpeg" or features.check(fmt):
+                formats.append(fmt)
+        except Exception:
+            pass
+    return formats
+
+
+def accepted_formats(accept: str) -> set:
+    """Formats the Accept header names explicitly with q > 0.
+
+    Wildcards do not count: browsers that send only */* may not decode
+    WebP or AVIF.
+    """
+    by_type = {content_type: fmt for fmt, content_type in FORMAT_CONTENT_TYPES.items()}
+    accepted = set()
+    for item in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        fmt = by_type.get(media_type.lower())
+        if fmt is None:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(fmt)
+    return accepted
+
+
+def negotiate_format(accept: str, available) -> Optional[str]:
+    """Best of the available variant formats the client accepts."""
+    accepted = accepted_formats(accept)
+    for fmt in FORMAT_CONTENT_TYPES:
+        if fmt in available and fmt in accepted:
+            return fmt
+    return None
+
+
+def generate_variants(document, formats=None) -> Optional[dict]:
+    """Write every thumbnail size of an image in modern formats.
+
+    One shrink-on-load decode feeds all sizes; each size is resized from
+    the next larger one. Files go to default_storage under VARIANTS_ROOT
+    and are recorded in the document's metadata together with the decode
+    statistics.
+
+    Args:
+        document: Original image Document
+        formats: Formats to write (default: supported_formats() minus JPEG,
+            which the media renditions already provide)
+
+    Returns:
+        The metadata record, or None if nothing was written
+    """
+    if formats is None:
+        formats = [fmt for fmt in supported_formats() if fmt != "jpeg"]
+    if not formats or not document.file:
+        return None
+    if Path(document.filename).suffix.lower() not in SUPPORTED_FORMATS:
+        return None
+
+    with document.file.open("rb") as original:
+        source, stats = decode_image(original, _largest_box(THUMBNAIL_SIZES))
+
+    encode_started = time.perf_counter()
+    files = {}
+    for size in _by_width_descending(THUMBNAIL_SIZES):
+        source = _resize(source, size)
+        for fmt in formats:
+            name = f"{VARIANTS_ROOT}/{document.pk}/{size}.{FORMAT_EXTENSIONS[fmt]}"
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            files.setdefault(size, {})[fmt] = default_storage.save(name, ContentFile(encode(source, fmt)))
+
+    record = {
+        "source": document.file.name,
+        "formats": list(formats),
+        "files": files,
+        "stats": {**stats.as_dict(), "encode_ms": round((time.perf_counter() - encode_started) * 1000, 1)},
+    }
+    logger.info(
+        "Thumbnail variants for %s: decoded %sx%s of %sx%s in %.0f ms (%s MB), encoded in %.0f ms",
+        document.pk,
+        *stats.decoded_size,
+        *stats.source_size,
+        stats.decode_seconds * 1000,
+        round(stats.decoded_bytes / 2**20, 1),
+        record["stats"]["encode_ms"],
+    )
+
+    # Re-read under lock: metadata may have been edited since document was loaded
+    with transaction.atomic():
+        current = Document.objects.select_for_update().only("metadata").get(pk=document.pk)
+        metadata = dict(current.metadata or {})
+        metadata[VARIANTS_METADATA_KEY] = record
+        Document.objects.filter(pk=document.pk).update(metadata=metadata)
+    document.metadata = metadata
+    return record
+
+
+def variant_url(document, size, accept: str) -> Optional[str]:
+    """URL of the best recorded variant the client accepts, if any.
+
+    Uses only the document's metadata; no queries. Variants of a file
+    that has since been replaced are ignored.
+    """
+    record = (document.metadata or {}).get(VARIANTS_METADATA_KEY) if document.file else None
+    if not record or record.get("source") != document.file.name:
+        return None
+    files = record.get("files", {}).get(size, {})
+    fmt = negotiate_format(accept, files)
+    return default_storage.url(files[fmt]) if fmt else None
 
 
 def delete_thumbnails(document):
@@ -20,6 +20,9 @@ __all__ = [
     "PricedBasketItem",
     "ResolvedPrice",
     "resolve_price",
+    "resolve_prices",
+    "invalidate_price_cache",
+    "get_price_cache_stats",
     "list_applicable_prices",
     "explain_price_resolution",
     "NoPriceFoundError",
@@ -45,6 +48,18 @@ def __getattr__(name):
         from .selectors import resolve_price
 
         return resolve_price
+    if name == "resolve_prices":
+        from .selectors import resolve_prices
+
+        return resolve_prices
+    if name == "invalidate_price_cache":
+        from .cache import invalidate_price_cache
+
+        return invalidate_price_cache
+    if name == "get_price_cache_stats":
+        from .cache import get_price_cache_stats
+
+        return get_price_cache_stats
     if name == "list_applicable_prices":
         from .selectors import list_applicable_prices
 
@@ -5,3 +5,6 @@ class PricingConfig(AppConfig):
     name = "diveops.pricing"
     verbose_name = "Pricing"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from . import signals  # noqa: F401
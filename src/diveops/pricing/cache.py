@@ -0,0 +1,201 @@
+"""In-process cache for resolved prices.
+
+Price resolution runs on every booking line and basket item, but prices
+change rarely. Resolved prices are cached per process, keyed by
+(catalog_item, organization, party, agreement, time bucket).
+
+Invalidation uses a generation counter in the shared Django cache (Redis
+in production). Saving or deleting a Price bumps the generation; every
+process compares its local generation on lookup and drops its entries
+when the counter has moved, so a price edit is visible to all gunicorn
+workers on their next resolution. The counter starts from the clock, and
+a counter that is missing from the shared cache (evicted or flushed) is
+treated as unknown: every process that finds it missing drops its entries
+before seeding a new one.
+
+Time buckets: when no as_of is given, "now" is floored to
+PRICE_CACHE_BUCKET_SECONDS, so prices whose valid_from/valid_to boundary
+falls inside a bucket take effect up to one bucket late. Explicit as_of
+lookups are keyed on the exact timestamp.
+
+QuerySet.update() and bulk_create() bypass model signals; call
+invalidate_price_cache() after bulk edits to Price rows.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+GENERATION_CACHE_KEY = "diveops:pricing:generation"
+
+# Marker for "no price found" so misses are cached too
+NO_PRICE = object()
+
+
+@dataclass
+class PriceCacheStats:
+    """Hit/miss counters for the resolved-price cache."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["hit_ratio"] = self.hit_ratio
+        return data
+
+
+_lock = threading.Lock()
+_entries: OrderedDict = OrderedDict()
+_local_generation: int | None = None
+_stats = PriceCacheStats()
+
+
+def _enabled() -> bool:
+    return getattr(settings, "PRICE_CACHE_ENABLED", True)
+
+
+def _max_entries() -> int:
+    return getattr(settings, "PRICE_CACHE_MAX_ENTRIES", 10000)
+
+
+def _pk(obj):
+    if obj is None:
+        return None
+    return getattr(obj, "pk", obj)
+
+
+def time_bucket(as_of: datetime | None) -> str:
+    """Return the cache time bucket for a resolution time."""
+    if as_of is not None:
+        return as_of.isoformat()
+    seconds = getattr(settings, "PRICE_CACHE_BUCKET_SECONDS", 60)
+    now = int(timezone.now().timestamp())
+    return f"b{now - now % seconds}"
+
+
+def make_key(catalog_item, *, organization=None, party=None, agreement=None, bucket: str) -> tuple:
+    """Build the cache key for one resolution."""
+    return (_pk(catalog_item), _pk(organization), _pk(party), _pk(agreement), bucket)
+
+
+def _shared_generation() -> tuple[int | None, bool]:
+    """Return (shared generation, whether it was missing and had to be seeded)."""
+    try:
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if generation is not None:
+            return generation, False
+        # Start from the clock so an evicted counter never reuses old values
+        cache.add(GENERATION_CACHE_KEY, int(time.time()), timeout=None)
+        return cache.get(GENERATION_CACHE_KEY), True
+    except Exception as e:
+        logger.warning("Price cache generation unavailable: %s", e)
+        return None, False
+
+
+def current_generation() -> int | None:
+    """Return the shared price generation, or None if the cache is unavailable."""
+    return _shared_generation()[0]
+
+
+def sync_generation() -> int | None:
+    """Drop local entries if the shared generation has moved; return it.
+
+    Call once per resolution (or once per bulk resolution) before get/put.
+    Returns None when caching is disabled or the shared cache is down, in
+    which case nothing is served from or stored in the local cache.
+    """
+    global _local_generation
+
+    if not _enabled():
+        return None
+    generation, missing = _shared_generation()
+    with _lock:
+        # A missing counter says nothing about what was invalidated meanwhile
+        if missing or generation != _local_generation:
+            _entries.clear()
+            _local_generation = generation
+    return generation
+
+
+def get(key: tuple, generation: int | None):
+    """Return the cached value for key, NO_PRICE for a cached miss, or None."""
+    if generation is None:
+        return None
+    with _lock:
+        value = _entries.get(key)
+        if value is None:
+            _stats.misses += 1
+            return None
+        _entries.move_to_end(key)
+        _stats.hits += 1
+        return value
+
+
+def put(key: tuple, value, generation: int | None) -> None:
+    """Store a resolved price (or NO_PRICE) computed under generation."""
+    if generation is None:
+        return
+    with _lock:
+        if generation != _local_generation:
+            return  # A newer generation arrived while we were querying
+        _entries[key] = value
+        _entries.move_to_end(key)
+        while len(_entries) > _max_entries():
+            _entries.popitem(last=False)
+
+
+def invalidate_price_cache() -> None:
+    """Bump the shared generation so every process drops its cached prices."""
+    global _local_generation
+
+    try:
+        if not cache.add(GENERATION_CACHE_KEY, int(time.time()), timeout=None):
+            cache.incr(GENERATION_CACHE_KEY)
+    except Exception as e:
+        logger.warning("Price cache invalidation failed: %s", e)
+    with _lock:
+        _entries.clear()
+        _local_generation = None
+        _stats.invalidations += 1
+
+
+def get_price_cache_stats() -> dict:
+    """Return hits, misses, hit_ratio, invalidations and size for this process."""
+    with _lock:
+        data = _stats.as_dict()
+        data["size"] = len(_entries)
+        data["generation"] = _local_generation
+    return data
+
+
+def reset_price_cache_stats() -> None:
+    """Zero the hit/miss counters."""
+    global _stats
+
+    with _lock:
+        _stats = PriceCacheStats()
+
+
+def clear_local_cache() -> None:
+    """Drop this process's entries without bumping the shared generation."""
+    global _local_generation
+
+    with _lock:
+        _entries.clear()
+        _local_generation = None
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pricing", "0004_price_cost_fields"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="price",
+            index=models.Index(
+                fields=["catalog_item", "-priority", "-valid_from"],
+                name="price_item_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="price",
+            index=models.Index(
+                condition=models.Q(
+                    ("agreement__isnull", True),
+                    ("organization__isnull", True),
+                    ("party__isnull", True),
+                ),
+                fields=["catalog_item", "-priority", "-valid_from"],
+                name="price_item_global_idx",
+            ),
+        ),
+    ]
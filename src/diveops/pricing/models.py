@@ -72,7 +72,7 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.utils import timezone
 
 from django_money import Money
@@ -112,6 +112,36 @@ class PriceQuerySet(models.QuerySet):
         """Filter to prices scoped to an agreement."""
         return self.filter(agreement=agreement)
 
+    def applicable(self, *, organization=None, party=None, agreement=None):
+        """Filter to prices in any scope level that applies, ranked by specificity.
+
+        Annotates scope_rank (0 agreement, 1 party, 2 organization, 3 global)
+        and orders by scope_rank, then priority, then valid_from, so the
+        first row is the price resolve_price would pick.
+        """
+        global_q = Q(organization__isnull=True, party__isnull=True, agreement__isnull=True)
+        scope_q = global_q
+        whens = []
+
+        if agreement is not None:
+            agreement_q = Q(agreement=agreement)
+            scope_q |= agreement_q
+            whens.append(When(agreement_q, then=Value(0)))
+        if party is not None:
+            party_q = Q(party=party, agreement__isnull=True)
+            scope_q |= party_q
+            whens.append(When(party_q, then=Value(1)))
+        if organization is not None:
+            organization_q = Q(organization=organization, party__isnull=True, agreement__isnull=True)
+            scope_q |= organization_q
+            whens.append(When(organization_q, then=Value(2)))
+
+        return (
+            self.filter(scope_q)
+            .annotate(scope_rank=Case(*whens, default=Value(3), output_field=IntegerField()))
+            .order_by("scope_rank", "-priority", "-valid_from")
+        )
+
 
 class Price(models.Model):
     """A price for a catalog item, optionally scoped and time-bounded.
@@ -210,6 +240,19 @@ class Price(models.Model):
 
     class Meta:
         ordering = ["-priority", "-valid_from"]
+        indexes = [
+            # Current-price lookups by item (resolve_price / resolve_prices)
+            models.Index(
+                fields=["catalog_item", "-priority", "-valid_from"],
+                name="price_item_priority_idx",
+            ),
+            # Global list prices, the fallback level hit by almost every lookup
+            models.Index(
+                fields=["catalog_item", "-priority", "-valid_from"],
+                name="price_item_global_idx",
+                condition=Q(organization__isnull=True, party__isnull=True, agreement__isnull=True),
+            ),
+        ]
         constraints = [
             # Amount must be positive
             models.CheckConstraint(
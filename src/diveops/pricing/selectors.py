@@ -9,6 +9,7 @@ from django.utils import timezone
 
 from django_money import Money
 
+from . import cache as price_cache
 from .exceptions import NoPriceFoundError
 from .models import Price
 from .value_objects import ResolvedPrice
@@ -24,6 +25,9 @@ def resolve_price(
 ) -> ResolvedPrice:
     """Resolve the unit price for a catalog item.
 
+    Results (including "no price") are served from the in-process price
+    cache when possible; see pricing.cache for keying and invalidation.
+
     Resolution order (first match wins):
     1. Agreement-specific price (if agreement provided)
     2. Party-specific price (if party provided)
@@ -47,48 +51,61 @@ def resolve_price(
     Raises:
         NoPriceFoundError: If no applicable price exists.
     """
-    check_time = as_of or timezone.now()
+    generation = price_cache.sync_generation()
+    key = price_cache.make_key(
+        catalog_item,
+        organization=organization,
+        party=party,
+        agreement=agreement,
+        bucket=price_cache.time_bucket(as_of),
+    )
+    cached = price_cache.get(key, generation)
+    if cached is price_cache.NO_PRICE:
+        raise NoPriceFoundError(
+            catalog_item,
+            context={
+                "organization": organization,
+                "party": party,
+                "agreement": agreement,
+                "as_of": as_of or timezone.now(),
+            },
+        )
+    if cached is not None:
+        return cached
 
-    # Get all current prices for this item
-    base_qs = Price.objects.for_catalog_item(catalog_item).current(as_of=check_time)
+    try:
+        resolved = _resolve_price_uncached(
+            catalog_item,
+            organization=organization,
+            party=party,
+            agreement=agreement,
+            as_of=as_of,
+        )
+    except NoPriceFoundError:
+        price_cache.put(key, price_cache.NO_PRICE, generation)
+        raise
+    price_cache.put(key, resolved, generation)
+    return resolved
 
-    # Try each scope level in order of specificity
-    price = None
 
-    # 1. Agreement-specific price (highest priority)
-    if agreement is not None:
-        price = (
-            base_qs.for_agreement(agreement)
-            .order_by("-priority", "-valid_from")
-            .first()
-        )
-        if price:
-            return _to_resolved_price(price)
-
-    # 2. Party-specific price
-    if party is not None:
-        price = (
-            base_qs.for_party(party)
-            .filter(agreement__isnull=True)  # Not tied to an agreement
-            .order_by("-priority", "-valid_from")
-            .first()
-        )
-        if price:
-            return _to_resolved_price(price)
-
-    # 3. Organization-specific price
-    if organization is not None:
-        price = (
-            base_qs.for_organization(organization)
-            .filter(party__isnull=True, agreement__isnull=True)
-            .order_by("-priority", "-valid_from")
-            .first()
-        )
-        if price:
-            return _to_resolved_price(price)
+def _resolve_price_uncached(
+    catalog_item,
+    *,
+    organization=None,
+    party=None,
+    agreement=None,
+    as_of: datetime | None = None,
+) -> ResolvedPrice:
+    """Resolve a price from the database (see resolve_price)."""
+    check_time = as_of or timezone.now()
 
-    # 4. Global price (fallback)
-    price = base_qs.global_scope().order_by("-priority", "-valid_from").first()
+    # One ranked query: most specific scope first, then priority, then valid_from
+    price = (
+        Price.objects.for_catalog_item(catalog_item)
+        .current(as_of=check_time)
+        .applicable(organization=organization, party=party, agreement=agreement)
+        .first()
+    )
 
     if price:
         return _to_resolved_price(price)
@@ -105,50 +122,95 @@ def resolve_price(
     )
 
 
-def list_applicable_prices(
-    catalog_item,
+def resolve_prices(
+    catalog_items,
     *,
     organization=None,
     party=None,
     agreement=None,
     as_of: datetime | None = None,
-) -> list[Price]:
-    """List all prices that could apply to a catalog item.
+) -> dict:
+    """Resolve unit prices for many catalog items at once.
 
-    Returns prices in resolution order (most specific first).
-    Useful for debugging and transparency.
+    Applies the same resolution order as resolve_price, but answers every
+    item not already in the price cache with a single query.
+
+    Args:
+        catalog_items: Iterable of CatalogItems (or their primary keys)
+        organization: Optional payer organization
+        party: Optional individual person
+        agreement: Optional contract/agreement
+        as_of: Point in time for price resolution (defaults to now)
+
+    Returns:
+        Dict mapping catalog item pk to ResolvedPrice. Items with no
+        applicable price are omitted.
     """
     check_time = as_of or timezone.now()
-    base_qs = Price.objects.for_catalog_item(catalog_item).current(as_of=check_time)
+    bucket = price_cache.time_bucket(as_of)
+    generation = price_cache.sync_generation()
+
+    resolved = {}
+    keys = {}
+    for item in catalog_items:
+        item_pk = getattr(item, "pk", item)
+        if item_pk in resolved or item_pk in keys:
+            continue
+        key = price_cache.make_key(
+            item_pk, organization=organization, party=party, agreement=agreement, bucket=bucket
+        )
+        cached = price_cache.get(key, generation)
+        if cached is price_cache.NO_PRICE:
+            continue
+        if cached is not None:
+            resolved[item_pk] = cached
+        else:
+            keys[item_pk] = key
+
+    if not keys:
+        return resolved
+
+    prices = (
+        Price.objects.filter(catalog_item_id__in=list(keys))
+        .current(as_of=check_time)
+        .applicable(organization=organization, party=party, agreement=agreement)
+    )
 
-    prices = []
+    # Rows arrive in resolution order, so the first per item wins
+    best = {}
+    for price in prices:
+        best.setdefault(price.catalog_item_id, price)
 
-    # Agreement-specific prices
-    if agreement:
-        prices.extend(
-            base_qs.for_agreement(agreement).order_by("-priority", "-valid_from")
-        )
+    for item_pk, key in keys.items():
+        price = best.get(item_pk)
+        if price is None:
+            price_cache.put(key, price_cache.NO_PRICE, generation)
+            continue
+        resolved[item_pk] = _to_resolved_price(price)
+        price_cache.put(key, resolved[item_pk], generation)
 
-    # Party-specific prices
-    if party:
-        prices.extend(
-            base_qs.for_party(party)
-            .filter(agreement__isnull=True)
-            .order_by("-priority", "-valid_from")
-        )
+    return resolved
 
-    # Organization-specific prices
-    if organization:
-        prices.extend(
-            base_qs.for_organization(organization)
-            .filter(party__isnull=True, agreement__isnull=True)
-            .order_by("-priority", "-valid_from")
-        )
 
-    # Global prices
-    prices.extend(base_qs.global_scope().order_by("-priority", "-valid_from"))
+def list_applicable_prices(
+    catalog_item,
+    *,
+    organization=None,
+    party=None,
+    agreement=None,
+    as_of: datetime | None = None,
+) -> list[Price]:
+    """List all prices that could apply to a catalog item.
 
-    return prices
+    Returns prices in resolution order (most specific first).
+    Useful for debugging and transparency.
+    """
+    check_time = as_of or timezone.now()
+    return list(
+        Price.objects.for_catalog_item(catalog_item)
+        .current(as_of=check_time)
+        .applicable(organization=organization, party=party, agreement=agreement)
+    )
 
 
 def explain_price_resolution(
@@ -166,7 +228,8 @@ def explain_price_resolution(
     - candidates: All applicable prices in resolution order
     - explanation: Human-readable explanation
 
-    Useful for debugging and auditing.
+    The selected price is the first candidate, so both come from the same
+    query and cannot disagree. Useful for debugging and auditing.
     """
     check_time = as_of or timezone.now()
 
@@ -178,17 +241,10 @@ def explain_price_resolution(
         as_of=check_time,
     )
 
-    try:
-        resolved = resolve_price(
-            catalog_item,
-            organization=organization,
-            party=party,
-            agreement=agreement,
-            as_of=check_time,
-        )
-        selected = resolved
-        explanation = resolved.explain()
-    except NoPriceFoundError:
+    if candidates:
+        selected = _to_resolved_price(candidates[0])
+        explanation = selected.explain()
+    else:
         selected = None
         explanation = "No applicable price found"
 
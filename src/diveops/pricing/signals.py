@@ -0,0 +1,15 @@
+"""Signal handlers for the pricing module."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_price_cache
+from .models import Price
+
+
+@receiver(post_save, sender=Price)
+@receiver(post_delete, sender=Price)
+def invalidate_cached_prices(sender, instance, **kwargs):
+    """Invalidate resolved prices once the Price change is committed."""
+    transaction.on_commit(invalidate_price_cache)
@@ -0,0 +1 @@
+"""Tests for the diveops.pricing module."""
@@ -0,0 +1,204 @@
+"""Tests for the resolved-price cache.
+
+Tests cover:
+- Cache hits for repeated resolve_price calls
+- Cached "no price" results
+- Generation-based invalidation, with a clock-seeded, eviction-safe counter
+- Bulk resolve_prices scope selection and caching
+"""
+
+import time
+from datetime import datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from django.core.cache import cache
+
+from .. import cache as price_cache
+from ..exceptions import NoPriceFoundError
+from ..selectors import resolve_price, resolve_prices
+
+AS_OF = datetime(2026, 1, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start every test with an empty cache and zeroed counters."""
+    cache.clear()
+    price_cache.clear_local_cache()
+    price_cache.reset_price_cache_stats()
+    yield
+    price_cache.clear_local_cache()
+
+
+def make_price(item_pk, *, organization_id=None, party_id=None, agreement_id=None, amount="10.00"):
+    """Build a Price stand-in with the attributes resolve_prices reads."""
+    price = MagicMock()
+    price.pk = uuid4()
+    price.catalog_item_id = item_pk
+    price.organization_id = organization_id
+    price.party_id = party_id
+    price.agreement_id = agreement_id
+    price.money = SimpleNamespace(amount=amount, currency="USD")
+    price.scope_type = "agreement" if agreement_id else "party" if party_id else (
+        "organization" if organization_id else "global"
+    )
+    price.scope_id = agreement_id or party_id or organization_id
+    price.valid_from = AS_OF
+    price.valid_to = None
+    price.priority = 50
+    return price
+
+
+def mock_price_query(mock_price_model, prices):
+    """Make Price.objects.filter(...).current(...).applicable(...) return prices."""
+    chain = mock_price_model.objects.filter.return_value.current.return_value
+    chain.applicable.return_value = prices
+
+
+class TestResolvePriceCache:
+    """Tests for caching in resolve_price."""
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_repeat_resolution_is_cached(self, mock_resolve):
+        """The second identical resolution does not hit the database."""
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        first = resolve_price(item, as_of=AS_OF)
+        second = resolve_price(item, as_of=AS_OF)
+
+        assert first == second == "resolved"
+        assert mock_resolve.call_count == 1
+        stats = price_cache.get_price_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_no_price_is_cached(self, mock_resolve):
+        """A missing price is remembered and re-raised."""
+        item = SimpleNamespace(pk=uuid4(), display_name="Tank")
+        mock_resolve.side_effect = NoPriceFoundError(item)
+
+        for _ in range(2):
+            with pytest.raises(NoPriceFoundError):
+                resolve_price(item, as_of=AS_OF)
+
+        assert mock_resolve.call_count == 1
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_scope_is_part_of_key(self, mock_resolve):
+        """Different payer scopes resolve separately."""
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        resolve_price(item, as_of=AS_OF)
+        resolve_price(item, organization=SimpleNamespace(pk=uuid4()), as_of=AS_OF)
+
+        assert mock_resolve.call_count == 2
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_invalidation_drops_entries(self, mock_resolve):
+        """Bumping the generation forces a fresh resolution."""
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        resolve_price(item, as_of=AS_OF)
+        price_cache.invalidate_price_cache()
+        resolve_price(item, as_of=AS_OF)
+
+        assert mock_resolve.call_count == 2
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_other_process_invalidation_is_seen(self, mock_resolve):
+        """A generation bumped elsewhere clears this process's entries."""
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        resolve_price(item, as_of=AS_OF)
+        cache.set(price_cache.GENERATION_CACHE_KEY, 99)
+        resolve_price(item, as_of=AS_OF)
+
+        assert mock_resolve.call_count == 2
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_evicted_generation_drops_entries(self, mock_resolve):
+        """A flushed counter is unknown, not a generation this process has seen."""
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        resolve_price(item, as_of=AS_OF)
+        cache.delete(price_cache.GENERATION_CACHE_KEY)
+        resolve_price(item, as_of=AS_OF)
+
+        assert mock_resolve.call_count == 2
+
+    def test_generation_seeded_from_clock(self):
+        """Invalidating with no counter starts it from the clock, never at 1."""
+        before = int(time.time())
+
+        price_cache.invalidate_price_cache()
+
+        assert cache.get(price_cache.GENERATION_CACHE_KEY) >= before
+
+    @patch("diveops.pricing.selectors._resolve_price_uncached")
+    def test_disabled_cache(self, mock_resolve, settings):
+        """PRICE_CACHE_ENABLED=False always resolves from the database."""
+        settings.PRICE_CACHE_ENABLED = False
+        item = SimpleNamespace(pk=uuid4())
+        mock_resolve.return_value = "resolved"
+
+        resolve_price(item, as_of=AS_OF)
+        resolve_price(item, as_of=AS_OF)
+
+        assert mock_resolve.call_count == 2
+
+
+class TestResolvePrices:
+    """Tests for bulk resolve_prices."""
+
+    @patch("diveops.pricing.selectors.Price")
+    def test_first_ranked_row_per_item_wins(self, mock_price_model):
+        """Rows arrive in resolution order; the first per item is used."""
+        org = SimpleNamespace(pk=uuid4())
+        item_a, item_b = uuid4(), uuid4()
+        mock_price_query(
+            mock_price_model,
+            [
+                make_price(item_a, organization_id=org.pk, amount="90"),
+                make_price(item_b, amount="30"),
+                make_price(item_a, amount="100"),
+            ],
+        )
+
+        resolved = resolve_prices([item_a, item_b], organization=org, as_of=AS_OF)
+
+        assert resolved[item_a].unit_price.amount == "90"
+        assert resolved[item_b].unit_price.amount == "30"
+        mock_price_model.objects.filter.assert_called_once()
+        mock_price_model.objects.filter.return_value.current.return_value.applicable.assert_called_once_with(
+            organization=org, party=None, agreement=None
+        )
+
+    @patch("diveops.pricing.selectors.Price")
+    def test_missing_items_are_omitted(self, mock_price_model):
+        """Items without a price are left out of the result."""
+        item = uuid4()
+        mock_price_query(mock_price_model, [])
+
+        assert resolve_prices([item], as_of=AS_OF) == {}
+
+    @patch("diveops.pricing.selectors.Price")
+    def test_cached_items_are_not_queried(self, mock_price_model):
+        """A second bulk call for the same items makes no query."""
+        item = uuid4()
+        mock_price_query(mock_price_model, [make_price(item)])
+
+        resolve_prices([item], as_of=AS_OF)
+        mock_price_model.objects.filter.reset_mock()
+        resolved = resolve_prices([item], as_of=AS_OF)
+
+        assert item in resolved
+        mock_price_model.objects.filter.assert_not_called()
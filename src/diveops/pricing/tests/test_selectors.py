@@ -0,0 +1,401 @@
+"""Tests for single-query price resolution.
+
+Tests cover:
+- PriceQuerySet.applicable() scope filter, ranking and ordering
+- explain_price_resolution selecting from the candidate query
+- Resolution against the database: scope precedence, priority and
+  valid_from within a scope, expired and future prices, and
+  resolve_price / list_applicable_prices / explain_price_resolution
+  agreeing on the winner
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Case
+
+from .. import cache as price_cache
+from ..exceptions import NoPriceFoundError
+from ..models import Price
+from ..selectors import explain_price_resolution, list_applicable_prices, resolve_price
+
+AS_OF = datetime(2026, 1, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class TestApplicableQuerySet:
+    """Tests for the ranked scope-cascade queryset."""
+
+    def test_orders_by_rank_priority_valid_from(self):
+        """Most specific scope first, then priority, then valid_from."""
+        qs = Price.objects.applicable()
+
+        assert qs.query.order_by == ("scope_rank", "-priority", "-valid_from")
+
+    def test_global_only_ranks_everything_global(self):
+        """Without scopes every row ranks as global."""
+        rank = Price.objects.applicable().query.annotations["scope_rank"]
+
+        assert isinstance(rank, Case)
+        assert rank.cases == []
+        assert rank.default.value == 3
+
+    def test_one_rank_per_given_scope(self):
+        """Each provided scope adds one ranked level, most specific first."""
+        rank = (
+            Price.objects.applicable(
+                organization=uuid4(),
+                party=uuid4(),
+                agreement=uuid4(),
+            )
+            .query.annotations["scope_rank"]
+        )
+
+        assert [when.result.value for when in rank.cases] == [0, 1, 2]
+
+
+class TestExplainPriceResolution:
+    """Tests for explain_price_resolution."""
+
+    @patch("diveops.pricing.selectors.list_applicable_prices")
+    def test_selected_is_first_candidate(self, mock_list):
+        """The selected price comes from the same ranked candidate list."""
+        first = MagicMock(
+            pk=uuid4(),
+            amount="80",
+            currency="USD",
+            scope_type="party",
+            scope_id=uuid4(),
+            priority=50,
+            valid_from=AS_OF,
+            valid_to=None,
+        )
+        second = MagicMock(
+            pk=uuid4(),
+            amount="100",
+            currency="USD",
+            scope_type="global",
+            scope_id=None,
+            priority=50,
+            valid_from=AS_OF,
+            valid_to=None,
+        )
+        mock_list.return_value = [first, second]
+
+        result = explain_price_resolution(SimpleNamespace(pk=uuid4()), as_of=AS_OF)
+
+        assert result["selected_price"].price_id == first.pk
+        assert [c["id"] for c in result["candidates"]] == [str(first.pk), str(second.pk)]
+
+    @patch("diveops.pricing.selectors.list_applicable_prices")
+    def test_no_candidates(self, mock_list):
+        """With no candidates nothing is selected."""
+        mock_list.return_value = []
+
+        result = explain_price_resolution(SimpleNamespace(pk=uuid4()), as_of=AS_OF)
+
+        assert result["selected_price"] is None
+        assert result["explanation"] == "No applicable price found"
+
+
+@pytest.fixture
+def user(db):
+    """Create a staff user to own prices."""
+    return get_user_model().objects.create_user(
+        username="pricer",
+        email="pricer@example.com",
+        password="testpass123",
+        is_staff=True,
+    )
+
+
+@pytest.fixture
+def catalog_item(db):
+    """Create a billable catalog item."""
+    from django_catalog.models import CatalogItem
+
+    return CatalogItem.objects.create(
+        display_name="Two-Tank Boat Dive",
+        kind="service",
+        is_billable=True,
+        active=True,
+    )
+
+
+@pytest.fixture
+def organization(db):
+    """Create a payer organization."""
+    from django_parties.models import Organization
+
+    return Organization.objects.create(name="Reef Travel Co", org_type="company")
+
+
+@pytest.fixture
+def other_organization(db):
+    """Create a second organization, for party prices that also name one."""
+    from django_parties.models import Organization
+
+    return Organization.objects.create(name="Blue Water Club", org_type="company")
+
+
+@pytest.fixture
+def party(db):
+    """Create a person to price for."""
+    from django_parties.models import Person
+
+    return Person.objects.create(
+        first_name="Price",
+        last_name="Tester",
+        email="price.tester@example.com",
+    )
+
+
+@pytest.fixture
+def agreement(db, organization, party):
+    """Create an agreement between the organization and the person."""
+    from django_agreements.services import create_agreement
+
+    return create_agreement(
+        party_a=organization,
+        party_b=party,
+        scope_type="pricing",
+        terms={"notes": "Negotiated rate"},
+        valid_from=AS_OF - timedelta(days=365),
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_price_cache():
+    """Resolve from the database, not from an earlier test's cache."""
+    cache.clear()
+    price_cache.clear_local_cache()
+    yield
+    price_cache.clear_local_cache()
+
+
+@pytest.fixture
+def make_price(catalog_item, user):
+    """Create a price for the catalog item, valid from 30 days before AS_OF."""
+
+    def _make_price(amount, **kwargs):
+        kwargs.setdefault("valid_from", AS_OF - timedelta(days=30))
+        return Price.objects.create(
+            catalog_item=catalog_item,
+            amount=Decimal(amount),
+            currency="USD",
+            created_by=user,
+            **kwargs,
+        )
+
+    return _make_price
+
+
+def resolve_all(catalog_item, **scopes):
+    """Run the three selectors and return (resolved, candidates, explanation)."""
+    return (
+        resolve_price(catalog_item, as_of=AS_OF, **scopes),
+        list_applicable_prices(catalog_item, as_of=AS_OF, **scopes),
+        explain_price_resolution(catalog_item, as_of=AS_OF, **scopes),
+    )
+
+
+@pytest.mark.django_db
+class TestResolutionPrecedence:
+    """Tests for scope precedence: agreement, party, organization, global."""
+
+    @pytest.fixture
+    def all_scopes(self, make_price, organization, party, agreement):
+        return {
+            "global": make_price("100.00", priority=90),
+            "organization": make_price("90.00", organization=organization, priority=70),
+            "party": make_price("80.00", party=party, priority=60),
+            "agreement": make_price("70.00", agreement=agreement),
+        }
+
+    def test_agreement_wins(self, catalog_item, all_scopes, organization, party, agreement):
+        """An agreement price beats every less specific scope, whatever its priority."""
+        resolved = resolve_price(
+            catalog_item, organization=organization, party=party, agreement=agreement, as_of=AS_OF
+        )
+
+        assert resolved.price_id == all_scopes["agreement"].pk
+        assert resolved.scope_type == "agreement"
+
+    def test_party_beats_organization(self, catalog_item, all_scopes, organization, party):
+        """Without an agreement the party price wins."""
+        resolved = resolve_price(catalog_item, organization=organization, party=party, as_of=AS_OF)
+
+        assert resolved.price_id == all_scopes["party"].pk
+
+    def test_organization_beats_global(self, catalog_item, all_scopes, organization):
+        """With only an organization its price beats the global one."""
+        resolved = resolve_price(catalog_item, organization=organization, as_of=AS_OF)
+
+        assert resolved.price_id == all_scopes["organization"].pk
+
+    def test_global_without_scopes(self, catalog_item, all_scopes):
+        """Without any scope only the global price applies."""
+        resolved, candidates, _ = resolve_all(catalog_item)
+
+        assert resolved.price_id == all_scopes["global"].pk
+        assert candidates == [all_scopes["global"]]
+
+    def test_candidates_in_scope_order(self, catalog_item, all_scopes, organization, party, agreement):
+        """Every applicable price is listed, most specific scope first."""
+        candidates = list_applicable_prices(
+            catalog_item, organization=organization, party=party, agreement=agreement, as_of=AS_OF
+        )
+
+        assert [p.scope_type for p in candidates] == ["agreement", "party", "organization", "global"]
+
+    def test_falls_back_when_scope_has_no_price(self, catalog_item, make_price, organization, party, agreement):
+        """A scope with no price falls through to the next level."""
+        org_price = make_price("90.00", organization=organization)
+        make_price("100.00")
+
+        resolved = resolve_price(
+            catalog_item, organization=organization, party=party, agreement=agreement, as_of=AS_OF
+        )
+
+        assert resolved.price_id == org_price.pk
+
+    def test_other_scopes_ignored(self, catalog_item, make_price, organization, other_organization):
+        """Prices for another organization never apply."""
+        make_price("50.00", organization=other_organization)
+        global_price = make_price("100.00")
+
+        resolved = resolve_price(catalog_item, organization=organization, as_of=AS_OF)
+
+        assert resolved.price_id == global_price.pk
+
+
+@pytest.mark.django_db
+class TestResolutionWithinScope:
+    """Tests for priority and valid_from ordering inside one scope level.
+
+    Two current prices in exactly the same scope would overlap, so these use
+    party prices with and without an organization: different scopes for the
+    overlap rules, the same party level for resolution.
+    """
+
+    def test_higher_priority_wins(self, catalog_item, make_price, party, other_organization):
+        """Higher priority beats a more recent valid_from."""
+        preferred = make_price("80.00", party=party, priority=80, valid_from=AS_OF - timedelta(days=60))
+        make_price("75.00", party=party, organization=other_organization, priority=50)
+
+        resolved, candidates, _ = resolve_all(catalog_item, party=party)
+
+        assert resolved.price_id == preferred.pk
+        assert [p.priority for p in candidates] == [80, 50]
+
+    def test_recent_valid_from_breaks_tie(self, catalog_item, make_price, party, other_organization):
+        """At equal priority the most recently effective price wins."""
+        make_price("80.00", party=party, valid_from=AS_OF - timedelta(days=60))
+        recent = make_price("75.00", party=party, organization=other_organization, valid_from=AS_OF - timedelta(days=5))
+
+        resolved = resolve_price(catalog_item, party=party, as_of=AS_OF)
+
+        assert resolved.price_id == recent.pk
+
+    def test_priority_does_not_cross_scopes(self, catalog_item, make_price, party):
+        """A high-priority global price still loses to a party price."""
+        make_price("100.00", priority=100)
+        party_price = make_price("80.00", party=party, priority=1)
+
+        resolved = resolve_price(catalog_item, party=party, as_of=AS_OF)
+
+        assert resolved.price_id == party_price.pk
+
+
+@pytest.mark.django_db
+class TestResolutionDating:
+    """Tests for expired and future prices."""
+
+    def test_expired_price_skipped(self, catalog_item, make_price, party):
+        """A price whose valid_to has passed falls through to the next scope."""
+        make_price("80.00", party=party, valid_to=AS_OF - timedelta(days=1))
+        global_price = make_price("100.00")
+
+        resolved, candidates, _ = resolve_all(catalog_item, party=party)
+
+        assert resolved.price_id == global_price.pk
+        assert candidates == [global_price]
+
+    def test_valid_to_is_exclusive(self, catalog_item, make_price, party):
+        """A price ending exactly at as_of no longer applies."""
+        make_price("80.00", party=party, valid_to=AS_OF)
+        global_price = make_price("100.00")
+
+        resolved = resolve_price(catalog_item, party=party, as_of=AS_OF)
+
+        assert resolved.price_id == global_price.pk
+
+    def test_future_price_skipped(self, catalog_item, make_price, organization):
+        """A price that has not started yet does not apply."""
+        make_price("90.00", organization=organization, valid_from=AS_OF + timedelta(days=1))
+        global_price = make_price("100.00")
+
+        resolved = resolve_price(catalog_item, organization=organization, as_of=AS_OF)
+
+        assert resolved.price_id == global_price.pk
+
+    def test_successive_prices_in_one_scope(self, catalog_item, make_price):
+        """The price in effect at as_of is chosen from a dated series."""
+        make_price("90.00", valid_from=AS_OF - timedelta(days=60), valid_to=AS_OF - timedelta(days=10))
+        current = make_price("95.00", valid_from=AS_OF - timedelta(days=10), valid_to=AS_OF + timedelta(days=10))
+        make_price("99.00", valid_from=AS_OF + timedelta(days=10))
+
+        resolved = resolve_price(catalog_item, as_of=AS_OF)
+
+        assert resolved.price_id == current.pk
+        assert resolved.unit_price.amount == Decimal("95.00")
+
+    def test_no_current_price(self, catalog_item, make_price):
+        """With only expired and future prices nothing resolves."""
+        make_price("90.00", valid_from=AS_OF - timedelta(days=60), valid_to=AS_OF - timedelta(days=10))
+        make_price("99.00", valid_from=AS_OF + timedelta(days=10))
+
+        with pytest.raises(NoPriceFoundError):
+            resolve_price(catalog_item, as_of=AS_OF)
+        assert list_applicable_prices(catalog_item, as_of=AS_OF) == []
+        assert explain_price_resolution(catalog_item, as_of=AS_OF)["selected_price"] is None
+
+
+@pytest.mark.django_db
+class TestSelectorsAgree:
+    """resolve_price, list_applicable_prices and explain_price_resolution agree."""
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("organization",),
+            ("party",),
+            ("organization", "party"),
+            ("organization", "party", "agreement"),
+        ],
+    )
+    def test_same_winner(
+        self, request, catalog_item, make_price, organization, party, agreement, other_organization, scopes
+    ):
+        """All three selectors pick the same price for every scope combination."""
+        make_price("100.00", priority=90)
+        make_price("95.00", priority=40, valid_from=AS_OF - timedelta(days=400), valid_to=AS_OF - timedelta(days=30))
+        make_price("90.00", organization=organization, valid_to=AS_OF + timedelta(days=1))
+        make_price("85.00", organization=organization, valid_from=AS_OF + timedelta(days=1))
+        make_price("80.00", party=party, priority=40)
+        make_price("78.00", party=party, organization=other_organization, priority=60)
+        make_price("70.00", agreement=agreement, valid_to=AS_OF - timedelta(days=1))
+        make_price("72.00", agreement=agreement, party=party, valid_from=AS_OF - timedelta(days=1))
+        kwargs = {scope: request.getfixturevalue(scope) for scope in scopes}
+
+        resolved, candidates, explained = resolve_all(catalog_item, **kwargs)
+
+        assert resolved.price_id == candidates[0].pk
+        assert explained["selected_price"] == resolved
+        assert [c["id"] for c in explained["candidates"]] == [str(p.pk) for p in candidates]
@@ -229,6 +229,74 @@ DIVE_SHOP_LONGITUDE = float(os.environ.get("DIVE_SHOP_LONGITUDE", "-80.1918"))
 USE_RUST_PRICING = os.environ.get("USE_RUST_PRICING", "true").lower() == "true"
 RUST_PRICING_URL = os.environ.get("RUST_PRICING_URL", "http://localhost:8080/api/pricing")
 RUST_PRICING_TIMEOUT = float(os.environ.get("RUST_PRICING_TIMEOUT", "5.0"))
+# Keep-alive connection pool shared by all pricing calls in a worker process
+RUST_PRICING_POOL_MAX_CONNECTIONS = int(os.environ.get("RUST_PRICING_POOL_MAX_CONNECTIONS", "20"))
+RUST_PRICING_POOL_MAX_KEEPALIVE = int(os.environ.get("RUST_PRICING_POOL_MAX_KEEPALIVE", "10"))
+RUST_PRICING_KEEPALIVE_EXPIRY = float(os.environ.get("RUST_PRICING_KEEPALIVE_EXPIRY", "30.0"))
+# Circuit breaker for pricing/deco sidecar calls (state shared via CACHES)
+RUST_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("RUST_CIRCUIT_FAILURE_THRESHOLD", "3"))
+RUST_CIRCUIT_RESET_TIMEOUT = float(os.environ.get("RUST_CIRCUIT_RESET_TIMEOUT", "30.0"))
+RUST_HEALTH_PROBE_INTERVAL = float(os.environ.get("RUST_HEALTH_PROBE_INTERVAL", "10.0"))
+# Bump when the deco validator tool or model changes, to drop cached results
+DECO_RESULT_CACHE_VERSION = os.environ.get("DECO_RESULT_CACHE_VERSION", "1")
+# Validate an excursion's dive plans (after commit) when they are locked
+DECO_VALIDATE_ON_LOCK = os.environ.get("DECO_VALIDATE_ON_LOCK", "false").lower() == "true"
+
+# In-process resolved-price cache (invalidated via a generation counter in CACHES)
+PRICE_CACHE_ENABLED = os.environ.get("PRICE_CACHE_ENABLED", "true").lower() == "true"
+PRICE_CACHE_BUCKET_SECONDS = int(os.environ.get("PRICE_CACHE_BUCKET_SECONDS", "60"))
+PRICE_CACHE_MAX_ENTRIES = int(os.environ.get("PRICE_CACHE_MAX_ENTRIES", "10000"))
+
+# Chat presence (seconds an entry lives without a heartbeat) and typing
+# indicator coalescing (minimum seconds between fan-outs per socket)
+CHAT_PRESENCE_TTL = int(os.environ.get("CHAT_PRESENCE_TTL", "60"))
+CHAT_TYPING_INTERVAL = float(os.environ.get("CHAT_TYPING_INTERVAL", "0.5"))
+
+# Chat inbox lists read the denormalized ConversationSummary table (run
+# backfill_conversation_summaries before enabling)
+CHAT_SUMMARY_ENABLED = os.environ.get("CHAT_SUMMARY_ENABLED", "false").lower() == "true"
+
+# FCM push notifications (sender class, background queue, failures before a
+# device is deactivated)
+FCM_PUSH_SENDER = os.environ.get("FCM_PUSH_SENDER", "diveops.operations.services.fcm.FirebaseSender")
+FCM_PUSH_ASYNC = os.environ.get("FCM_PUSH_ASYNC", "true").lower() == "true"
+FCM_MAX_FAILURES = int(os.environ.get("FCM_MAX_FAILURES", "5"))
+
+# Image renditions are generated by a background worker after upload
+MEDIA_RENDITIONS_ASYNC = os.environ.get("MEDIA_RENDITIONS_ASYNC", "true").lower() == "true"
+
+# Thumbnail variant formats written next to the JPEG renditions ("webp",
+# "avif" with Pillow 11.3+), and the memory one decoded original may use
+THUMBNAIL_FORMATS = [f.strip() for f in os.environ.get("THUMBNAIL_FORMATS", "webp").split(",") if f.strip()]
+THUMBNAIL_DECODE_BUDGET_MB = int(os.environ.get("THUMBNAIL_DECODE_BUDGET_MB", "256"))
+
+# Document S3 sync (parallel uploads, and the size above which files are
+# uploaded in multipart chunks of that size)
+S3_SYNC_WORKERS = int(os.environ.get("S3_SYNC_WORKERS", "8"))
+S3_SYNC_MULTIPART_MB = int(os.environ.get("S3_SYNC_MULTIPART_MB", "16"))
+
+# Cached document folder paths (invalidated by a folder-tree version in CACHES)
+FOLDER_TREE_CACHE_TIMEOUT = int(os.environ.get("FOLDER_TREE_CACHE_TIMEOUT", "86400"))
+
+# Mobile location uploads (maximum updates per batch request)
+LOCATION_BATCH_MAX_UPDATES = int(os.environ.get("LOCATION_BATCH_MAX_UPDATES", "1000"))
+
+# Location history retention, per LocationSharingPreference visibility
+# ("default" applies to everyone else and fills in missing keys). Raw points
+# older than downsample_after_days are thinned with Douglas-Peucker at
+# tolerance_meters; points older than delete_after_days are removed (None
+# keeps them). Run compact_location_history daily.
+LOCATION_RETENTION_POLICIES = {
+    "default": {"downsample_after_days": 30, "tolerance_meters": 10, "delete_after_days": 730},
+    "private": {"downsample_after_days": 7, "tolerance_meters": 25, "delete_after_days": 180},
+}
+
+# Monthly LocationUpdate partitions created ahead of time (partitioned tables
+# only, see partition_location_updates)
+LOCATION_PARTITION_MONTHS_AHEAD = int(os.environ.get("LOCATION_PARTITION_MONTHS_AHEAD", "3"))
+
+# Seconds a completed excursion's reconstructed track stays cached
+LOCATION_TRACK_CACHE_TIMEOUT = int(os.environ.get("LOCATION_TRACK_CACHE_TIMEOUT", str(7 * 24 * 3600)))
 
 # Site configuration
 SITE_NAME = DIVE_SHOP_NAME
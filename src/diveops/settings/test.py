@@ -68,3 +68,10 @@ CHANNEL_LAYERS = {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
     },
 }
+
+# Push notifications: local stub sender, sent inline (no worker thread)
+FCM_PUSH_SENDER = "diveops.operations.services.fcm.StubSender"
+FCM_PUSH_ASYNC = False
+
+# Image renditions generated inline (no worker thread)
+MEDIA_RENDITIONS_ASYNC = False